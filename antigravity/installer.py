@@ -9,14 +9,31 @@ import os
 import sys
 import subprocess
 import tempfile
-import requests
-import time
+import re
 import ctypes
+import argparse
 import platform
 from pathlib import Path
 
+# Garantir que os módulos compartilhados (nodeecli/modules) sejam importáveis
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / 'nodeecli').is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from nodeecli.modules.common import (  # noqa: E402
+    configure_stdout_stderr, obter_diretorio_staging, salvar_artefato_preparado,
+    carregar_artefato_preparado, limpar_artefato_preparado,
+)
+from nodeecli.modules.artifact_cache import obter_com_cache  # noqa: E402
+from nodeecli.modules.bundle import ErroBundle, adicionar_argumento_bundle, obter_bundle  # noqa: E402
+from nodeecli.modules.downloader import ErroDownload  # noqa: E402
+from nodeecli.modules.events import avisar, cancelamento_solicitado, concluir, fase  # noqa: E402
+from nodeecli.modules.http_client import adicionar_argumentos_http, definir_opcoes_http  # noqa: E402
+from nodeecli.modules.progress import IndicadorProgresso  # noqa: E402
+
 
 # Constantes
+FERRAMENTA = "antigravity"
 # URL oficial do Google Edge CDN para download do Antigravity
 ANTIGRAVITY_DOWNLOAD_URL_X64 = "https://edgedl.me.gvt1.com/edgedl/release2/j0qc3/antigravity/stable/1.15.8-5724687216017408/windows-x64/Antigravity.exe"
 ANTIGRAVITY_DOWNLOAD_URL_ARM64 = "https://edgedl.me.gvt1.com/edgedl/release2/j0qc3/antigravity/stable/1.15.8-5724687216017408/windows-arm64/Antigravity.exe"
@@ -61,16 +78,45 @@ def get_download_url() -> str:
     return ANTIGRAVITY_DOWNLOAD_URL_X64
 
 
-def download_antigravity() -> str | None:
+def get_version(download_url: str) -> str | None:
+    """
+    Extrai a versão da URL de download (ex.: '.../stable/1.15.8-5724687216017408/...').
+
+    Returns:
+        str: Versão (ex.: '1.15.8') ou None se a URL não seguir o padrão
+    """
+    match = re.search(r"/stable/(\d+(?:\.\d+)+)-", download_url)
+    return match.group(1) if match else None
+
+
+def download_antigravity(bundle=None) -> str | None:
     """
     Baixa o instalador do Antigravity com barra de progresso.
 
+    Args:
+        bundle (Bundle): Bundle offline; se informado, o instalador é copiado dele sem acessar a rede
+
     Returns:
         str: Caminho completo do arquivo baixado
         None: Em caso de erro
     """
     download_url = get_download_url()
     arch = "ARM64" if "arm" in platform.machine().lower() else "x64"
+
+    if bundle:
+        entry = bundle.procurar(FERRAMENTA, arquitetura=arch.lower())
+        if not entry:
+            print(f"❌ O bundle não contém o instalador do Antigravity ({arch}).")
+            return None
+        try:
+            installer_path = bundle.materializar(
+                entry, obter_diretorio_staging(FERRAMENTA) / f"Antigravity-{arch}.exe")
+        except ErroBundle as e:
+            print(f"❌ {e}")
+            return None
+        print(f"📦 Usando Antigravity {entry.get('versao') or ''} ({arch}) do bundle offline")
+        print(f"✅ Instalador disponível: {installer_path}")
+        return installer_path
     
     print(f"📥 Baixando Antigravity IDE ({arch})...")
     print(f"   URL: {download_url}")
@@ -78,78 +124,26 @@ def download_antigravity() -> str | None:
     print()
 
     try:
-        # Criar arquivo temporário com nome único
-        temp_file = tempfile.NamedTemporaryFile(suffix='.exe', delete=False)
-        installer_path = temp_file.name
-        temp_file.close()
-
-        # Configurar timeout e tentativas
-        TIMEOUT = (15, 180)  # connect, read - maior timeout para download grande
-        response = None
-
-        for attempt in range(3):
-            try:
-                print(f"   Tentativa {attempt + 1}/3...")
-                response = requests.get(download_url, stream=True, timeout=TIMEOUT, allow_redirects=True)
-                response.raise_for_status()
-                break
-            except requests.RequestException as e:
-                print(f"   Erro na tentativa {attempt + 1}: {e}")
-                if attempt == 2:
-                    raise
-                wait_time = 3 * (attempt + 1)
-                print(f"   Aguardando {wait_time} segundos antes de tentar novamente...")
-                time.sleep(wait_time)
-
-        # Obter tamanho total do arquivo
-        total_size = None
-        total_mb = 0
-        if response is not None:
-            total_size = response.headers.get('Content-Length')
-            if total_size is not None:
-                total_size = int(total_size)
-                total_mb = total_size / (1024 * 1024)
-            else:
-                total_size = None
-
-        # Iniciar download com barra de progresso
-        downloaded = 0
-        chunk_size = 8192
-
-        with open(installer_path, 'wb') as file:
-            if response is not None:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        file.write(chunk)
-                        downloaded += len(chunk)
-                        downloaded_mb = downloaded / (1024 * 1024)
-
-                        # Exibir progresso
-                        if total_size:
-                            progress = downloaded / total_size * 100
-                            bar_length = 40
-                            filled_length = int(bar_length * progress / 100)
-                            bar = '█' * filled_length + '-' * (bar_length - filled_length)
-                            print(f'\r   Progresso: |{bar}| {progress:.1f}% ({downloaded_mb:.1f}/{total_mb:.1f} MB)', end='', flush=True)
-                        else:
-                            print(f'\r   Baixado: {downloaded_mb:.1f} MB', end='', flush=True)
-
-        print()  # Nova linha após o progresso
-        
-        # Verificar integridade do download (tolerar pequenas diferenças do CDN)
-        if total_size is not None and downloaded < total_size:
-            try:
-                os.remove(installer_path)
-            except Exception:
-                pass
-            print(f"\n❌ Download incompleto: {downloaded} bytes de {total_size} bytes esperados.")
-            return None
-            
+        # Caminho determinístico no staging: a etapa "install" pode rodar em outro processo
+        installer_path = str(obter_diretorio_staging(FERRAMENTA) / f"Antigravity-{arch}.exe")
+
+        # Download em faixas paralelas (fluxo único se o servidor não suportar Range)
+        # Reaproveitar o cache local de artefatos quando esta versão já foi baixada
+        indicador = IndicadorProgresso()
+        resultado = obter_com_cache(download_url, installer_path, FERRAMENTA, get_version(download_url),
+                                    arch.lower(), timeout=(15, 180), ao_progresso=indicador,
+                                    cancelar=cancelamento_solicitado)
+        indicador.concluir()
+        if resultado['origem'] == 'cache':
+            print("📦 Instalador encontrado no cache local (download dispensado)")
+
         print(f"✅ Download concluído: {installer_path}")
+        if resultado['segmentos'] > 1:
+            print(f"   Conexões simultâneas: {resultado['segmentos']}")
         return str(installer_path)
 
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ Erro de conexão após 3 tentativas: {e}")
+    except ErroDownload as e:
+        print(f"\n❌ Erro no download: {e}")
         print("   Verifique sua conexão com a internet e tente novamente.")
         return None
     except IOError as e:
@@ -238,23 +232,23 @@ def install() -> int:
     Returns:
         int: 0 se sucesso, 1 se falha
     """
-    return main()
+    return main([])
+
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Interpreta os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Instalador automático do Antigravity IDE")
+    parser.add_argument('--phase', choices=['all', 'fetch', 'install'], default='all',
+                        help="Etapa a executar: all=download + instalação, fetch=apenas download, "
+                             "install=instala o que a etapa fetch baixou")
+    adicionar_argumentos_http(parser)
+    adicionar_argumento_bundle(parser)
+    return parser.parse_args(argv)
 
-def main() -> int:
+
+def main(argv=None) -> int:
     """Função principal que orquestra o processo de instalação."""
-    # Import resiliente de configure_stdout_stderr (opcional)
-    try:
-        from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-    except ModuleNotFoundError:
-        try:
-            project_root = Path(__file__).resolve().parent.parent
-            if (project_root / 'nodeecli').is_dir() and str(project_root) not in sys.path:
-                sys.path.insert(0, str(project_root))
-            from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-        except ModuleNotFoundError:
-            def configure_stdout_stderr() -> None:  # type: ignore
-                return None
+    args = parse_args(argv)
 
     try:
         configure_stdout_stderr()
@@ -263,6 +257,13 @@ def main() -> int:
     
     print_banner()
 
+    try:
+        definir_opcoes_http(proxy=args.proxy, cacert=args.cacert, espelho=args.mirror)
+        bundle = obter_bundle(args.from_bundle) if args.phase != 'install' else None
+    except (FileNotFoundError, ErroBundle) as e:
+        print(f"❌ {e}")
+        return 1
+
     # Verificar se está no Windows
     if not verify_windows():
         return 1
@@ -274,33 +275,50 @@ def main() -> int:
         print("   • Será baixada a versão ARM64 do Antigravity")
         print()
     elif arch not in ("amd64", "x86_64"):
-        print("⚠️  Aviso: Arquitetura não reconhecida.")
-        print(f"   • Detectado: {arch}")
+        avisar(f"Arquitetura não reconhecida ({arch}).")
         print("   • Será tentada a versão x64")
         print()
 
-    # Verificar privilégios de administrador
-    admin_status = is_admin()
-    if not admin_status:
-        print("ℹ️  Nota: Executando sem privilégios de administrador.")
-        print("   • O instalador pode solicitar elevação")
-        print("   • Se encontrar problemas, execute como administrador")
-        print()
-    else:
-        print("✅ Executando com privilégios de administrador")
-        print()
+    if args.phase != 'fetch':
+        # Verificar privilégios de administrador
+        admin_status = is_admin()
+        if not admin_status:
+            print("ℹ️  Nota: Executando sem privilégios de administrador.")
+            print("   • O instalador pode solicitar elevação")
+            print("   • Se encontrar problemas, execute como administrador")
+            print()
+        else:
+            print("✅ Executando com privilégios de administrador")
+            print()
 
     try:
-        # Baixar o instalador
-        installer_path = download_antigravity()
-        if not installer_path:
-            return 1
+        if args.phase == 'install':
+            # Usar o instalador baixado pela etapa "fetch"
+            preparado = carregar_artefato_preparado(FERRAMENTA)
+            if not preparado or not preparado.get('caminho'):
+                print("❌ Nenhum instalador preparado encontrado. Execute a etapa 'fetch' antes.")
+                return 1
+            installer_path = preparado['caminho']
+        else:
+            # Baixar o instalador
+            with fase('download') as etapa:
+                installer_path = download_antigravity(bundle)
+                etapa.sucesso = bool(installer_path)
+            if not installer_path:
+                return 1
+
+            if args.phase == 'fetch':
+                salvar_artefato_preparado(FERRAMENTA, installer_path)
+                print("📦 Instalador pronto para a etapa de instalação.")
+                return 0
 
         # Executar instalação
-        success = install_antigravity(installer_path)
+        with fase('instalacao') as etapa:
+            success = etapa.sucesso = install_antigravity(installer_path)
 
         # Limpar arquivo temporário
         cleanup(installer_path)
+        limpar_artefato_preparado(FERRAMENTA)
 
         if success:
             print("\n🎉 Instalação concluída com sucesso!")
@@ -321,4 +339,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(concluir(main()))
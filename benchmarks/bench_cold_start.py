@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de partida a frio de cada instalador (``python <script> --help``).
+
+Para cada instalador executa ``python -X importtime <script> --help`` e
+informa a mediana do tempo total do processo, o tempo somado dos imports, se
+a pilha HTTP (requests, urllib3, ssl) foi carregada e os imports mais caros.
+O --help passa pelos mesmos imports de uma execução sem nada a fazer (Node.js
+já atualizado, ferramenta já instalada), que não devem pagar pela pilha HTTP.
+
+Uso:
+    python -m benchmarks.bench_cold_start [--repeticoes 5] [--top 5] [--ferramenta vscode]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.tools import INSTALLER_SCRIPTS  # noqa: E402
+
+# Módulos cujo carregamento indica que a pilha HTTP foi importada
+PILHA_HTTP = ('requests', 'urllib3', 'ssl')
+
+
+def medir(script):
+    """
+    Executa o instalador com -X importtime.
+
+    Returns:
+        tuple: (segundos do processo, {módulo: (próprio em µs, acumulado em µs)})
+    """
+    comando = [sys.executable, '-X', 'importtime', os.path.join(project_root, script), '--help']
+    inicio = time.perf_counter()
+    resultado = subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               text=True, encoding='utf-8', errors='replace',
+                               creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    decorrido = time.perf_counter() - inicio
+    imports = {}
+    for linha in resultado.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        imports[nome.strip()] = (int(proprio), int(acumulado))
+    return decorrido, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help="Imports mais caros exibidos por instalador")
+    parser.add_argument('--ferramenta', choices=list(INSTALLER_SCRIPTS), help="Medir só este instalador")
+    args = parser.parse_args()
+
+    ferramentas = [args.ferramenta] if args.ferramenta else list(INSTALLER_SCRIPTS)
+    print(f"{'Ferramenta':<12} {'Total (ms)':>11} {'Imports (ms)':>13} {'Módulos':>8}  Pilha HTTP")
+    detalhes = []
+    for ferramenta in ferramentas:
+        script = INSTALLER_SCRIPTS[ferramenta]
+        medir(script)  # aquecer o cache de disco e os .pyc
+        medidas = [medir(script) for _ in range(args.repeticoes)]
+        total = statistics.median(m[0] for m in medidas) * 1000
+        imports = medidas[-1][1]
+        tempo_imports = statistics.median(sum(p for p, _ in m[1].values()) for m in medidas) / 1000
+        http = [nome for nome in PILHA_HTTP if nome in imports]
+        print(f"{ferramenta:<12} {total:>11.0f} {tempo_imports:>13.1f} {len(imports):>8}  "
+              f"{', '.join(http) if http else 'não carregada'}")
+        # Pacotes de topo com maior tempo acumulado
+        topo = sorted(((a, n) for n, (_, a) in imports.items() if '.' not in n), reverse=True)
+        detalhes.append((ferramenta, topo[:args.top]))
+
+    for ferramenta, topo in detalhes:
+        print(f"\n{ferramenta}: imports mais caros (acumulado, ms)")
+        for acumulado, nome in topo:
+            print(f"  {nome:<40} {acumulado / 1000:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark da fila de mensagens da interface (src/app/message_pump.py).
+
+Uma thread produz mensagens (90% PROGRESS/DOWNLOAD, 10% LOG) na taxa pedida;
+o consumidor simula o loop do Tk, em que cada atualização de widget custa
+um tempo fixo. Compara o tratamento de uma mensagem por vez (fila esvaziada
+inteira a cada 100 ms, como antes) com o pump com orçamento e coalescência.
+A métrica que importa para a interface é a maior passada (tempo em que o loop
+do Tk fica sem atender cliques e redesenhos).
+
+Uso:
+    python -m benchmarks.bench_message_pump [--taxa 20000] [--segundos 3] [--custo-us 50]
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.app.message_pump import WakeupQueue, drain  # noqa: E402
+
+
+def produzir(fila, taxa, segundos):
+    """Coloca mensagens na fila em lotes de 1 ms até completar taxa * segundos."""
+    por_ms = max(1, taxa // 1000)
+    inicio = time.perf_counter()
+    for lote in range(int(segundos * 1000)):
+        for i in range(por_ms):
+            if i % 10 == 0:
+                fila.put(('LOG', f'linha {lote}.{i}', 'INFO'))
+            elif i % 2:
+                fila.put(('PROGRESS', lote / (segundos * 1000)))
+            else:
+                fila.put(('DOWNLOAD', 'VS Code', lote, segundos * 1000, 1.0))
+        atraso = inicio + (lote + 1) / 1000 - time.perf_counter()
+        if atraso > 0:
+            time.sleep(atraso)
+
+
+def ocupar(segundos):
+    """Simula o custo de atualizar widgets."""
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        pass
+
+
+def por_mensagem(taxa, segundos, custo):
+    """Modelo anterior: a cada 100 ms, trata todas as mensagens, uma atualização por mensagem."""
+    fila = queue.Queue()
+    produtor = threading.Thread(target=produzir, args=(fila, taxa, segundos))
+    produtor.start()
+    passadas = []
+    while produtor.is_alive() or not fila.empty():
+        time.sleep(0.1)
+        inicio = time.perf_counter()
+        while True:
+            try:
+                fila.get_nowait()
+            except queue.Empty:
+                break
+            ocupar(custo)
+        passadas.append(time.perf_counter() - inicio)
+    produtor.join()
+    return passadas
+
+
+def com_pump(taxa, segundos, custo):
+    """Pump: acorda com a primeira mensagem, passadas de até 8 ms, valores redundantes descartados."""
+    avisos = threading.Semaphore(0)
+    fila = WakeupQueue(avisos.release)
+    produtor = threading.Thread(target=produzir, args=(fila, taxa, segundos))
+    produtor.start()
+    passadas = []
+    while produtor.is_alive() or not fila.empty():
+        if not avisos.acquire(timeout=0.1):
+            continue
+        while True:
+            inicio = time.perf_counter()
+            batch, more = drain(fila, 0.008)
+            ocupar(custo * batch.applied)
+            passadas.append(time.perf_counter() - inicio)
+            if not more and not fila.rearm():
+                break
+    produtor.join()
+    return passadas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da fila de mensagens da interface")
+    parser.add_argument('--taxa', type=int, default=20000, help="Mensagens por segundo")
+    parser.add_argument('--segundos', type=float, default=3.0, help="Duração da produção")
+    parser.add_argument('--custo-us', type=float, default=50.0, help="Custo de uma atualização de widget em µs")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"{args.taxa} mensagens/s por {args.segundos:.0f}s | atualização de widget: {args.custo_us:.0f} µs")
+    print("=" * 60)
+    for nome, modelo in (("por mensagem", por_mensagem), ("pump", com_pump)):
+        passadas = sorted(modelo(args.taxa, args.segundos, args.custo_us / 1_000_000))
+        ocupado = sum(passadas)
+        print(f"{nome:<13}: {len(passadas):5d} passadas  maior {passadas[-1] * 1000:7.1f} ms  "
+              f"p95 {passadas[int(len(passadas) * 0.95) - 1] * 1000:6.1f} ms  "
+              f"loop ocupado {ocupado / args.segundos:5.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
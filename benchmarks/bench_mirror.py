@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga do espelho de artefatos (mirror serve).
+
+Um servidor HTTP local faz o papel de nodejs.org, com banda limitada por
+conexão; vários clientes simultâneos baixam o mesmo instalador pelo espelho,
+com o downloader segmentado dos instaladores. A primeira rodada encontra o
+cache vazio (todos os clientes acompanham uma única busca na origem); a
+segunda é atendida inteiramente do cache do espelho.
+
+Uso:
+    python -m benchmarks.bench_mirror [--clientes 32] [--mb 32] [--mbps-origem 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.artifact_cache import ArtifactCache  # noqa: E402
+from nodeecli.modules.downloader import baixar_arquivo  # noqa: E402
+from nodeecli.modules.http_client import criar_sessao  # noqa: E402
+from src.core.mirror import MirrorServer  # noqa: E402
+from tests.http_stub import ServidorHttpLocal  # noqa: E402
+
+
+def rodada(url, diretorio, clientes):
+    """Baixa a URL com N clientes simultâneos. Retorna (duração total, durações por cliente, erros)."""
+    duracoes, erros = [], []
+    barreira = threading.Barrier(clientes)
+
+    def cliente(indice):
+        destino = os.path.join(diretorio, f'cliente{indice}.msi')
+        barreira.wait()
+        inicio = time.perf_counter()
+        try:
+            baixar_arquivo(url, destino, session=requests.Session())
+            duracoes.append(time.perf_counter() - inicio)
+        except Exception as e:
+            erros.append(e)
+        finally:
+            if os.path.exists(destino):
+                os.remove(destino)
+
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - inicio, sorted(duracoes), erros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de carga do espelho de artefatos")
+    parser.add_argument('--clientes', type=int, default=32, help="Clientes simultâneos")
+    parser.add_argument('--mb', type=int, default=32, help="Tamanho do instalador em MB")
+    parser.add_argument('--mbps-origem', type=float, default=200.0,
+                        help="Limite de banda por conexão com a origem em Mbit/s")
+    args = parser.parse_args(argv)
+
+    conteudo = os.urandom(args.mb * 1024 * 1024)
+    limite = int(args.mbps_origem * 1_000_000 / 8)
+
+    print("=" * 60)
+    print(f"{args.clientes} clientes | instalador de {args.mb} MB | origem: {args.mbps_origem:.0f} Mbit/s por conexão")
+    print("=" * 60)
+
+    with ServidorHttpLocal({'/dist/v22.11.0/node.msi': conteudo}, bytes_por_segundo=limite) as origem, \
+            tempfile.TemporaryDirectory() as tmp:
+        espelho = MirrorServer('127.0.0.1', 0, cache=ArtifactCache(os.path.join(tmp, 'cache')),
+                               origins={'dist': origem.url('/dist/')}, session=criar_sessao(espelho=''))
+        with espelho:
+            url = f"{espelho.url}/dist/v22.11.0/node.msi"
+            for nome in ("cache vazio", "cache cheio"):
+                total, duracoes, erros = rodada(url, tmp, args.clientes)
+                vazao = args.clientes * args.mb * 8 / total
+                p50 = statistics.median(duracoes) if duracoes else 0
+                p95 = duracoes[int(len(duracoes) * 0.95) - 1] if duracoes else 0
+                print(f"{nome:<12}: {total:6.2f}s  {vazao:8.1f} Mbit/s agregados  "
+                      f"p50 {p50:5.2f}s  p95 {p95:5.2f}s  erros: {len(erros)}")
+
+            print("-" * 60)
+            print(f"Requisições ao espelho: {espelho.stats.get('requests', 0)} "
+                  f"(aguardando a busca: {espelho.stats.get('joined', 0)})")
+            print(f"Baixado da origem: {origem.bytes_enviados / (1024 * 1024):.1f} MB "
+                  f"(sem espelho: {2 * args.clientes * args.mb} MB)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark do download segmentado.
+
+Serve um instalador fictício por um servidor HTTP local que limita a banda de
+cada conexão (simulando o teto de um único fluxo TCP até o CDN) e compara o
+download em fluxo único com 4 e 8 segmentos.
+
+Uso:
+    python -m benchmarks.bench_segmented_download [--mb 32] [--mbps-por-conexao 40]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.downloader import baixar_arquivo  # noqa: E402
+from tests.http_stub import ServidorHttpLocal  # noqa: E402
+
+
+def medir(url, destino, segmentos):
+    inicio = time.perf_counter()
+    resultado = baixar_arquivo(url, destino, segmentos=segmentos)
+    duracao = time.perf_counter() - inicio
+    os.remove(destino)
+    return duracao, resultado['segmentos']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do download segmentado")
+    parser.add_argument('--mb', type=int, default=32, help="Tamanho do arquivo em MB")
+    parser.add_argument('--mbps-por-conexao', type=float, default=40.0,
+                        help="Limite de banda por conexão em Mbit/s")
+    args = parser.parse_args(argv)
+
+    conteudo = os.urandom(args.mb * 1024 * 1024)
+    limite = int(args.mbps_por_conexao * 1_000_000 / 8)
+
+    print("=" * 60)
+    print(f"Arquivo: {args.mb} MB | limite por conexão: {args.mbps_por_conexao:.0f} Mbit/s")
+    print("=" * 60)
+
+    with ServidorHttpLocal({'/setup.exe': conteudo}, bytes_por_segundo=limite) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, 'setup.exe')
+        base = None
+        for segmentos in (1, 4, 8):
+            duracao, usados = medir(servidor.url('/setup.exe'), destino, segmentos)
+            base = base or duracao
+            vazao = args.mb * 8 / duracao
+            print(f"{usados} segmento(s): {duracao:6.2f}s  {vazao:7.1f} Mbit/s  ({base / duracao:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
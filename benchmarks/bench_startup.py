@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização dos instaladores: tempo até a primeira saída.
+
+Para cada instalador mede, a partir do início do processo, quanto tempo leva
+até o primeiro byte no stdout (``--help``: todos os imports do instalador já
+foram feitos, nada foi baixado) e até o fim do processo. Formas comparadas:
+
+- script:  python <script>.py (execução a partir do código-fonte)
+- run:     python src/main.py run <ferramenta> (o despachante do executável único)
+- exe:     <executável empacotado> run <ferramenta> (com --exe)
+- antigo:  os executáveis onefile separados de builds anteriores (com --antigos)
+
+Uso:
+    python -m benchmarks.bench_startup [--repeticoes 5]
+        [--exe dist\\OrquestradorInstalacoes\\OrquestradorInstalacoes.exe] [--antigos dist_antigo]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.tools import INSTALLER_SCRIPTS  # noqa: E402
+
+# Executáveis onefile gerados pelo orchestrator.spec antes do executável único
+EXECUTAVEIS_ANTIGOS = {
+    "nodejs": "install_nodejs.exe",
+    "vscode": "vscode_installer.exe",
+    "git": "git_installer.exe",
+    "mcp_excel": "mcp_excel_installer.exe",
+}
+
+
+def medir(comando):
+    """Retorna (segundos até o primeiro byte no stdout, segundos até o fim do processo)."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+                                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    processo.stdout.read(1)
+    primeira_saida = time.perf_counter() - inicio
+    processo.stdout.read()
+    processo.stdout.close()
+    processo.wait()
+    return primeira_saida, time.perf_counter() - inicio
+
+
+def comandos(ferramenta, exe=None, antigos=None):
+    """Formas de iniciar o instalador, por rótulo."""
+    formas = {
+        "script": [sys.executable, os.path.join(project_root, INSTALLER_SCRIPTS[ferramenta]), "--help"],
+        "run": [sys.executable, os.path.join(project_root, "src", "main.py"), "run", ferramenta, "--help"],
+    }
+    if exe:
+        formas["exe"] = [exe, "run", ferramenta, "--help"]
+    if antigos and ferramenta in EXECUTAVEIS_ANTIGOS:
+        caminho = os.path.join(antigos, EXECUTAVEIS_ANTIGOS[ferramenta])
+        if os.path.exists(caminho):
+            formas["antigo"] = [caminho, "--help"]
+    return formas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--exe', help="Executável único gerado pelo orchestrator.spec")
+    parser.add_argument('--antigos', help="Diretório com os executáveis onefile antigos")
+    args = parser.parse_args()
+
+    print(f"{'Ferramenta':<12} {'Forma':<8} {'1ª saída (ms)':>14} {'Total (ms)':>11}")
+    for ferramenta in INSTALLER_SCRIPTS:
+        for rotulo, comando in comandos(ferramenta, args.exe, args.antigos).items():
+            medir(comando)  # aquecer o cache de disco
+            medidas = [medir(comando) for _ in range(args.repeticoes)]
+            primeira = statistics.median(m[0] for m in medidas) * 1000
+            total = statistics.median(m[1] for m in medidas) * 1000
+            print(f"{ferramenta:<12} {rotulo:<8} {primeira:>14.0f} {total:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
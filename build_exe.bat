@@ -66,10 +66,8 @@ echo   Build concluÃ­do com sucesso!
 echo ========================================
 echo.
 echo ExecutÃ¡veis disponÃ­veis em:
-echo   - dist\OrquestradorInstalacoes.exe (Interface GrÃ¡fica)
-echo   - dist\install_nodejs.exe (Instalador Node.js)
-echo   - dist\vscode_installer.exe (Instalador VS Code)
-echo   - dist\git_installer.exe (Instalador Git)
-echo   - dist\mcp_excel_installer.exe (Instalador MCP Excel Server)
+echo   - dist\OrquestradorInstalacoes\OrquestradorInstalacoes.exe
+echo     (GUI; os instaladores rodam como "OrquestradorInstalacoes.exe run <ferramenta>")
+echo   Distribua a pasta dist\OrquestradorInstalacoes inteira.
 echo.
 pause
@@ -0,0 +1,9 @@
+"""
+Git Installer Module
+
+Módulo de instalação automatizada do Git for Windows.
+"""
+
+from git.git_installer import main
+
+__all__ = ["main"]
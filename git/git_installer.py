@@ -1,15 +1,39 @@
-import os
+import re
 import sys
 import time
 import json
 import ctypes
+import argparse
 import tempfile
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import platform
-import requests
+
+# Garantir que os módulos compartilhados (nodeecli/modules) sejam importáveis
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / "nodeecli").is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from nodeecli.modules.common import (  # noqa: E402
+    obter_diretorio_staging, salvar_artefato_preparado,
+    carregar_artefato_preparado, limpar_artefato_preparado,
+)
+from nodeecli.modules.artifact_cache import obter_com_cache, obter_do_cache  # noqa: E402
+from nodeecli.modules.bundle import ErroBundle, adicionar_argumento_bundle, obter_bundle  # noqa: E402
+from nodeecli.modules.downloader import ErroDownload  # noqa: E402
+from nodeecli.modules.events import avisar, cancelamento_solicitado, concluir, fase  # noqa: E402
+from nodeecli.modules.http_client import adicionar_argumentos_http, definir_opcoes_http  # noqa: E402
+from nodeecli.modules.importacao import importar_adiado  # noqa: E402
+from nodeecli.modules.metadata_cache import MetadataCache, TTL_PADRAO  # noqa: E402
+from nodeecli.modules.progress import IndicadorProgresso  # noqa: E402
+
+# Importado na primeira requisição: --help e a etapa "install" não carregam a pilha HTTP
+requests = importar_adiado("requests")
+
+FERRAMENTA = "git"
+ARQUITETURA = "x64"
 
 
 def print_banner() -> None:
@@ -39,81 +63,55 @@ def _resolve_latest_git_url(timeout: int = 15) -> Optional[str]:
     headers = {"Accept": "application/vnd.github+json", "User-Agent": "git-installer"}
 
     try:
-        resp = requests.get(api, headers=headers, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
+        # Resposta em cache com revalidação condicional: 304 não consome o limite da API
+        data = MetadataCache().obter(api, ttl=TTL_PADRAO, timeout=timeout, headers=headers).json()
         for asset in data.get("assets", []):
             name = asset.get("name", "")
             if name.endswith("-64-bit.exe") and name.startswith("Git-"):
                 return asset.get("browser_download_url")
-    except requests.RequestException:
+    except (requests.RequestException, ValueError):
         return None
     return None
 
 
+def _version_from_url(url: str) -> Optional[str]:
+    """Extracts the Git version from an installer URL (e.g. '.../Git-2.47.1-64-bit.exe')."""
+    match = re.search(r"Git-(\d+(?:\.\d+)+)-64-bit\.exe$", url)
+    return match.group(1) if match else None
+
+
 def download_git(url: str, timeout: int = 300) -> Optional[Path]:
     """Downloads the Git installer from the given URL with retries and progress.
 
     Returns the path to the downloaded file or None on failure.
     """
     print(f"Baixando instalador do Git: {url}")
-    target = Path(tempfile.gettempdir()) / "GitInstaller-setup.exe"
+    target = obter_diretorio_staging(FERRAMENTA) / "GitInstaller-setup.exe"
 
     backoffs = [2, 5, 10]
     for attempt in range(1, 4):
         print(f"[DOWNLOAD] tentativa {attempt}/3")
-        # Remover artefato anterior (se existir) antes de cada tentativa
+        # O download parcial (.part) é mantido entre tentativas e retomado via Range
         try:
-            if target.exists():
-                target.unlink(missing_ok=True)  # type: ignore[call-arg]
-        except Exception:
-            pass
-
-        try:
-            with requests.get(url, stream=True, timeout=timeout) as r:
-                r.raise_for_status()
-                total = int(r.headers.get("Content-Length", 0))
-                downloaded = 0
-                chunk = 1024 * 64
-
-                with open(target, "wb") as f:
-                    start = time.time()
-                    for part in r.iter_content(chunk_size=chunk):
-                        if not part:
-                            continue
-
-                        # Checagem opcional de cancelamento via variável de ambiente
-                        if os.environ.get("INSTALL_CANCELLED") == "1":
-                            print("Download cancelado pelo usuário (variável INSTALL_CANCELLED=1).", flush=True)
-                            try:
-                                f.flush()
-                            except Exception:
-                                pass
-                            try:
-                                target.unlink(missing_ok=True)  # type: ignore[call-arg]
-                            except Exception:
-                                pass
-                            return None
-
-                        f.write(part)
-                        downloaded += len(part)
-
-                        if total > 0:
-                            percent = downloaded / total
-                            bar = int(percent * 30)
-                            print(
-                                f"[DOWNLOAD] [{'#' * bar}{'.' * (30 - bar)}] {percent:6.2%}",
-                                flush=True,
-                            )
-                    elapsed = max(time.time() - start, 0.1)
-                    speed = downloaded / elapsed / 1024
-                    print(f"Download concluído ({downloaded/1024/1024:.2f} MB a {speed:.1f} KB/s)")
-
-                if total and downloaded != total:
-                    print("Aviso: tamanho baixado difere do esperado", flush=True)
-
+            start = time.time()
+            indicador = IndicadorProgresso("[DOWNLOAD]")
+            resultado = obter_com_cache(url, target, FERRAMENTA, _version_from_url(url), ARQUITETURA,
+                                        timeout=(10, timeout), ao_progresso=indicador,
+                                        cancelar=cancelamento_solicitado)
+            indicador.concluir()
+            if resultado["origem"] == "cache":
+                print("Instalador encontrado no cache local (download dispensado)")
+                return target
+            elapsed = max(time.time() - start, 0.1)
+            size = resultado["tamanho"]
+            speed = size / elapsed / 1024
+            origem = " (retomado)" if resultado["retomado"] else ""
+            print(f"Download concluído{origem} ({size/1024/1024:.2f} MB a {speed:.1f} KB/s)")
             return target
-        except requests.RequestException as e:
+        except ErroDownload as e:
+            if cancelamento_solicitado():
+                print("Download cancelado pelo usuário.", flush=True)
+                return None
             print(f"Erro de rede ao baixar Git (tentativa {attempt}/3): {e}", flush=True)
         except OSError as e:
             print(f"Erro ao salvar arquivo do instalador (tentativa {attempt}/3): {e}", flush=True)
@@ -182,8 +180,39 @@ def cleanup(path: Optional[Path]) -> None:
         pass
 
 
-def main() -> int:
+def _installer_from_bundle(bundle) -> Optional[Path]:
+    """Copies the Git installer from an offline bundle to the staging directory.
+
+    Returns the path to the copied installer or None if the bundle does not contain it.
+    """
+    entry = bundle.procurar(FERRAMENTA, arquitetura=ARQUITETURA)
+    if not entry:
+        print("O bundle não contém o instalador do Git.")
+        return None
+    target = obter_diretorio_staging(FERRAMENTA) / "GitInstaller-setup.exe"
+    try:
+        bundle.materializar(entry, target)
+    except ErroBundle as e:
+        print(str(e))
+        return None
+    print(f"Usando Git {entry.get('versao') or ''} do bundle offline")
+    return target
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Instalador automático do Git for Windows")
+    parser.add_argument("--phase", choices=["all", "fetch", "install"], default="all",
+                        help="Etapa a executar: all=download + instalação, fetch=apenas download, "
+                             "install=instala o que a etapa fetch baixou")
+    adicionar_argumentos_http(parser)
+    adicionar_argumento_bundle(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Main entry point for Git installer orchestration."""
+    args = parse_args(argv)
     try:
         try:
             sys.stdout.reconfigure(encoding="utf-8")  # type: ignore[attr-defined]
@@ -193,28 +222,65 @@ def main() -> int:
 
         print_banner()
 
+        try:
+            definir_opcoes_http(proxy=args.proxy, cacert=args.cacert, espelho=args.mirror)
+            bundle = obter_bundle(args.from_bundle) if args.phase != "install" else None
+        except (FileNotFoundError, ErroBundle) as e:
+            print(str(e))
+            return 1
+
         if not verify_windows():
             print("Este instalador suporta apenas Windows.")
             return 1
 
         if platform.machine().endswith("64") is False:
-            print("Aviso: arquitetura não detectada como 64-bit.")
+            avisar("arquitetura não detectada como 64-bit.")
+
+        if args.phase == "install":
+            preparado = carregar_artefato_preparado(FERRAMENTA)
+            if not preparado or not preparado.get("caminho"):
+                print("Nenhum instalador do Git preparado. Execute a etapa 'fetch' antes.")
+                return 1
+            installer = Path(preparado["caminho"])
+        else:
+            url = ""
+            if not bundle:
+                print("Resolvendo URL do instalador mais recente do Git...")
+                url = _resolve_latest_git_url() or ""
+            if bundle:
+                installer = _installer_from_bundle(bundle)
+            elif url:
+                with fase("download") as etapa:
+                    installer = download_git(url)
+                    etapa.sucesso = installer is not None
+            else:
+                # Sem acesso à API: usar o instalador mais recente do cache local, se houver
+                target = obter_diretorio_staging(FERRAMENTA) / "GitInstaller-setup.exe"
+                entry = obter_do_cache(FERRAMENTA, target, arquitetura=ARQUITETURA)
+                if not entry:
+                    print("Não foi possível resolver a URL do instalador do Git via API do GitHub.")
+                    print("Tente novamente mais tarde ou baixe manualmente de: https://gitforwindows.org/")
+                    return 1
+                avisar(f"Sem acesso à API do GitHub: usando Git {entry.get('versao') or ''} do cache local")
+                url = entry.get("url") or ""
+                installer = target
+            if not installer:
+                return 1
+
+            if args.phase == "fetch":
+                salvar_artefato_preparado(FERRAMENTA, installer, url=url)
+                print("Instalador do Git pronto para a etapa de instalação.")
+                return 0
 
         if not is_admin():
             print("Executando sem privilégios de administrador (pode solicitar elevação).")
 
-        print("Resolvendo URL do instalador mais recente do Git...")
-        url = _resolve_latest_git_url() or ""
-        if not url:
-            print("Não foi possível resolver a URL do instalador do Git via API do GitHub.")
-            print("Tente novamente mais tarde ou baixe manualmente de: https://gitforwindows.org/")
-            return 1
-
-        installer = download_git(url)
-        if not installer:
-            return 1
-
-        code = install_git(installer)
+        with fase("instalacao") as etapa:
+            code = install_git(installer)
+            etapa.sucesso = code == 0
+        # O instalador permanece no cache de artefatos; a cópia do staging pode ser removida
+        cleanup(installer)
+        limpar_artefato_preparado(FERRAMENTA)
         if code == 0:
             print("Git instalado com sucesso! ✅")
         else:
@@ -226,11 +292,7 @@ def main() -> int:
     except Exception as e:
         print(f"Erro inesperado: {e}")
         return 1
-    finally:
-        # Deixar o arquivo para diagnóstico; comente a próxima linha caso prefira manter
-        # cleanup(installer)
-        pass
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(concluir(main()))
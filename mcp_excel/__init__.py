@@ -0,0 +1,9 @@
+"""
+MCP Excel Server Installer Module
+
+Módulo de instalação automatizada do MCP Excel Server.
+"""
+
+from mcp_excel.mcp_excel_installer import main
+
+__all__ = ["main"]
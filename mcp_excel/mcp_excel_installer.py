@@ -1,14 +1,31 @@
 import os
 import sys
+import json
 import shutil
+import hashlib
+import argparse
 import subprocess
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Dict, List, Optional, Sequence
 
+# Garantir que os módulos compartilhados (nodeecli/modules) sejam importáveis
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / "nodeecli").is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from nodeecli.modules.common import configure_stdout_stderr  # noqa: E402
+from nodeecli.modules.events import concluir, fase  # noqa: E402
 
 REPO_URL = "https://github.com/yzfly/mcp-excel-server"
 INSTALL_DIR = Path("C:/Projetos")
 
+# Arquivos que definem as dependências do projeto (entram na impressão digital)
+ARQUIVOS_DEPENDENCIAS = ("pyproject.toml", "uv.lock", "requirements.txt")
+
+# Impressão digital do último provisionamento concluído, dentro do .venv:
+# apagar o ambiente virtual também invalida a impressão
+ARQUIVO_IMPRESSAO = ".orquestrador-impressao.json"
+
 
 def print_banner() -> None:
     """Exibe banner inicial do instalador MCP Excel Server."""
@@ -69,8 +86,9 @@ def verificar_uv_instalado() -> bool:
 
 
 def _is_cancelled() -> bool:
-    """Retorna True se o usuário solicitou cancelamento via variável de ambiente."""
-    return os.environ.get("INSTALL_CANCELLED") == "1"
+    """Retorna True se o orquestrador pediu o cancelamento (pipe de controle ou INSTALL_CANCELLED)."""
+    from nodeecli.modules.events import cancelamento_solicitado
+    return cancelamento_solicitado()
 
 
 def instalar_uv() -> bool:
@@ -85,6 +103,36 @@ def instalar_uv() -> bool:
     return False
 
 
+def instalar_uv_do_bundle(bundle) -> bool:
+    """Instala 'uv' a partir do .zip incluído no bundle offline, sem acessar a rede."""
+    from nodeecli.modules.bundle import ErroBundle, TIPO_BINARIO, extrair_executavel
+
+    entry = bundle.procurar("uv", tipo=TIPO_BINARIO, arquitetura="x64")
+    if not entry:
+        print("O bundle não contém o 'uv'.")
+        return False
+    destino = Path.home() / ".local" / "bin"
+    try:
+        uv_exe = extrair_executavel(bundle, entry, "uv.exe", destino)
+    except (ErroBundle, OSError) as e:
+        print(f"Falha ao extrair 'uv' do bundle: {e}")
+        return False
+    os.environ["PATH"] = f"{destino}{os.pathsep}{os.environ.get('PATH', '')}"
+    print(f"'uv' {entry.get('versao') or ''} instalado do bundle offline: {uv_exe}")
+    return True
+
+
+def _clonar(fonte: str, destino: Path) -> bool:
+    """Clona o repositório a partir da URL oficial ou de um 'git bundle' local."""
+    rc = _run_streamed(["git", "clone", fonte, str(destino)])
+    if rc != 0:
+        return False
+    if fonte != REPO_URL:
+        # Clone a partir do bundle: apontar o origin para o remoto oficial (atualizações futuras)
+        rc = _run_streamed(["git", "-C", str(destino), "remote", "set-url", "origin", REPO_URL])
+    return rc == 0
+
+
 def garantir_diretorio_base() -> Path:
     """Garante que o diretório base de projetos exista."""
     try:
@@ -94,6 +142,26 @@ def garantir_diretorio_base() -> Path:
     return INSTALL_DIR
 
 
+def _python_venv(projeto_dir: Path) -> Path:
+    """Interpretador do ambiente virtual do projeto."""
+    venv_dir = projeto_dir / ".venv"
+    if os.name == "nt":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
+def venv_valido(projeto_dir: Path) -> bool:
+    """Indica se o .venv existe e aponta para um interpretador base que ainda existe."""
+    cfg = projeto_dir / ".venv" / "pyvenv.cfg"
+    if not (_python_venv(projeto_dir).exists() and cfg.is_file()):
+        return False
+    for linha in cfg.read_text(encoding="utf-8", errors="replace").splitlines():
+        chave, _, valor = linha.partition("=")
+        if chave.strip() == "home":
+            return Path(valor.strip()).is_dir()
+    return True
+
+
 def criar_venv_uv(projeto_dir: Path) -> bool:
     """Cria ambiente virtual usando 'uv venv' dentro do diretório do projeto."""
     print("Criando ambiente virtual com 'uv venv'...")
@@ -102,24 +170,117 @@ def criar_venv_uv(projeto_dir: Path) -> bool:
 
 
 def instalar_dependencias(projeto_dir: Path) -> bool:
-    """Instala dependências do projeto com 'uv pip install -e .'"""
-    print("Instalando dependências com 'uv pip install -e .'...")
-    rc = _run_streamed(["uv", "pip", "install", "-e", "."], cwd=projeto_dir)
+    """Instala as dependências do projeto, com os .pyc já compilados.
+
+    Com 'uv.lock' no repositório: 'uv sync --frozen' instala exatamente as versões
+    travadas (sem resolver nem reescrever o lock). Sem ele: 'uv pip install -e .'.
+    """
+    if (projeto_dir / "uv.lock").is_file():
+        print("Instalando dependências com 'uv sync --frozen' (uv.lock)...")
+        cmd = ["uv", "sync", "--frozen", "--compile-bytecode"]
+    else:
+        print("Instalando dependências com 'uv pip install -e .'...")
+        cmd = ["uv", "pip", "install", "--compile-bytecode", "-e", "."]
+    rc = _run_streamed(cmd, cwd=projeto_dir)
     return rc == 0
 
 
-def preparar_repositorio(destino: Path) -> bool:
+def _head(repositorio: str, remoto: bool = False) -> Optional[str]:
+    """Commit do HEAD de um clone local ou, com remoto=True, de um remoto/'git bundle' (ls-remote)."""
+    cmd = ["git", "ls-remote", repositorio, "HEAD"] if remoto else ["git", "-C", repositorio, "rev-parse", "HEAD"]
+    try:
+        res = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace",
+                             timeout=60, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    partes = (res.stdout or "").split()
+    return partes[0] if res.returncode == 0 and partes else None
+
+
+def calcular_impressao(projeto_dir: Path) -> Dict[str, object]:
+    """Impressão digital do projeto: HEAD, hash dos arquivos de dependências e do pyvenv.cfg."""
+    def sha256(caminho: Path) -> Optional[str]:
+        return hashlib.sha256(caminho.read_bytes()).hexdigest() if caminho.is_file() else None
+
+    return {
+        "head": _head(str(projeto_dir)),
+        "arquivos": {nome: sha256(projeto_dir / nome) for nome in ARQUIVOS_DEPENDENCIAS},
+        "python": str(_python_venv(projeto_dir)),
+        "pyvenv_cfg": sha256(projeto_dir / ".venv" / "pyvenv.cfg"),
+    }
+
+
+def ler_impressao(projeto_dir: Path) -> Optional[Dict[str, object]]:
+    """Impressão digital gravada no último provisionamento concluído (None se ausente)."""
+    try:
+        return json.loads((projeto_dir / ".venv" / ARQUIVO_IMPRESSAO).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def gravar_impressao(projeto_dir: Path, impressao: Dict[str, object]) -> None:
+    """Grava a impressão digital (falhas apenas fazem o próximo provisionamento ser completo)."""
+    try:
+        (projeto_dir / ".venv" / ARQUIVO_IMPRESSAO).write_text(json.dumps(impressao, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar a impressão digital do ambiente: {e}")
+
+
+def provisionar_ambiente(projeto_dir: Path) -> int:
+    """Cria o .venv e instala as dependências, pulando o que não mudou.
+
+    Se o HEAD, os arquivos de dependências e o interpretador do .venv forem os
+    mesmos do último provisionamento concluído, nada é executado.
+
+    Returns:
+        int: 0 em caso de sucesso, 1 em falha, 2 se cancelado
+    """
+    impressao = calcular_impressao(projeto_dir)
+    if impressao["head"] and venv_valido(projeto_dir) and ler_impressao(projeto_dir) == impressao:
+        print(f"Ambiente virtual e dependências já atualizados (HEAD {str(impressao['head'])[:12]}).")
+        return 0
+
+    if not venv_valido(projeto_dir):
+        if not criar_venv_uv(projeto_dir):
+            print("Falha ao criar ambiente virtual com 'uv'.")
+            return 1
+    else:
+        print("Ambiente virtual existente reaproveitado.")
+
+    if _is_cancelled():
+        print("Instalação cancelada pelo usuário.")
+        return 2
+
+    if not instalar_dependencias(projeto_dir):
+        print("Falha ao instalar dependências do MCP Excel Server.")
+        return 1
+
+    # Verificação pós-instalação do ambiente virtual e Python
+    if not verificar_instalacao(projeto_dir):
+        print("Falha na verificação pós-instalação do ambiente virtual.")
+        return 1
+
+    # Recalculada: 'uv venv' pode ter criado o pyvenv.cfg
+    gravar_impressao(projeto_dir, calcular_impressao(projeto_dir))
+    return 0
+
+
+def preparar_repositorio(destino: Path, fonte: str = REPO_URL) -> bool:
     """Garante que o repositório alvo exista e esteja sincronizado.
 
     - Se não existir: git clone.
     - Se existir e for clone do remoto esperado: fetch --all --prune + pull --ff-only.
     - Se existir e não corresponder ou não for Git: falha, a menos que MCP_EXCEL_FORCE_RECLONE=1
       (neste caso remove e reclona).
+
+    'fonte' pode ser um arquivo 'git bundle' do bundle offline: o clone e a
+    atualização são feitos a partir dele, sem acessar a rede.
+
+    Se o HEAD de 'fonte' (git ls-remote) já for o do clone, fetch e pull não são executados.
     """
     if not destino.exists():
         print(f"Clonando repositório para {destino}...")
-        rc = _run_streamed(["git", "clone", REPO_URL, str(destino)])
-        return rc == 0
+        return _clonar(fonte, destino)
 
     git_dir = destino / ".git"
     if git_dir.is_dir():
@@ -137,7 +298,14 @@ def preparar_repositorio(destino: Path) -> bool:
             return False
 
         if remote_url == REPO_URL:
+            local = _head(str(destino))
+            if local and local == _head(fonte, remoto=True):
+                print(f"Repositório já atualizado ({local[:12]}).")
+                return True
             print("Diretório já contém o repositório correto; atualizando...")
+            if fonte != REPO_URL:
+                rc = _run_streamed(["git", "-C", str(destino), "pull", "--ff-only", fonte, "HEAD"])
+                return rc == 0
             rc1 = _run_streamed(["git", "-C", str(destino), "fetch", "--all", "--prune"])
             if rc1 != 0:
                 return False
@@ -158,8 +326,7 @@ def preparar_repositorio(destino: Path) -> bool:
                     print(f"Falha ao remover diretório existente: {e}")
                     return False
                 print(f"Re-clonando repositório em {destino}...")
-                rc = _run_streamed(["git", "clone", REPO_URL, str(destino)])
-                return rc == 0
+                return _clonar(fonte, destino)
             else:
                 print("Operação abortada: diretório existente não é o mcp-excel-server alvo.")
                 return False
@@ -173,27 +340,24 @@ def preparar_repositorio(destino: Path) -> bool:
                 print(f"Falha ao remover diretório existente: {e}")
                 return False
             print(f"Clonando repositório para {destino}...")
-            rc = _run_streamed(["git", "clone", REPO_URL, str(destino)])
-            return rc == 0
+            return _clonar(fonte, destino)
         else:
             print("Operação abortada: diretório existente não é um clone do mcp-excel-server.")
             return False
 
 
-def main() -> int:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Interpreta os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Instalador automático do MCP Excel Server")
+    parser.add_argument("--from-bundle", dest="from_bundle", default=None, metavar="CAMINHO",
+                        help="Instalar a partir de um bundle offline (diretório ou .zip; "
+                             "padrão: ORQUESTRADOR_BUNDLE)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Fluxo principal do instalador MCP Excel Server."""
-    # Import resiliente de configure_stdout_stderr (opcional)
-    try:
-        from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-    except ImportError:
-        try:
-            project_root = Path(__file__).resolve().parent.parent
-            if str(project_root) not in sys.path:
-                sys.path.insert(0, str(project_root))
-            from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-        except ImportError:
-            def configure_stdout_stderr() -> None:  # type: ignore
-                return None
+    args = parse_args(argv)
 
     try:
         configure_stdout_stderr()
@@ -202,6 +366,16 @@ def main() -> int:
 
     print_banner()
 
+    # Bundle offline (--from-bundle ou ORQUESTRADOR_BUNDLE)
+    bundle = None
+    if args.from_bundle or os.environ.get("ORQUESTRADOR_BUNDLE"):
+        from nodeecli.modules.bundle import ErroBundle, TIPO_REPOSITORIO, obter_bundle
+        try:
+            bundle = obter_bundle(args.from_bundle)
+        except ErroBundle as e:
+            print(str(e))
+            return 1
+
     if sys.platform != "win32":
         print("Este instalador suporta apenas Windows.")
         return 1
@@ -213,55 +387,51 @@ def main() -> int:
     if not verificar_python_instalado():
         print("Python não detectado.")
         return 1
-    if not verificar_uv_instalado():
-        if not instalar_uv():
-            return 1
 
     base = garantir_diretorio_base()
     projeto = base / "mcp-excel-server"
 
-    if not preparar_repositorio(projeto):
-        print("Falha ao preparar o repositório (clone/atualização).")
-        return 1
-
-    if _is_cancelled():
-        print("Instalação cancelada pelo usuário.")
-        return 2
-
-    if not criar_venv_uv(projeto):
-        print("Falha ao criar ambiente virtual com 'uv'.")
-        return 1
-
-    if _is_cancelled():
-        print("Instalação cancelada pelo usuário.")
-        return 2
+    fonte = REPO_URL
+    if bundle:
+        entry = bundle.procurar("mcp_excel", tipo=TIPO_REPOSITORIO)
+        if not entry:
+            print("O bundle não contém o repositório do mcp-excel-server.")
+            return 1
+        fonte = str(bundle.caminho(entry))
+        print(f"Usando o repositório do bundle offline ({(entry.get('versao') or '')[:12]})")
 
-    if _is_cancelled():
+    try:
+        with fase("download") as etapa:
+            if not verificar_uv_instalado() and not (instalar_uv_do_bundle(bundle) if bundle else instalar_uv()):
+                etapa.sucesso = False
+                return 1
+            if not preparar_repositorio(projeto, fonte):
+                etapa.sucesso = False
+                print("Falha ao preparar o repositório (clone/atualização).")
+                return 1
+
+        with fase("instalacao") as etapa:
+            rc = provisionar_ambiente(projeto)
+            etapa.sucesso = rc == 0
+    except KeyboardInterrupt:
         print("Instalação cancelada pelo usuário.")
         return 2
-
-    if not instalar_dependencias(projeto):
-        print("Falha ao instalar dependências do MCP Excel Server.")
-        return 1
-
-    # Verificação pós-instalação do ambiente virtual e Python
-    if not verificar_instalacao(projeto):
-        print("Falha na verificação pós-instalação do ambiente virtual.")
-        return 1
+    if rc != 0:
+        return rc
 
     print("MCP Excel Server instalado com sucesso! ✅")
     return 0
 
 
 def verificar_instalacao(projeto_dir: Path) -> bool:
-    """Checa se o .venv existe e o Python do ambiente virtual é utilizável (Windows)."""
+    """Checa se o .venv existe e o Python do ambiente virtual é utilizável."""
     venv_dir = projeto_dir / ".venv"
     if not venv_dir.is_dir():
         print("Verificação: diretório .venv não encontrado.")
         return False
-    python_path = venv_dir / "Scripts" / "python.exe"
+    python_path = _python_venv(projeto_dir)
     if not python_path.exists():
-        print("Verificação: python.exe não encontrado em .venv/Scripts.")
+        print(f"Verificação: {python_path.name} não encontrado em {python_path.parent}.")
         return False
     rc = _run_streamed([str(python_path), "-c", "import sys; print(sys.version)"])
     if rc != 0:
@@ -272,4 +442,4 @@ def verificar_instalacao(projeto_dir: Path) -> bool:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(concluir(main()))
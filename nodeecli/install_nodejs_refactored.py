@@ -18,17 +18,29 @@ import os
 import platform
 import argparse
 import time
+from pathlib import Path
 
-# Importar os módulos modularizados
+# Garantir que o pacote nodeecli seja importável (script executado diretamente
+# ou importado pelo subcomando "run" do orquestrador)
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / 'nodeecli').is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+# Importar os módulos modularizados. Os instaladores (NodejsInstaller, npm_global das CLIs)
+# são importados em main(), depois dos argumentos, só para as etapas que os usam;
+# requests só é importado na primeira requisição.
 try:
-    from modules.common import (
+    from nodeecli.modules.common import (
         Logger, configure_stdout_stderr, detectar_arquitetura, 
         verificar_permissoes_admin, detectar_nvm_windows, 
-        configurar_execution_policy
+        configurar_execution_policy, salvar_artefato_preparado,
+        carregar_artefato_preparado, limpar_artefato_preparado,
+        obter_diretorio_staging
     )
-    from modules.nodejs_installer import NodejsInstaller
-    from modules.gemini_cli_installer import GeminiCliInstaller
-    from modules.qwen_cli_installer import QwenCliInstaller
+    from nodeecli.modules.events import concluir, fase
+    from nodeecli.modules.http_client import definir_opcoes_http
+    from nodeecli.modules.mirror import adicionar_argumento_mirror, configurar_npm
+    from nodeecli.modules.bundle import ErroBundle, TIPO_PACOTE_NPM, adicionar_argumento_bundle, obter_bundle
 except ImportError as e:
     print(f"Erro ao importar módulos: {e}")
     print("Verifique se os módulos estão no diretório 'modules' corretamente.")
@@ -40,15 +52,6 @@ try:
 except Exception:
     pass
 
-# Verificar se a biblioteca requests está instalada
-try:
-    import requests
-except ImportError:
-    print("Erro: A biblioteca 'requests' não está instalada.")
-    print("Execute o seguinte comando para instalá-la:")
-    print("pip install requests")
-    sys.exit(1)
-
 
 def verificar_versao_windows(args):
     """
@@ -135,46 +138,70 @@ def verificar_permissoes_e_configurar(args):
 
 def criar_sessao_http(args):
     """
-    Cria e configura uma sessão HTTP com suporte a proxy.
+    Configura a sessão HTTP compartilhada (modules.http_client) com proxy, CA e espelho.
+
+    A sessão só é criada na primeira requisição: com o Node.js já atualizado e o
+    índice de releases em cache, a execução não importa requests.
     
     Args:
         args: Argumentos de linha de comando parseados
-        
+
     Returns:
-        requests.Session: Sessão HTTP configurada
+        str | None: Espelho em uso (URL normalizada), ou None
     """
-    # Criar sessão HTTP com suporte a proxy
-    session = requests.Session()
-
-    # Configurar proxy se fornecido via argumento ou variáveis de ambiente
+    # Proxy via argumento ou variáveis de ambiente
     proxy_url = args.proxy or os.environ.get('HTTP_PROXY') or os.environ.get('HTTPS_PROXY')
     if proxy_url:
         print(f"Usando proxy: {proxy_url}")
-        session.proxies = {
-            'http': proxy_url,
-            'https': proxy_url
-        }
-        # Configurar headers para proxy
-        session.headers.update({
-            'User-Agent': 'Node.js-Installer-Python/1.0'
-        })
 
     # Configurar verificação SSL/TLS para certificados corporativos
     if args.insecure:
         print("\n⚠️  AVISO: Verificação de certificado SSL/TLS desativada!")
         print("Esta opção não é recomendada e expõe a conexão a riscos de segurança.")
         print("A comunicação com servidores não será validada, podendo ser vulnerável a ataques man-in-the-middle.")
-        session.verify = False
     elif args.cacert:
-        if os.path.exists(args.cacert):
-            print(f"Usando certificado CA personalizado: {args.cacert}")
-            session.verify = args.cacert
-        else:
-            print(f"\nErro: Arquivo de certificado CA não encontrado: {args.cacert}")
-            print("Verifique o caminho do arquivo e tente novamente.")
-            sys.exit(1)
-    
-    return session
+        print(f"Usando certificado CA personalizado: {args.cacert}")
+
+    try:
+        espelho = definir_opcoes_http(proxy=proxy_url, cacert=args.cacert, insecure=args.insecure,
+                                      espelho=args.mirror)
+        if espelho:
+            print(f"Usando espelho de artefatos: {espelho}")
+        return espelho
+    except FileNotFoundError:
+        print(f"\nErro: Arquivo de certificado CA não encontrado: {args.cacert}")
+        print("Verifique o caminho do arquivo e tente novamente.")
+        sys.exit(1)
+
+
+def obter_pacote_do_bundle(bundle, ferramenta, registro_local=False):
+    """
+    Copia o tarball npm de uma ferramenta CLI do bundle offline para o staging.
+
+    Args:
+        bundle (Bundle): Bundle offline (None = instalar a partir do registro npm)
+        ferramenta (str): Identificador no bundle ('gemini-cli' ou 'qwen-code')
+        registro_local (bool): O bundle é servido por um RegistroLocal: só a versão é necessária
+
+    Returns:
+        tuple: (caminho do tarball, versão), ou (None, None) para usar o registro npm
+    """
+    if not bundle:
+        return None, None
+    entrada = bundle.procurar(ferramenta, tipo=TIPO_PACOTE_NPM)
+    if not entrada:
+        print(f"Aviso: o bundle não contém o pacote {ferramenta}; usando o registro npm.")
+        return None, None
+    if registro_local:
+        print(f"Usando {entrada.get('pacote') or ferramenta}@{entrada.get('versao')} e dependências do bundle offline")
+        return None, entrada.get('versao')
+    try:
+        destino = bundle.materializar(entrada, obter_diretorio_staging('npm') / os.path.basename(entrada['arquivo']))
+    except ErroBundle as e:
+        print(f"Aviso: {e}; usando o registro npm.")
+        return None, None
+    print(f"Usando {entrada.get('pacote') or ferramenta}@{entrada.get('versao')} do bundle offline")
+    return destino, entrada.get('versao')
 
 
 def exibir_resumo_instalacao(nodejs_sucesso, nodejs_versao, gemini_sucesso, qwen_sucesso):
@@ -182,29 +209,37 @@ def exibir_resumo_instalacao(nodejs_sucesso, nodejs_versao, gemini_sucesso, qwen
     Exibe um resumo final da instalação.
     
     Args:
-        nodejs_sucesso (bool): Status da instalação do Node.js
+        nodejs_sucesso (bool): Status da instalação do Node.js (None se a etapa não foi executada)
         nodejs_versao (str): Versão do Node.js instalada
-        gemini_sucesso (bool): Status da instalação do Gemini CLI
-        qwen_sucesso (bool): Status da instalação do Qwen CLI
+        gemini_sucesso (bool): Status da instalação do Gemini CLI (None se não executada)
+        qwen_sucesso (bool): Status da instalação do Qwen CLI (None se não executada)
     """
     print("\n" + "=" * 60)
     print("RESUMO DA INSTALAÇÃO")
     print("=" * 60)
     
-    print(f"Node.js: {'✅ SUCESSO' if nodejs_sucesso else '❌ FALHA'}")
+    def status(sucesso):
+        if sucesso is None:
+            return '⏭️  NÃO EXECUTADO'
+        return '✅ SUCESSO' if sucesso else '❌ FALHA'
+
+    print(f"Node.js: {status(nodejs_sucesso)}")
     if nodejs_sucesso and nodejs_versao:
         print(f"  Versão: {nodejs_versao}")
     
-    print(f"Gemini CLI: {'✅ SUCESSO' if gemini_sucesso else '❌ FALHA'}")
-    print(f"Qwen CLI: {'✅ SUCESSO' if qwen_sucesso else '❌ FALHA'}")
+    print(f"Gemini CLI: {status(gemini_sucesso)}")
+    print(f"Qwen CLI: {status(qwen_sucesso)}")
     
     print("\n" + "=" * 60)
 
 
-def main():
+def main(argv=None):
     """
     Função principal que orquestra todo o processo de verificação e instalação.
 
+    Args:
+        argv (list): Argumentos da linha de comando (padrão: sys.argv[1:])
+
     Returns:
         int: Exit code (0 para sucesso, !=0 para falha/cancelamento)
     """
@@ -217,6 +252,7 @@ Exemplos:
   python install_nodejs_refactored.py           # Modo interativo padrão
   python install_nodejs_refactored.py -y        # Prossiga sem prompts (para automação)
   python install_nodejs_refactored.py --yes     # Mesmo que -y
+  python install_nodejs_refactored.py -y --from-bundle D:\\bundle   # Sem rede, a partir do bundle offline
         '''
     )
     parser.add_argument('-y', '--yes', action='store_true',
@@ -245,8 +281,14 @@ Exemplos:
                        help='Caminho para arquivo de certificado CA personalizado para validação SSL/TLS')
     parser.add_argument('--insecure', action='store_true',
                        help='Desativar verificação de certificado SSL/TLS (não recomendado)')
+    parser.add_argument('--phase', choices=['all', 'nodejs', 'fetch', 'install', 'cli'], default='all',
+                       help='Etapa a executar: all=Node.js + CLIs, nodejs=apenas Node.js, '
+                            'fetch=apenas download do MSI, install=instala o MSI baixado pela etapa fetch, '
+                            'cli=apenas Gemini/Qwen CLI (usado pelo orquestrador)')
+    adicionar_argumento_mirror(parser)
+    adicionar_argumento_bundle(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Inicializar sistema de logging
     logger = Logger(verbose=args.verbose, log_file=args.log_file)
@@ -268,72 +310,124 @@ Exemplos:
     if resultado != 0:
         return resultado
 
-    # Verificar permissões e configurar ambiente
-    resultado = verificar_permissoes_e_configurar(args)
-    if resultado != 0:
-        return resultado
-
-    # Criar sessão HTTP
-    session = criar_sessao_http(args)
-
-    # Inicializar instaladores
-    nodejs_installer = NodejsInstaller(logger)
-    gemini_installer = GeminiCliInstaller(logger)
-    qwen_installer = QwenCliInstaller(logger)
-
-    # Verificar se o Node.js já está instalado
-    print("\nVerificando instalação existente do Node.js...")
-    versao_atual = nodejs_installer.verificar_instalacao()
-
-    if versao_atual:
-        print(f"Node.js versão {versao_atual} está instalado.")
-    else:
-        print("Node.js não está instalado.")
-
-    # Verificar se precisa instalar o Node.js
-    instalar_nodejs = True
-    if versao_atual and not args.version:
-        # Obter versão mais recente para comparação
-        from modules.nodejs_installer import obter_versao_mais_recente, comparar_versoes
-        
-        versao_info = obter_versao_mais_recente(session, args.track)
-        if versao_info:
-            versao_mais_recente = versao_info['version'].lstrip('v')
-            if comparar_versoes(versao_atual, versao_mais_recente) >= 0:
-                print(f"Seu Node.js (v{versao_atual}) já está atualizado!")
-                instalar_nodejs = False
-
-    # Instalar Node.js se necessário
-    nodejs_sucesso = False
-    nodejs_versao = versao_atual
-    
-    if instalar_nodejs:
-        nodejs_sucesso, nodejs_versao = nodejs_installer.instalar(
-            versao=args.version,
-            track=args.track,
-            session=session,
-            download_timeout=args.download_timeout,
-            install_timeout=args.install_timeout,
-            all_users=args.all_users,
-            auto_yes=args.yes,
-            allow_arch_fallback=args.allow_arch_fallback
-        )
-    else:
-        nodejs_sucesso = True  # Já estava atualizado
-        print(" pulando instalação do Node.js (já está atualizado).")
-
-    # Instalar CLIs adicionais
-    print("\n" + "="*60)
-    print("INSTALAÇÃO DAS FERRAMENTAS CLI ADICIONAIS")
-    print("="*60)
-
-    # Instalar Gemini CLI
-    print("\nInstalando Gemini CLI...")
-    gemini_sucesso = gemini_installer.instalar(args.npm_timeout)
-
-    # Instalar Qwen CLI
-    print("\nInstalando Qwen CLI...")
-    qwen_sucesso = qwen_installer.instalar(args.npm_timeout)
+    # Bundle offline (--from-bundle ou ORQUESTRADOR_BUNDLE): artefatos sem acesso à rede
+    try:
+        bundle = obter_bundle(args.from_bundle) if args.phase != 'install' else None
+    except ErroBundle as e:
+        print(f"\nErro: {e}")
+        return 1
+    if bundle:
+        print(f"Usando bundle offline: {bundle.raiz}")
+
+    executar_nodejs = args.phase in ('all', 'nodejs', 'fetch', 'install')
+    executar_cli = args.phase in ('all', 'cli')
+
+    nodejs_sucesso = None
+    nodejs_versao = None
+    espelho = None
+
+    if executar_nodejs:
+        from nodeecli.modules.nodejs_installer import NodejsInstaller
+
+        # Verificar permissões e configurar ambiente (desnecessário para apenas baixar)
+        if args.phase != 'fetch':
+            resultado = verificar_permissoes_e_configurar(args)
+            if resultado != 0:
+                return resultado
+
+        nodejs_installer = NodejsInstaller(logger)
+
+        if args.phase == 'install':
+            # Instalar o MSI baixado pela etapa "fetch"
+            preparado = carregar_artefato_preparado('nodejs')
+            if not preparado:
+                print("\nNenhum instalador do Node.js preparado. Execute a etapa 'fetch' antes.")
+                nodejs_sucesso = False
+            elif not preparado.get('caminho'):
+                nodejs_sucesso = True
+                nodejs_versao = preparado.get('versao')
+                print(f"Seu Node.js (v{nodejs_versao}) já está atualizado!")
+                print(" pulando instalação do Node.js (já está atualizado).")
+            else:
+                with fase('instalacao') as etapa:
+                    nodejs_sucesso, nodejs_versao = nodejs_installer.concluir(
+                        preparado['caminho'], preparado['versao'],
+                        args.install_timeout, args.all_users
+                    )
+                    etapa.sucesso = nodejs_sucesso
+            limpar_artefato_preparado('nodejs')
+        else:
+            # Configurar a sessão HTTP (criada na primeira requisição)
+            espelho = criar_sessao_http(args)
+
+            print("\nVerificando instalação existente do Node.js...")
+            with fase('download') as etapa:
+                status, caminho_msi, versao_efetiva = nodejs_installer.preparar(
+                    versao=args.version,
+                    track=args.track,
+                    download_timeout=args.download_timeout,
+                    auto_yes=args.yes,
+                    allow_arch_fallback=args.allow_arch_fallback,
+                    bundle=bundle
+                )
+                etapa.sucesso = status != 'erro'
+
+            if status == 'erro':
+                nodejs_sucesso = False
+            elif args.phase == 'fetch':
+                # Registrar o MSI (ou a ausência de trabalho) para a etapa "install"
+                salvar_artefato_preparado('nodejs', caminho_msi, versao=versao_efetiva)
+                nodejs_sucesso = True
+                nodejs_versao = versao_efetiva
+                if caminho_msi:
+                    print("Instalador do Node.js pronto para a etapa de instalação.")
+            elif status == 'atualizado':
+                nodejs_sucesso = True  # Já estava atualizado
+                nodejs_versao = versao_efetiva
+                print(" pulando instalação do Node.js (já está atualizado).")
+            else:
+                with fase('instalacao') as etapa:
+                    nodejs_sucesso, nodejs_versao = nodejs_installer.concluir(
+                        caminho_msi, versao_efetiva, args.install_timeout, args.all_users
+                    )
+                    etapa.sucesso = nodejs_sucesso
+
+    gemini_sucesso = None
+    qwen_sucesso = None
+
+    if executar_cli:
+        from contextlib import nullcontext
+
+        from nodeecli.modules.npm_global import InstaladorNpmGlobal, PacoteNpm
+        from nodeecli.modules.npm_offline import RegistroLocal
+
+        if args.phase == 'cli':
+            # Proxy, CA e espelho valem para a consulta ao registro e para o npm
+            espelho = criar_sessao_http(args)
+        # Só aqui o npm é executado; esta etapa nunca roda dentro do processo do orquestrador,
+        # então alterar o ambiente não afeta outras execuções
+        configurar_npm(espelho)
+
+        # Instalar CLIs adicionais
+        print("\n" + "="*60)
+        print("INSTALAÇÃO DAS FERRAMENTAS CLI ADICIONAIS")
+        print("="*60)
+
+        with fase('cli') as etapa:
+            # Bundle com as dependências dos pacotes: o npm as instala de um registro local, sem rede
+            registro = RegistroLocal.do_bundle(bundle) if bundle else None
+            # Gemini e Qwen em uma única execução do npm (só os ausentes ou desatualizados)
+            pacotes = [
+                PacoteNpm('@google/gemini-cli', 'gemini', 'Gemini CLI',
+                          *obter_pacote_do_bundle(bundle, 'gemini-cli', registro is not None)),
+                PacoteNpm('@qwen-code/qwen-code', 'qwen', 'Qwen CLI',
+                          *obter_pacote_do_bundle(bundle, 'qwen-code', registro is not None)),
+            ]
+            with registro or nullcontext():
+                instalador = InstaladorNpmGlobal(logger, registro.url if registro else None)
+                resultados = instalador.instalar(pacotes, args.npm_timeout)
+            gemini_sucesso, qwen_sucesso = (resultados[pacote.nome].sucesso for pacote in pacotes)
+            etapa.sucesso = gemini_sucesso and qwen_sucesso
 
     # Exibir resumo
     exibir_resumo_instalacao(nodejs_sucesso, nodejs_versao, gemini_sucesso, qwen_sucesso)
@@ -343,12 +437,18 @@ Exemplos:
         logger.close()
 
     # Determinar código de saída
+    if not executar_nodejs:
+        # Etapa 'cli': o resultado depende apenas das ferramentas CLI
+        return 0 if gemini_sucesso and qwen_sucesso else 1
+
     if nodejs_sucesso:
         return 0
+    elif args.phase == 'fetch':
+        return 1
     else:
         # Se o Node.js falhou, mas já havia uma instalação existente,
         # ainda consideramos parcialmente bem-sucedido
-        if versao_atual:
+        if NodejsInstaller().verificar_instalacao():
             print("\nAVISO: Embora a instalação do Node.js tenha falhado,")
             print("foi detectada uma instalação existente no sistema.")
             print("As ferramentas CLI foram instaladas se possível.")
@@ -358,11 +458,11 @@ Exemplos:
 
 if __name__ == "__main__":
     try:
-        sys.exit(main())
+        sys.exit(concluir(main()))
     except KeyboardInterrupt:
         print("\n\nOperação cancelada pelo usuário.")
-        sys.exit(130)
+        sys.exit(concluir(130, "Operação cancelada pelo usuário"))
     except Exception as e:
         print(f"\nOcorreu um erro inesperado: {e}")
         print("Por favor, reporte este problema para melhoria do script.")
-        sys.exit(1)
+        sys.exit(concluir(1, f"Erro inesperado: {e}"))
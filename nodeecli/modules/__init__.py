@@ -3,8 +3,7 @@ Módulos para instalação de ferramentas de desenvolvimento.
 
 Este pacote contém módulos especializados para instalar diferentes ferramentas:
 - nodejs_installer: Instalação do Node.js
-- gemini_cli_installer: Instalação do Gemini CLI
-- qwen_cli_installer: Instalação do Qwen CLI
+- npm_global: Instalação das CLIs npm (Gemini CLI, Qwen CLI) em lote
 """
 
 __version__ = "1.0.0"
\ No newline at end of file
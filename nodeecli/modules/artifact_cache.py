@@ -0,0 +1,409 @@
+"""
+Cache local de artefatos (instaladores) endereçado por conteúdo.
+
+Cada arquivo é guardado uma única vez em 'blobs/<sha256[:2]>/<sha256>' e
+indexado por (ferramenta, versão, arquitetura, URL). Uma reinstalação na
+mesma máquina — ou uma nova tentativa depois de uma falha — reaproveita o
+instalador sem acessar a rede. O espaço em disco é limitado por um
+orçamento configurável, com remoção dos artefatos usados há mais tempo (LRU).
+"""
+
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+
+from .downloader import baixar_arquivo, calcular_sha256
+
+
+# Orçamento padrão de disco do cache (pode ser alterado por ORQUESTRADOR_CACHE_MAX_MB)
+ORCAMENTO_PADRAO_MB = 2048
+
+# Tempo após o qual um arquivo de bloqueio é considerado abandonado
+BLOQUEIO_EXPIRADO_SEGUNDOS = 30
+
+VERSAO_INDICE = 1
+
+
+def obter_diretorio_cache():
+    """
+    Retorna o diretório raiz do cache de artefatos.
+
+    Usa ORQUESTRADOR_CACHE_DIR, se definida; senão
+    %LOCALAPPDATA%/OrquestradorInstalacoes/cache (no Windows) ou
+    ~/.cache/OrquestradorInstalacoes nos demais sistemas.
+
+    Returns:
+        Path: Diretório do cache (não é criado aqui)
+    """
+    personalizado = os.environ.get('ORQUESTRADOR_CACHE_DIR')
+    if personalizado:
+        return Path(personalizado)
+    local_appdata = os.environ.get('LOCALAPPDATA')
+    if local_appdata:
+        return Path(local_appdata) / 'OrquestradorInstalacoes' / 'cache'
+    return Path.home() / '.cache' / 'OrquestradorInstalacoes'
+
+
+def obter_orcamento_bytes():
+    """
+    Retorna o orçamento de disco do cache em bytes (ORQUESTRADOR_CACHE_MAX_MB).
+
+    Returns:
+        int: Limite em bytes
+    """
+    valor = os.environ.get('ORQUESTRADOR_CACHE_MAX_MB', '')
+    try:
+        megabytes = int(valor) if valor else ORCAMENTO_PADRAO_MB
+    except ValueError:
+        megabytes = ORCAMENTO_PADRAO_MB
+    return max(0, megabytes) * 1024 * 1024
+
+
+class _BloqueioIndice:
+    """Bloqueio entre processos (arquivo criado com O_EXCL) para alterar o índice."""
+
+    def __init__(self, caminho, espera_maxima=10.0):
+        self.caminho = str(caminho)
+        self.espera_maxima = espera_maxima
+
+    def __enter__(self):
+        limite = time.monotonic() + self.espera_maxima
+        while True:
+            try:
+                fd = os.open(self.caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.caminho) > BLOQUEIO_EXPIRADO_SEGUNDOS:
+                        os.unlink(self.caminho)  # processo anterior morreu segurando o bloqueio
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > limite:
+                    raise TimeoutError(f"não foi possível obter o bloqueio do cache: {self.caminho}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            os.unlink(self.caminho)
+        except OSError:
+            pass
+
+
+class ArtifactCache:
+    """
+    Armazena instaladores por SHA-256 com índice por (ferramenta, versão, arquitetura, URL).
+    """
+
+    def __init__(self, raiz=None, orcamento_bytes=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            raiz (str | Path): Diretório do cache (padrão: obter_diretorio_cache())
+            orcamento_bytes (int): Espaço máximo ocupado pelos blobs (padrão: obter_orcamento_bytes())
+        """
+        self.raiz = Path(raiz) if raiz else obter_diretorio_cache()
+        self.orcamento_bytes = obter_orcamento_bytes() if orcamento_bytes is None else orcamento_bytes
+        self.dir_blobs = self.raiz / 'blobs'
+        self.caminho_indice = self.raiz / 'index.json'
+        self.caminho_bloqueio = self.raiz / 'index.lock'
+
+    # ------------------------------------------------------------------ índice
+
+    def _ler_indice(self):
+        try:
+            dados = json.loads(self.caminho_indice.read_text(encoding='utf-8'))
+            entradas = dados.get('entradas', [])
+            return entradas if isinstance(entradas, list) else []
+        except (OSError, ValueError, AttributeError):
+            return []
+
+    def _gravar_indice(self, entradas):
+        self.raiz.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho_indice.with_suffix('.json.tmp')
+        temporario.write_text(
+            json.dumps({'versao': VERSAO_INDICE, 'entradas': entradas}, ensure_ascii=False, indent=2),
+            encoding='utf-8',
+        )
+        os.replace(temporario, self.caminho_indice)
+
+    def _bloqueio(self):
+        self.raiz.mkdir(parents=True, exist_ok=True)
+        return _BloqueioIndice(self.caminho_bloqueio)
+
+    def caminho_blob(self, sha256):
+        """Caminho do blob de um SHA-256."""
+        return self.dir_blobs / sha256[:2] / sha256
+
+    # ------------------------------------------------------------------ consulta
+
+    @staticmethod
+    def _corresponde(entrada, ferramenta, versao, arquitetura, url):
+        return (
+            entrada.get('ferramenta') == ferramenta
+            and (versao is None or entrada.get('versao') == versao)
+            and (arquitetura is None or entrada.get('arquitetura') == arquitetura)
+            and (url is None or entrada.get('url') == url)
+        )
+
+    def procurar(self, ferramenta, versao=None, arquitetura=None, url=None):
+        """
+        Procura um artefato no cache. Critérios None são ignorados.
+
+        Quando mais de uma entrada corresponde, retorna a adicionada mais
+        recentemente. A entrada encontrada é marcada como usada agora (LRU).
+
+        Args:
+            ferramenta (str): Identificador da ferramenta (ex.: 'vscode')
+            versao (str): Versão do artefato
+            arquitetura (str): Arquitetura ('x64', 'arm64', ...)
+            url (str): URL de origem
+
+        Returns:
+            dict | None: Entrada do índice com a chave extra 'caminho' (blob), ou None
+        """
+        with self._bloqueio():
+            entradas = self._ler_indice()
+            candidatas = [
+                e for e in entradas
+                if self._corresponde(e, ferramenta, versao, arquitetura, url)
+                and self.caminho_blob(e.get('sha256', '')).is_file()
+            ]
+            if not candidatas:
+                return None
+            entrada = max(candidatas, key=lambda e: e.get('adicionado', 0))
+            entrada['ultimo_uso'] = time.time()
+            self._gravar_indice(entradas)
+
+        resultado = dict(entrada)
+        resultado['caminho'] = str(self.caminho_blob(entrada['sha256']))
+        return resultado
+
+    def listar(self):
+        """
+        Lista as entradas do índice, da usada mais recentemente para a mais antiga.
+
+        Returns:
+            list: Entradas (dict) com a chave extra 'presente' (blob existe em disco)
+        """
+        entradas = []
+        for entrada in self._ler_indice():
+            item = dict(entrada)
+            item['presente'] = self.caminho_blob(entrada.get('sha256', '')).is_file()
+            entradas.append(item)
+        entradas.sort(key=lambda e: e.get('ultimo_uso', 0), reverse=True)
+        return entradas
+
+    def tamanho_total(self):
+        """Espaço ocupado pelos blobs indexados, em bytes."""
+        blobs = {e['sha256']: e.get('tamanho', 0) for e in self.listar() if e['presente']}
+        return sum(blobs.values())
+
+    # ------------------------------------------------------------------ escrita
+
+    def armazenar(self, caminho, ferramenta, versao=None, arquitetura=None, url=None, sha256=None):
+        """
+        Copia (ou cria um hard link de) um arquivo para o cache e o indexa.
+
+        Args:
+            caminho (str | Path): Arquivo baixado
+            ferramenta (str): Identificador da ferramenta
+            versao (str): Versão do artefato
+            arquitetura (str): Arquitetura
+            url (str): URL de origem
+            sha256 (str): Hash já conhecido do arquivo (calculado se None)
+
+        Returns:
+            dict: Entrada gravada no índice
+        """
+        sha256 = (sha256 or calcular_sha256(caminho)).lower()
+        blob = self.caminho_blob(sha256)
+        if not blob.is_file():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            temporario = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+            try:
+                os.link(caminho, temporario)
+            except OSError:
+                shutil.copyfile(caminho, temporario)
+            os.replace(temporario, blob)
+
+        agora = time.time()
+        entrada = {
+            'ferramenta': ferramenta,
+            'versao': versao,
+            'arquitetura': arquitetura,
+            'url': url,
+            'sha256': sha256,
+            'tamanho': blob.stat().st_size,
+            'nome': Path(caminho).name,
+            'adicionado': agora,
+            'ultimo_uso': agora,
+        }
+        with self._bloqueio():
+            entradas = [
+                e for e in self._ler_indice()
+                if not (e.get('ferramenta') == ferramenta and e.get('versao') == versao
+                        and e.get('arquitetura') == arquitetura and e.get('url') == url)
+            ]
+            entradas.append(entrada)
+            self._gravar_indice(entradas)
+            self._podar(entradas, self.orcamento_bytes, preservar={sha256})
+        return entrada
+
+    def materializar(self, entrada, destino):
+        """
+        Disponibiliza um artefato do cache em 'destino' (hard link ou cópia).
+
+        O instalador pode apagar 'destino' depois de usá-lo sem afetar o cache.
+
+        Args:
+            entrada (dict): Entrada retornada por procurar()
+            destino (str | Path): Caminho de destino
+
+        Returns:
+            str: Caminho de destino
+        """
+        destino = Path(destino)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        if destino.exists():
+            destino.unlink()
+        try:
+            os.link(entrada['caminho'], destino)
+        except OSError:
+            shutil.copyfile(entrada['caminho'], destino)
+        return str(destino)
+
+    # ------------------------------------------------------------------ poda
+
+    def _podar(self, entradas, limite_bytes, preservar=()):
+        """Remove blobs menos usados até caber em limite_bytes. Chamado com o bloqueio."""
+        ultimo_uso = {}
+        tamanhos = {}
+        for e in entradas:
+            sha = e.get('sha256', '')
+            ultimo_uso[sha] = max(ultimo_uso.get(sha, 0), e.get('ultimo_uso', 0))
+            tamanhos[sha] = e.get('tamanho', 0)
+
+        total = sum(tamanhos.values())
+        removidos = []
+        for sha in sorted(ultimo_uso, key=ultimo_uso.get):
+            if total <= limite_bytes:
+                break
+            if sha in preservar:
+                continue
+            try:
+                self.caminho_blob(sha).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue  # em uso (ex.: instalador em execução); tentar na próxima poda
+            total -= tamanhos[sha]
+            removidos.append(sha)
+
+        if removidos:
+            restantes = [e for e in entradas if e.get('sha256') not in removidos]
+            removidas = [e for e in entradas if e.get('sha256') in removidos]
+            entradas[:] = restantes
+            self._gravar_indice(entradas)
+            return removidas
+        return []
+
+    def podar(self, limite_bytes=None):
+        """
+        Aplica o orçamento de disco, removendo os artefatos usados há mais tempo.
+
+        Também descarta entradas cujo blob não existe mais.
+
+        Args:
+            limite_bytes (int): Limite a aplicar (padrão: orçamento do cache; 0 esvazia o cache)
+
+        Returns:
+            list: Entradas removidas
+        """
+        limite = self.orcamento_bytes if limite_bytes is None else limite_bytes
+        with self._bloqueio():
+            entradas = self._ler_indice()
+            orfas = [e for e in entradas if not self.caminho_blob(e.get('sha256', '')).is_file()]
+            entradas = [e for e in entradas if e not in orfas]
+            if orfas:
+                self._gravar_indice(entradas)
+            return orfas + self._podar(entradas, limite)
+
+
+def obter_com_cache(url, destino, ferramenta, versao=None, arquitetura=None, cache=None, **opcoes_download):
+    """
+    Obtém um artefato do cache ou, se ausente, baixa e guarda no cache.
+
+    Falhas do próprio cache (disco cheio, permissão) não impedem a instalação:
+    o download segue normalmente e apenas não é reaproveitado.
+
+    Args:
+        url (str): URL do artefato
+        destino (str | Path): Caminho onde o instalador deve ficar disponível
+        ferramenta (str): Identificador da ferramenta
+        versao (str): Versão do artefato
+        arquitetura (str): Arquitetura
+        cache (ArtifactCache): Cache a usar (padrão: ArtifactCache())
+        **opcoes_download: Repassadas para baixar_arquivo() (session, sha256_esperado, ...)
+
+    Returns:
+        dict: Resultado de baixar_arquivo() com a chave extra 'origem' ('cache' ou 'rede')
+    """
+    cache = cache or ArtifactCache()
+    sha256_esperado = opcoes_download.get('sha256_esperado')
+    try:
+        entrada = cache.procurar(ferramenta, versao, arquitetura, url)
+        if entrada and (not sha256_esperado or entrada['sha256'] == sha256_esperado.lower()):
+            caminho = cache.materializar(entrada, destino)
+            return {
+                'caminho': caminho,
+                'tamanho': entrada.get('tamanho'),
+                'segmentos': 0,
+                'sha256': entrada['sha256'],
+                'retomado': False,
+                'origem': 'cache',
+            }
+    except (OSError, TimeoutError) as e:
+        print(f"Aviso: cache de artefatos indisponível ({e})")
+
+    resultado = baixar_arquivo(url, destino, **opcoes_download)
+    resultado['origem'] = 'rede'
+    try:
+        entrada = cache.armazenar(destino, ferramenta, versao, arquitetura, url, sha256=resultado.get('sha256'))
+        resultado['sha256'] = entrada['sha256']
+    except (OSError, TimeoutError) as e:
+        print(f"Aviso: não foi possível guardar o artefato no cache ({e})")
+    return resultado
+
+
+def obter_do_cache(ferramenta, destino, versao=None, arquitetura=None, cache=None):
+    """
+    Disponibiliza em 'destino' o artefato mais recente do cache, sem acessar a rede.
+
+    Usado quando a versão mais recente não pode ser resolvida (máquina offline).
+
+    Args:
+        ferramenta (str): Identificador da ferramenta
+        destino (str | Path): Caminho onde o instalador deve ficar disponível
+        versao (str): Versão exigida (None = mais recente no cache)
+        arquitetura (str): Arquitetura exigida (None = qualquer)
+        cache (ArtifactCache): Cache a usar (padrão: ArtifactCache())
+
+    Returns:
+        dict | None: Entrada do cache (com 'caminho' = destino), ou None se não houver
+    """
+    cache = cache or ArtifactCache()
+    try:
+        entrada = cache.procurar(ferramenta, versao, arquitetura)
+        if not entrada:
+            return None
+        entrada['caminho'] = cache.materializar(entrada, destino)
+        return entrada
+    except (OSError, TimeoutError) as e:
+        print(f"Aviso: cache de artefatos indisponível ({e})")
+        return None
@@ -0,0 +1,348 @@
+"""
+Pacote offline de instaladores (bundle).
+
+Um bundle é um diretório — ou um arquivo .zip com o mesmo conteúdo — com
+todos os artefatos usados pelos instaladores e um manifest.json que descreve
+cada um (ferramenta, tipo, versão, arquitetura, URL de origem e SHA-256).
+É gerado uma única vez com 'orquestrador bundle build' e usado nas demais
+máquinas com --from-bundle: nenhum artefato é baixado e cada arquivo é
+conferido pelo SHA-256 do manifesto antes de ser usado.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+from pathlib import Path
+
+from .common import obter_diretorio_staging
+from .downloader import calcular_sha256, TAMANHO_BLOCO
+
+
+NOME_MANIFESTO = 'manifest.json'
+VERSAO_FORMATO = 1
+
+# Bundle usado quando --from-bundle não é informado
+ENV_BUNDLE = 'ORQUESTRADOR_BUNDLE'
+
+# Tipos de artefato registrados no manifesto
+TIPO_INSTALADOR = 'instalador'      # MSI/EXE executado pelo instalador da ferramenta
+TIPO_CHECKSUMS = 'checksums'        # SHASUMS256.txt do Node.js
+TIPO_PACOTE_NPM = 'pacote-npm'      # tarball do registro npm
+TIPO_BINARIO = 'binario'            # arquivo .zip com executável (Bun, uv)
+TIPO_REPOSITORIO = 'repositorio'    # 'git bundle' de um repositório
+
+
+class ErroBundle(Exception):
+    """Bundle ausente, inválido ou com artefato corrompido."""
+
+
+class Bundle:
+    """
+    Diretório de artefatos descrito por um manifest.json.
+    """
+
+    def __init__(self, raiz, manifesto=None):
+        """
+        Inicializa o bundle.
+
+        Args:
+            raiz (str | Path): Diretório do bundle
+            manifesto (dict): Conteúdo do manifest.json (padrão: manifesto vazio)
+        """
+        self.raiz = Path(raiz)
+        self.manifesto = manifesto or {'formato': VERSAO_FORMATO, 'criado_em': time.time(), 'artefatos': []}
+
+    @property
+    def artefatos(self):
+        """Entradas do manifesto."""
+        return self.manifesto['artefatos']
+
+    @classmethod
+    def criar(cls, raiz):
+        """
+        Cria um bundle vazio em 'raiz'.
+
+        Args:
+            raiz (str | Path): Diretório do bundle (criado se não existir)
+
+        Returns:
+            Bundle: Bundle vazio (o manifesto é gravado por salvar())
+        """
+        Path(raiz).mkdir(parents=True, exist_ok=True)
+        return cls(raiz)
+
+    @classmethod
+    def abrir(cls, caminho):
+        """
+        Abre um bundle a partir de um diretório ou de um arquivo .zip.
+
+        O .zip é extraído uma única vez para o staging; aberturas seguintes
+        (ex.: as etapas fetch e install de outra ferramenta) reaproveitam a extração.
+
+        Args:
+            caminho (str | Path): Diretório do bundle ou arquivo .zip
+
+        Returns:
+            Bundle: Bundle carregado
+
+        Raises:
+            ErroBundle: Se o caminho não existir ou o manifesto for inválido
+        """
+        caminho = Path(caminho)
+        if caminho.is_file() and zipfile.is_zipfile(caminho):
+            caminho = _extrair_zip(caminho)
+        if not caminho.is_dir():
+            raise ErroBundle(f"Bundle não encontrado: {caminho}")
+
+        try:
+            manifesto = json.loads((caminho / NOME_MANIFESTO).read_text(encoding='utf-8'))
+        except OSError:
+            raise ErroBundle(f"{NOME_MANIFESTO} não encontrado em {caminho}")
+        except ValueError as e:
+            raise ErroBundle(f"{NOME_MANIFESTO} inválido: {e}")
+
+        if not isinstance(manifesto, dict) or not isinstance(manifesto.get('artefatos'), list):
+            raise ErroBundle(f"{NOME_MANIFESTO} inválido: lista de artefatos ausente")
+        if manifesto.get('formato', 0) > VERSAO_FORMATO:
+            raise ErroBundle(f"Formato de bundle {manifesto.get('formato')} não suportado por esta versão")
+        return cls(caminho, manifesto)
+
+    def salvar(self):
+        """Grava o manifest.json."""
+        temporario = self.raiz / f"{NOME_MANIFESTO}.tmp"
+        temporario.write_text(json.dumps(self.manifesto, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(temporario, self.raiz / NOME_MANIFESTO)
+
+    def adicionar(self, origem, ferramenta, tipo=TIPO_INSTALADOR, versao=None, arquitetura=None,
+                  url=None, nome=None, **extras):
+        """
+        Copia um arquivo para o bundle e o registra no manifesto.
+
+        Uma entrada anterior com a mesma (ferramenta, tipo, arquitetura, nome) é substituída.
+
+        Args:
+            origem (str | Path): Arquivo a incluir
+            ferramenta (str): Identificador da ferramenta (ex.: 'nodejs', 'gemini-cli')
+            tipo (str): Um dos TIPO_* deste módulo
+            versao (str): Versão do artefato
+            arquitetura (str): Arquitetura ('x64', 'arm64', ...) ou None se independente
+            url (str): URL de origem
+            nome (str): Nome do arquivo no bundle (padrão: nome de 'origem')
+            **extras: Metadados adicionais (ex.: 'pacote' dos tarballs npm)
+
+        Returns:
+            dict: Entrada registrada
+        """
+        nome = nome or Path(origem).name
+        relativo = f"{ferramenta}/{nome}"
+        destino = self.raiz / ferramenta / nome
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        if Path(origem).resolve() != destino.resolve():
+            shutil.copyfile(origem, destino)
+
+        entrada = {
+            'ferramenta': ferramenta,
+            'tipo': tipo,
+            'versao': versao,
+            'arquitetura': arquitetura,
+            'url': url,
+            'arquivo': relativo,
+            'sha256': calcular_sha256(destino),
+            'tamanho': destino.stat().st_size,
+        }
+        entrada.update(extras)
+        self.manifesto['artefatos'] = [
+            e for e in self.artefatos
+            if not (e.get('ferramenta') == ferramenta and e.get('tipo') == tipo
+                    and e.get('arquitetura') == arquitetura and e.get('arquivo') == relativo)
+        ] + [entrada]
+        return entrada
+
+    def procurar(self, ferramenta, tipo=TIPO_INSTALADOR, arquitetura=None):
+        """
+        Procura um artefato no manifesto.
+
+        Args:
+            ferramenta (str): Identificador da ferramenta
+            tipo (str): Tipo do artefato
+            arquitetura (str): Arquitetura exigida (None = qualquer). Artefatos
+                sem arquitetura atendem a qualquer uma.
+
+        Returns:
+            dict | None: Entrada do manifesto, ou None se ausente
+        """
+        for entrada in self.artefatos:
+            if entrada.get('ferramenta') != ferramenta or entrada.get('tipo') != tipo:
+                continue
+            if arquitetura and entrada.get('arquitetura') not in (None, arquitetura):
+                continue
+            return entrada
+        return None
+
+    def caminho(self, entrada):
+        """Caminho do arquivo de uma entrada dentro do bundle."""
+        return self.raiz / entrada['arquivo']
+
+    def materializar(self, entrada, destino):
+        """
+        Copia um artefato do bundle para 'destino', conferindo o SHA-256.
+
+        Args:
+            entrada (dict): Entrada retornada por procurar()
+            destino (str | Path): Caminho de destino
+
+        Returns:
+            str: Caminho de destino
+
+        Raises:
+            ErroBundle: Se o arquivo estiver ausente ou o SHA-256 não conferir
+        """
+        origem = self.caminho(entrada)
+        destino = Path(destino)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        temporario = destino.with_name(destino.name + '.tmp')
+        sha256 = hashlib.sha256()
+        try:
+            with open(origem, 'rb') as entrada_arquivo, open(temporario, 'wb') as saida:
+                for bloco in iter(lambda: entrada_arquivo.read(TAMANHO_BLOCO), b''):
+                    sha256.update(bloco)
+                    saida.write(bloco)
+        except FileNotFoundError:
+            raise ErroBundle(f"Arquivo ausente no bundle: {entrada['arquivo']}")
+
+        if sha256.hexdigest() != entrada.get('sha256'):
+            temporario.unlink()
+            raise ErroBundle(f"SHA-256 não confere para {entrada['arquivo']} (bundle corrompido?)")
+        os.replace(temporario, destino)
+        return str(destino)
+
+    def verificar(self):
+        """
+        Confere a presença e o SHA-256 de todos os artefatos.
+
+        Returns:
+            list: (entrada, problema) para cada artefato com problema; vazia se tudo confere
+        """
+        problemas = []
+        for entrada in self.artefatos:
+            caminho = self.caminho(entrada)
+            if not caminho.is_file():
+                problemas.append((entrada, 'arquivo ausente'))
+            elif calcular_sha256(caminho) != entrada.get('sha256'):
+                problemas.append((entrada, 'SHA-256 não confere'))
+        return problemas
+
+    def compactar(self, arquivo_zip):
+        """
+        Gera um .zip com o conteúdo do bundle.
+
+        Args:
+            arquivo_zip (str | Path): Arquivo .zip de destino
+
+        Returns:
+            str: Caminho do .zip gerado
+        """
+        arquivo_zip = Path(arquivo_zip)
+        arquivo_zip.parent.mkdir(parents=True, exist_ok=True)
+        temporario = arquivo_zip.with_name(arquivo_zip.name + '.tmp')
+        # Instaladores já são comprimidos: ZIP_STORED evita gastar CPU sem ganho de espaço
+        with zipfile.ZipFile(temporario, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+            zf.write(self.raiz / NOME_MANIFESTO, NOME_MANIFESTO)
+            for entrada in self.artefatos:
+                zf.write(self.caminho(entrada), entrada['arquivo'])
+        os.replace(temporario, arquivo_zip)
+        return str(arquivo_zip)
+
+
+def extrair_executavel(bundle, entrada, nome_executavel, diretorio_destino):
+    """
+    Extrai um executável (ex.: 'bun.exe', 'uv.exe') de um artefato .zip do bundle.
+
+    O .zip é conferido pelo SHA-256 antes da extração.
+
+    Args:
+        bundle (Bundle): Bundle offline
+        entrada (dict): Entrada do tipo TIPO_BINARIO
+        nome_executavel (str): Nome do arquivo dentro do .zip (em qualquer subdiretório)
+        diretorio_destino (str | Path): Diretório onde o executável é gravado
+
+    Returns:
+        Path: Caminho do executável extraído
+
+    Raises:
+        ErroBundle: Se o artefato estiver corrompido ou não contiver o executável
+    """
+    arquivo_zip = bundle.materializar(entrada, obter_diretorio_staging('bundle') / Path(entrada['arquivo']).name)
+    destino = Path(diretorio_destino) / nome_executavel
+    try:
+        with zipfile.ZipFile(arquivo_zip) as zf:
+            membro = next((m for m in zf.namelist() if m.rsplit('/', 1)[-1] == nome_executavel), None)
+            if not membro:
+                raise ErroBundle(f"{nome_executavel} não encontrado em {entrada['arquivo']}")
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(membro) as origem, open(destino, 'wb') as saida:
+                shutil.copyfileobj(origem, saida, TAMANHO_BLOCO)
+    except zipfile.BadZipFile as e:
+        raise ErroBundle(f"{entrada['arquivo']} inválido: {e}")
+    finally:
+        os.remove(arquivo_zip)
+    return destino
+
+
+def _extrair_zip(arquivo_zip):
+    """Extrai um bundle .zip para o staging (uma vez por conteúdo) e retorna o diretório."""
+    estado = arquivo_zip.stat()
+    chave = hashlib.sha256(f"{arquivo_zip.resolve()}|{estado.st_size}|{estado.st_mtime_ns}".encode()).hexdigest()
+    destino = obter_diretorio_staging('bundle') / chave[:16]
+    if (destino / NOME_MANIFESTO).is_file():
+        return destino
+
+    temporario = destino.with_name(destino.name + f".{os.getpid()}.tmp")
+    shutil.rmtree(temporario, ignore_errors=True)
+    try:
+        with zipfile.ZipFile(arquivo_zip) as zf:
+            zf.extractall(temporario)
+        os.replace(temporario, destino)
+    except OSError:
+        # Outro processo concluiu a mesma extração primeiro
+        shutil.rmtree(temporario, ignore_errors=True)
+        if not (destino / NOME_MANIFESTO).is_file():
+            raise
+    except zipfile.BadZipFile as e:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise ErroBundle(f"Arquivo de bundle inválido: {e}")
+    return destino
+
+
+def obter_bundle(caminho=None):
+    """
+    Abre o bundle informado por --from-bundle ou pela variável ORQUESTRADOR_BUNDLE.
+
+    Args:
+        caminho (str): Valor de --from-bundle (None = usar a variável de ambiente)
+
+    Returns:
+        Bundle | None: Bundle aberto, ou None se nenhum foi informado
+
+    Raises:
+        ErroBundle: Se o bundle informado não puder ser aberto
+    """
+    caminho = caminho or os.environ.get(ENV_BUNDLE)
+    if not caminho:
+        return None
+    return Bundle.abrir(caminho)
+
+
+def adicionar_argumento_bundle(parser):
+    """
+    Adiciona --from-bundle a um ArgumentParser de instalador.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser do instalador
+    """
+    parser.add_argument('--from-bundle', dest='from_bundle', type=str, default=None, metavar='CAMINHO',
+                        help=f"Instalar sem acesso à rede a partir de um bundle offline "
+                             f"(diretório ou .zip; padrão: {ENV_BUNDLE})")
@@ -10,7 +10,10 @@ import sys
 import os
 import platform
 import logging
+import json
+import tempfile
 from datetime import datetime
+from pathlib import Path
 import shutil
 
 
@@ -198,6 +201,58 @@ def detectar_nvm_windows():
     return False
 
 
+# Chaves de desinstalação do Windows (programas instalados por usuário, por máquina e 32-bit)
+CHAVES_DESINSTALACAO = (
+    ('HKEY_CURRENT_USER', r'Software\Microsoft\Windows\CurrentVersion\Uninstall'),
+    ('HKEY_LOCAL_MACHINE', r'Software\Microsoft\Windows\CurrentVersion\Uninstall'),
+    ('HKEY_LOCAL_MACHINE', r'Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall'),
+)
+
+
+def versao_registrada(nome_exibicao):
+    """
+    Lê a versão de um programa instalado nas chaves de desinstalação do Windows.
+
+    Mais rápido que executar '<programa> --version': não inicia processos
+    (o 'code --version' do VS Code, por exemplo, abre o Electron).
+
+    Args:
+        nome_exibicao (str): DisplayName do programa (ex.: 'Git'); também aceita o nome
+            seguido de um qualificador, como 'Microsoft Visual Studio Code (User)'
+
+    Returns:
+        str: DisplayVersion do programa, ou None se não encontrado (ou fora do Windows)
+    """
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    for raiz, caminho in CHAVES_DESINSTALACAO:
+        try:
+            chave = winreg.OpenKey(getattr(winreg, raiz), caminho)
+        except OSError:
+            continue
+        with chave:
+            indice = 0
+            while True:
+                try:
+                    subchave = winreg.EnumKey(chave, indice)
+                except OSError:
+                    break
+                indice += 1
+                try:
+                    with winreg.OpenKey(chave, subchave) as programa:
+                        nome, _ = winreg.QueryValueEx(programa, 'DisplayName')
+                        # 'Git' não deve corresponder a 'GitHub Desktop'
+                        if nome == nome_exibicao or str(nome).startswith(nome_exibicao + ' ('):
+                            versao, _ = winreg.QueryValueEx(programa, 'DisplayVersion')
+                            return str(versao)
+                except OSError:
+                    continue
+    return None
+
+
 def configurar_execution_policy():
     """
     Configura a política de execução do PowerShell para RemoteSigned.
@@ -320,4 +375,78 @@ def preparar_ambiente_nodejs():
         updated_parts = novos + paths_atual  # prepend para priorizar
         novo_ambiente['PATH'] = os.pathsep.join(updated_parts)
 
-    return novo_ambiente
\ No newline at end of file
+    return novo_ambiente
+
+
+# Diretório de staging compartilhado entre as etapas "fetch" e "install".
+# As duas etapas rodam em processos diferentes (o orquestrador executa o
+# download de uma ferramenta enquanto instala outra), então o artefato
+# baixado é registrado em um manifesto com caminho determinístico.
+NOME_MANIFESTO_PREPARADO = 'preparado.json'
+
+
+def obter_diretorio_staging(ferramenta):
+    """
+    Retorna (e cria) o diretório de staging de uma ferramenta.
+
+    Args:
+        ferramenta (str): Identificador da ferramenta (ex.: 'vscode', 'nodejs')
+
+    Returns:
+        Path: Diretório %TEMP%/OrquestradorInstalacoes/<ferramenta>
+    """
+    diretorio = Path(tempfile.gettempdir()) / 'OrquestradorInstalacoes' / ferramenta
+    diretorio.mkdir(parents=True, exist_ok=True)
+    return diretorio
+
+
+def salvar_artefato_preparado(ferramenta, caminho=None, **metadados):
+    """
+    Registra o resultado da etapa de download (fetch) de uma ferramenta.
+
+    Args:
+        ferramenta (str): Identificador da ferramenta
+        caminho (str | Path | None): Arquivo baixado (None quando não há nada a instalar)
+        **metadados: Informações extras para a etapa de instalação (ex.: versão)
+    """
+    dados = dict(metadados)
+    dados['caminho'] = str(caminho) if caminho else None
+    manifesto = obter_diretorio_staging(ferramenta) / NOME_MANIFESTO_PREPARADO
+    manifesto.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def carregar_artefato_preparado(ferramenta):
+    """
+    Lê o manifesto gravado pela etapa de download.
+
+    Args:
+        ferramenta (str): Identificador da ferramenta
+
+    Returns:
+        dict: Metadados do artefato preparado, ou None se não houver manifesto
+              válido ou se o arquivo registrado não existir mais
+    """
+    manifesto = obter_diretorio_staging(ferramenta) / NOME_MANIFESTO_PREPARADO
+    try:
+        dados = json.loads(manifesto.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+    caminho = dados.get('caminho')
+    if caminho and not os.path.exists(caminho):
+        return None
+    return dados
+
+
+def limpar_artefato_preparado(ferramenta):
+    """
+    Remove o manifesto da etapa de download após a instalação.
+
+    Args:
+        ferramenta (str): Identificador da ferramenta
+    """
+    manifesto = obter_diretorio_staging(ferramenta) / NOME_MANIFESTO_PREPARADO
+    try:
+        manifesto.unlink()
+    except OSError:
+        pass
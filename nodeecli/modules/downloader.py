@@ -0,0 +1,424 @@
+"""
+Módulo de download compartilhado entre os instaladores.
+
+Baixa arquivos grandes (instaladores de 100–150 MB) usando várias conexões
+HTTP simultâneas com requisições Range, gravando cada segmento diretamente
+na sua posição de um arquivo pré-alocado. Quando o servidor não suporta
+Range, faz o download em um único fluxo.
+
+Downloads interrompidos são retomados a partir do arquivo '.part' e do seu
+sidecar '.part.json', inclusive entre execuções diferentes do instalador.
+"""
+
+import contextvars
+import os
+import json
+import hashlib
+import threading
+import time
+
+from .http_client import obter_sessao
+from .importacao import importar_adiado
+
+# Importado na primeira requisição (ver importacao.py)
+requests = importar_adiado('requests')
+
+
+# Tamanho do bloco lido de cada resposta HTTP
+TAMANHO_BLOCO = 64 * 1024
+
+# Abaixo deste tamanho não compensa abrir várias conexões
+TAMANHO_MINIMO_SEGMENTADO = 8 * 1024 * 1024
+
+# Número padrão de conexões simultâneas
+SEGMENTOS_PADRAO = 4
+
+# Bytes baixados entre duas atualizações do sidecar de retomada
+INTERVALO_REGISTRO = 1024 * 1024
+
+# Tentativas por segmento (e da requisição inicial) antes de desistir
+TENTATIVAS_POR_SEGMENTO = 3
+
+
+class ErroDownload(Exception):
+    """Falha no download (rede, tamanho inesperado, checksum ou cancelamento)."""
+
+
+class ErroChecksum(ErroDownload):
+    """O arquivo baixado não confere com o SHA-256 esperado."""
+
+
+class _RespostaInesperada(ErroDownload):
+    """O servidor deixou de responder 206 a uma faixa (arquivo mudou ou Range desativado)."""
+
+
+def _dividir_em_segmentos(total, segmentos):
+    """
+    Divide o intervalo [0, total) em faixas contíguas.
+
+    Args:
+        total (int): Tamanho do arquivo em bytes
+        segmentos (int): Número desejado de faixas
+
+    Returns:
+        list: Lista de tuplas (inicio, fim) inclusivas
+    """
+    segmentos = max(1, min(segmentos, total))
+    tamanho = total // segmentos
+    faixas = []
+    inicio = 0
+    for indice in range(segmentos):
+        fim = total - 1 if indice == segmentos - 1 else inicio + tamanho - 1
+        faixas.append((inicio, fim))
+        inicio = fim + 1
+    return faixas
+
+
+def calcular_sha256(caminho):
+    """
+    Calcula o SHA-256 de um arquivo.
+
+    Args:
+        caminho (str): Caminho do arquivo
+
+    Returns:
+        str: Hash em hexadecimal (minúsculo)
+    """
+    hasher = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(bloco)
+    return hasher.hexdigest()
+
+
+class _Progresso:
+    """Acumula bytes baixados por várias threads e repassa ao callback."""
+
+    def __init__(self, total, callback):
+        self.total = total
+        self.baixados = 0
+        self.callback = callback
+        self.lock = threading.Lock()
+
+    def adicionar(self, quantidade):
+        with self.lock:
+            self.baixados += quantidade
+            if self.callback:
+                self.callback(self.baixados, self.total)
+
+
+def _sondar(session, url, timeout):
+    """
+    Sonda o servidor com 'Range: bytes=0-0', com novas tentativas em falhas de rede.
+
+    Returns:
+        requests.Response: 206 indica suporte a Range (o tamanho total vem em
+        Content-Range); 200 indica que o servidor ignorou o Range e a resposta
+        já é o arquivo completo.
+    """
+    for tentativa in range(1, TENTATIVAS_POR_SEGMENTO + 1):
+        try:
+            resposta = session.get(url, headers={'Range': 'bytes=0-0', 'Accept-Encoding': 'identity'},
+                                   stream=True, timeout=timeout, allow_redirects=True)
+            if resposta.status_code < 500:
+                resposta.raise_for_status()
+                return resposta
+            resposta.close()
+            if tentativa == TENTATIVAS_POR_SEGMENTO:
+                resposta.raise_for_status()
+        except (requests.ConnectionError, requests.Timeout):
+            if tentativa == TENTATIVAS_POR_SEGMENTO:
+                raise
+        time.sleep(tentativa)
+
+
+def _total_de_content_range(resposta):
+    """Extrai o tamanho total de 'Content-Range: bytes 0-0/12345'."""
+    content_range = resposta.headers.get('Content-Range', '')
+    if '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class _EstadoRetomada:
+    """
+    Sidecar '<destino>.part.json' que permite retomar um download interrompido.
+
+    Guarda a URL, o validador (ETag/Last-Modified), o tamanho total e, para
+    cada faixa, a posição até a qual os bytes já foram gravados no '.part'.
+    """
+
+    def __init__(self, caminho, url, validador, total, faixas):
+        self.caminho = caminho
+        self.url = url
+        self.validador = validador
+        self.total = total
+        self.faixas = [list(faixa) for faixa in faixas]  # [inicio, fim, posicao]
+        self.lock = threading.Lock()
+
+    @classmethod
+    def carregar(cls, caminho, url, validador, total, parcial):
+        """
+        Carrega o estado salvo se ele ainda corresponder ao arquivo remoto.
+
+        Returns:
+            _EstadoRetomada | None: Estado compatível, ou None para recomeçar do zero
+        """
+        if not validador:
+            return None  # sem validador não há como garantir que o arquivo é o mesmo
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            faixas = [(int(i), int(f_), int(p)) for i, f_, p in dados['faixas']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if (dados.get('url') != url or dados.get('validador') != validador
+                or dados.get('total') != total or not faixas):
+            return None
+        try:
+            if os.path.getsize(parcial) != total:
+                return None
+        except OSError:
+            return None
+        if any(not (inicio <= posicao <= fim + 1) for inicio, fim, posicao in faixas):
+            return None
+        return cls(caminho, url, validador, total, faixas)
+
+    @property
+    def baixados(self):
+        return sum(posicao - inicio for inicio, _, posicao in self.faixas)
+
+    def registrar(self, indice, posicao):
+        """Atualiza a posição gravada de uma faixa e persiste o sidecar."""
+        with self.lock:
+            self.faixas[indice][2] = posicao
+            self._salvar()
+
+    def _salvar(self):
+        dados = {
+            'url': self.url,
+            'validador': self.validador,
+            'total': self.total,
+            'faixas': self.faixas,
+        }
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+        os.replace(temporario, self.caminho)
+
+    def salvar(self):
+        with self.lock:
+            self._salvar()
+
+
+def _remover(*caminhos):
+    for caminho in caminhos:
+        try:
+            os.unlink(caminho)
+        except OSError:
+            pass
+
+
+def _baixar_segmento(session, url, caminho, indice, estado, timeout, progresso, cancelar, erros):
+    """
+    Baixa a faixa 'indice' do estado para a mesma posição do arquivo pré-alocado.
+
+    Em falhas de rede, a nova tentativa continua da última posição gravada.
+    A posição só é registrada no sidecar depois de o bloco ser descarregado
+    no arquivo, para que uma retomada nunca pule bytes não gravados.
+    """
+    inicio, fim, posicao = estado.faixas[indice]
+    for tentativa in range(1, TENTATIVAS_POR_SEGMENTO + 1):
+        if erros:
+            return  # outro segmento já falhou
+        if posicao > fim:
+            return  # faixa concluída (ex.: retomada de um download anterior)
+        headers = {'Range': f'bytes={posicao}-{fim}', 'Accept-Encoding': 'identity'}
+        if estado.validador:
+            headers['If-Range'] = estado.validador
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as resposta:
+                if resposta.status_code != 206:
+                    raise _RespostaInesperada(
+                        f"servidor respondeu {resposta.status_code} para a faixa {posicao}-{fim}"
+                    )
+                with open(caminho, 'r+b') as f:
+                    f.seek(posicao)
+                    registrado = posicao
+                    try:
+                        for bloco in resposta.iter_content(chunk_size=TAMANHO_BLOCO):
+                            if cancelar and cancelar():
+                                erros.append(ErroDownload("download cancelado"))
+                                return
+                            if not bloco:
+                                continue
+                            restante = fim - posicao + 1
+                            bloco = bloco[:restante]
+                            f.write(bloco)
+                            posicao += len(bloco)
+                            progresso.adicionar(len(bloco))
+                            if posicao - registrado >= INTERVALO_REGISTRO:
+                                f.flush()
+                                estado.registrar(indice, posicao)
+                                registrado = posicao
+                            if posicao > fim:
+                                break
+                    finally:
+                        f.flush()
+                        estado.registrar(indice, posicao)
+            if posicao > fim:
+                return
+            raise ErroDownload(f"faixa {inicio}-{fim} interrompida em {posicao}")
+        except _RespostaInesperada as e:
+            erros.append(e)
+            return
+        except (requests.RequestException, ErroDownload, OSError) as e:
+            if tentativa == TENTATIVAS_POR_SEGMENTO:
+                erros.append(e)
+                return
+            time.sleep(tentativa)
+
+
+def _baixar_fluxo_unico(resposta, caminho, progresso, cancelar):
+    """Grava o corpo de uma resposta 200 em um único fluxo."""
+    with open(caminho, 'wb') as f:
+        for bloco in resposta.iter_content(chunk_size=TAMANHO_BLOCO):
+            if cancelar and cancelar():
+                raise ErroDownload("download cancelado")
+            if bloco:
+                f.write(bloco)
+                progresso.adicionar(len(bloco))
+
+
+def _validador_de(resposta):
+    """ETag forte ou Last-Modified — os únicos aceitos em If-Range."""
+    etag = resposta.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return resposta.headers.get('Last-Modified')
+
+
+def baixar_arquivo(url, destino, session=None, segmentos=SEGMENTOS_PADRAO, timeout=(10, 120),
+                   sha256_esperado=None, ao_progresso=None, cancelar=None):
+    """
+    Baixa um arquivo, em paralelo por faixas quando o servidor permite.
+
+    O conteúdo é gravado em '<destino>.part' e movido para 'destino' apenas
+    depois de conferido o tamanho (e o SHA-256, se informado). O progresso de
+    cada faixa fica em '<destino>.part.json': se o download for interrompido
+    (falha de rede, cancelamento ou fim do processo), a próxima chamada com o
+    mesmo destino retoma de onde parou usando Range/If-Range, desde que o
+    servidor ainda informe o mesmo ETag/Last-Modified e tamanho.
+
+    Args:
+        url (str): URL do arquivo
+        destino (str): Caminho final do arquivo
+        session: Sessão requests (padrão: sessão compartilhada do processo)
+        segmentos (int): Número máximo de conexões simultâneas
+        timeout (tuple | int): Timeout (conexão, leitura) das requisições
+        sha256_esperado (str): Hash esperado do arquivo completo (opcional)
+        ao_progresso (callable): Função chamada com (bytes_baixados, total_ou_None)
+        cancelar (callable): Função que retorna True para interromper o download
+
+    Returns:
+        dict: {'caminho', 'tamanho', 'segmentos', 'sha256', 'retomado'} do arquivo baixado
+
+    Raises:
+        ErroDownload: Falha de rede, tamanho divergente, checksum inválido ou cancelamento
+    """
+    session = session or obter_sessao()
+    destino = str(destino)
+    parcial = f"{destino}.part"
+    caminho_estado = f"{parcial}.json"
+
+    try:
+        resposta = _sondar(session, url, timeout)
+    except requests.RequestException as e:
+        raise ErroDownload(f"falha ao contatar o servidor: {e}") from e
+
+    with resposta:
+        url_final = resposta.url or url
+        validador = _validador_de(resposta)
+        suporta_range = resposta.status_code == 206
+
+        if suporta_range:
+            total = _total_de_content_range(resposta)
+        else:
+            tamanho = resposta.headers.get('Content-Length')
+            total = int(tamanho) if tamanho and tamanho.isdigit() else None
+        progresso = _Progresso(total, ao_progresso)
+
+        if not suporta_range:
+            # Servidor ignorou o Range: a própria resposta já é o arquivo completo
+            # e não há como retomar — descartar qualquer estado anterior
+            _remover(caminho_estado)
+            try:
+                _baixar_fluxo_unico(resposta, parcial, progresso, cancelar)
+            except requests.RequestException as e:
+                raise ErroDownload(f"conexão interrompida: {e}") from e
+            quantidade_segmentos = 1
+            retomado = False
+
+    if suporta_range:
+        if not total:
+            raise ErroDownload("servidor não informou o tamanho do arquivo")
+
+        estado = _EstadoRetomada.carregar(caminho_estado, url, validador, total, parcial)
+        retomado = estado is not None
+        if estado is None:
+            usar_segmentos = segmentos > 1 and total >= TAMANHO_MINIMO_SEGMENTADO
+            faixas = _dividir_em_segmentos(total, segmentos if usar_segmentos else 1)
+            estado = _EstadoRetomada(caminho_estado, url, validador, total,
+                                     [(inicio, fim, inicio) for inicio, fim in faixas])
+            # Pré-alocar o arquivo para que cada segmento escreva na sua posição
+            with open(parcial, 'wb') as f:
+                f.truncate(total)
+            estado.salvar()
+        else:
+            progresso.adicionar(estado.baixados)
+        quantidade_segmentos = len(estado.faixas)
+
+        erros = []
+        # Cada segmento roda com uma cópia do contexto de quem chamou (canal de eventos e
+        # cancelamento de um instalador executado dentro do orquestrador)
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_baixar_segmento, session, url_final, parcial, indice, estado, timeout, progresso,
+                      cancelar, erros),
+                daemon=True,
+            )
+            for indice in range(quantidade_segmentos)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if erros:
+            if any(isinstance(erro, _RespostaInesperada) for erro in erros):
+                # O arquivo remoto mudou: o que foi baixado não serve para retomar
+                _remover(parcial, caminho_estado)
+            raise ErroDownload(f"falha no download segmentado: {erros[0]}")
+
+    tamanho_final = os.path.getsize(parcial)
+    if total is not None and tamanho_final != total:
+        _remover(parcial, caminho_estado)
+        raise ErroDownload(f"tamanho inesperado: {tamanho_final} de {total} bytes")
+
+    sha256 = None
+    if sha256_esperado:
+        sha256 = calcular_sha256(parcial)
+        if sha256.lower() != sha256_esperado.lower():
+            _remover(parcial, caminho_estado)
+            raise ErroChecksum(f"checksum inválido (esperado {sha256_esperado}, obtido {sha256})")
+
+    os.replace(parcial, destino)
+    _remover(caminho_estado)
+    return {
+        'caminho': destino,
+        'tamanho': tamanho_final,
+        'segmentos': quantidade_segmentos,
+        'sha256': sha256,
+        'retomado': retomado,
+    }
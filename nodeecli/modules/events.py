@@ -0,0 +1,350 @@
+"""
+Canal de eventos estruturados entre os instaladores e o orquestrador.
+
+O stdout dos instaladores continua sendo o log legível. Os eventos
+(início/fim de etapa, bytes baixados, avisos e o resultado) seguem por um
+canal separado: o orquestrador abre um pipe e informa ao processo filho,
+em ORQUESTRADOR_EVENTOS, onde escrever ('fd:<n>' no POSIX,
+'handle:<n>' no Windows). Cada evento é uma linha JSON:
+
+    {"v": 1, "evento": "progresso", "t": 1731000000.5, "baixados": 1048576, "total": 157286400, "taxa": 12582912}
+
+Tipos de evento (VERSAO_PROTOCOLO 1):
+- fase_inicio:  fase
+- fase_fim:     fase, sucesso, duracao (segundos)
+- progresso:    baixados, total (ou null), taxa (bytes/s, ou null)
+- atividade:    descricao, concluidos (ou null), total (ou null) - npm/bun em execução
+- aviso:        mensagem
+- resultado:    sucesso, codigo, mensagem (opcional)
+
+Fora do orquestrador (variável ausente) os eventos são descartados e os
+avisos vão para o stdout.
+
+No sentido contrário, ORQUESTRADOR_CONTROLE aponta para o pipe de controle:
+qualquer dado recebido nele (ou o fechamento do pipe, se o orquestrador
+terminar) é um pedido de cancelamento. Os instaladores consultam
+cancelamento_solicitado() nos laços de download e entre as etapas; o que
+estiver bloqueado em um programa externo (msiexec, npm) é encerrado pelo
+orquestrador junto com toda a árvore de processos.
+
+Quando o orquestrador executa um instalador no próprio processo (em uma
+thread), canal e cancelamento vêm do contexto definido por
+contexto_execucao() em vez das variáveis de ambiente.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+ENV_CANAL_EVENTOS = 'ORQUESTRADOR_EVENTOS'
+ENV_CANAL_CONTROLE = 'ORQUESTRADOR_CONTROLE'
+# Sinalização antiga de cancelamento, ainda respeitada
+ENV_CANCELADO = 'INSTALL_CANCELLED'
+
+# Incrementada quando um campo existente muda de significado
+VERSAO_PROTOCOLO = 1
+
+EVENTO_FASE_INICIO = 'fase_inicio'
+EVENTO_FASE_FIM = 'fase_fim'
+EVENTO_PROGRESSO = 'progresso'
+EVENTO_ATIVIDADE = 'atividade'
+EVENTO_AVISO = 'aviso'
+EVENTO_RESULTADO = 'resultado'
+
+TIPOS_EVENTO = (
+    EVENTO_FASE_INICIO, EVENTO_FASE_FIM, EVENTO_PROGRESSO, EVENTO_ATIVIDADE, EVENTO_AVISO, EVENTO_RESULTADO,
+)
+
+
+class CanalEventos:
+    """Escreve eventos, um por linha, em um arquivo de texto (o pipe do orquestrador)."""
+
+    def __init__(self, arquivo=None):
+        """
+        Inicializa o canal.
+
+        Args:
+            arquivo: Arquivo de texto de destino (None: canal inativo, eventos descartados)
+        """
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self):
+        """True se há um orquestrador lendo os eventos."""
+        return self.arquivo is not None
+
+    def emitir(self, evento, **dados):
+        """
+        Escreve um evento no canal.
+
+        Args:
+            evento (str): Um dos TIPOS_EVENTO
+            **dados: Campos do evento
+        """
+        if self.arquivo is None:
+            return
+        linha = json.dumps({'v': VERSAO_PROTOCOLO, 'evento': evento, 't': round(time.time(), 3), **dados})
+        with self._lock:
+            try:
+                self.arquivo.write(linha + '\n')
+                self.arquivo.flush()
+            except (OSError, ValueError):
+                # Orquestrador encerrado: seguir sem eventos
+                self.arquivo = None
+
+
+class InstalacaoCancelada(KeyboardInterrupt):
+    """Cancelamento pedido pelo orquestrador (tratado pelos instaladores como um Ctrl+C)."""
+
+
+def _abrir_descritor(valor, modo):
+    """
+    Converte o valor de ORQUESTRADOR_EVENTOS/ORQUESTRADOR_CONTROLE em um descritor.
+
+    Args:
+        valor (str): 'fd:<n>' ou 'handle:<n>' (Windows)
+        modo (int): os.O_WRONLY ou os.O_RDONLY
+
+    Returns:
+        int | None: Descritor, ou None se o valor for inválido
+    """
+    tipo, _, numero = (valor or '').partition(':')
+    try:
+        if tipo == 'handle':
+            import msvcrt
+            return msvcrt.open_osfhandle(int(numero), modo)
+        if tipo == 'fd':
+            return int(numero)
+    except (ImportError, OSError, ValueError):
+        pass
+    return None
+
+
+def abrir_canal(valor):
+    """
+    Abre o destino informado pelo orquestrador em ORQUESTRADOR_EVENTOS.
+
+    Args:
+        valor (str): 'fd:<n>' ou 'handle:<n>' (Windows)
+
+    Returns:
+        CanalEventos: Canal aberto (inativo se o valor for inválido)
+    """
+    fd = _abrir_descritor(valor, os.O_WRONLY)
+    if fd is None:
+        return CanalEventos()
+    try:
+        return CanalEventos(os.fdopen(fd, 'w', encoding='utf-8'))
+    except (OSError, ValueError):
+        return CanalEventos()
+
+
+_canal = None
+_canal_lock = threading.Lock()
+
+
+class _ContextoExecucao:
+    """Canal e cancelamento de um instalador executado dentro do orquestrador."""
+
+    def __init__(self, canal, cancelamento):
+        self.canal = canal
+        self.cancelamento = cancelamento
+
+
+_contexto = contextvars.ContextVar('contexto_execucao', default=None)
+
+
+@contextmanager
+def contexto_execucao(canal, cancelamento):
+    """
+    Define o canal e o cancelamento do instalador executado na thread atual.
+
+    Vale para o código executado dentro do bloco e para as threads iniciadas
+    com uma cópia do contexto (contextvars.copy_context()), como as do downloader.
+
+    Args:
+        canal (CanalEventos): Canal de eventos do instalador
+        cancelamento (threading.Event): Sinalizado quando o orquestrador pede o cancelamento
+    """
+    token = _contexto.set(_ContextoExecucao(canal, cancelamento))
+    try:
+        yield
+    finally:
+        _contexto.reset(token)
+
+
+def obter_canal():
+    """
+    Retorna o canal de eventos do processo, aberto na primeira chamada.
+
+    A variável de ambiente é removida depois de lida: o descritor vale só para
+    este processo, não para os programas que ele executa (npm, msiexec).
+
+    Returns:
+        CanalEventos: Canal do orquestrador, ou um canal inativo
+    """
+    global _canal
+    contexto = _contexto.get()
+    if contexto is not None:
+        return contexto.canal
+    with _canal_lock:
+        if _canal is None:
+            _canal = abrir_canal(os.environ.pop(ENV_CANAL_EVENTOS, ''))
+        return _canal
+
+
+_cancelamento = threading.Event()
+_controle_aberto = False
+
+
+def _escutar_controle(fd):
+    """Espera o pedido de cancelamento (ou o fim do pipe) em uma thread própria."""
+    try:
+        os.read(fd, 64)
+    except OSError:
+        # Pipe inválido: sem cancelamento por este canal
+        return
+    _cancelamento.set()
+
+
+def escutar_cancelamento():
+    """
+    Passa a escutar o pipe de controle do orquestrador (apenas na primeira chamada).
+
+    Como no canal de eventos, a variável de ambiente é removida depois de lida.
+    """
+    global _controle_aberto
+    with _canal_lock:
+        if _controle_aberto:
+            return
+        _controle_aberto = True
+        fd = _abrir_descritor(os.environ.pop(ENV_CANAL_CONTROLE, ''), os.O_RDONLY)
+    if fd is not None:
+        threading.Thread(target=_escutar_controle, args=(fd,), daemon=True).start()
+
+
+def cancelamento_solicitado():
+    """
+    Verifica se o orquestrador pediu o cancelamento.
+
+    Feita para ser passada como ``cancelar=`` aos downloads e consultada entre as etapas.
+
+    Returns:
+        bool: True se o cancelamento foi pedido
+    """
+    contexto = _contexto.get()
+    if contexto is not None:
+        return contexto.cancelamento.is_set()
+    escutar_cancelamento()
+    return _cancelamento.is_set() or os.environ.get(ENV_CANCELADO) == '1'
+
+
+def verificar_cancelamento():
+    """
+    Interrompe o instalador se o cancelamento foi pedido.
+
+    Raises:
+        InstalacaoCancelada: Se cancelamento_solicitado() for True
+    """
+    if cancelamento_solicitado():
+        raise InstalacaoCancelada()
+
+
+def emitir(evento, **dados):
+    """Emite um evento no canal do processo (sem efeito fora do orquestrador)."""
+    obter_canal().emitir(evento, **dados)
+
+
+class _Fase:
+    """Estado de uma etapa aberta por fase()."""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.sucesso = True
+
+
+@contextmanager
+def fase(nome):
+    """
+    Delimita uma etapa do instalador com os eventos fase_inicio/fase_fim.
+
+    Uma exceção marca a etapa como malsucedida; para falhas sem exceção,
+    atribua ``etapa.sucesso = False`` dentro do bloco. Se o cancelamento já
+    foi pedido, a etapa nem começa.
+
+    Args:
+        nome (str): Nome da etapa (ex.: 'download', 'instalacao')
+
+    Raises:
+        InstalacaoCancelada: Se o orquestrador pediu o cancelamento
+    """
+    verificar_cancelamento()
+    etapa = _Fase(nome)
+    inicio = time.monotonic()
+    emitir(EVENTO_FASE_INICIO, fase=nome)
+    try:
+        yield etapa
+    except BaseException:
+        etapa.sucesso = False
+        raise
+    finally:
+        emitir(EVENTO_FASE_FIM, fase=nome, sucesso=bool(etapa.sucesso),
+               duracao=round(time.monotonic() - inicio, 3))
+
+
+def avisar(mensagem):
+    """
+    Registra um aviso: evento 'aviso' sob o orquestrador, linha no stdout caso contrário.
+
+    Args:
+        mensagem (str): Texto do aviso
+    """
+    canal = obter_canal()
+    if canal.ativo:
+        canal.emitir(EVENTO_AVISO, mensagem=mensagem)
+    else:
+        print(f"⚠️  Aviso: {mensagem}")
+
+
+def concluir(codigo, mensagem=None):
+    """
+    Emite o evento 'resultado' com o código de saída do instalador.
+
+    Args:
+        codigo (int): Código de saída
+        mensagem (str): Resumo opcional
+
+    Returns:
+        int: O próprio código (para sys.exit(concluir(main())))
+    """
+    dados = {'sucesso': codigo == 0, 'codigo': codigo}
+    if mensagem:
+        dados['mensagem'] = mensagem
+    emitir(EVENTO_RESULTADO, **dados)
+    return codigo
+
+
+def ler_evento(linha):
+    """
+    Interpreta uma linha do canal de eventos.
+
+    Args:
+        linha (str): Linha JSON
+
+    Returns:
+        dict | None: Evento, ou None se a linha for inválida, de outra versão ou de tipo desconhecido
+    """
+    try:
+        dados = json.loads(linha)
+    except ValueError:
+        return None
+    if not isinstance(dados, dict) or dados.get('v') != VERSAO_PROTOCOLO:
+        return None
+    if dados.get('evento') not in TIPOS_EVENTO:
+        return None
+    return dados
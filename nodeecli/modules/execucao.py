@@ -0,0 +1,274 @@
+"""
+Execução dos gerenciadores de pacotes (npm, bun, PowerShell) com a saída transmitida.
+
+Com subprocess.run(capture_output=True), uma instalação de vários minutos não
+mostra nada até terminar, e uma instalação travada parece igual a uma lenta.
+executar_transmitindo() repassa cada linha assim que o programa a escreve e:
+
+- conta as requisições ao registro ('npm http fetch ...', com --loglevel=http)
+  e os pacotes informados pelo npm/bun, emitindo eventos 'atividade'
+  (events.py) no máximo algumas vezes por segundo;
+- avisa quando o programa passa muito tempo sem escrever nada;
+- guarda só as últimas linhas (a cauda) para a mensagem de erro, em vez de
+  toda a saída em memória;
+- no timeout ou no cancelamento, encerra o programa junto com os processos
+  que ele iniciou (npm.cmd -> node).
+"""
+
+import contextvars
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+from .events import EVENTO_ATIVIDADE, InstalacaoCancelada, avisar, cancelamento_solicitado, obter_canal
+from .progress import INTERVALO_PADRAO, formatar_tempo
+
+# Linhas guardadas para o diagnóstico de uma falha
+LINHAS_CAUDA = 40
+
+# Segundos sem nenhuma linha até o aviso de que o programa pode estar travado
+SILENCIO_AVISO = 60
+
+# Intervalo de verificação do timeout, do cancelamento e do silêncio
+INTERVALO_VERIFICACAO = 0.2
+
+# 'npm http fetch GET 200 https://registry.npmjs.org/... 35ms (cache hit)'
+_NPM_FETCH = re.compile(r'^npm (?:http|verbose|verb) fetch [A-Z]+ \d{3} ')
+# 'added 123 packages, and changed 2 packages in 5s' (npm) e '12 packages installed [1.23s]' (bun)
+_PACOTES_RESUMO = re.compile(r'^(?:(?:added|changed|removed) \d+ packages?|\d+ packages? installed)')
+_QUANTIDADE_PACOTES = re.compile(r'(\d+) packages?')
+# bun: 'Resolved, downloaded and extracted [123]'
+_BUN_EXTRAIDOS = re.compile(r'Resolved, downloaded and extracted \[(\d+)\]')
+# Linhas de erro do npm ('npm ERR!' até o npm 9, 'npm error' depois) e do bun ('error:')
+_LINHA_ERRO = re.compile(r'\bERR!|\berror\b', re.IGNORECASE)
+_ERRO_SEM_DETALHE = re.compile(r'\b(?:ERR!|error) (?:code|errno)\b|complete log of this run', re.IGNORECASE)
+
+
+class ResultadoExecucao:
+    """
+    Resultado de executar_transmitindo().
+    """
+
+    def __init__(self, comando, returncode, cauda, requisicoes=0, do_cache=0, pacotes=None, duracao=0.0):
+        self.comando = comando
+        self.returncode = returncode
+        self.cauda = list(cauda)
+        self.requisicoes = requisicoes
+        self.do_cache = do_cache
+        self.pacotes = pacotes
+        self.duracao = duracao
+
+    @property
+    def sucesso(self):
+        """True se o programa terminou com código 0."""
+        return self.returncode == 0
+
+    @property
+    def saida(self):
+        """Últimas linhas da saída (stdout e stderr juntos)."""
+        return '\n'.join(self.cauda)
+
+    def detalhe_erro(self):
+        """
+        Linha mais informativa da cauda para a mensagem de erro.
+
+        Returns:
+            str: A primeira linha de erro com detalhes (ex.: '404 Not Found - GET ...'), a última linha ou ''
+        """
+        for linha in self.cauda:
+            if _LINHA_ERRO.search(linha) and not _ERRO_SEM_DETALHE.search(linha):
+                return linha
+        return self.cauda[-1] if self.cauda else ''
+
+
+class _Acompanhamento:
+    """Contadores, cauda e eventos 'atividade' da saída de uma execução."""
+
+    def __init__(self, rotulo, ecoar, prefixo, intervalo=INTERVALO_PADRAO, relogio=time.monotonic):
+        self.rotulo = rotulo
+        self.ecoar = ecoar
+        self.prefixo = prefixo
+        self.intervalo = intervalo
+        self.relogio = relogio
+        self.canal = obter_canal()
+        self.cauda = deque(maxlen=LINHAS_CAUDA)
+        self.requisicoes = 0
+        self.do_cache = 0
+        self.pacotes = None
+        self.ultima_linha = relogio()
+        self._ultima_emissao = None
+        self._descricao = None
+
+    def receber(self, linha):
+        """Processa uma linha da saída (chamada na ordem em que o programa as escreve)."""
+        self.ultima_linha = self.relogio()
+        linha = linha.rstrip()
+        if not linha:
+            return
+        self.cauda.append(linha)
+
+        if _NPM_FETCH.match(linha):
+            # Uma linha por requisição: contada, não repassada ao log
+            self.requisicoes += 1
+            if '(cache hit)' in linha:
+                self.do_cache += 1
+            self._atualizar(f"{self.requisicoes} requisições ao registro", self.requisicoes)
+            return
+
+        extraidos = _BUN_EXTRAIDOS.search(linha)
+        if extraidos:
+            self.pacotes = int(extraidos.group(1))
+            self._atualizar(f"{self.pacotes} pacotes baixados e extraídos", self.pacotes)
+        elif _PACOTES_RESUMO.match(linha):
+            self.pacotes = sum(int(n) for n in _QUANTIDADE_PACOTES.findall(linha))
+
+        if self.ecoar:
+            print(f"{self.prefixo}{linha}", flush=True)
+
+    def _atualizar(self, descricao, concluidos, total=None):
+        """Emite um evento 'atividade', no máximo um a cada 'intervalo' segundos."""
+        self._descricao = (descricao, concluidos, total)
+        agora = self.relogio()
+        if self._ultima_emissao is not None and agora - self._ultima_emissao < self.intervalo:
+            return
+        self._emitir(agora)
+
+    def _emitir(self, agora):
+        self._ultima_emissao = agora
+        descricao, concluidos, total = self._descricao
+        self.canal.emitir(EVENTO_ATIVIDADE, descricao=f"{self.rotulo}: {descricao}",
+                          concluidos=concluidos, total=total)
+
+    def verificar_silencio(self, avisado_em):
+        """
+        Avisa se o programa está há SILENCIO_AVISO segundos sem escrever nada.
+
+        Args:
+            avisado_em (float): Instante do último aviso (None: nenhum)
+
+        Returns:
+            float: Instante do último aviso, atualizado
+        """
+        agora = self.relogio()
+        silencio = agora - self.ultima_linha
+        if silencio < SILENCIO_AVISO or (avisado_em is not None and agora - avisado_em < SILENCIO_AVISO):
+            return avisado_em
+        avisar(f"{self.rotulo} sem saída há {formatar_tempo(silencio)}; ainda aguardando o término")
+        return agora
+
+    def concluir(self, duracao):
+        """Emite o último estado dos contadores e resume as requisições no log."""
+        if self._descricao is not None:
+            self._emitir(self.relogio())
+        if self.requisicoes and self.ecoar:
+            print(f"{self.prefixo}{self.rotulo}: {self.requisicoes} requisições ao registro "
+                  f"({self.do_cache} do cache local) em {formatar_tempo(duracao)}", flush=True)
+
+
+def _argumentos_arvore():
+    """Argumentos do Popen para que o programa e os processos que ele iniciar possam ser encerrados juntos."""
+    if os.name == 'nt':
+        return {'creationflags': getattr(subprocess, 'CREATE_NO_WINDOW', 0)}
+    return {'start_new_session': True}
+
+
+def _encerrar(processo):
+    """Encerra o programa e os processos que ele iniciou."""
+    if os.name == 'nt':
+        # taskkill percorre a árvore a partir do programa (enquanto ele existir)
+        if processo.poll() is None:
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(processo.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        return
+    # No POSIX o programa lidera um grupo próprio, que sobrevive a ele
+    try:
+        os.killpg(processo.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Grupo já vazio
+        pass
+
+
+def _vigiar(processo, acompanhamento, prazo, cancelar, fim, motivo):
+    """Encerra o programa no timeout ou no cancelamento e avisa dos silêncios longos (thread própria)."""
+    avisado_em = None
+    while not fim.wait(INTERVALO_VERIFICACAO):
+        if cancelar is not None and cancelar():
+            motivo.append('cancelado')
+        elif prazo is not None and time.monotonic() >= prazo:
+            motivo.append('timeout')
+        else:
+            avisado_em = acompanhamento.verificar_silencio(avisado_em)
+            continue
+        _encerrar(processo)
+        return
+
+
+def executar_transmitindo(comando, rotulo=None, timeout=None, env=None, ecoar=True, prefixo='   ',
+                          cancelar=cancelamento_solicitado):
+    """
+    Executa um programa repassando a sua saída ao log linha a linha.
+
+    stdout e stderr são lidos juntos, na ordem em que o programa os escreve.
+
+    Args:
+        comando (list): Programa e argumentos
+        rotulo (str): Nome nas mensagens e eventos (padrão: nome do programa, ex.: 'npm')
+        timeout (float): Tempo máximo em segundos (None: sem limite)
+        env (dict): Ambiente do programa (padrão: o do processo)
+        ecoar (bool): Imprimir as linhas no stdout (o log do instalador)
+        prefixo (str): Texto antes de cada linha impressa
+        cancelar (callable): Retorna True quando a execução deve ser interrompida
+
+    Returns:
+        ResultadoExecucao: Código de saída, cauda da saída e contadores
+
+    Raises:
+        subprocess.TimeoutExpired: Se o timeout foi atingido (o programa é encerrado)
+        InstalacaoCancelada: Se o orquestrador pediu o cancelamento (o programa é encerrado)
+        OSError: Se o programa não puder ser iniciado (ex.: FileNotFoundError)
+    """
+    rotulo = rotulo or os.path.splitext(os.path.basename(str(comando[0])))[0]
+    acompanhamento = _Acompanhamento(rotulo, ecoar, prefixo)
+    inicio = time.monotonic()
+    processo = subprocess.Popen(
+        comando, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding='utf-8', errors='replace', env=env, **_argumentos_arvore(),
+    )
+
+    fim = threading.Event()
+    motivo = []
+    # O vigia roda com uma cópia do contexto (canal de eventos e cancelamento de um
+    # instalador executado dentro do orquestrador)
+    vigia = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_vigiar, processo, acompanhamento, inicio + timeout if timeout else None, cancelar, fim, motivo),
+        daemon=True,
+    )
+    vigia.start()
+    try:
+        with processo.stdout:
+            for linha in processo.stdout:
+                acompanhamento.receber(linha)
+        processo.wait()
+    except BaseException:
+        _encerrar(processo)
+        raise
+    finally:
+        fim.set()
+        vigia.join()
+
+    duracao = time.monotonic() - inicio
+    acompanhamento.concluir(duracao)
+    if 'timeout' in motivo:
+        raise subprocess.TimeoutExpired(comando, timeout, output='\n'.join(acompanhamento.cauda))
+    if 'cancelado' in motivo:
+        raise InstalacaoCancelada()
+    return ResultadoExecucao(
+        comando, processo.returncode, acompanhamento.cauda, acompanhamento.requisicoes,
+        acompanhamento.do_cache, acompanhamento.pacotes, duracao,
+    )
@@ -0,0 +1,239 @@
+"""
+Cliente HTTP compartilhado por todos os instaladores.
+
+Mantém uma requests.Session por conjunto de opções no processo, com pool de conexões
+dimensionado para o download segmentado, keep-alive entre as requisições de
+metadados e de conteúdo, e tratamento uniforme de proxy e certificados CA
+(argumentos --proxy/--cacert ou variáveis de ambiente). Com um espelho na
+rede local (--mirror), as URLs das origens conhecidas são reescritas para ele.
+
+requests só é importado quando a primeira sessão é criada: definir_opcoes_http()
+guarda as opções, e a sessão nasce na primeira requisição (obter_sessao()).
+
+Execuções simultâneas no mesmo processo (etapas de download dentro do
+orquestrador) podem usar opções diferentes: cada uma guarda as suas no
+contexto de execução (contextvars), e nenhuma sessão é fechada enquanto o
+processo existir, pois outra execução pode estar baixando por ela.
+"""
+
+import contextvars
+import os
+import socket
+import threading
+from functools import lru_cache
+
+from .importacao import importar_adiado
+from .mirror import (
+    ENV_MIRROR, adicionar_argumento_mirror, normalizar_espelho, url_espelhada,
+)
+
+
+# Hosts usados pelos instaladores (aquecidos enquanto a GUI está ociosa)
+HOSTS_CONHECIDOS = (
+    'nodejs.org',
+    'update.code.visualstudio.com',
+    'api.github.com',
+    'github.com',
+    'edgedl.me.gvt1.com',
+)
+
+# Quantidade de hosts com pool próprio e conexões mantidas por host.
+# O pool por host comporta os segmentos do downloader mais as requisições de metadados.
+POOL_HOSTS = 8
+POOL_CONEXOES_POR_HOST = 16
+
+USER_AGENT = 'OrquestradorInstalacoes/1.0 (python-requests)'
+
+# Variáveis de ambiente repassadas pelo orquestrador aos instaladores
+ENV_PROXY = 'ORQUESTRADOR_PROXY'
+ENV_CACERT = 'ORQUESTRADOR_CACERT'
+
+# Importado na criação da primeira sessão (ver importacao.py)
+requests = importar_adiado('requests')
+
+# Sessões criadas no processo, por opções (proxy, cacert, insecure, espelho)
+_sessoes = {}
+# Opções definidas pela execução atual (definir_opcoes_http); threads sem o contexto
+# da execução usam as últimas definidas no processo e, na falta delas, as variáveis de ambiente
+_opcoes_execucao = contextvars.ContextVar('opcoes_http', default=None)
+_opcoes = None
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _classe_sessao_espelhada():
+    """Classe SessaoEspelhada (criada no primeiro uso, pois depende de requests)."""
+    class SessaoEspelhada(requests.Session):
+        """Sessão que envia as requisições das origens conhecidas para um espelho local."""
+
+        def __init__(self, espelho):
+            super().__init__()
+            self.espelho = espelho
+
+        def request(self, method, url, *args, **kwargs):
+            return super().request(method, url_espelhada(url, self.espelho), *args, **kwargs)
+
+    return SessaoEspelhada
+
+
+def _resolver_opcoes(proxy=None, cacert=None, insecure=False, espelho=None):
+    """Completa as opções da sessão com as variáveis de ambiente (ver criar_sessao)."""
+    proxy = proxy or os.environ.get(ENV_PROXY)
+    cacert = cacert or os.environ.get(ENV_CACERT)
+    espelho = normalizar_espelho(os.environ.get(ENV_MIRROR) if espelho is None else espelho)
+    return proxy, cacert, bool(insecure), espelho
+
+
+def criar_sessao(proxy=None, cacert=None, insecure=False, espelho=None):
+    """
+    Cria uma sessão HTTP com pool de conexões e proxy/CA configurados.
+
+    Args:
+        proxy (str): URL do proxy (padrão: ORQUESTRADOR_PROXY; HTTP(S)_PROXY continua valendo)
+        cacert (str): Arquivo de certificados CA (padrão: ORQUESTRADOR_CACERT; REQUESTS_CA_BUNDLE continua valendo)
+        insecure (bool): Desativa a verificação de certificados (não recomendado)
+        espelho (str): Espelho de artefatos (padrão: ORQUESTRADOR_MIRROR; '' desativa)
+
+    Returns:
+        requests.Session: Sessão configurada
+
+    Raises:
+        FileNotFoundError: Se o arquivo de certificado CA não existir
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    opcoes = _resolver_opcoes(proxy, cacert, insecure, espelho)
+    proxy, cacert, insecure, espelho = opcoes
+
+    session = _classe_sessao_espelhada()(espelho) if espelho else requests.Session()
+    session.opcoes = opcoes
+    # Novas tentativas apenas para falhas de conexão (nada foi enviado ao servidor)
+    retry = Retry(total=None, connect=2, read=0, status=0, redirect=10, backoff_factor=0.5)
+    adaptador = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONEXOES_POR_HOST,
+                            max_retries=retry)
+    session.mount('https://', adaptador)
+    session.mount('http://', adaptador)
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    if proxy:
+        session.proxies = {'http': proxy, 'https': proxy}
+
+    if insecure:
+        session.verify = False
+    elif cacert:
+        if not os.path.exists(cacert):
+            raise FileNotFoundError(f"Arquivo de certificado CA não encontrado: {cacert}")
+        session.verify = cacert
+
+    return session
+
+
+def definir_opcoes_http(proxy=None, cacert=None, insecure=False, espelho=None):
+    """
+    Define as opções da sessão compartilhada da execução atual, sem criá-la.
+
+    Deve ser chamada no início do instalador, depois de interpretar --proxy/--cacert/--mirror.
+    A sessão é criada na primeira requisição (obter_sessao()); uma execução que não
+    acessa a rede não importa requests. Outro instalador executado no mesmo processo com
+    as mesmas opções reaproveita a sessão, com as conexões já abertas; com opções
+    diferentes, recebe uma sessão própria, sem afetar a que já está em uso.
+
+    Returns:
+        str | None: Espelho em uso (URL normalizada), ou None
+
+    Raises:
+        FileNotFoundError: Se o arquivo de certificado CA não existir
+    """
+    global _opcoes
+    opcoes = _resolver_opcoes(proxy, cacert, insecure, espelho)
+    proxy, cacert, insecure, espelho = opcoes
+    if cacert and not insecure and not os.path.exists(cacert):
+        raise FileNotFoundError(f"Arquivo de certificado CA não encontrado: {cacert}")
+    _opcoes_execucao.set(opcoes)
+    with _lock:
+        _opcoes = opcoes
+    return espelho
+
+
+def configurar_http(proxy=None, cacert=None, insecure=False, espelho=None):
+    """
+    Define as opções da sessão compartilhada (ver definir_opcoes_http) e a cria imediatamente.
+
+    Returns:
+        requests.Session: Sessão compartilhada
+    """
+    definir_opcoes_http(proxy, cacert, insecure, espelho)
+    return obter_sessao()
+
+
+def obter_sessao():
+    """
+    Retorna a sessão HTTP compartilhada com as opções da execução atual (criada sob demanda).
+
+    Returns:
+        requests.Session: Sessão compartilhada
+    """
+    with _lock:
+        opcoes = _opcoes_execucao.get() or _opcoes or _resolver_opcoes()
+        sessao = _sessoes.get(opcoes)
+        if sessao is None:
+            sessao = _sessoes[opcoes] = criar_sessao(*opcoes)
+        return sessao
+
+
+def adicionar_argumentos_http(parser):
+    """
+    Adiciona --proxy, --cacert e --mirror a um ArgumentParser de instalador.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser do instalador
+    """
+    parser.add_argument('--proxy', type=str, default=None,
+                        help=f"URL do proxy HTTP/HTTPS (padrão: {ENV_PROXY}, HTTP_PROXY/HTTPS_PROXY)")
+    parser.add_argument('--cacert', type=str, default=None,
+                        help=f"Arquivo de certificados CA para proxies corporativos (padrão: {ENV_CACERT})")
+    adicionar_argumento_mirror(parser)
+
+
+def _aquecer_host(session, host, timeout, resultado):
+    try:
+        socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+    except OSError:
+        resultado[host] = False
+        return
+    try:
+        # HEAD leve apenas para abrir a conexão TCP/TLS e deixá-la no pool
+        session.head(f"https://{host}/", timeout=timeout, allow_redirects=False).close()
+        resultado[host] = True
+    except requests.RequestException:
+        resultado[host] = False
+
+
+def aquecer_conexoes(hosts=HOSTS_CONHECIDOS, session=None, timeout=5):
+    """
+    Resolve o DNS e abre conexões com os hosts conhecidos, em paralelo.
+
+    Chamado enquanto a GUI está ociosa: a resolução aquece o cache de DNS do
+    sistema (compartilhado com os processos dos instaladores) e as conexões
+    ficam no pool da sessão do processo atual.
+
+    Args:
+        hosts (Iterable[str]): Hosts a aquecer
+        session (requests.Session): Sessão a usar (padrão: sessão compartilhada)
+        timeout (int): Timeout por host
+
+    Returns:
+        dict: host -> True se a conexão foi estabelecida
+    """
+    session = session or obter_sessao()
+    resultado = {}
+    threads = [
+        threading.Thread(target=_aquecer_host, args=(session, host, timeout, resultado), daemon=True)
+        for host in hosts
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout + 1)
+    return resultado
@@ -0,0 +1,67 @@
+"""
+Importação adiada de dependências pesadas.
+
+Importar requests (com urllib3, ssl, http.client e charset_normalizer) custa
+dezenas de milissegundos por processo. Os instaladores só precisam dele
+quando acessam a rede: --help, a detecção da versão instalada e as execuções
+sem nada a fazer não devem pagar esse custo.
+
+    requests = importar_adiado('requests')
+
+    def baixar(url):
+        ...
+        except requests.RequestException:  # o módulo é importado aqui, no primeiro uso
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+
+
+class ModuloAdiado:
+    """Representa um módulo que só é importado no primeiro acesso a um atributo."""
+
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+        self._lock = threading.Lock()
+
+    @property
+    def carregado(self):
+        """True se o módulo já foi importado (por este objeto ou por outro import)."""
+        return self._modulo is not None or self._nome in sys.modules
+
+    def _carregar(self):
+        with self._lock:
+            if self._modulo is None:
+                self._modulo = importlib.import_module(self._nome)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        modulo = self._modulo if self._modulo is not None else self._carregar()
+        return getattr(modulo, atributo)
+
+    def __repr__(self):
+        estado = 'carregado' if self.carregado else 'adiado'
+        return f"<módulo {self._nome} ({estado})>"
+
+
+def importar_adiado(nome):
+    """
+    Retorna o módulo (se já importado) ou um ModuloAdiado que o importa no primeiro uso.
+
+    Args:
+        nome (str): Nome do módulo (ex: 'requests')
+
+    Returns:
+        module | ModuloAdiado: Módulo ou seu representante
+
+    Raises:
+        ModuleNotFoundError: Se o módulo não estiver instalado (verificado sem importá-lo)
+    """
+    if nome in sys.modules:
+        return sys.modules[nome]
+    if importlib.util.find_spec(nome) is None:
+        raise ModuleNotFoundError(f"No module named '{nome}'", name=nome)
+    return ModuloAdiado(nome)
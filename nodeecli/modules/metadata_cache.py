@@ -0,0 +1,159 @@
+"""
+Cache persistente de metadados de releases (index.json, API do GitHub, SHASUMS).
+
+Cada resposta é guardada em disco com o seu ETag/Last-Modified. Enquanto a
+cópia estiver dentro do TTL ela é usada sem acessar a rede; depois disso, a
+revalidação é feita com If-None-Match/If-Modified-Since e, em geral, custa
+apenas uma resposta 304 sem corpo. Sem conexão, a última cópia conhecida é
+usada mesmo que esteja vencida.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from .artifact_cache import obter_diretorio_cache
+from .http_client import obter_sessao
+from .importacao import importar_adiado
+
+# Importado na primeira requisição (ver importacao.py)
+requests = importar_adiado('requests')
+
+
+# TTL padrão dos metadados que mudam com novas releases (index.json, API do GitHub)
+TTL_PADRAO = 10 * 60
+
+# Arquivos imutáveis depois de publicados (ex.: SHASUMS256.txt de uma versão)
+TTL_IMUTAVEL = 30 * 24 * 60 * 60
+
+
+class RespostaMetadados:
+    """Conteúdo de uma URL de metadados e a forma como foi obtido."""
+
+    # Origens possíveis
+    CACHE = 'cache'              # cópia dentro do TTL, sem acesso à rede
+    REVALIDADO = 'revalidado'    # servidor respondeu 304 Not Modified
+    REDE = 'rede'                # conteúdo novo baixado (200)
+    OBSOLETO = 'obsoleto'        # servidor inacessível: última cópia conhecida
+
+    def __init__(self, url, conteudo, origem):
+        self.url = url
+        self.content = conteudo
+        self.origem = origem
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class MetadataCache:
+    """
+    Cache HTTP de metadados com revalidação condicional e TTL.
+    """
+
+    def __init__(self, raiz=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            raiz (str | Path): Diretório do cache (padrão: <cache de artefatos>/metadata)
+        """
+        self.raiz = str(raiz) if raiz else str(obter_diretorio_cache() / 'metadata')
+
+    def _caminhos(self, url):
+        chave = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.raiz, chave)
+        return f"{base}.json", f"{base}.body"
+
+    def _carregar(self, url):
+        """Lê a entrada salva de uma URL, ou None se ausente/corrompida."""
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(caminho_corpo, 'rb') as f:
+                corpo = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get('url') != url or meta.get('sha256') != hashlib.sha256(corpo).hexdigest():
+            return None, None
+        return meta, corpo
+
+    def _salvar(self, url, meta, corpo=None):
+        """Grava a entrada de forma atômica (corpo antes dos metadados)."""
+        os.makedirs(self.raiz, exist_ok=True)
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        sufixo = f".{os.getpid()}.tmp"
+        if corpo is not None:
+            with open(caminho_corpo + sufixo, 'wb') as f:
+                f.write(corpo)
+            os.replace(caminho_corpo + sufixo, caminho_corpo)
+        with open(caminho_meta + sufixo, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(caminho_meta + sufixo, caminho_meta)
+
+    def obter(self, url, session=None, ttl=TTL_PADRAO, timeout=15, headers=None):
+        """
+        Obtém o conteúdo de uma URL de metadados usando o cache.
+
+        Args:
+            url (str): URL dos metadados
+            session: Sessão requests para suporte a proxy (padrão: sessão compartilhada)
+            ttl (int): Segundos durante os quais a cópia é usada sem revalidar
+            timeout (int | tuple): Timeout da requisição
+            headers (dict): Headers extras (ex.: Accept da API do GitHub)
+
+        Returns:
+            RespostaMetadados: Conteúdo e origem ('cache', 'revalidado', 'rede' ou 'obsoleto')
+
+        Raises:
+            requests.RequestException: Falha de rede/HTTP sem cópia em cache para usar
+        """
+        meta, corpo = self._carregar(url)
+        agora = time.time()
+        if meta and agora - meta.get('validado_em', 0) < ttl:
+            return RespostaMetadados(url, corpo, RespostaMetadados.CACHE)
+
+        cabecalhos = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                cabecalhos['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                cabecalhos['If-Modified-Since'] = meta['last_modified']
+
+        requester = session if session else obter_sessao()
+        try:
+            with requester.get(url, headers=cabecalhos, timeout=timeout) as resposta:
+                if resposta.status_code == 304 and meta:
+                    meta['validado_em'] = agora
+                    self._salvar_sem_falhar(url, meta)
+                    return RespostaMetadados(url, corpo, RespostaMetadados.REVALIDADO)
+                if resposta.status_code >= 500 and meta:
+                    return RespostaMetadados(url, corpo, RespostaMetadados.OBSOLETO)
+                resposta.raise_for_status()
+                conteudo = resposta.content
+                novo_meta = {
+                    'url': url,
+                    'etag': resposta.headers.get('ETag'),
+                    'last_modified': resposta.headers.get('Last-Modified'),
+                    'validado_em': agora,
+                    'sha256': hashlib.sha256(conteudo).hexdigest(),
+                }
+        except (requests.ConnectionError, requests.Timeout):
+            if meta:
+                return RespostaMetadados(url, corpo, RespostaMetadados.OBSOLETO)
+            raise
+
+        self._salvar_sem_falhar(url, novo_meta, conteudo)
+        return RespostaMetadados(url, conteudo, RespostaMetadados.REDE)
+
+    def _salvar_sem_falhar(self, url, meta, corpo=None):
+        # Falhas de disco não devem impedir o uso dos metadados já obtidos
+        try:
+            self._salvar(url, meta, corpo)
+        except OSError:
+            pass
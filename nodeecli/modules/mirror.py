@@ -0,0 +1,137 @@
+"""
+Espelho de artefatos na rede local.
+
+Um orquestrador executado com 'mirror serve' atende, por HTTP, as mesmas
+URLs que os instaladores usam na internet, cada origem sob um prefixo:
+
+    https://nodejs.org/dist/v22.11.0/node-v22.11.0-x64.msi
+    -> http://espelho:8080/dist/v22.11.0/node-v22.11.0-x64.msi
+
+Os demais orquestradores apontam --mirror (ou ORQUESTRADOR_MIRROR) para o
+espelho: a sessão HTTP compartilhada reescreve as URLs das origens
+conhecidas e o npm passa a usar o registro servido pelo espelho.
+"""
+
+import os
+
+
+# Variável de ambiente repassada pelo orquestrador aos instaladores
+ENV_MIRROR = 'ORQUESTRADOR_MIRROR'
+
+# Prefixo no espelho -> origem. O prefixo 'dist' reproduz o layout de
+# nodejs.org/dist, de modo que o espelho também serve como NODE_MIRROR.
+ORIGENS = {
+    'dist': 'https://nodejs.org/dist/',
+    'vscode': 'https://update.code.visualstudio.com/',
+    'vscode-cdn': 'https://vscode.download.prss.microsoft.com/',
+    'antigravity': 'https://edgedl.me.gvt1.com/',
+    'github': 'https://github.com/',
+    'github-api': 'https://api.github.com/',
+    'npm': 'https://registry.npmjs.org/',
+}
+
+# Origens que apenas redirecionam para a versão mais recente ("latest"):
+# o espelho repassa o redirecionamento em vez de guardar o corpo
+ORIGENS_REDIRECIONAMENTO = ('vscode',)
+
+# Extensões dos artefatos imutáveis guardados no cache de artefatos do espelho;
+# as demais URLs são metadados (index.json, SHASUMS, API do GitHub, registro npm)
+EXTENSOES_ARTEFATO = ('.msi', '.exe', '.zip', '.tgz', '.7z', '.gz', '.xz')
+
+
+def normalizar_espelho(espelho):
+    """
+    Normaliza a URL base do espelho (sem barra final; http:// se omitido).
+
+    Args:
+        espelho (str): URL ou host:porta do espelho
+
+    Returns:
+        str | None: URL base, ou None se vazio
+    """
+    if not espelho:
+        return None
+    espelho = espelho.strip().rstrip('/')
+    if '://' not in espelho:
+        espelho = f"http://{espelho}"
+    return espelho
+
+
+def obter_espelho(espelho=None):
+    """
+    Retorna o espelho informado ou, na falta dele, o de ORQUESTRADOR_MIRROR.
+
+    Returns:
+        str | None: URL base do espelho, ou None se nenhum estiver configurado
+    """
+    return normalizar_espelho(espelho or os.environ.get(ENV_MIRROR))
+
+
+def url_espelhada(url, espelho, origens=ORIGENS):
+    """
+    Reescreve uma URL de origem conhecida para o espelho.
+
+    Args:
+        url (str): URL original
+        espelho (str): URL base do espelho (None = sem espelho)
+        origens (dict): Prefixo -> origem
+
+    Returns:
+        str: URL no espelho, ou a própria URL se a origem não for espelhada
+    """
+    if not espelho:
+        return url
+    for prefixo, origem in origens.items():
+        if url.startswith(origem):
+            return f"{espelho}/{prefixo}/{url[len(origem):]}"
+    return url
+
+
+def url_de_origem(caminho, origens=ORIGENS):
+    """
+    Converte o caminho de uma requisição ao espelho na URL de origem.
+
+    Args:
+        caminho (str): Caminho requisitado (ex.: '/dist/index.json')
+        origens (dict): Prefixo -> origem
+
+    Returns:
+        tuple: (prefixo, url_de_origem), ou (None, None) se o prefixo for desconhecido
+    """
+    prefixo, _, resto = caminho.lstrip('/').partition('/')
+    origem = origens.get(prefixo)
+    if origem is None:
+        return None, None
+    return prefixo, origem + resto
+
+
+def eh_artefato(url):
+    """True se a URL aponta para um artefato imutável (instalador, pacote ou arquivo compactado)."""
+    return url.split('?', 1)[0].lower().endswith(EXTENSOES_ARTEFATO)
+
+
+def registro_npm(espelho):
+    """URL do registro npm servido pelo espelho."""
+    return f"{espelho}/npm/"
+
+
+def configurar_npm(espelho):
+    """
+    Faz o npm executado por este processo (e seus filhos) usar o registro do espelho.
+
+    Args:
+        espelho (str): URL base do espelho (None = não altera a configuração)
+    """
+    if espelho:
+        os.environ['npm_config_registry'] = registro_npm(espelho)
+
+
+def adicionar_argumento_mirror(parser):
+    """
+    Adiciona --mirror a um ArgumentParser de instalador.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser do instalador
+    """
+    parser.add_argument('--mirror', type=str, default=None, metavar='URL',
+                        help=f"Espelho de artefatos na rede local, ex.: http://servidor:8080 (padrão: {ENV_MIRROR})")
@@ -0,0 +1,123 @@
+"""
+Índice de releases do Node.js construído a partir de https://nodejs.org/dist/index.json.
+
+Cada release do index.json traz o array 'files' com os artefatos publicados
+('win-x64-msi', 'win-x86-msi', 'win-arm64-msi', ...). O índice responde em
+memória perguntas como "LTS mais recente com MSI para x86", sem uma
+requisição HEAD por versão.
+"""
+
+import re
+
+from .metadata_cache import MetadataCache, TTL_PADRAO
+
+
+URL_INDICE = "https://nodejs.org/dist/index.json"
+
+# Chave do array 'files' que indica a existência do MSI de cada arquitetura
+CHAVES_MSI = {
+    'x64': 'win-x64-msi',
+    'x86': 'win-x86-msi',
+    'arm64': 'win-arm64-msi',
+}
+
+
+def parse_semver(versao):
+    """
+    Converte 'v22.10.0' em (22, 10, 0) para ordenação.
+
+    Args:
+        versao (str): Versão com ou sem prefixo 'v'
+
+    Returns:
+        tuple: (major, minor, patch)
+    """
+    versao = versao.lstrip('v')
+    major, minor, patch = (re.split(r"[.-]", versao) + ["0", "0", "0"])[:3]
+    return tuple(map(int, (major, minor, patch)))
+
+
+class IndiceReleases:
+    """
+    Releases do Node.js ordenadas da mais recente para a mais antiga.
+    """
+
+    def __init__(self, releases):
+        """
+        Inicializa o índice.
+
+        Args:
+            releases (list): Entradas do index.json (dicts com 'version', 'lts', 'files')
+        """
+        self.releases = sorted(
+            (r for r in releases if r.get('version')),
+            key=lambda r: parse_semver(r['version']),
+            reverse=True,
+        )
+        self._por_versao = {r['version']: r for r in self.releases}
+        self._arquivos = {r['version']: frozenset(r.get('files') or ()) for r in self.releases}
+
+    @classmethod
+    def carregar(cls, session=None, timeout=15):
+        """
+        Carrega o índice a partir do index.json (via cache de metadados).
+
+        Args:
+            session: Sessão requests para suporte a proxy
+            timeout (int): Timeout da requisição
+
+        Returns:
+            IndiceReleases: Índice carregado
+
+        Raises:
+            requests.RequestException, ValueError: Falha ao obter ou interpretar o index.json
+        """
+        dados = MetadataCache().obter(URL_INDICE, session=session, ttl=TTL_PADRAO, timeout=timeout).json()
+        return cls(dados)
+
+    def versao(self, versao):
+        """
+        Retorna a release de uma versão.
+
+        Args:
+            versao (str): Versão com ou sem prefixo 'v'
+
+        Returns:
+            dict | None: Entrada do index.json, ou None se a versão não existir
+        """
+        if not versao.startswith('v'):
+            versao = 'v' + versao
+        return self._por_versao.get(versao)
+
+    def tem_msi(self, versao, arquitetura):
+        """
+        Indica se a versão publicou o MSI para a arquitetura.
+
+        Args:
+            versao (str): Versão com prefixo 'v'
+            arquitetura (str): 'x64', 'x86' ou 'arm64'
+
+        Returns:
+            bool: True se o MSI existe
+        """
+        chave = CHAVES_MSI.get(arquitetura)
+        return bool(chave) and chave in self._arquivos.get(versao, ())
+
+    def mais_recente(self, track='lts', arquitetura=None):
+        """
+        Retorna a release mais recente da trilha, opcionalmente com MSI para a arquitetura.
+
+        Args:
+            track (str): 'lts' para versões LTS, 'current' para qualquer versão
+            arquitetura (str): Se informada, exige o MSI desta arquitetura
+
+        Returns:
+            dict | None: Entrada do index.json, ou None se nenhuma atender
+        """
+        for release in self.releases:
+            if track == 'lts' and not release.get('lts'):
+                continue
+            if arquitetura and not self.tem_msi(release['version'], arquitetura):
+                continue
+            return release
+        return None
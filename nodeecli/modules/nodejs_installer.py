@@ -10,24 +10,32 @@ import subprocess
 import sys
 import os
 import platform
-import json
-import tempfile
-import hashlib
 from pathlib import Path
 import time
 import shutil
-import re
 
-# Verificar se a biblioteca requests está instalada
+from .importacao import importar_adiado
+
+# Verificar se a biblioteca requests está instalada (importada só no primeiro acesso à rede)
 try:
-    import requests
+    requests = importar_adiado('requests')
 except ImportError:
     print("Erro: A biblioteca 'requests' não está instalada.")
     print("Execute o seguinte comando para instalá-la:")
     print("pip install requests")
     sys.exit(1)
 
-from .common import Logger, detectar_arquitetura, verificar_permissoes_admin, detectar_nvm_windows
+from .common import (
+    Logger, detectar_arquitetura, verificar_permissoes_admin, detectar_nvm_windows, obter_diretorio_staging
+)
+from .artifact_cache import ArtifactCache, obter_com_cache, obter_do_cache
+from .bundle import ErroBundle, TIPO_CHECKSUMS
+from .downloader import ErroChecksum, ErroDownload
+from .events import cancelamento_solicitado
+from .http_client import obter_sessao
+from .metadata_cache import MetadataCache, TTL_IMUTAVEL
+from .node_releases import IndiceReleases
+from .progress import IndicadorProgresso
 
 
 def verificar_node_instalado():
@@ -85,35 +93,19 @@ def obter_versao_mais_recente(session=None, track='lts'):
     Returns:
         dict: Informações da versão mais recente ou None em caso de erro
     """
-    url = "https://nodejs.org/dist/index.json"
     try:
         print(f"Verificando a versão mais recente do Node.js (trilha: {track})...")
 
-        # Usar sessão fornecida ou requests padrão
-        requester = session if session else requests
-        with requester.get(url, timeout=15) as response:
-            response.raise_for_status()
-            data = response.json()
-
-        def parse_semver(v):
-            # v like 'v22.10.0' -> (22,10,0)
-            v = v.lstrip('v')
-            major, minor, patch = (re.split(r"[.-]", v) + ["0","0","0"])[:3]
-            return tuple(map(int, (major, minor, patch)))
-
-        if track == 'lts':
-            lts_entries = [x for x in data if x.get('lts')]
-            if not lts_entries:
-                print("Nenhuma versão LTS encontrada.")
-                return None
-            latest = max(lts_entries, key=lambda x: parse_semver(x['version']))
-        else:  # current
-            # Pega a versão mais recente regardless de LTS
-            latest = max(data, key=lambda x: parse_semver(x['version']))
+        # index.json em cache: dentro do TTL não há requisição; depois, revalidação condicional (304)
+        indice = IndiceReleases.carregar(session, timeout=15)
+        latest = indice.mais_recente(track)
+        if latest is None:
+            print("Nenhuma versão LTS encontrada.")
+            return None
 
         return latest
 
-    except (requests.RequestException, json.JSONDecodeError, KeyError) as e:
+    except (requests.RequestException, ValueError, KeyError) as e:
         print(f"Erro ao obter versão mais recente: {e}")
 
     return None
@@ -215,63 +207,57 @@ def baixar_instalador(versao_info, arquitetura, session=None, download_timeout=3
         nome_arquivo = f"node-{versao}-{arquitetura}.msi"
         url = f"https://nodejs.org/dist/{versao}/{nome_arquivo}"
 
+        # Instalador já baixado e verificado em uma execução anterior: dispensa a rede
+        cache = ArtifactCache()
+        entrada = obter_do_cache('nodejs', obter_diretorio_staging('nodejs') / nome_arquivo,
+                                 versao=versao, arquitetura=arquitetura, cache=cache)
+        if entrada:
+            print(f"Instalador {nome_arquivo} encontrado no cache local.")
+            print(f"Checksum (cache): {entrada['sha256']}")
+            return entrada['caminho'], versao
+
         print(f"Verificando disponibilidade do instalador {nome_arquivo}...")
 
-        # Usar sessão fornecida ou requests padrão
-        requester = session if session else requests
+        # Usar sessão fornecida ou a sessão compartilhada
+        requester = session if session else obter_sessao()
+
+        # Índice de releases (index.json em cache): responde em memória, sem uma requisição por versão
+        try:
+            indice = IndiceReleases.carregar(session, timeout=download_timeout)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Aviso: não foi possível carregar o índice de releases: {e}")
+            indice = None
+
+        def msi_disponivel(versao_msi, arquitetura_msi):
+            if indice and indice.versao(versao_msi):
+                return indice.tem_msi(versao_msi, arquitetura_msi)
+            # Versão ausente do índice (ou índice indisponível): consultar o próprio arquivo
+            url_msi = f"https://nodejs.org/dist/{versao_msi}/node-{versao_msi}-{arquitetura_msi}.msi"
+            status_code = verificar_disponibilidade_arquivo(url_msi, requester, timeout=download_timeout)
+            if status_code not in (200, 404):
+                raise requests.RequestException(f"Status {status_code}")
+            return status_code == 200
 
         # Verificar se o arquivo existe antes de baixar
         try:
-            status_code = verificar_disponibilidade_arquivo(url, requester, timeout=download_timeout)
-            if status_code == 404:
+            if not msi_disponivel(versao, arquitetura):
                 if arquitetura == 'x86':
                     print(f"\nErro: O instalador x86 para Node.js {versao} não está disponível.")
                     print("Versões recentes do Node.js LTS não oferecem mais suporte para sistemas 32-bit.")
 
-                    # Tentar encontrar uma versão mais antiga com suporte x86
+                    # Procurar, no índice, a versão LTS mais recente que publicou o MSI x86
                     print("\nTentando encontrar uma versão LTS mais recente com suporte x86...")
-
-                    # Obter lista de versões disponíveis
-                    index_url = "https://nodejs.org/dist/index.json"
-                    try:
-                        with requester.get(index_url, timeout=download_timeout) as index_response:
-                            index_response.raise_for_status()
-                            all_versions = index_response.json()
-
-                        # Filtrar apenas versões LTS e verificar se têm suporte x86
-                        def parse_semver(v):
-                            v = v.lstrip('v')
-                            major, minor, patch = (re.split(r"[.-]", v) + ["0","0","0"])[:3]
-                            return tuple(map(int, (major, minor, patch)))
-
-                        lts_versions = [v for v in all_versions if v.get('lts')]
-                        lts_versions.sort(key=lambda x: parse_semver(x['version']), reverse=True)
-
-                        for version_info in lts_versions:
-                            test_version = version_info['version']
-                            test_filename = f"node-{test_version}-x86.msi"
-                            test_url = f"https://nodejs.org/dist/{test_version}/{test_filename}"
-
-                            try:
-                                test_status = verificar_disponibilidade_arquivo(test_url, requester, timeout=download_timeout)
-                                if test_status == 200:
-                                    print(f"Encontrada versão compatível: {test_version}")
-                                    print(f"URL: {test_url}")
-                                    nome_arquivo = test_filename
-                                    url = test_url
-                                    versao = test_version
-                                    break
-                            except requests.RequestException:
-                                continue
-                        else:
-                            print("\nNão foi possível encontrar nenhuma versão LTS recente com suporte x86.")
-                            print("Considere atualizar seu sistema para uma versão 64-bit.")
-                            return None, None
-
-                    except (requests.RequestException, json.JSONDecodeError):
-                        print("\nNão foi possível verificar versões alternativas.")
+                    alternativa = indice.mais_recente('lts', 'x86') if indice else None
+                    if not alternativa:
+                        print("\nNão foi possível encontrar nenhuma versão LTS recente com suporte x86.")
                         print("Considere atualizar seu sistema para uma versão 64-bit.")
                         return None, None
+
+                    versao = alternativa['version']
+                    nome_arquivo = f"node-{versao}-x86.msi"
+                    url = f"https://nodejs.org/dist/{versao}/{nome_arquivo}"
+                    print(f"Encontrada versão compatível: {versao}")
+                    print(f"URL: {url}")
                 elif arquitetura == 'arm64':
                     print(f"\nAviso: O instalador ARM64 para Node.js {versao} não está disponível.")
                     print("Tentando fazer fallback para x64 (compatível via emulação)...")
@@ -280,41 +266,33 @@ def baixar_instalador(versao_info, arquitetura, session=None, download_timeout=3
                     fallback_filename = f"node-{versao}-x64.msi"
                     fallback_url = f"https://nodejs.org/dist/{versao}/{fallback_filename}"
 
-                    try:
-                        fallback_status = verificar_disponibilidade_arquivo(fallback_url, requester, timeout=download_timeout)
-                        if fallback_status == 200:
-                            print(f"Encontrado instalador x64 compatível: {fallback_filename}")
-                            print("O Node.js x64 funcionará via emulação no seu sistema ARM64.")
-
-                            # Solicitar confirmação antes de prosseguir com o fallback
-                            if not auto_yes and not allow_arch_fallback:
-                                print("\n⚠️  AVISO: O instalador x64 funcionará via emulação no sistema ARM64.")
-                                print("Isso pode resultar em desempenho reduzido em comparação com o nativo ARM64.")
-                                resposta = input("Deseja prosseguir com a instalação via emulação x64? (S/N): ").strip().upper()
-                                if resposta != 'S':
-                                    print("Instalação cancelada pelo usuário.")
-                                    return None, None
-                            else:
-                                if allow_arch_fallback:
-                                    print("\nModo automático (arch-fallback): Prosseguindo com instalação x64 via emulação.")
-                                else:
-                                    print("\nModo automático: Prosseguindo com instalação x64 via emulação.")
-
-                            nome_arquivo = fallback_filename
-                            url = fallback_url
-                            # Manter a versão original
-                        else:
-                            print(f"\nErro: Nem o instalador ARM64 nem o x64 estão disponíveis para esta versão.")
-                            return None, None
-                    except requests.RequestException:
-                        print(f"\nErro: Não foi possível verificar a disponibilidade do instalador x64 de fallback.")
+                    if not msi_disponivel(versao, 'x64'):
+                        print(f"\nErro: Nem o instalador ARM64 nem o x64 estão disponíveis para esta versão.")
                         return None, None
+
+                    print(f"Encontrado instalador x64 compatível: {fallback_filename}")
+                    print("O Node.js x64 funcionará via emulação no seu sistema ARM64.")
+
+                    # Solicitar confirmação antes de prosseguir com o fallback
+                    if not auto_yes and not allow_arch_fallback:
+                        print("\n⚠️  AVISO: O instalador x64 funcionará via emulação no sistema ARM64.")
+                        print("Isso pode resultar em desempenho reduzido em comparação com o nativo ARM64.")
+                        resposta = input("Deseja prosseguir com a instalação via emulação x64? (S/N): ").strip().upper()
+                        if resposta != 'S':
+                            print("Instalação cancelada pelo usuário.")
+                            return None, None
+                    else:
+                        if allow_arch_fallback:
+                            print("\nModo automático (arch-fallback): Prosseguindo com instalação x64 via emulação.")
+                        else:
+                            print("\nModo automático: Prosseguindo com instalação x64 via emulação.")
+
+                    nome_arquivo = fallback_filename
+                    url = fallback_url
+                    # Manter a versão original
                 else:
                     print(f"\nErro: O instalador para {arquitetura} não está disponível para esta versão.")
                     return None, None
-            elif status_code != 200:
-                print(f"\nErro ao verificar disponibilidade: Status {status_code}")
-                return None, None
         except Exception as e:
             print(f"\nErro ao verificar disponibilidade do instalador: {e}")
             return None, None
@@ -325,9 +303,10 @@ def baixar_instalador(versao_info, arquitetura, session=None, download_timeout=3
         print("Obtendo checksums para verificação de integridade...")
         shasums_url = f"https://nodejs.org/dist/{versao}/SHASUMS256.txt"
         try:
-            with requester.get(shasums_url, timeout=download_timeout) as shasums_response:
-                shasums_response.raise_for_status()
-                shasums_content = shasums_response.text
+            # SHASUMS256.txt de uma versão publicada não muda: TTL longo
+            shasums_content = MetadataCache().obter(
+                shasums_url, session=session, ttl=TTL_IMUTAVEL, timeout=download_timeout
+            ).text
 
             # Parse SHA256 checksums
             sha256_mapping = {}
@@ -353,62 +332,91 @@ def baixar_instalador(versao_info, arquitetura, session=None, download_timeout=3
             print("Abortando instalação por segurança. Não é possível verificar a integridade do arquivo.")
             return None, None
 
-        # Criar arquivo temporário
-        with tempfile.NamedTemporaryFile(suffix='.msi', delete=False) as temp_file:
-            temp_path = temp_file.name
+        # Caminho determinístico no staging: um download interrompido (.part)
+        # é retomado na próxima tentativa ou execução
+        caminho_msi = str(obter_diretorio_staging('nodejs') / nome_arquivo)
 
-        # Baixar com barra de progresso e calcular hash simultaneamente
-        with requester.get(url, stream=True, timeout=download_timeout) as response:
-            response.raise_for_status()
+        # Baixar com barra de progresso; o SHA256 é conferido antes de liberar o arquivo
+        # Arquitetura efetiva (pode ter mudado pelo fallback ARM64 -> x64)
+        arquitetura_arquivo = nome_arquivo[:-len('.msi')].rsplit('-', 1)[-1]
+        indicador = IndicadorProgresso()
+        try:
+            resultado = obter_com_cache(url, caminho_msi, 'nodejs', versao, arquitetura_arquivo, cache=cache,
+                                        session=session, timeout=download_timeout,
+                                        sha256_esperado=expected_sha256, ao_progresso=indicador,
+                                        cancelar=cancelamento_solicitado)
+            indicador.concluir()
+        except ErroChecksum as e:
+            print("\nERRO: Verificação de integridade falhou!")
+            print("O arquivo baixado está corrompido ou foi alterado.")
+            print(f"Detalhes: {e}")
+            return None, None
+        except ErroDownload as e:
+            print(f"\nErro ao baixar instalador: {e}")
+            return None, None
 
-            total_size = int(response.headers.get('content-length', 0))
-            bytes_baixados = 0
+        if resultado['origem'] == 'cache':
+            print(f"\nInstalador {nome_arquivo} encontrado no cache local.")
+        if resultado['retomado']:
+            print("\nDownload retomado a partir do arquivo parcial anterior.")
+        print(f"\nDownload concluído: {caminho_msi}")
+        print(f"Checksum calculado: {resultado['sha256']}")
+        print("✓ Verificação de integridade concluída com sucesso!")
 
-            # Calcular SHA256 durante o download
-            sha256_hasher = hashlib.sha256()
+        return caminho_msi, versao
 
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        sha256_hasher.update(chunk)
-                        bytes_baixados += len(chunk)
+    except (requests.RequestException, IOError, KeyError) as e:
+        print(f"\nErro ao baixar instalador: {e}")
+        return None, None
 
-                        # Mostrar progresso
-                        if total_size > 0:
-                            progresso = int(50 * bytes_baixados / total_size)
-                            bar = '[' + '=' * progresso + ' ' * (50 - progresso) + ']'
-                            percent = int(100 * bytes_baixados / total_size)
-                            print(f"\r{bar} {percent}%", end='', flush=True)
 
-        print(f"\nDownload concluído: {temp_path}")
+def obter_instalador_do_bundle(bundle, arquitetura, allow_arch_fallback=False):
+    """
+    Copia o MSI do Node.js de um bundle offline para o staging, sem acessar a rede.
 
-        # Verificar integridade do arquivo (sempre executado, pois expected_sha256 é garantido)
-        actual_sha256 = sha256_hasher.hexdigest()
-        print(f"Checksum calculado: {actual_sha256}")
+    O SHA-256 do MSI é conferido pelo manifesto do bundle e também pelo
+    SHASUMS256.txt oficial incluído no bundle.
 
-        if actual_sha256.lower() != expected_sha256.lower():
-            print("\nERRO: Verificação de integridade falhou!")
-            print("O arquivo baixado está corrompido ou foi alterado.")
-            print(f"Esperado: {expected_sha256}")
-            print(f"Recebido: {actual_sha256}")
+    Args:
+        bundle (Bundle): Bundle offline
+        arquitetura (str): Arquitetura do sistema ('x64', 'arm64', ou 'x86')
+        allow_arch_fallback (bool): Se True, usa o MSI x64 quando o bundle não tem o ARM64
 
-            # Remover arquivo corrompido
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            return None, None
-        else:
-            print("✓ Verificação de integridade concluída com sucesso!")
+    Returns:
+        tuple: (caminho_msi, versao) ou (None, None) se o bundle não tiver um MSI utilizável
+    """
+    entrada = bundle.procurar('nodejs', arquitetura=arquitetura)
+    if not entrada and arquitetura == 'arm64' and allow_arch_fallback:
+        print("O bundle não contém o MSI ARM64; usando o x64 (compatível via emulação).")
+        entrada = bundle.procurar('nodejs', arquitetura='x64')
+    if not entrada:
+        print(f"Erro: O bundle não contém o instalador do Node.js para {arquitetura}.")
+        return None, None
 
-        return temp_path, versao
+    versao = entrada['versao']
+    nome_arquivo = Path(entrada['arquivo']).name
+    try:
+        checksums = bundle.procurar('nodejs', tipo=TIPO_CHECKSUMS)
+        if checksums:
+            oficiais = {}
+            with open(bundle.caminho(checksums), 'r', encoding='utf-8') as f:
+                for linha in f:
+                    partes = linha.split()
+                    if len(partes) >= 2:
+                        oficiais[partes[1]] = partes[0]
+            if oficiais.get(nome_arquivo) != entrada['sha256']:
+                print(f"\nERRO: {nome_arquivo} não confere com o SHASUMS256.txt oficial do bundle.")
+                return None, None
 
-    except (requests.RequestException, IOError, KeyError) as e:
-        print(f"\nErro ao baixar instalador: {e}")
-        temp_path = locals().get('temp_path')
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+        caminho_msi = bundle.materializar(entrada, obter_diretorio_staging('nodejs') / nome_arquivo)
+    except (ErroBundle, OSError) as e:
+        print(f"\nErro ao usar o bundle offline: {e}")
         return None, None
 
+    print(f"Instalador {nome_arquivo} obtido do bundle offline.")
+    print(f"Checksum verificado: {entrada['sha256']}")
+    return caminho_msi, versao
+
 
 def instalar_nodejs(caminho_msi, install_timeout=300, all_users=False):
     """
@@ -521,6 +529,9 @@ class NodejsInstaller:
         """
         Instala o Node.js com os parâmetros especificados.
         
+        Equivale a executar a etapa de download (preparar) seguida da etapa
+        de instalação (concluir).
+        
         Args:
             versao (str): Versão específica para instalar (opcional)
             track (str): 'lts' ou 'current'
@@ -534,11 +545,45 @@ class NodejsInstaller:
         Returns:
             tuple: (sucesso, versao_instalada)
         """
+        status, caminho_msi, versao_efetiva = self.preparar(
+            versao=versao, track=track, session=session,
+            download_timeout=download_timeout, auto_yes=auto_yes,
+            allow_arch_fallback=allow_arch_fallback
+        )
+        if status == 'atualizado':
+            return True, versao_efetiva
+        if status != 'baixado':
+            return False, None
+
+        return self.concluir(caminho_msi, versao_efetiva, install_timeout, all_users)
+
+    def preparar(self, versao=None, track='lts', session=None, download_timeout=300,
+                 auto_yes=False, allow_arch_fallback=False, bundle=None):
+        """
+        Etapa de download: resolve a versão alvo e baixa/valida o MSI.
+        
+        Args:
+            versao (str): Versão específica para instalar (opcional)
+            track (str): 'lts' ou 'current'
+            session: Sessão requests para suporte a proxy
+            download_timeout (int): Timeout para download
+            auto_yes (bool): Modo automático sem prompts
+            allow_arch_fallback (bool): Permitir fallback de arquitetura
+            bundle (Bundle): Bundle offline; se informado, a versão e o MSI vêm dele (sem rede)
+            
+        Returns:
+            tuple: (status, caminho_msi, versao) onde status é 'baixado' (MSI pronto
+                   para instalar), 'atualizado' (nada a fazer; versao é a instalada)
+                   ou 'erro'
+        """
         # Verificar se o Node.js já está instalado
         versao_atual = self.verificar_instalacao()
         
         if versao_atual:
             print(f"Node.js versão {versao_atual} está instalado.")
+
+        if bundle:
+            return self._preparar_do_bundle(bundle, versao_atual, versao, auto_yes or allow_arch_fallback)
         
         # Obter informações da versão
         versao_info = None
@@ -550,38 +595,43 @@ class NodejsInstaller:
             if not versao_alvo.startswith('v'):
                 versao_alvo = 'v' + versao_alvo
 
+            # Versão pedida já instalada: nada a validar na rede
+            if versao_atual and comparar_versoes(versao_atual, versao_alvo[1:]) == 0:
+                print(f"Node.js versão {versao_atual} já está instalado.")
+                print("Não é necessária reinstalação.")
+                return 'atualizado', None, versao_atual
+
             # Validar se a versão existe
             try:
                 print(f"Validando disponibilidade da versão {versao_alvo}...")
-                requester = session if session else requests
-                version_check_url = f"https://nodejs.org/dist/{versao_alvo}/SHASUMS256.txt"
-                version_status = verificar_disponibilidade_arquivo(version_check_url, requester, timeout=10)
+                try:
+                    versao_info = IndiceReleases.carregar(session, timeout=10).versao(versao_alvo)
+                except ValueError:
+                    versao_info = None
 
-                if version_status != 200:
-                    print(f"Erro: Versão {versao_alvo} não encontrada ou não está disponível.")
-                    return False, None
+                if not versao_info:
+                    # Versão ausente do índice em cache (ex.: publicada há poucos minutos)
+                    requester = session if session else obter_sessao()
+                    version_check_url = f"https://nodejs.org/dist/{versao_alvo}/SHASUMS256.txt"
+                    version_status = verificar_disponibilidade_arquivo(version_check_url, requester, timeout=10)
 
-                # Criar versao_info no formato esperado
-                versao_info = {'version': versao_alvo, 'lts': False}
+                    if version_status != 200:
+                        print(f"Erro: Versão {versao_alvo} não encontrada ou não está disponível.")
+                        return 'erro', None, None
 
-                # Verificar se a versão já está instalada e é a mesma
-                if versao_atual:
-                    versao_alvo_sem_v = versao_alvo[1:] if versao_alvo.startswith('v') else versao_alvo
-                    if comparar_versoes(versao_atual, versao_alvo_sem_v) == 0:
-                        print(f"Node.js versão {versao_atual} já está instalado.")
-                        print("Não é necessária reinstalação.")
-                        return True, versao_atual
+                    # Criar versao_info no formato esperado
+                    versao_info = {'version': versao_alvo, 'lts': False}
 
             except requests.RequestException as e:
                 print(f"Erro ao validar versão {versao_alvo}: {e}")
-                return False, None
+                return 'erro', None, None
         else:
             # Obter versão mais recente da trilha selecionada
             versao_info = obter_versao_mais_recente(session, track)
             if not versao_info:
                 print("Não foi possível obter a versão mais recente do Node.js.")
                 print("Verifique sua conexão com a internet e tente novamente.")
-                return False, None
+                return 'erro', None, None
 
         versao_mais_recente = versao_info['version'].lstrip('v')
 
@@ -596,7 +646,7 @@ class NodejsInstaller:
         if not versao and versao_atual:
             if comparar_versoes(versao_atual, versao_mais_recente) >= 0:
                 print(f"Seu Node.js (v{versao_atual}) já está atualizado!")
-                return True, versao_atual
+                return 'atualizado', None, versao_atual
             else:
                 print(f"Seu Node.js (v{versao_atual}) está desatualizado.")
                 print("Iniciando atualização...")
@@ -612,8 +662,51 @@ class NodejsInstaller:
                                                         download_timeout, auto_yes, allow_arch_fallback)
         if not caminho_msi:
             print("Falha ao baixar o instalador. Operação cancelada.")
-            return False, None
+            return 'erro', None, None
 
+        return 'baixado', caminho_msi, versao_efetiva
+
+    def _preparar_do_bundle(self, bundle, versao_atual, versao, allow_arch_fallback):
+        """
+        Etapa de download a partir de um bundle offline: a versão alvo é a do bundle.
+
+        Returns:
+            tuple: (status, caminho_msi, versao), como em preparar()
+        """
+        arquitetura = detectar_arquitetura()
+        print(f"Detectada arquitetura: {arquitetura}")
+        entrada = bundle.procurar('nodejs', arquitetura=arquitetura) or bundle.procurar('nodejs')
+        if not entrada:
+            print("Erro: O bundle não contém o instalador do Node.js.")
+            return 'erro', None, None
+
+        versao_bundle = entrada['versao'].lstrip('v')
+        print(f"Versão disponível no bundle: {versao_bundle}")
+        if versao and versao.lstrip('v') != versao_bundle:
+            print(f"Erro: O bundle contém o Node.js {versao_bundle}, não a versão {versao.lstrip('v')}.")
+            return 'erro', None, None
+        if versao_atual and comparar_versoes(versao_atual, versao_bundle) >= 0:
+            print(f"Seu Node.js (v{versao_atual}) já está atualizado!")
+            return 'atualizado', None, versao_atual
+
+        caminho_msi, versao_efetiva = obter_instalador_do_bundle(bundle, arquitetura, allow_arch_fallback)
+        if not caminho_msi:
+            return 'erro', None, None
+        return 'baixado', caminho_msi, versao_efetiva
+
+    def concluir(self, caminho_msi, versao_efetiva, install_timeout=300, all_users=False):
+        """
+        Etapa de instalação: executa o MSI baixado por preparar() e verifica o resultado.
+        
+        Args:
+            caminho_msi (str): Caminho do MSI baixado
+            versao_efetiva (str): Versão contida no MSI
+            install_timeout (int): Timeout para instalação
+            all_users (bool): Instalar para todos os usuários
+            
+        Returns:
+            tuple: (sucesso, versao_instalada)
+        """
         # Mostrar versão efetiva que será instalada
         versao_efetiva_sem_v = versao_efetiva.lstrip('v')
         print(f"Instalando Node.js {versao_efetiva_sem_v}...")
@@ -638,4 +731,4 @@ class NodejsInstaller:
         else:
             print("\nFalha na instalação. Verifique os erros acima.")
             print("Tente executar o script como administrador.")
-            return False, None
\ No newline at end of file
+            return False, None
@@ -0,0 +1,305 @@
+"""
+Instalação em lote de pacotes npm globais (Gemini CLI, Qwen CLI, ...).
+
+Instalar cada pacote com o seu próprio 'npm install -g' paga, a cada vez, a
+inicialização do npm, a consulta ao registro e a reconstrução da árvore
+global. Aqui os pacotes pedidos são comparados com uma única listagem
+('npm ls -g --json') e apenas os ausentes ou desatualizados são instalados,
+todos na mesma chamada, com --prefer-offline e a saída do npm transmitida
+(execucao.py). Em seguida os comandos de todos os pacotes são verificados
+em paralelo.
+
+Com um registro local (npm_offline.RegistroLocal, a partir do bundle offline),
+o npm instala as versões do bundle e as suas dependências sem acessar a rede.
+"""
+
+import json
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from .common import preparar_ambiente_nodejs
+from .execucao import executar_transmitindo
+from .metadata_cache import MetadataCache, TTL_PADRAO
+from .mirror import ORIGENS
+
+
+# Registro npm (a sessão compartilhada reescreve a URL para o espelho, com --mirror)
+REGISTRO_NPM = ORIGENS['npm']
+
+# Tempo máximo de 'npm ls -g' e de cada '<comando> --version'
+TIMEOUT_CONSULTA = 60
+
+
+class PacoteNpm:
+    """
+    Pacote npm global e o comando que ele instala.
+    """
+
+    def __init__(self, nome, comando, rotulo, tarball=None, versao=None):
+        """
+        Inicializa a descrição do pacote.
+
+        Args:
+            nome (str): Nome no registro npm (ex.: '@google/gemini-cli')
+            comando (str): Executável instalado pelo pacote (ex.: 'gemini')
+            rotulo (str): Nome exibido nas mensagens (ex.: 'Gemini CLI')
+            tarball (str): Tarball local a instalar no lugar do registro (bundle offline)
+            versao (str): Versão desejada (do bundle); None = a mais recente do registro
+        """
+        self.nome = nome
+        self.comando = comando
+        self.rotulo = rotulo
+        self.tarball = tarball
+        self.versao = versao
+
+
+class ResultadoPacote:
+    """
+    Resultado da instalação de um pacote.
+    """
+
+    # Ações possíveis
+    ATUAL = 'atual'                # já estava na versão desejada, nada foi feito
+    INSTALADO = 'instalado'        # não estava instalado
+    ATUALIZADO = 'atualizado'      # estava em uma versão mais antiga
+    FALHOU = 'falhou'
+
+    def __init__(self, pacote, acao, versao_anterior=None, mensagem=None):
+        self.pacote = pacote
+        self.acao = acao
+        self.versao_anterior = versao_anterior
+        self.mensagem = mensagem
+        # Preenchidos pela verificação dos comandos
+        self.caminho_comando = None
+        self.versao_comando = None
+
+    @property
+    def sucesso(self):
+        """True se o pacote está instalado e o seu comando foi encontrado."""
+        return self.acao != ResultadoPacote.FALHOU and self.caminho_comando is not None
+
+
+class InstaladorNpmGlobal:
+    """
+    Instala uma lista de pacotes npm globais em uma única execução do npm.
+    """
+
+    def __init__(self, logger=None, registro=None):
+        """
+        Inicializa o instalador.
+
+        Args:
+            logger: Instância de Logger para registrar logs
+            registro (str): URL do registro npm a usar no lugar do configurado (ex.: RegistroLocal.url)
+        """
+        self.logger = logger
+        self.registro = registro
+
+    def _log(self, mensagem, verbose_only=False):
+        if self.logger:
+            self.logger.print(mensagem, verbose_only=verbose_only)
+
+    def listar_instalados(self, npm_path, ambiente):
+        """
+        Lista os pacotes globais com uma única chamada 'npm ls -g --json --depth=0'.
+
+        Args:
+            npm_path (str): Executável do npm
+            ambiente (dict): Ambiente com os caminhos do Node.js
+
+        Returns:
+            dict: Nome do pacote -> versão instalada
+        """
+        try:
+            resultado = subprocess.run(
+                [npm_path, 'ls', '-g', '--json', '--depth=0'], capture_output=True, text=True,
+                timeout=TIMEOUT_CONSULTA, env=ambiente, encoding='utf-8', errors='replace',
+            )
+            # Com problemas na árvore (ex.: dependência ausente) o código é 1, mas o JSON vem completo
+            dependencias = json.loads(resultado.stdout or '{}').get('dependencies') or {}
+        except (subprocess.SubprocessError, OSError, ValueError) as e:
+            self._log(f"Não foi possível listar os pacotes globais: {e}", verbose_only=True)
+            return {}
+        return {nome: info.get('version') for nome, info in dependencias.items() if info.get('version')}
+
+    def versao_mais_recente(self, nome):
+        """
+        Versão 'latest' de um pacote no registro npm (via cache de metadados).
+
+        Args:
+            nome (str): Nome do pacote
+
+        Returns:
+            str: Versão, ou None se o registro não puder ser consultado
+        """
+        try:
+            url = f"{REGISTRO_NPM}{quote(nome, safe='@')}/latest"
+            return MetadataCache().obter(url, ttl=TTL_PADRAO).json().get('version')
+        except Exception as e:
+            self._log(f"Não foi possível consultar a versão mais recente de {nome}: {e}", verbose_only=True)
+            return None
+
+    def planejar(self, pacotes, instalados):
+        """
+        Separa os pacotes que precisam ser instalados dos que já estão na versão desejada.
+
+        Args:
+            pacotes (list[PacoteNpm]): Pacotes pedidos
+            instalados (dict): Resultado de listar_instalados()
+
+        Returns:
+            tuple: (lista de (pacote, especificação para o npm), dict nome -> ResultadoPacote dos já atuais)
+        """
+        # Versões mais recentes dos pacotes sem versão definida, consultadas em paralelo. A versão
+        # exata vai para o npm: com --prefer-offline, '@latest' poderia vir de um cache antigo
+        do_registro = [p for p in pacotes if not p.versao]
+        with ThreadPoolExecutor(max_workers=max(len(do_registro), 1)) as executor:
+            recentes = dict(zip((p.nome for p in do_registro), executor.map(
+                lambda p: self.versao_mais_recente(p.nome), do_registro)))
+
+        a_instalar = []
+        atuais = {}
+        for pacote in pacotes:
+            instalada = instalados.get(pacote.nome)
+            desejada = pacote.versao or recentes.get(pacote.nome)
+            # Sem acesso ao registro, um pacote instalado é mantido como está
+            sem_versao_conhecida = desejada is None and not pacote.tarball
+            if instalada and (instalada == desejada or sem_versao_conhecida):
+                atuais[pacote.nome] = ResultadoPacote(pacote, ResultadoPacote.ATUAL, instalada)
+                continue
+            if pacote.tarball:
+                especificacao = str(pacote.tarball)
+            else:
+                especificacao = f"{pacote.nome}@{desejada or 'latest'}"
+            a_instalar.append((pacote, especificacao))
+        return a_instalar, atuais
+
+    def _npm_install(self, npm_path, especificacoes, ambiente, npm_timeout):
+        """Executa um único 'npm install -g' com todas as especificações; retorna o ResultadoExecucao."""
+        # --loglevel=http: uma linha por requisição ao registro, contada pelo acompanhamento da saída
+        comando = [npm_path, 'install', '-g', '--prefer-offline', '--no-audit', '--no-fund', '--loglevel=http',
+                   *especificacoes]
+        if self.registro:
+            # Registro local: repetir uma requisição (ex.: tarball com integrity inválido) não muda o resultado
+            comando += [f"--registry={self.registro}", '--fetch-retries=0']
+        print(f"Executando: npm install -g --prefer-offline {' '.join(especificacoes)}")
+        self._log(f"Executando comando: {' '.join(comando)}", verbose_only=True)
+        return executar_transmitindo(comando, 'npm', timeout=npm_timeout, env=ambiente)
+
+    def verificar_comandos(self, resultados, ambiente):
+        """
+        Localiza e executa '<comando> --version' de todos os pacotes em paralelo.
+
+        Args:
+            resultados (dict): Nome do pacote -> ResultadoPacote (atualizados no lugar)
+            ambiente (dict): Ambiente com os caminhos do Node.js e do npm
+        """
+        def verificar(resultado):
+            caminho = shutil.which(resultado.pacote.comando, path=ambiente.get('PATH'))
+            resultado.caminho_comando = caminho
+            if not caminho:
+                return
+            try:
+                saida = subprocess.run(
+                    [caminho, '--version'], capture_output=True, text=True, timeout=TIMEOUT_CONSULTA,
+                    env=ambiente, encoding='utf-8', errors='replace',
+                )
+                if saida.returncode == 0:
+                    resultado.versao_comando = saida.stdout.strip()
+            except (subprocess.SubprocessError, OSError):
+                pass
+
+        validos = [r for r in resultados.values() if r.acao != ResultadoPacote.FALHOU]
+        with ThreadPoolExecutor(max_workers=max(len(validos), 1)) as executor:
+            list(executor.map(verificar, validos))
+
+    def instalar(self, pacotes, npm_timeout=300):
+        """
+        Instala os pacotes ausentes ou desatualizados em uma única chamada do npm.
+
+        Se a chamada em lote falhar, cada pacote é tentado separadamente, para que
+        um pacote com problema não impeça a instalação dos demais.
+
+        Args:
+            pacotes (list[PacoteNpm]): Pacotes a instalar
+            npm_timeout (int): Timeout em segundos de cada execução do npm
+
+        Returns:
+            dict: Nome do pacote -> ResultadoPacote (na ordem de 'pacotes')
+        """
+        def falha(mensagem):
+            return {p.nome: ResultadoPacote(p, ResultadoPacote.FALHOU, mensagem=mensagem) for p in pacotes}
+
+        ambiente = preparar_ambiente_nodejs()
+        npm_path = shutil.which('npm', path=ambiente.get('PATH'))
+        if not npm_path:
+            print("❌ ERRO: npm não encontrado. Instale o Node.js e tente novamente.")
+            self._log("ERRO: npm não encontrado no PATH atualizado")
+            return falha("npm não encontrado")
+        print(f"✓ npm encontrado em: {npm_path}")
+
+        instalados = self.listar_instalados(npm_path, ambiente)
+        a_instalar, resultados = self.planejar(pacotes, instalados)
+        for resultado in resultados.values():
+            print(f"✓ {resultado.pacote.rotulo} já está na versão mais recente ({resultado.versao_anterior})")
+
+        if a_instalar:
+            especificacoes = [especificacao for _, especificacao in a_instalar]
+            try:
+                lotes = [a_instalar]
+                execucao = self._npm_install(npm_path, especificacoes, ambiente, npm_timeout)
+                if not execucao.sucesso and len(a_instalar) > 1:
+                    print("⚠️  A instalação em lote falhou; instalando os pacotes separadamente...")
+                    self._log(f"Falha no lote: {execucao.saida}", verbose_only=True)
+                    lotes = [[item] for item in a_instalar]
+                    execucoes = [self._npm_install(npm_path, [e], ambiente, npm_timeout) for _, e in a_instalar]
+                else:
+                    execucoes = [execucao]
+            except subprocess.TimeoutExpired:
+                print(f"⏰ TIMEOUT: o npm excedeu o tempo limite ({npm_timeout} segundos).")
+                lotes = [a_instalar]
+                execucoes = [None]
+
+            for lote, execucao in zip(lotes, execucoes):
+                for pacote, _ in lote:
+                    anterior = instalados.get(pacote.nome)
+                    if execucao is not None and execucao.sucesso:
+                        acao = ResultadoPacote.ATUALIZADO if anterior else ResultadoPacote.INSTALADO
+                        resultados[pacote.nome] = ResultadoPacote(pacote, acao, anterior)
+                    else:
+                        detalhe = execucao.detalhe_erro() if execucao else 'timeout'
+                        resultados[pacote.nome] = ResultadoPacote(
+                            pacote, ResultadoPacote.FALHOU, anterior, f"npm install falhou: {detalhe}"
+                        )
+
+        self.verificar_comandos(resultados, ambiente)
+        resultados = {p.nome: resultados[p.nome] for p in pacotes}
+        self.exibir_resultados(resultados)
+        return resultados
+
+    def exibir_resultados(self, resultados):
+        """
+        Exibe (e registra no log) o resultado de cada pacote.
+
+        Args:
+            resultados (dict): Nome do pacote -> ResultadoPacote
+        """
+        for resultado in resultados.values():
+            rotulo = resultado.pacote.rotulo
+            if resultado.acao == ResultadoPacote.FALHOU:
+                print(f"❌ {rotulo}: {resultado.mensagem}")
+                print(f"   Para instalar manualmente: npm install -g {resultado.pacote.nome}")
+            elif not resultado.caminho_comando:
+                print(f"❌ {rotulo}: comando '{resultado.pacote.comando}' não encontrado no PATH após a instalação")
+                print("   Tente reiniciar o terminal ou o computador.")
+            else:
+                acao = {
+                    ResultadoPacote.ATUAL: "já atualizado",
+                    ResultadoPacote.INSTALADO: "instalado",
+                    ResultadoPacote.ATUALIZADO: f"atualizado (era {resultado.versao_anterior})",
+                }[resultado.acao]
+                versao = resultado.versao_comando or "versão não informada"
+                print(f"✅ {rotulo}: {acao} - {versao} em {resultado.caminho_comando}")
+            self._log(f"{rotulo}: {resultado.acao} (comando: {resultado.caminho_comando or 'não encontrado'})")
@@ -0,0 +1,327 @@
+"""
+Instalação de pacotes npm (Gemini CLI, Qwen CLI, opencode-ai) sem acesso ao registro público.
+
+O bundle offline (orquestrador bundle build) guarda, além do tarball de cada
+CLI, os tarballs de todas as suas dependências, resolvidas uma única vez por
+resolver_dependencias() (um package-lock gerado pelo próprio npm, com versão
+exata e integrity de cada pacote) e filtradas para a plataforma de destino.
+
+Na instalação, RegistroLocal serve esses tarballs como um registro npm em
+127.0.0.1: o npm (ou o bun) instala as versões exatas do bundle sem acessar
+a rede, conferindo o integrity de cada tarball. Os tarballs ficam no cache
+do npm, endereçados pelo integrity, e uma atualização posterior pelo
+registro público com --prefer-offline não os baixa de novo.
+"""
+
+import base64
+import hashlib
+import json
+import tarfile
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from .bundle import TIPO_PACOTE_NPM
+from .execucao import executar_transmitindo
+
+
+# Ferramenta das dependências no bundle (compartilhadas entre as CLIs)
+FERRAMENTA_DEPENDENCIAS = 'npm'
+
+# Plataforma das máquinas de destino (process.platform do Node.js)
+PLATAFORMA_ALVO = 'win32'
+
+# Tempo máximo para o npm resolver a árvore de dependências
+TIMEOUT_RESOLUCAO = 300
+
+# Prefixo das URLs dos tarballs servidos por RegistroLocal
+_PREFIXO_TARBALLS = '/-/tarballs/'
+
+
+class ErroResolucao(Exception):
+    """Falha ao resolver a árvore de dependências de um pacote."""
+
+
+def calcular_integrity(caminho, algoritmo='sha512'):
+    """
+    Calcula o integrity (Subresource Integrity) de um arquivo, como o do registro npm.
+
+    Args:
+        caminho (str | Path): Arquivo
+        algoritmo (str): Algoritmo de hash
+
+    Returns:
+        str: Ex.: 'sha512-<base64>'
+    """
+    digest = hashlib.new(algoritmo)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(bloco)
+    return f"{algoritmo}-{base64.b64encode(digest.digest()).decode()}"
+
+
+def nome_arquivo_tarball(nome, versao):
+    """
+    Nome do tarball de um pacote no bundle, único entre escopos.
+
+    Args:
+        nome (str): Nome do pacote (ex.: '@google/gemini-cli')
+        versao (str): Versão
+
+    Returns:
+        str: Ex.: 'google-gemini-cli-0.2.0.tgz'
+    """
+    return f"{nome.lstrip('@').replace('/', '-')}-{versao}.tgz"
+
+
+def _compativel(valores, alvo):
+    """Confere um campo 'os'/'cpu' do package.json ('win32', '!darwin', ...) com a plataforma de destino."""
+    if not valores:
+        return True
+    if f"!{alvo}" in valores:
+        return False
+    positivos = [v for v in valores if not v.startswith('!')]
+    return not positivos or alvo in positivos
+
+
+def _nome_no_lock(caminho, entrada):
+    """Nome do pacote de uma entrada 'node_modules/...' do package-lock."""
+    return entrada.get('name') or caminho.rpartition('node_modules/')[2]
+
+
+def resolver_dependencias(pacote, versao, npm_path, registro=None, arquitetura='x64',
+                          plataforma=PLATAFORMA_ALVO, ambiente=None, timeout=TIMEOUT_RESOLUCAO):
+    """
+    Resolve a árvore completa de dependências de um pacote com o próprio npm.
+
+    Executa 'npm install --package-lock-only' em um diretório temporário (nada é
+    baixado nem instalado) e lê do package-lock a versão, a URL e o integrity
+    de cada pacote. Dependências opcionais de outras plataformas (ex.: binários
+    para macOS/Linux) são descartadas.
+
+    Args:
+        pacote (str): Nome do pacote (ex.: '@google/gemini-cli')
+        versao (str): Versão exata do pacote
+        npm_path (str): Executável do npm
+        registro (str): URL do registro (padrão: o configurado no npm)
+        arquitetura (str): Arquitetura de destino ('x64', 'arm64')
+        plataforma (str): Sistema de destino ('win32')
+        ambiente (dict): Ambiente do npm
+        timeout (int): Tempo máximo em segundos
+
+    Returns:
+        list: Dicionários {'nome', 'versao', 'url', 'integrity'}, sem repetições, incluindo o próprio pacote
+
+    Raises:
+        ErroResolucao: Se o npm falhar ou o package-lock não puder ser lido
+    """
+    with tempfile.TemporaryDirectory(prefix='npm-resolucao-') as pasta:
+        Path(pasta, 'package.json').write_text(
+            json.dumps({'name': 'resolucao-bundle', 'version': '0.0.0', 'private': True}), encoding='utf-8'
+        )
+        comando = [npm_path, 'install', f"{pacote}@{versao}", '--package-lock-only', '--ignore-scripts',
+                   '--no-audit', '--no-fund', '--lockfile-version=3', '--prefix', pasta]
+        if registro:
+            comando.append(f"--registry={registro}")
+        try:
+            execucao = executar_transmitindo(comando, 'npm', timeout=timeout, env=ambiente, ecoar=False)
+        except Exception as e:
+            raise ErroResolucao(f"npm não pôde resolver {pacote}@{versao}: {e}")
+        if not execucao.sucesso:
+            raise ErroResolucao(f"npm não pôde resolver {pacote}@{versao}: {execucao.detalhe_erro()}")
+        try:
+            lock = json.loads(Path(pasta, 'package-lock.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            raise ErroResolucao(f"package-lock.json inválido para {pacote}@{versao}: {e}")
+
+    pacotes = {}
+    for caminho, entrada in (lock.get('packages') or {}).items():
+        if not caminho or entrada.get('link') or entrada.get('inBundle') or entrada.get('dev'):
+            continue
+        if not entrada.get('resolved') or not entrada.get('integrity'):
+            continue
+        if not (_compativel(entrada.get('os'), plataforma) and _compativel(entrada.get('cpu'), arquitetura)):
+            continue
+        nome = _nome_no_lock(caminho, entrada)
+        pacotes[(nome, entrada['version'])] = {
+            'nome': nome, 'versao': entrada['version'], 'url': entrada['resolved'], 'integrity': entrada['integrity'],
+        }
+    return sorted(pacotes.values(), key=lambda p: (p['nome'], p['versao']))
+
+
+def _ler_package_json(caminho):
+    """Lê o package.json de dentro de um tarball npm (diretório 'package/' ou outro de primeiro nível)."""
+    with tarfile.open(caminho, 'r:gz') as tar:
+        for membro in tar:
+            partes = membro.name.split('/')
+            if membro.isfile() and len(partes) == 2 and partes[1] == 'package.json':
+                return json.load(tar.extractfile(membro))
+    raise ValueError(f"package.json não encontrado em {Path(caminho).name}")
+
+
+class _RegistroHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: '_RegistroHTTPServer'
+
+    def log_message(self, format, *args):
+        # Acessos não vão para o log do instalador
+        pass
+
+    def do_GET(self):
+        self._responder(incluir_corpo=True)
+
+    def do_HEAD(self):
+        self._responder(incluir_corpo=False)
+
+    def _responder(self, incluir_corpo):
+        registro = self.server.registro
+        caminho = self.path.split('?', 1)[0]
+        registro.contar(caminho)
+        if caminho.startswith(_PREFIXO_TARBALLS):
+            arquivo = registro.arquivos.get(caminho[len(_PREFIXO_TARBALLS):])
+            corpo = Path(arquivo).read_bytes() if arquivo else None
+            tipo = 'application/octet-stream'
+        else:
+            documento = registro.documento(unquote(caminho.lstrip('/')), self._base_url())
+            if documento is None:
+                # '/<pacote>/<versão ou tag>' (ex.: '/opencode-ai/latest')
+                nome, _, versao = unquote(caminho.lstrip('/')).rpartition('/')
+                documento = registro.documento(nome, self._base_url(), versao) if nome else None
+            corpo = json.dumps(documento).encode('utf-8') if documento else None
+            tipo = 'application/json'
+
+        self.send_response(200 if corpo is not None else 404)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(corpo or b'')))
+        self.end_headers()
+        if corpo and incluir_corpo:
+            self.wfile.write(corpo)
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host') or '127.0.0.1:%s' % self.server.server_address[1]}"
+
+
+class _RegistroHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    registro: 'RegistroLocal'
+
+
+class RegistroLocal:
+    """
+    Registro npm mínimo, em 127.0.0.1, que serve apenas os tarballs informados.
+
+    Cada pacote é descrito a partir do package.json do próprio tarball (dependências,
+    bin, os/cpu...), lido no primeiro pedido, com 'dist.tarball' apontando para
+    este servidor. Pacotes e versões ausentes respondem 404: o npm nunca recorre
+    a outro registro.
+
+    Uso:
+        with RegistroLocal.do_bundle(bundle) as registro:
+            npm install -g --registry <registro.url> pacote@versao
+    """
+
+    def __init__(self, tarballs):
+        """
+        Inicializa o registro (o servidor só atende depois de start() ou do bloco with).
+
+        Args:
+            tarballs (list): Tuplas (nome, versao, caminho do tarball, integrity ou None)
+        """
+        self.versoes = {}
+        self.arquivos = {}
+        self.requisicoes = {'documentos': 0, 'tarballs': 0}
+        self._lock = threading.Lock()
+        self._manifestos = {}
+        for nome, versao, caminho, integrity in tarballs:
+            arquivo = quote(nome_arquivo_tarball(nome, versao))
+            self.arquivos[arquivo] = str(caminho)
+            self.versoes.setdefault(nome, {})[versao] = (arquivo, integrity)
+        self.httpd = _RegistroHTTPServer(('127.0.0.1', 0), _RegistroHandler)
+        self.httpd.registro = self
+        self._thread = None
+
+    @classmethod
+    def do_bundle(cls, bundle):
+        """
+        Cria o registro com todos os tarballs npm de um bundle (CLIs e dependências).
+
+        Args:
+            bundle (Bundle): Bundle offline
+
+        Returns:
+            RegistroLocal | None: Registro, ou None se o bundle não trouxer as dependências
+                (bundles antigos: o npm resolve as dependências pelo registro público)
+        """
+        entradas = [e for e in bundle.artefatos if e.get('tipo') == TIPO_PACOTE_NPM and e.get('pacote')]
+        if not any(e.get('ferramenta') == FERRAMENTA_DEPENDENCIAS for e in entradas):
+            return None
+        return cls([
+            (e['pacote'], e['versao'], bundle.caminho(e), e.get('integrity')) for e in entradas
+        ])
+
+    @property
+    def url(self):
+        """URL do registro (para --registry)."""
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+
+    def contar(self, caminho):
+        with self._lock:
+            chave = 'tarballs' if caminho.startswith(_PREFIXO_TARBALLS) else 'documentos'
+            self.requisicoes[chave] += 1
+
+    def documento(self, nome, base_url, versao=None):
+        """
+        Documento do pacote (packument) no formato do registro npm.
+
+        Args:
+            nome (str): Nome do pacote
+            base_url (str): URL deste servidor vista pelo cliente
+            versao (str): Versão ou 'latest' para o manifesto de uma única versão
+
+        Returns:
+            dict | None: Documento, ou None se o pacote (ou a versão) não estiver no registro
+        """
+        versoes = self.versoes.get(nome)
+        if not versoes:
+            return None
+        documento_versoes = {}
+        for numero, (arquivo, integrity) in versoes.items():
+            manifesto = self._manifesto(nome, numero, arquivo, integrity)
+            dist = dict(manifesto['dist'], tarball=f"{base_url}{_PREFIXO_TARBALLS}{arquivo}")
+            documento_versoes[numero] = dict(manifesto, dist=dist)
+        mais_recente = max(versoes, key=lambda v: [int(p) if p.isdigit() else 0 for p in v.split('-')[0].split('.')])
+        if versao is not None:
+            return documento_versoes.get(mais_recente if versao == 'latest' else versao)
+        return {'name': nome, 'dist-tags': {'latest': mais_recente}, 'versions': documento_versoes}
+
+    def _manifesto(self, nome, versao, arquivo, integrity):
+        """package.json de uma versão, lido do tarball uma única vez."""
+        with self._lock:
+            manifesto = self._manifestos.get(arquivo)
+        if manifesto is None:
+            caminho = self.arquivos[arquivo]
+            manifesto = _ler_package_json(caminho)
+            manifesto.update(name=nome, version=versao)
+            manifesto['dist'] = {'integrity': integrity or calcular_integrity(caminho)}
+            with self._lock:
+                self._manifestos[arquivo] = manifesto
+        return manifesto
+
+    def start(self):
+        """Atende em uma thread de fundo."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra o servidor."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
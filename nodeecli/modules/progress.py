@@ -0,0 +1,170 @@
+"""
+Indicador de progresso de download compartilhado pelos instaladores.
+
+O downloader notifica o progresso a cada bloco de 64 KB (milhares de vezes
+em um instalador de 150 MB). O indicador repassa no máximo uma atualização
+por ponto percentual inteiro e algumas por segundo, com os valores numéricos
+(bytes, total, taxa):
+
+- no terminal, redesenha uma barra na mesma linha ('\\r');
+- sob o orquestrador, emite eventos 'progresso' no canal de eventos
+  (events.py), fora do log do stdout.
+"""
+
+import sys
+import time
+
+from .events import EVENTO_PROGRESSO, obter_canal
+
+# Intervalo mínimo entre duas atualizações, em segundos
+INTERVALO_PADRAO = 0.25
+
+MODO_TERMINAL = 'terminal'
+MODO_ORQUESTRADOR = 'orquestrador'
+
+
+def formatar_tempo(segundos):
+    """
+    Formata uma duração curta para exibição.
+
+    Args:
+        segundos (float): Duração em segundos
+
+    Returns:
+        str: Ex.: '45 s', '2 min 05 s', '1 h 10 min'
+    """
+    segundos = int(round(segundos))
+    if segundos < 60:
+        return f"{segundos} s"
+    minutos, segundos = divmod(segundos, 60)
+    if minutos < 60:
+        return f"{minutos} min {segundos:02d} s"
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas} h {minutos:02d} min"
+
+
+def estimar_restante(baixados, total, taxa):
+    """
+    Estima o tempo restante de um download.
+
+    Returns:
+        float | None: Segundos restantes, ou None sem total ou taxa conhecidos
+    """
+    if not total or not taxa:
+        return None
+    return max(total - baixados, 0) / taxa
+
+
+def formatar_progresso(baixados, total=None, taxa=None):
+    """
+    Formata o progresso de um download para exibição.
+
+    Args:
+        baixados (int): Bytes baixados
+        total (int | None): Tamanho total, se conhecido
+        taxa (float | None): Taxa em bytes por segundo
+
+    Returns:
+        str: Ex.: '45% (67.5/150.0 MB, 12.3 MB/s, ~7 s restantes)'
+    """
+    mb = 1024 * 1024
+    detalhes = []
+    if total:
+        texto = f"{int(baixados * 100 / total)}%"
+        detalhes.append(f"{baixados / mb:.1f}/{total / mb:.1f} MB")
+    else:
+        texto = f"{baixados / mb:.1f} MB"
+    if taxa:
+        detalhes.append(f"{taxa / mb:.1f} MB/s")
+    restante = estimar_restante(baixados, total, taxa)
+    if restante is not None and baixados < total:
+        detalhes.append(f"~{formatar_tempo(restante)} restantes")
+    return f"{texto} ({', '.join(detalhes)})" if detalhes else texto
+
+
+class IndicadorProgresso:
+    """
+    Callback de progresso (ao_progresso) com limite de atualizações.
+
+    Não é reentrante: o downloader já serializa as chamadas das várias
+    conexões de um download.
+    """
+
+    def __init__(self, rotulo='Progresso', intervalo=INTERVALO_PADRAO, modo=None, saida=None,
+                 relogio=time.monotonic, canal=None):
+        """
+        Inicializa o indicador.
+
+        Args:
+            rotulo (str): Texto exibido antes da barra no terminal
+            intervalo (float): Segundos mínimos entre duas atualizações
+            modo (str): MODO_TERMINAL ou MODO_ORQUESTRADOR (padrão: orquestrador se o canal de eventos estiver ativo)
+            saida: Arquivo da barra no terminal (padrão: sys.stdout)
+            relogio (callable): Fonte de tempo (substituível nos testes)
+            canal (CanalEventos): Canal dos eventos 'progresso' (padrão: o do processo)
+        """
+        self.rotulo = rotulo
+        self.intervalo = intervalo
+        self.saida = saida
+        self.relogio = relogio
+        self.canal = canal or obter_canal()
+        if modo is None:
+            modo = MODO_ORQUESTRADOR if self.canal.ativo else MODO_TERMINAL
+        self.modo = modo
+        self.baixados = 0
+        self.total = None
+        self.atualizacoes = 0
+        self._inicio = None
+        self._baixados_inicio = 0
+        self._ultima_emissao = None
+        self._ultimo_percentual = None
+
+    @property
+    def taxa(self):
+        """Taxa média desde o início do download, em bytes por segundo (None no início)."""
+        if self._inicio is None:
+            return None
+        decorrido = self.relogio() - self._inicio
+        if decorrido <= 0:
+            return None
+        return (self.baixados - self._baixados_inicio) / decorrido
+
+    def __call__(self, baixados, total):
+        """Recebe o progresso do downloader e emite uma atualização se o limite permitir."""
+        agora = self.relogio()
+        if self._inicio is None:
+            # Download retomado: a taxa considera só os bytes desta execução
+            self._inicio = agora
+            self._baixados_inicio = baixados
+        self.baixados, self.total = baixados, total
+
+        concluido = bool(total) and baixados >= total
+        if not concluido and self._ultima_emissao is not None:
+            if agora - self._ultima_emissao < self.intervalo:
+                return
+            if total and int(baixados * 100 / total) == self._ultimo_percentual:
+                return
+        self._emitir(agora)
+
+    def _emitir(self, agora):
+        self._ultima_emissao = agora
+        self._ultimo_percentual = int(self.baixados * 100 / self.total) if self.total else None
+        self.atualizacoes += 1
+        taxa = self.taxa
+        if self.modo == MODO_ORQUESTRADOR:
+            self.canal.emitir(EVENTO_PROGRESSO, baixados=self.baixados, total=self.total,
+                              taxa=round(taxa) if taxa else None)
+            return
+
+        if self.total:
+            preenchido = int(40 * self.baixados / self.total)
+            barra = '█' * preenchido + '-' * (40 - preenchido)
+            texto = f"|{barra}| {formatar_progresso(self.baixados, self.total, taxa)}"
+        else:
+            texto = formatar_progresso(self.baixados, None, taxa)
+        print(f"\r   {self.rotulo}: {texto}   ", end='', file=self.saida or sys.stdout, flush=True)
+
+    def concluir(self):
+        """Encerra a linha da barra no terminal (chamar depois do download)."""
+        if self.modo == MODO_TERMINAL and self.atualizacoes:
+            print(file=self.saida or sys.stdout, flush=True)
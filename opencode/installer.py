@@ -6,10 +6,35 @@ Script Python que automatiza a instalação do Bun e OpenCode CLI no Windows 10/
 
 import os
 import sys
+import argparse
 import subprocess
 import ctypes
 import platform
+import shutil
+import zipfile
 from pathlib import Path
+from typing import Optional, Tuple
+
+# Garantir que os módulos compartilhados (nodeecli/modules) sejam importáveis
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / "nodeecli").is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from nodeecli.modules.common import configure_stdout_stderr  # noqa: E402
+from nodeecli.modules.events import concluir, fase  # noqa: E402
+
+GITHUB_API = "https://api.github.com/repos"
+BUN_REPO = "oven-sh/bun"
+
+# Asset da release do Bun por arquitetura; 'baseline' roda em CPUs x64 sem AVX2
+BUN_ASSETS = {
+    "x64": "bun-windows-x64.zip",
+    "x64-baseline": "bun-windows-x64-baseline.zip",
+    "arm64": "bun-windows-aarch64.zip",
+}
+
+# IsProcessorFeaturePresent: PF_AVX2_INSTRUCTIONS_AVAILABLE
+PF_AVX2_INSTRUCTIONS_AVAILABLE = 40
 
 
 def print_banner():
@@ -75,13 +100,190 @@ def is_opencode_installed() -> bool:
     return False
 
 
+def bun_install_dir() -> Path:
+    """Diretório dos executáveis do Bun (o mesmo do instalador oficial)."""
+    return Path.home() / ".bun" / "bin"
+
+
+def _cpu_supports_avx2() -> bool:
+    """Indica se a CPU tem AVX2 (exigido pelo build padrão do Bun para x64)."""
+    try:
+        return bool(ctypes.windll.kernel32.IsProcessorFeaturePresent(PF_AVX2_INSTRUCTIONS_AVAILABLE))
+    except Exception:
+        # Fora do Windows (ou sem a API) o build padrão é assumido, como no install.ps1
+        return True
+
+
+def bun_asset_name(arch: str, avx2: bool = True) -> str:
+    """
+    Nome do asset da release do Bun para a arquitetura.
+
+    Raises:
+        ValueError: Se o Bun não publica build para a arquitetura (ex.: x86)
+    """
+    if arch == "x64" and not avx2:
+        arch = "x64-baseline"
+    if arch not in BUN_ASSETS:
+        raise ValueError(f"o Bun não tem build para Windows {arch}")
+    return BUN_ASSETS[arch]
+
+
+def resolve_bun_release(asset_name: str) -> Tuple[str, str, str]:
+    """
+    Resolve a release mais recente do Bun (via cache de metadados).
+
+    O SHA-256 vem do SHASUMS256.txt publicado na release ou, na falta dele,
+    do 'digest' do asset informado pela API do GitHub.
+
+    Args:
+        asset_name (str): Nome do asset (ex.: 'bun-windows-x64.zip')
+
+    Returns:
+        tuple: (URL do asset, tag da release, SHA-256 esperado)
+
+    Raises:
+        ValueError: Se o asset ou o seu SHA-256 não estiverem na release
+    """
+    from nodeecli.modules.metadata_cache import TTL_IMUTAVEL, TTL_PADRAO, MetadataCache
+
+    release = MetadataCache().obter(
+        f"{GITHUB_API}/{BUN_REPO}/releases/latest", ttl=TTL_PADRAO,
+        headers={"Accept": "application/vnd.github+json"},
+    ).json()
+    assets = {asset.get("name"): asset for asset in release.get("assets", [])}
+    asset = assets.get(asset_name)
+    if not asset:
+        raise ValueError(f"{asset_name} não encontrado na release {release.get('tag_name')}")
+
+    sha256 = None
+    shasums = assets.get("SHASUMS256.txt")
+    if shasums:
+        texto = MetadataCache().obter(shasums["browser_download_url"], ttl=TTL_IMUTAVEL).text
+        for linha in texto.splitlines():
+            partes = linha.split()
+            if len(partes) >= 2 and partes[1].lstrip("*") == asset_name:
+                sha256 = partes[0].lower()
+    if not sha256 and (asset.get("digest") or "").startswith("sha256:"):
+        sha256 = asset["digest"].split(":", 1)[1].lower()
+    if not sha256:
+        raise ValueError(f"SHA-256 de {asset_name} não publicado na release {release.get('tag_name')}")
+    return asset["browser_download_url"], release.get("tag_name"), sha256
+
+
+def _extract_bun(archive: Path, bin_dir: Path) -> Path:
+    """Extrai bun.exe do .zip da release para bin_dir (e cria bunx.exe, como o instalador oficial)."""
+    bun_exe = bin_dir / "bun.exe"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(archive) as zf:
+        member = next((m for m in zf.namelist() if m.rsplit("/", 1)[-1] == "bun.exe"), None)
+        if not member:
+            raise ValueError(f"bun.exe não encontrado em {archive.name}")
+        # Arquivo temporário: um bun.exe incompleto nunca fica no lugar do atual
+        partial = bin_dir / "bun.exe.part"
+        with zf.open(member) as source, open(partial, "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    os.replace(partial, bun_exe)
+
+    bunx = bin_dir / "bunx.exe"
+    bunx.unlink(missing_ok=True)
+    try:
+        os.link(bun_exe, bunx)
+    except OSError:
+        shutil.copyfile(bun_exe, bunx)
+    return bun_exe
+
+
+def add_bun_to_user_path(bin_dir: Path) -> None:
+    """Inclui o diretório do Bun no PATH do usuário (registro), como o instalador oficial."""
+    try:
+        import winreg
+    except ImportError:
+        return
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0,
+                            winreg.KEY_READ | winreg.KEY_WRITE) as key:
+            try:
+                current, kind = winreg.QueryValueEx(key, "Path")
+            except FileNotFoundError:
+                current, kind = "", winreg.REG_EXPAND_SZ
+            entries = [entry for entry in current.split(";") if entry]
+            if any(os.path.normcase(os.path.expandvars(entry).rstrip("\\")) == os.path.normcase(str(bin_dir))
+                   for entry in entries):
+                return
+            winreg.SetValueEx(key, "Path", 0, kind, ";".join([str(bin_dir), *entries]))
+        # Avisar o Explorer para que novos terminais recebam o PATH atualizado
+        ctypes.windll.user32.SendMessageTimeoutW(0xFFFF, 0x001A, 0, "Environment", 0x0002, 5000, None)
+        print(f"   PATH do usuário atualizado: {bin_dir}")
+    except OSError as e:
+        print(f"⚠️  Não foi possível atualizar o PATH do usuário: {e}")
+
+
+def install_bun_native(bin_dir: Optional[Path] = None) -> bool:
+    """
+    Instala o Bun sem PowerShell: baixa o .zip da release pelo cache de artefatos,
+    confere o SHA-256 e extrai bun.exe para ~/.bun/bin.
+
+    Em uma reinstalação (ou em outra conta da mesma máquina) o .zip vem do
+    cache, sem acesso à rede para o download.
+
+    Args:
+        bin_dir (Path): Diretório de destino (padrão: bun_install_dir())
+
+    Returns:
+        bool: True se instalação bem-sucedida
+    """
+    from nodeecli.modules.artifact_cache import obter_com_cache
+    from nodeecli.modules.common import detectar_arquitetura, obter_diretorio_staging
+    from nodeecli.modules.events import cancelamento_solicitado
+
+    bin_dir = bin_dir or bun_install_dir()
+    try:
+        arch = detectar_arquitetura()
+        asset_name = bun_asset_name(arch, _cpu_supports_avx2())
+        url, version, sha256 = resolve_bun_release(asset_name)
+        label = version[4:] if version.startswith("bun-") else version
+        print(f"📥 Instalando Bun {label} ({asset_name})...")
+        archive = obter_diretorio_staging("bun") / asset_name
+        result = obter_com_cache(url, archive, "bun", version, arch, sha256_esperado=sha256,
+                                 cancelar=cancelamento_solicitado)
+        if result["origem"] == "cache":
+            print("   .zip reaproveitado do cache de artefatos")
+        try:
+            bun_exe = _extract_bun(archive, bin_dir)
+        finally:
+            archive.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"⚠️  Não foi possível instalar o Bun a partir da release: {e}")
+        return False
+
+    add_bun_to_user_path(bin_dir)
+    print(f"✅ Bun instalado em: {bun_exe}")
+    return True
+
+
 def install_bun() -> bool:
+    """
+    Instala o Bun a partir da release (install_bun_native) e, se isso falhar,
+    pelo script oficial do PowerShell.
+
+    Returns:
+        bool: True se instalação bem-sucedida
+    """
+    if install_bun_native():
+        return True
+    print("   Usando o script oficial do Bun...")
+    return install_bun_script()
+
+
+def install_bun_script() -> bool:
     """
     Instala o Bun usando o script oficial do PowerShell.
     
     Returns:
         bool: True se instalação bem-sucedida
     """
+    from nodeecli.modules.execucao import executar_transmitindo
+
     print("📥 Instalando Bun Runtime...")
     print("   Comando: irm bun.sh/install.ps1 | iex")
     print()
@@ -95,28 +297,16 @@ def install_bun() -> bool:
             "irm bun.sh/install.ps1 | iex"
         ]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=300  # 5 minutos
-        )
+        # Saída do script repassada ao log enquanto ele executa
+        result = executar_transmitindo(cmd, "PowerShell", timeout=300)  # 5 minutos
 
-        if result.returncode == 0:
+        if result.sucesso:
             print("✅ Bun instalado com sucesso!")
-            if result.stdout:
-                # Mostrar apenas as últimas linhas relevantes
-                lines = result.stdout.strip().split('\n')
-                for line in lines[-5:]:
-                    if line.strip():
-                        print(f"   {line.strip()}")
             return True
         else:
             print(f"❌ Erro na instalação do Bun (código: {result.returncode})")
-            if result.stderr:
-                print(f"   Detalhes: {result.stderr[:500]}")
+            if result.cauda:
+                print(f"   Detalhes: {result.detalhe_erro()[:500]}")
             return False
 
     except subprocess.TimeoutExpired:
@@ -127,30 +317,79 @@ def install_bun() -> bool:
         return False
 
 
+def install_bun_from_bundle(bundle) -> bool:
+    """
+    Instala o Bun a partir do .zip incluído no bundle offline (sem PowerShell nem rede).
+
+    O build é escolhido como em install_bun_native: pela arquitetura e, em x64,
+    pelo suporte a AVX2 (o baseline também serve a CPUs com AVX2).
+
+    Args:
+        bundle (Bundle): Bundle offline
+
+    Returns:
+        bool: True se instalação bem-sucedida
+    """
+    from nodeecli.modules.bundle import ErroBundle, TIPO_BINARIO, extrair_executavel
+    from nodeecli.modules.common import detectar_arquitetura
+
+    arch = detectar_arquitetura()
+    try:
+        asset_names = [bun_asset_name(arch, _cpu_supports_avx2())]
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    if arch == "x64":
+        asset_names.append(bun_asset_name(arch, avx2=False))
+    entries = {
+        Path(e["arquivo"]).name: e for e in bundle.artefatos
+        if e.get("ferramenta") == "bun" and e.get("tipo") == TIPO_BINARIO
+    }
+    entry = next((entries[name] for name in asset_names if name in entries), None)
+    if not entry:
+        print(f"❌ O bundle não contém o Bun para este processador ({asset_names[0]}).")
+        return False
+
+    print(f"📦 Instalando Bun {entry.get('versao') or ''} do bundle offline...")
+    try:
+        bun_exe = extrair_executavel(bundle, entry, "bun.exe", bun_install_dir())
+    except (ErroBundle, OSError) as e:
+        print(f"❌ Erro ao extrair o Bun do bundle: {e}")
+        return False
+    add_bun_to_user_path(bun_install_dir())
+    print(f"✅ Bun instalado em: {bun_exe}")
+    return True
+
+
 def refresh_path() -> None:
     """
     Atualiza o PATH do processo atual para incluir o Bun.
     """
     # Caminho padrão do Bun no Windows
-    user_home = Path.home()
-    bun_path = user_home / ".bun" / "bin"
+    bun_path = bun_install_dir()
     
     if bun_path.exists():
         current_path = os.environ.get("PATH", "")
         if str(bun_path) not in current_path:
-            os.environ["PATH"] = f"{bun_path};{current_path}"
+            os.environ["PATH"] = f"{bun_path}{os.pathsep}{current_path}"
             print(f"   PATH atualizado: {bun_path}")
 
 
-def install_opencode() -> bool:
+def install_opencode(package: str = "opencode-ai", registry: Optional[str] = None) -> bool:
     """
     Instala o OpenCode CLI usando o Bun.
+
+    Args:
+        package (str): Pacote a instalar (nome no registro npm ou tarball do bundle offline)
+        registry (str): URL do registro npm a usar no lugar do padrão (registro local do bundle)
     
     Returns:
         bool: True se instalação bem-sucedida
     """
+    from nodeecli.modules.execucao import executar_transmitindo
+
     print("\n📥 Instalando OpenCode CLI...")
-    print("   Comando: bun add -g opencode-ai")
+    print(f"   Comando: bun add -g {package}")
     print()
 
     try:
@@ -158,8 +397,7 @@ def install_opencode() -> bool:
         refresh_path()
         
         # Encontrar o executável do Bun
-        user_home = Path.home()
-        bun_exe = user_home / ".bun" / "bin" / "bun.exe"
+        bun_exe = bun_install_dir() / "bun.exe"
         
         if not bun_exe.exists():
             # Tentar usar o bun do PATH
@@ -167,29 +405,20 @@ def install_opencode() -> bool:
         else:
             bun_cmd = str(bun_exe)
 
-        cmd = [bun_cmd, "add", "-g", "opencode-ai"]
+        cmd = [bun_cmd, "add", "-g", package]
+        if registry:
+            cmd += ["--registry", registry]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=180  # 3 minutos
-        )
+        # Saída do bun repassada ao log (e pacotes extraídos contados) enquanto ele executa
+        result = executar_transmitindo(cmd, "bun", timeout=180)  # 3 minutos
 
-        if result.returncode == 0:
+        if result.sucesso:
             print("✅ OpenCode CLI instalado com sucesso!")
-            if result.stdout:
-                lines = result.stdout.strip().split('\n')
-                for line in lines[-3:]:
-                    if line.strip():
-                        print(f"   {line.strip()}")
             return True
         else:
             print(f"❌ Erro na instalação do OpenCode CLI (código: {result.returncode})")
-            if result.stderr:
-                print(f"   Detalhes: {result.stderr[:500]}")
+            if result.cauda:
+                print(f"   Detalhes: {result.detalhe_erro()[:500]}")
             return False
 
     except FileNotFoundError:
@@ -203,6 +432,50 @@ def install_opencode() -> bool:
         return False
 
 
+def opencode_package_from_bundle(bundle) -> Optional[str]:
+    """
+    Copia o tarball do opencode-ai do bundle offline para o staging.
+
+    Returns:
+        str: Caminho do tarball, ou None se o bundle não o contiver
+    """
+    from nodeecli.modules.bundle import ErroBundle, TIPO_PACOTE_NPM
+    from nodeecli.modules.common import obter_diretorio_staging
+
+    entry = bundle.procurar("opencode", tipo=TIPO_PACOTE_NPM)
+    if not entry:
+        print("⚠️  O bundle não contém o opencode-ai; usando o registro npm.")
+        return None
+    try:
+        return bundle.materializar(entry, obter_diretorio_staging("npm") / Path(entry["arquivo"]).name)
+    except ErroBundle as e:
+        print(f"⚠️  {e}; usando o registro npm.")
+        return None
+
+
+def install_opencode_from_bundle(bundle) -> bool:
+    """
+    Instala o OpenCode CLI a partir do bundle offline.
+
+    Se o bundle trouxer as dependências do opencode-ai, o Bun instala tudo de um
+    registro local (npm_offline.RegistroLocal), sem acessar a rede; senão só o
+    tarball do pacote vem do bundle e as dependências vêm do registro npm.
+
+    Returns:
+        bool: True se instalação bem-sucedida
+    """
+    from nodeecli.modules.bundle import TIPO_PACOTE_NPM
+    from nodeecli.modules.npm_offline import RegistroLocal
+
+    entry = bundle.procurar("opencode", tipo=TIPO_PACOTE_NPM)
+    registry = RegistroLocal.do_bundle(bundle) if entry else None
+    if registry:
+        print(f"📦 Usando opencode-ai {entry.get('versao')} e dependências do bundle offline")
+        with registry:
+            return install_opencode(f"opencode-ai@{entry.get('versao')}", registry.url)
+    return install_opencode(opencode_package_from_bundle(bundle) or "opencode-ai")
+
+
 def install() -> int:
     """
     Função principal de instalação - API pública do módulo.
@@ -210,23 +483,24 @@ def install() -> int:
     Returns:
         int: 0 se sucesso, 1 se falha
     """
-    return main()
+    return main([])
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Interpreta os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Instalador automático do Bun + OpenCode CLI")
+    parser.add_argument("--from-bundle", dest="from_bundle", default=None, metavar="CAMINHO",
+                        help="Instalar sem acesso à rede a partir de um bundle offline "
+                             "(diretório ou .zip; padrão: ORQUESTRADOR_BUNDLE)")
+    parser.add_argument("--mirror", default=None, metavar="URL",
+                        help="Espelho de artefatos na rede local cujo registro npm será usado "
+                             "(padrão: ORQUESTRADOR_MIRROR)")
+    return parser.parse_args(argv)
 
 
-def main() -> int:
+def main(argv=None) -> int:
     """Função principal que orquestra o processo de instalação."""
-    # Import resiliente de configure_stdout_stderr (opcional)
-    try:
-        from nodeecli.modules.common import configure_stdout_stderr
-    except ModuleNotFoundError:
-        try:
-            project_root = Path(__file__).resolve().parent.parent
-            if (project_root / 'nodeecli').is_dir() and str(project_root) not in sys.path:
-                sys.path.insert(0, str(project_root))
-            from nodeecli.modules.common import configure_stdout_stderr
-        except ModuleNotFoundError:
-            def configure_stdout_stderr() -> None:
-                return None
+    args = parse_args(argv)
 
     try:
         configure_stdout_stderr()
@@ -235,6 +509,21 @@ def main() -> int:
     
     print_banner()
 
+    # Bundle offline (--from-bundle ou ORQUESTRADOR_BUNDLE)
+    bundle = None
+    if args.from_bundle or os.environ.get("ORQUESTRADOR_BUNDLE"):
+        from nodeecli.modules.bundle import ErroBundle, obter_bundle
+        try:
+            bundle = obter_bundle(args.from_bundle)
+        except ErroBundle as e:
+            print(f"❌ {e}")
+            return 1
+
+    # Espelho na rede local (--mirror ou ORQUESTRADOR_MIRROR): npm usa o registro do espelho
+    if args.mirror or os.environ.get("ORQUESTRADOR_MIRROR"):
+        from nodeecli.modules.mirror import configurar_npm, obter_espelho
+        configurar_npm(obter_espelho(args.mirror))
+
     # Verificar se está no Windows
     if not verify_windows():
         return 1
@@ -250,7 +539,9 @@ def main() -> int:
     try:
         # Passo 1: Instalar Bun (se não estiver instalado)
         if not is_bun_installed():
-            if not install_bun():
+            with fase("download") as etapa:
+                etapa.sucesso = install_bun_from_bundle(bundle) if bundle else install_bun()
+            if not etapa.sucesso:
                 print("\n❌ Falha na instalação do Bun.")
                 return 1
             # Aguardar um momento para o PATH ser atualizado
@@ -260,7 +551,9 @@ def main() -> int:
         
         # Passo 2: Instalar OpenCode CLI (se não estiver instalado)
         if not is_opencode_installed():
-            if not install_opencode():
+            with fase("instalacao") as etapa:
+                etapa.sucesso = install_opencode_from_bundle(bundle) if bundle else install_opencode()
+            if not etapa.sucesso:
                 print("\n❌ Falha na instalação do OpenCode CLI.")
                 success = False
 
@@ -284,4 +577,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(concluir(main()))
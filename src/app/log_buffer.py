@@ -0,0 +1,140 @@
+import os
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional, Set, TextIO, Tuple
+
+# Linhas mantidas em memória (a console exibe só as visíveis; o histórico completo vai para o disco)
+DEFAULT_CAPACITY = 5000
+# Históricos de sessões anteriores mantidos no diretório de logs
+HISTORY_KEEP = 20
+
+LOG_LEVELS = ("INFO", "WARNING", "ERROR", "SUCCESS")
+
+
+def default_history_dir() -> Path:
+    """Returns the directory of the session log files (created on first write)."""
+    local_appdata = os.environ.get('LOCALAPPDATA')
+    if local_appdata:
+        return Path(local_appdata) / 'OrquestradorInstalacoes' / 'logs'
+    return Path.home() / '.cache' / 'OrquestradorInstalacoes' / 'logs'
+
+
+def new_session_history(directory: Optional[Path] = None, keep: int = HISTORY_KEEP) -> Path:
+    """Returns the log file path of a new session, removing the oldest session files."""
+    directory = directory or default_history_dir()
+    try:
+        old = sorted(directory.glob('sessao-*.log'))
+        for path in old[:max(len(old) - keep + 1, 0)]:
+            path.unlink()
+    except OSError:
+        pass
+    return directory / f"sessao-{time.strftime('%Y%m%d-%H%M%S')}.log"
+
+
+class LogEntry:
+    """One line of the log console."""
+
+    __slots__ = ("timestamp", "level", "message")
+
+    def __init__(self, timestamp: str, level: str, message: str) -> None:
+        self.timestamp = timestamp
+        self.level = level
+        self.message = message
+
+    def text(self) -> str:
+        """Line as displayed in the console."""
+        return f"[{self.timestamp}] {self.message}"
+
+
+class LogBuffer:
+    """
+    Bounded log storage behind the console.
+
+    Keeps the last ``capacity`` lines and the subset that passes the current level
+    filter and search (``view``), updated incrementally as lines arrive; every line
+    is also appended to the session history file.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, history_path: Optional[Path] = None) -> None:
+        """Initializes an empty buffer writing its history to ``history_path`` (None: no history)."""
+        self.capacity = capacity
+        self.entries: Deque[LogEntry] = deque(maxlen=capacity)
+        self.view: Deque[LogEntry] = deque(maxlen=capacity)
+        self.levels: Optional[Set[str]] = None
+        self.query: str = ""
+        self.history_path: Optional[Path] = history_path
+        self._history: Optional[TextIO] = None
+
+    @property
+    def filtered(self) -> bool:
+        """True when a level filter or search is active."""
+        return self.levels is not None or bool(self.query)
+
+    def matches(self, entry: LogEntry) -> bool:
+        """Checks an entry against the level filter and the search (case-insensitive)."""
+        if self.levels is not None and entry.level not in self.levels:
+            return False
+        return not self.query or self.query in entry.message.lower()
+
+    def append(self, entries: Iterable[Tuple[str, str]], timestamp: Optional[str] = None) -> int:
+        """
+        Adds (message, level) entries.
+
+        Returns:
+            Number of entries that entered the filtered view.
+        """
+        timestamp = timestamp or time.strftime("%H:%M:%S")
+        added: List[LogEntry] = []
+        shown = 0
+        for message, level in entries:
+            entry = LogEntry(timestamp, level, message)
+            if len(self.entries) == self.entries.maxlen:
+                # A entrada descartada é a mais antiga; se estiver na visão, é a primeira dela
+                oldest = self.entries[0]
+                if self.view and self.view[0] is oldest:
+                    self.view.popleft()
+            self.entries.append(entry)
+            if self.matches(entry):
+                self.view.append(entry)
+                shown += 1
+            added.append(entry)
+        self._write_history(added)
+        return shown
+
+    def set_filter(self, levels: Optional[Iterable[str]] = None, query: str = "") -> None:
+        """Sets the level filter (None: all levels) and the search text, rebuilding the view."""
+        self.levels = set(levels) if levels is not None else None
+        self.query = query.strip().lower()
+        self.view = deque((entry for entry in self.entries if self.matches(entry)), maxlen=self.capacity)
+
+    def window(self, start: int, count: int) -> List[LogEntry]:
+        """Returns ``count`` entries of the view starting at ``start``."""
+        return list(islice(self.view, start, start + count))
+
+    def clear(self) -> None:
+        """Empties the console (the history file keeps everything)."""
+        self.entries.clear()
+        self.view.clear()
+
+    def close(self) -> None:
+        """Closes the history file."""
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
+    def _write_history(self, entries: List[LogEntry]) -> None:
+        if not entries or self.history_path is None:
+            return
+        try:
+            if self._history is None:
+                self.history_path.parent.mkdir(parents=True, exist_ok=True)
+                self._history = open(self.history_path, 'a', encoding='utf-8')
+            self._history.write("".join(
+                f"{entry.timestamp} [{entry.level}] {entry.message}\n" for entry in entries
+            ))
+            self._history.flush()
+        except OSError:
+            # Sem histórico em disco (disco cheio, sem permissão): a console continua funcionando
+            self.history_path = None
@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class WakeupQueue(queue.Queue):
+    """
+    Queue that wakes its consumer up instead of being polled.
+
+    The first ``put`` after the consumer re-arms the queue calls ``wakeup`` (in the
+    producer's thread); later puts add to the same pending batch without further calls.
+    """
+
+    def __init__(self, wakeup: Optional[Callable[[], None]] = None) -> None:
+        """Initializes the queue with the callback that schedules the consumer."""
+        super().__init__()
+        self.wakeup = wakeup
+        self._wakeup_pending = False
+        self._wakeup_lock = threading.Lock()
+
+    def put(self, item, block: bool = True, timeout: Optional[float] = None) -> None:
+        """Adds an item and wakes the consumer up if no wakeup is pending."""
+        super().put(item, block, timeout)
+        with self._wakeup_lock:
+            if self._wakeup_pending or self.wakeup is None:
+                return
+            self._wakeup_pending = True
+        try:
+            self.wakeup()
+        except Exception:
+            # Janela fechada ou loop do Tk ainda não iniciado: a próxima mensagem tenta de novo
+            with self._wakeup_lock:
+                self._wakeup_pending = False
+
+    def rearm(self) -> bool:
+        """
+        Re-enables wakeups once the consumer has emptied the queue.
+
+        Returns True (leaving wakeups disabled) if items arrived in the meantime:
+        the consumer must then schedule another pass itself.
+        """
+        with self._wakeup_lock:
+            if self.qsize():
+                return True
+            self._wakeup_pending = False
+            return False
+
+
+class MessageBatch:
+    """Messages taken from the queue in one pump pass, with redundant updates collapsed."""
+
+    def __init__(self) -> None:
+        """Initializes an empty batch."""
+        self.logs: List[Tuple[str, str]] = []
+        # Só o último valor importa: barra geral e estado (fase/download/atividade) de cada ferramenta
+        self.progress: Optional[float] = None
+        self.tool_updates: Dict[str, tuple] = {}
+        self.complete: Optional[tuple] = None
+        self.received = 0
+
+    def add(self, message: tuple) -> None:
+        """Adds a service message (``('LOG', text, level)``, ``('PROGRESS', value)``...)."""
+        self.received += 1
+        msg_type = message[0]
+        if msg_type == 'LOG':
+            self.logs.append((message[1], message[2]))
+        elif msg_type == 'PROGRESS':
+            self.progress = message[1]
+        elif msg_type in ('DOWNLOAD', 'PHASE', 'ACTIVITY'):
+            # Remover antes de inserir: a ordem entre ferramentas segue a última atualização
+            self.tool_updates.pop(message[1], None)
+            self.tool_updates[message[1]] = message
+        elif msg_type == 'COMPLETE':
+            self.complete = message
+
+    @property
+    def applied(self) -> int:
+        """Number of UI updates the batch turns into (logs count as one insertion)."""
+        return (
+            (1 if self.logs else 0) + (self.progress is not None) + len(self.tool_updates)
+            + (self.complete is not None)
+        )
+
+
+def drain(
+    message_queue: queue.Queue, budget: float, clock: Callable[[], float] = time.perf_counter
+) -> Tuple[MessageBatch, bool]:
+    """
+    Takes messages from the queue for at most ``budget`` seconds.
+
+    Stops early at COMPLETE, which must be handled after everything before it.
+
+    Returns:
+        The batch and whether messages may remain in the queue.
+    """
+    batch = MessageBatch()
+    deadline = clock() + budget
+    while True:
+        try:
+            message = message_queue.get_nowait()
+        except queue.Empty:
+            return batch, False
+        batch.add(message)
+        if batch.complete is not None:
+            return batch, not message_queue.empty()
+        if clock() >= deadline:
+            return batch, True
@@ -1,11 +1,28 @@
 
-import tkinter.messagebox as messagebox
 import threading
-import queue
 import customtkinter as ctk
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from nodeecli.modules.progress import estimar_restante, formatar_progresso, formatar_tempo
 from ..ui.main_view import MainView
 from .app_state import AppState
-from ..core.installation_service import InstallationService
+from .message_pump import MessageBatch, WakeupQueue, drain
+
+if TYPE_CHECKING:
+    from ..core.installation_service import InstallationService
+
+# Tempo máximo por passada da fila no loop do Tk (o restante fica para a próxima)
+PUMP_BUDGET = 0.008
+# Evento virtual gerado pela thread de instalação quando há mensagens novas
+MESSAGES_EVENT = "<<MessagesQueued>>"
+# Verificação de segurança da fila durante a instalação, caso um aviso se perca
+WATCHDOG_MS = 1000
+
+# Textos das etapas anunciadas pelos instaladores (eventos de fase): em andamento, concluída
+PHASE_LABELS: Dict[str, Tuple[str, str]] = {
+    "download": ("baixando...", "download concluído"),
+    "instalacao": ("instalando...", "instalado"),
+    "cli": ("instalando ferramentas CLI...", "ferramentas CLI instaladas"),
+}
 
 class OrchestratorApp:
     """Orchestrator for the installation application."""
@@ -14,11 +31,22 @@ class OrchestratorApp:
         """Initializes the orchestrator."""
         self.root = root
         self.state = AppState()
-        self.message_queue = queue.Queue()
-        self.installation_service = InstallationService(self.message_queue)
+        self.message_queue = WakeupQueue(self._request_pump)
+        self._installation_service: Optional["InstallationService"] = None
+        # Último progresso de cada download: ferramenta -> (bytes, total, bytes/s)
+        self.downloads: Dict[str, Tuple[int, Optional[int], Optional[float]]] = {}
 
         self._configure_ui_listeners()
         self.root.set_on_closing_callback(self._on_closing)
+        self.root.bind(MESSAGES_EVENT, lambda event: self._process_queue())
+
+    @property
+    def installation_service(self) -> "InstallationService":
+        """Service running the installers (imported and created on first use, after the window is up)."""
+        if self._installation_service is None:
+            from ..core.installation_service import InstallationService
+            self._installation_service = InstallationService(self.message_queue)
+        return self._installation_service
 
     def _configure_ui_listeners(self) -> None:
         """Configures listeners for UI events."""
@@ -68,13 +96,15 @@ class OrchestratorApp:
         self.state.installation_in_progress = True
         self._set_ui_state(installing=True)
 
-        self.root.console_textbox.configure(state="normal")
-        self.root.console_textbox.delete("1.0", "end")
-        self.root.console_textbox.configure(state="disabled")
+        self.root.clear_log()
 
         self.installation_service.cancel_requested = False
+        self.downloads.clear()
+        self.root.clear_tool_progress()
 
         self.root.log_message("=== INICIANDO INSTALAÇÃO ===", "INFO")
+        if self.root.log_buffer.history_path:
+            self.root.log_message(f"Histórico completo do log: {self.root.log_buffer.history_path}", "INFO")
 
         threading.Thread(
             target=self.installation_service.run_installations,
@@ -92,37 +122,96 @@ class OrchestratorApp:
             daemon=True,
         ).start()
 
-        self.root.after(100, self._process_queue)
+        self.root.after(WATCHDOG_MS, self._watchdog)
 
-    def cancel_installation(self) -> None:
-        """Cancels the installation process."""
-        self.installation_service.cancel_installation()
+    def cancel_installation(self, wait: bool = False) -> None:
+        """Cancels the installation process (``wait``: until the installers are gone)."""
+        self.installation_service.cancel_installation(wait=wait)
         self.root.cancel_button.configure(state="disabled")
 
+    def _request_pump(self) -> None:
+        """Wakes the Tk loop up to process the queue (called from the installation thread)."""
+        self.root.event_generate(MESSAGES_EVENT, when="tail")
+
+    def _watchdog(self) -> None:
+        """Processes the queue at a slow pace during the installation, in case a wakeup was lost."""
+        if not self.state.installation_in_progress:
+            return
+        if not self.message_queue.empty():
+            self._process_queue()
+        self.root.after(WATCHDOG_MS, self._watchdog)
+
     def _process_queue(self) -> None:
-        """Processes messages from the installation service."""
+        """Applies the queued messages for at most PUMP_BUDGET seconds, collapsing redundant updates."""
         try:
-            while True:
-                message = self.message_queue.get_nowait()
-                msg_type, *payload = message
-
-                if msg_type == 'LOG':
-                    self.root.log_message(payload[0], payload[1])
-                elif msg_type == 'PROGRESS':
-                    if self.root.progress_bar.cget("mode") == "indeterminate":
-                        self.root.progress_bar.stop()
-                        self.root.progress_bar.configure(mode="determinate")
-                    self.root.progress_bar.set(payload[0])
-                elif msg_type == 'COMPLETE':
-                    self._installation_complete(*payload)
-                    return
-        except queue.Empty:
-            pass
+            batch, more = drain(self.message_queue, PUMP_BUDGET)
+            self._apply_batch(batch)
         except Exception as e:
             self.root.log_message(f"Erro ao processar mensagem da fila: {e}", "ERROR")
+            more = not self.message_queue.empty()
 
-        if self.state.installation_in_progress:
-            self.root.after(100, self._process_queue)
+        # Com mensagens pendentes, continuar depois que o Tk atender a tela e os cliques
+        if more or self.message_queue.rearm():
+            self.root.after(1, self._process_queue)
+
+    def _apply_batch(self, batch: MessageBatch) -> None:
+        """Applies one pump pass to the UI."""
+        if batch.logs:
+            self.root.log_messages(batch.logs)
+        for msg_type, *payload in batch.tool_updates.values():
+            if msg_type == 'DOWNLOAD':
+                self._update_download(*payload)
+            elif msg_type == 'ACTIVITY':
+                self._update_activity(*payload)
+            else:
+                self._update_phase(*payload)
+        if batch.progress is not None:
+            if self.root.progress_bar.cget("mode") == "indeterminate":
+                self.root.progress_bar.stop()
+                self.root.progress_bar.configure(mode="determinate")
+            self.root.progress_bar.set(batch.progress)
+        if batch.complete is not None:
+            self._installation_complete(*batch.complete[1:])
+
+    def _update_download(self, tool: str, downloaded: int, total: Optional[int], rate: Optional[float]) -> None:
+        """Shows a tool's byte progress and ETA, and the combined rate of all downloads."""
+        self.downloads[tool] = (downloaded, total, rate)
+        fraction = downloaded / total if total else None
+        self.root.show_tool_progress(tool, f"{tool}: {formatar_progresso(downloaded, total, rate)}", fraction)
+        self._refresh_download_status()
+
+    def _refresh_download_status(self) -> None:
+        """Shows the combined rate and ETA of the running downloads in the status label."""
+        active = [values for values in self.downloads.values() if not values[1] or values[0] < values[1]]
+        if not active:
+            self.root.status_label.configure(text="Downloads concluídos")
+            return
+        speed = sum(values[2] or 0 for values in active)
+        text = f"Baixando {len(active)} arquivo(s)"
+        if speed:
+            text += f" — {speed / (1024 * 1024):.1f} MB/s"
+            remaining = estimar_restante(
+                sum(values[0] for values in active), sum(values[1] or 0 for values in active), speed
+            )
+            if remaining is not None and all(values[1] for values in active):
+                text += f", ~{formatar_tempo(remaining)} restantes"
+        self.root.status_label.configure(text=text)
+
+    def _update_activity(self, tool: str, description: str, fraction: Optional[float]) -> None:
+        """Shows what a tool's package manager is doing (npm/bun output counters)."""
+        self.root.show_tool_progress(tool, f"{tool}: {description}", fraction)
+
+    def _update_phase(self, tool: str, phase: str, finished: bool, success: Optional[bool]) -> None:
+        """Shows the phase a tool is in (download, installation...)."""
+        running, done = PHASE_LABELS.get(phase, (f"{phase}...", f"{phase} concluído"))
+        if self.downloads.pop(tool, None) is not None:
+            self._refresh_download_status()
+        if not finished:
+            self.root.show_tool_progress(tool, f"{tool}: {running}", 0.0 if phase == "download" else None)
+        elif success:
+            self.root.show_tool_progress(tool, f"{tool}: {done}", 1.0)
+        else:
+            self.root.show_tool_progress(tool, f"{tool}: falhou ({running.rstrip('.')})")
 
     def _installation_complete(self, success_count: int, failure_count: int) -> None:
         """Handles the completion of the installation."""
@@ -163,16 +252,31 @@ class OrchestratorApp:
     def _on_closing(self) -> None:
         """Handles the window closing event."""
         if self.state.installation_in_progress:
+            import tkinter.messagebox as messagebox
             if messagebox.askyesno(
                 "Instalação em Andamento",
                 "Deseja realmente sair e cancelar a instalação?",
                 icon=messagebox.WARNING,
             ):
-                self.cancel_installation()
+                # Esperar o encerramento: ao sair, nenhum instalador pode ficar órfão
+                self.cancel_installation(wait=True)
                 self.root.destroy()
         else:
             self.root.destroy()
 
+    def _warm_up_network(self) -> None:
+        """Pre-resolves DNS and opens connections to the download hosts in the background."""
+        def warm_up() -> None:
+            try:
+                from nodeecli.modules.http_client import aquecer_conexoes
+                aquecer_conexoes()
+            except Exception:
+                pass  # apenas otimização: falhas aqui não afetam a instalação
+
+        threading.Thread(target=warm_up, daemon=True).start()
+
     def run(self) -> None:
         """Runs the application."""
+        # Aquecer a rede quando a janela estiver ociosa (usuário escolhendo as ferramentas)
+        self.root.after_idle(self._warm_up_network)
         self.root.mainloop()
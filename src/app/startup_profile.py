@@ -0,0 +1,148 @@
+import builtins
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+# Orçamento da primeira pintura da janela, contado desde a criação do processo
+FIRST_PAINT_BUDGET = 1.0
+# Pacotes exibidos no detalhamento dos imports (os demais são somados em "outros")
+TOP_IMPORTS = 8
+
+
+def process_age() -> Optional[float]:
+    """Seconds since the current process was created (interpreter or bootloader startup included)."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            from ctypes import wintypes
+
+            creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(
+                kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(exit_time),
+                ctypes.byref(kernel), ctypes.byref(user),
+            ):
+                return None
+            # FILETIME: intervalos de 100 ns desde 1601-01-01
+            created = ((creation.dwHighDateTime << 32) | creation.dwLowDateTime) / 1e7 - 11644473600
+            return max(time.time() - created, 0.0)
+        with open('/proc/self/stat') as stat:
+            # Campo 22 (starttime, em ticks desde o boot); o nome do processo pode conter espaços
+            start_ticks = int(stat.read().rpartition(')')[2].split()[19])
+        with open('/proc/uptime') as uptime:
+            return max(float(uptime.read().split()[0]) - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfile:
+    """
+    Startup timing of the GUI (``main.py --startup-profile``).
+
+    Records the time spent before ``main()`` (process creation, interpreter or
+    bootloader), the time of each marked step and the import time of each
+    top-level package. The report is printed once the window is first painted
+    and is compared against ``FIRST_PAINT_BUDGET``.
+    """
+
+    def __init__(self) -> None:
+        """Starts the clock (call as early as possible in ``main()``)."""
+        self.started = time.perf_counter()
+        self.before_main: Optional[float] = process_age()
+        self.steps: List[Tuple[str, float]] = []
+        # Tempo próprio de import de cada pacote (sem os pacotes que ele importou)
+        self.imports: Dict[str, float] = defaultdict(float)
+        self._original_import: Optional[Callable] = None
+
+    def mark(self, step: str) -> None:
+        """Ends a step started at the previous mark (or at the profile start)."""
+        self.steps.append((step, time.perf_counter()))
+
+    def track_imports(self) -> None:
+        """Times the first import of each module made by the main thread until ``stop_tracking()``."""
+        original = self._original_import = builtins.__import__
+        main_thread = threading.main_thread()
+        # Pacotes sendo importados: [pacote, início, tempo dos pacotes importados por ele]
+        stack: List[list] = []
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or threading.current_thread() is not main_thread:
+                return original(name, globals, locals, fromlist, level)
+            package = name.partition('.')[0]
+            if stack and stack[-1][0] == package:
+                return original(name, globals, locals, fromlist, level)
+            frame = [package, time.perf_counter(), 0.0]
+            stack.append(frame)
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                stack.pop()
+                elapsed = time.perf_counter() - frame[1]
+                self.imports[package] += elapsed - frame[2]
+                if stack:
+                    stack[-1][2] += elapsed
+
+        builtins.__import__ = timed_import
+
+    def stop_tracking(self) -> None:
+        """Restores the regular import machinery."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @property
+    def first_paint(self) -> float:
+        """Seconds from process creation to the last mark (the first paint, once reported)."""
+        end = self.steps[-1][1] if self.steps else time.perf_counter()
+        return (self.before_main or 0.0) + end - self.started
+
+    def within_budget(self, budget: float = FIRST_PAINT_BUDGET) -> bool:
+        """True if the first paint happened within ``budget`` seconds."""
+        return self.first_paint <= budget
+
+    def report(self, budget: float = FIRST_PAINT_BUDGET) -> str:
+        """Startup breakdown in milliseconds."""
+        lines = ["Perfil de inicialização (ms)"]
+        if self.before_main is not None:
+            lines.append(f"  {'Antes de main() (processo, interpretador)':<44} {self.before_main * 1000:>7.0f}")
+        previous = self.started
+        for step, timestamp in self.steps:
+            lines.append(f"  {step:<44} {(timestamp - previous) * 1000:>7.0f}")
+            previous = timestamp
+        if self.imports:
+            lines.append("  Imports por pacote:")
+            ranked = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+            for package, elapsed in ranked[:TOP_IMPORTS]:
+                lines.append(f"    {package:<42} {elapsed * 1000:>7.0f}")
+            others = sum(elapsed for _, elapsed in ranked[TOP_IMPORTS:])
+            if others:
+                lines.append(f"    {f'outros ({len(ranked) - TOP_IMPORTS})':<42} {others * 1000:>7.0f}")
+        verdict = "dentro do orçamento" if self.within_budget(budget) else "ACIMA DO ORÇAMENTO"
+        lines.append(f"  {'Total até a primeira pintura':<44} {self.first_paint * 1000:>7.0f}  "
+                     f"({verdict} de {budget * 1000:.0f} ms)")
+        return "\n".join(lines)
+
+    def watch_first_paint(self, root, on_painted: Callable[[], None]) -> None:
+        """
+        Calls ``on_painted`` once the window is first drawn.
+
+        The first ``<Expose>`` event marks the start of the drawing; the pending
+        redraws run before the idle callback that closes the measurement.
+        """
+        def exposed(event) -> None:
+            root.unbind("<Expose>", binding)
+            root.after_idle(painted)
+
+        def painted() -> None:
+            self.mark("Primeira pintura")
+            self.stop_tracking()
+            on_painted()
+
+        binding = root.bind("<Expose>", exposed, add="+")
+
+    def print_report(self, stream: Optional[TextIO] = None, budget: float = FIRST_PAINT_BUDGET) -> None:
+        """Prints the report to ``stream`` (stdout by default)."""
+        print(self.report(budget), file=stream or sys.stdout, flush=True)
@@ -0,0 +1,326 @@
+"""
+Orquestrador de Instalações - Comandos de linha de comando
+
+Executado por src/main.py quando há argumentos; sem argumentos, a GUI é aberta.
+"""
+import argparse
+import sys
+import threading
+from datetime import datetime
+from queue import Queue
+from typing import Callable, Dict, List, Optional
+
+from nodeecli.modules.artifact_cache import ArtifactCache
+from nodeecli.modules.bundle import Bundle, ErroBundle
+from nodeecli.modules.progress import formatar_progresso
+
+from .core.tools import INSTALLER_SCRIPTS, TOOL_SPECS
+from .runner import run_installer
+
+
+def _format_size(size: Optional[int]) -> str:
+    """Formats a byte count as MB."""
+    return f"{(size or 0) / (1024 * 1024):.1f} MB"
+
+
+def _format_time(timestamp: Optional[float]) -> str:
+    """Formats a Unix timestamp as local date/time."""
+    if not timestamp:
+        return "-"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def cmd_cache_list(args: argparse.Namespace) -> int:
+    """
+    Lists the artifacts stored in the local cache.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code.
+    """
+    cache = ArtifactCache()
+    entries = cache.listar()
+    print(f"Cache de artefatos: {cache.raiz}")
+    if not entries:
+        print("Nenhum artefato no cache.")
+        return 0
+
+    print(f"{'Ferramenta':<12} {'Versão':<12} {'Arq.':<6} {'Tamanho':>10}  {'Último uso':<16}  SHA-256")
+    for entry in entries:
+        sha = entry.get("sha256", "")
+        missing = "" if entry["presente"] else "  (ausente)"
+        print(
+            f"{entry.get('ferramenta') or '-':<12} {entry.get('versao') or '-':<12} "
+            f"{entry.get('arquitetura') or '-':<6} {_format_size(entry.get('tamanho')):>10}  "
+            f"{_format_time(entry.get('ultimo_uso')):<16}  {sha[:12]}{missing}"
+        )
+    print(f"Total: {_format_size(cache.tamanho_total())} de {_format_size(cache.orcamento_bytes)}")
+    return 0
+
+
+def cmd_cache_prune(args: argparse.Namespace) -> int:
+    """
+    Evicts least recently used artifacts until the cache fits the budget.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code.
+    """
+    cache = ArtifactCache()
+    if args.all:
+        limit = 0
+    elif args.max_mb is not None:
+        limit = args.max_mb * 1024 * 1024
+    else:
+        limit = None
+
+    removed = cache.podar(limit)
+    for entry in removed:
+        print(f"Removido: {entry.get('ferramenta')} {entry.get('versao') or ''} ({entry.get('sha256', '')[:12]})")
+    print(f"{len(removed)} artefato(s) removido(s). Ocupado: {_format_size(cache.tamanho_total())}")
+    return 0
+
+
+def _parse_tools(value: Optional[str]) -> Optional[List[str]]:
+    """Parses a comma-separated list of tool keys (None = every tool)."""
+    if not value:
+        return None
+    return [key.strip() for key in value.split(",") if key.strip()]
+
+
+def cmd_bundle_build(args: argparse.Namespace) -> int:
+    """
+    Downloads every artifact of the selected tools into an offline bundle.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code.
+    """
+    from .core.bundle import build_bundle
+
+    try:
+        bundle = build_bundle(args.output, _parse_tools(args.tools), arch=args.arch)
+    except Exception as e:
+        print(f"Falha ao gerar o bundle: {e}")
+        return 1
+
+    total = sum(entry.get("tamanho", 0) for entry in bundle.artefatos)
+    print(f"Bundle gerado em {bundle.raiz}: {len(bundle.artefatos)} artefato(s), {_format_size(total)}")
+    if args.archive:
+        print(f"Compactando em {args.archive}...")
+        print(f"Arquivo gerado: {bundle.compactar(args.archive)}")
+    return 0
+
+
+def cmd_bundle_verify(args: argparse.Namespace) -> int:
+    """
+    Checks the presence and SHA-256 of every artifact of a bundle.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code.
+    """
+    try:
+        bundle = Bundle.abrir(args.path)
+    except ErroBundle as e:
+        print(str(e))
+        return 1
+
+    for entry in bundle.artefatos:
+        print(f"{entry.get('ferramenta'):<12} {entry.get('versao') or '-':<16} {entry['arquivo']}")
+    problems = bundle.verificar()
+    for entry, problem in problems:
+        print(f"ERRO: {entry['arquivo']}: {problem}")
+    print(f"{len(bundle.artefatos)} artefato(s), {len(problems)} com problema")
+    return 1 if problems else 0
+
+
+def cmd_mirror_serve(args: argparse.Namespace) -> int:
+    """
+    Serves the local artifact cache as a LAN mirror until interrupted.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code.
+    """
+    from .core.mirror import MirrorServer
+
+    cache = ArtifactCache(orcamento_bytes=args.max_mb * 1024 * 1024 if args.max_mb is not None else None)
+    try:
+        server = MirrorServer(args.bind, args.port, cache=cache, log=print if args.verbose else None)
+    except OSError as e:
+        print(f"Não foi possível abrir a porta {args.port}: {e}")
+        return 1
+
+    print(f"Espelho de artefatos em http://{args.bind}:{args.port} (cache: {cache.raiz})")
+    print(f"Nos demais computadores: --mirror http://<este-computador>:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def cmd_install(args: argparse.Namespace) -> int:
+    """
+    Runs the installations without the GUI, printing the installers' output.
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: Exit code (0 if every tool was installed).
+    """
+    from .core.installation_service import InstallationService
+
+    tools = _parse_tools(args.tools)
+    valid_keys = [spec.key for spec in TOOL_SPECS]
+    unknown = [key for key in tools or [] if key not in valid_keys]
+    if unknown:
+        print(f"Ferramentas desconhecidas: {', '.join(unknown)}")
+        print(f"Ferramentas válidas: {', '.join(valid_keys)}")
+        return 2
+    if tools is None and args.from_bundle:
+        # Padrão: as ferramentas incluídas no bundle
+        try:
+            tools = Bundle.abrir(args.from_bundle).manifesto.get("ferramentas")
+        except ErroBundle as e:
+            print(str(e))
+            return 1
+    selected = set(tools or (spec.key for spec in TOOL_SPECS))
+
+    messages: Queue = Queue()
+    service = InstallationService(
+        messages, bundle_path=args.from_bundle, mirror_url=args.mirror, in_process=not args.subprocess,
+        preflight=not args.force,
+    )
+    worker = threading.Thread(
+        target=service.run_installations,
+        kwargs=dict(
+            node_selected="nodejs" in selected or "cli_tools" in selected,
+            vscode_selected="vscode" in selected,
+            antigravity_selected="antigravity" in selected,
+            git_selected="git" in selected,
+            mcp_excel_selected="mcp_excel" in selected,
+            opencode_selected="opencode" in selected,
+            auto_mode=True,
+            download_timeout=args.download_timeout,
+            install_timeout=args.install_timeout,
+        ),
+        daemon=True,
+    )
+    worker.start()
+    download_steps: Dict[str, int] = {}
+    try:
+        while True:
+            message = messages.get()
+            if message[0] == "LOG":
+                print(message[1], flush=True)
+            elif message[0] == "DOWNLOAD":
+                tool, downloaded, total, rate = message[1:]
+                # Uma linha a cada 10% (a GUI mostra a barra completa)
+                step = downloaded * 10 // total if total else None
+                if step is not None and step != download_steps.get(tool):
+                    download_steps[tool] = step
+                    print(f"[{tool}] Download: {formatar_progresso(downloaded, total, rate)}", flush=True)
+            elif message[0] == "COMPLETE":
+                success, failure = message[1], message[2]
+                print(f"Concluído: {success} sucesso(s), {failure} falha(s)")
+                return 0 if failure == 0 else 1
+    except KeyboardInterrupt:
+        service.cancel_installation(wait=True)
+        worker.join(timeout=5)
+        return 130
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """
+    Runs one installer in this process (see src/runner.py).
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    Returns:
+        int: The installer's exit code.
+    """
+    return run_installer(args.tool, args.installer_args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser with every subcommand."""
+    parser = argparse.ArgumentParser(prog="orquestrador", description="Orquestrador de Instalações")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cache = commands.add_parser("cache", help="Gerencia o cache local de instaladores")
+    cache_commands = cache.add_subparsers(dest="cache_command", required=True)
+
+    cache_list = cache_commands.add_parser("list", help="Lista os artefatos em cache")
+    cache_list.set_defaults(handler=cmd_cache_list)
+
+    cache_prune = cache_commands.add_parser("prune", help="Remove artefatos usados há mais tempo")
+    group = cache_prune.add_mutually_exclusive_group()
+    group.add_argument("--max-mb", type=int, help="Limite de espaço a aplicar (padrão: orçamento do cache)")
+    group.add_argument("--all", action="store_true", help="Esvazia o cache")
+    cache_prune.set_defaults(handler=cmd_cache_prune)
+
+    tool_keys = ", ".join(spec.key for spec in TOOL_SPECS)
+
+    bundle = commands.add_parser("bundle", help="Gera e confere pacotes offline de instaladores")
+    bundle_commands = bundle.add_subparsers(dest="bundle_command", required=True)
+
+    bundle_build = bundle_commands.add_parser("build", help="Baixa todos os artefatos para um bundle offline")
+    bundle_build.add_argument("--output", required=True, help="Diretório do bundle")
+    bundle_build.add_argument("--archive", help="Também gera um .zip com o bundle")
+    bundle_build.add_argument("--tools", help=f"Ferramentas separadas por vírgula (padrão: todas: {tool_keys})")
+    bundle_build.add_argument("--arch", choices=["x64", "arm64"], default="x64",
+                              help="Arquitetura dos instaladores do Node.js e do Antigravity")
+    bundle_build.set_defaults(handler=cmd_bundle_build)
+
+    bundle_verify = bundle_commands.add_parser("verify", help="Confere os artefatos de um bundle")
+    bundle_verify.add_argument("path", help="Diretório do bundle ou arquivo .zip")
+    bundle_verify.set_defaults(handler=cmd_bundle_verify)
+
+    mirror = commands.add_parser("mirror", help="Espelho de artefatos para a rede local")
+    mirror_commands = mirror.add_subparsers(dest="mirror_command", required=True)
+
+    mirror_serve = mirror_commands.add_parser("serve", help="Serve o cache de artefatos aos demais orquestradores")
+    mirror_serve.add_argument("--bind", default="0.0.0.0", help="Endereço de escuta (padrão: todas as interfaces)")
+    mirror_serve.add_argument("--port", type=int, default=8080, help="Porta de escuta (padrão: 8080)")
+    mirror_serve.add_argument("--max-mb", type=int, help="Espaço máximo do cache (padrão: orçamento do cache)")
+    mirror_serve.add_argument("--verbose", action="store_true", help="Exibe cada requisição atendida")
+    mirror_serve.set_defaults(handler=cmd_mirror_serve)
+
+    install = commands.add_parser("install", help="Instala as ferramentas sem abrir a GUI")
+    install.add_argument("--from-bundle", dest="from_bundle", metavar="CAMINHO",
+                         help="Instalar sem acesso à rede a partir de um bundle offline")
+    install.add_argument("--mirror", metavar="URL", help="Baixar de um espelho na rede local (mirror serve)")
+    install.add_argument("--tools", help=f"Ferramentas separadas por vírgula (padrão: as do bundle, ou todas: {tool_keys})")
+    install.add_argument("--download-timeout", type=int, default=300, help="Timeout de download em segundos")
+    install.add_argument("--install-timeout", type=int, default=300, help="Timeout de instalação em segundos")
+    install.add_argument("--subprocess", action="store_true",
+                         help="Executar também os downloads em processos separados (um por instalador)")
+    install.add_argument("--force", action="store_true",
+                         help="Executar os instaladores mesmo das ferramentas já atualizadas")
+    install.set_defaults(handler=cmd_install)
+
+    run = commands.add_parser("run", help="Executa um instalador (usado pelo executável empacotado)")
+    run.add_argument("tool", choices=list(INSTALLER_SCRIPTS), help="Instalador a executar")
+    run.add_argument("installer_args", nargs=argparse.REMAINDER, help="Argumentos repassados ao instalador")
+    run.set_defaults(handler=cmd_run)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs a command-line subcommand.
+    Args:
+        argv (List[str]): Arguments (defaults to sys.argv[1:]).
+    Returns:
+        int: Exit code.
+    """
+    args = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    return handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+import base64
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from nodeecli.modules.artifact_cache import obter_com_cache
+from nodeecli.modules.bundle import (
+    TIPO_BINARIO, TIPO_CHECKSUMS, TIPO_INSTALADOR, TIPO_PACOTE_NPM, TIPO_REPOSITORIO, Bundle,
+)
+from nodeecli.modules.metadata_cache import TTL_IMUTAVEL, TTL_PADRAO, MetadataCache
+
+NPM_REGISTRY = "https://registry.npmjs.org"
+GITHUB_API = "https://api.github.com/repos"
+
+
+class BundleArtifact:
+    """One file to be included in an offline bundle."""
+
+    def __init__(
+        self,
+        tool: str,
+        kind: str,
+        name: str,
+        url: Optional[str] = None,
+        version: Optional[str] = None,
+        arch: Optional[str] = None,
+        sha256: Optional[str] = None,
+        integrity: Optional[str] = None,
+        content: Optional[bytes] = None,
+        extras: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Initializes the artifact description.
+        Args:
+            tool (str): Tool identifier inside the bundle (e.g. 'nodejs', 'gemini-cli').
+            kind (str): Artifact type (one of the TIPO_* constants of nodeecli.modules.bundle).
+            name (str): File name inside the bundle.
+            url (str): Source URL (a git remote for repository artifacts).
+            version (str): Resolved version.
+            arch (str): Target architecture, or None if architecture independent.
+            sha256 (str): Expected SHA-256, checked while downloading.
+            integrity (str): npm Subresource Integrity string ('sha512-...'), checked after download.
+            content (bytes): Already fetched content (written as is, no download).
+            extras (Dict[str, str]): Additional manifest metadata.
+        """
+        self.tool = tool
+        self.kind = kind
+        self.name = name
+        self.url = url
+        self.version = version
+        self.arch = arch
+        self.sha256 = sha256
+        self.integrity = integrity
+        self.content = content
+        self.extras = extras or {}
+
+
+def _github_release_asset(tool: str, repo: str, asset_name: str, arch: str) -> BundleArtifact:
+    """Resolves an asset of the latest GitHub release (through the metadata cache)."""
+    release = MetadataCache().obter(
+        f"{GITHUB_API}/{repo}/releases/latest", ttl=TTL_PADRAO,
+        headers={"Accept": "application/vnd.github+json"},
+    ).json()
+    for asset in release.get("assets", []):
+        if asset.get("name") == asset_name:
+            return BundleArtifact(tool, TIPO_BINARIO, asset_name, url=asset["browser_download_url"],
+                                  version=release.get("tag_name"), arch=arch)
+    raise ValueError(f"Asset {asset_name} não encontrado na release mais recente de {repo}")
+
+
+def _npm_package(tool: str, package: str) -> BundleArtifact:
+    """Resolves the tarball of the latest version of an npm package."""
+    manifest = MetadataCache().obter(f"{NPM_REGISTRY}/{quote(package, safe='@')}/latest", ttl=TTL_PADRAO).json()
+    dist = manifest["dist"]
+    return BundleArtifact(
+        tool, TIPO_PACOTE_NPM, dist["tarball"].rsplit("/", 1)[-1], url=dist["tarball"],
+        version=manifest["version"], integrity=dist.get("integrity"), extras={"pacote": package},
+    )
+
+
+def _npm_dependencies(package: str, version: str, arch: str) -> List[BundleArtifact]:
+    """Resolves the tarball of every dependency of an npm package for Windows on the given architecture.
+
+    The tree is resolved once by npm itself (exact versions and integrity from a
+    package-lock), so that installs from the bundle never query the registry.
+    Without npm on the build machine only the package tarball is bundled and
+    its dependencies are still fetched from the registry at install time.
+    """
+    from nodeecli.modules.npm_offline import (
+        FERRAMENTA_DEPENDENCIAS, ErroResolucao, nome_arquivo_tarball, resolver_dependencias,
+    )
+
+    npm_path = shutil.which("npm")
+    if not npm_path:
+        return []
+    try:
+        dependencies = resolver_dependencias(package, version, npm_path, registro=f"{NPM_REGISTRY}/",
+                                             arquitetura=arch)
+    except ErroResolucao as e:
+        raise ValueError(str(e))
+    return [
+        BundleArtifact(FERRAMENTA_DEPENDENCIAS, TIPO_PACOTE_NPM, nome_arquivo_tarball(dep["nome"], dep["versao"]),
+                       url=dep["url"], version=dep["versao"], integrity=dep["integrity"],
+                       extras={"pacote": dep["nome"]})
+        for dep in dependencies if dep["nome"] != package
+    ]
+
+
+def _npm_package_tree(tool: str, package: str, arch: str) -> List[BundleArtifact]:
+    """Resolves an npm package tarball together with the tarballs of its dependencies."""
+    artifact = _npm_package(tool, package)
+    return [artifact, *_npm_dependencies(package, artifact.version, arch)]
+
+
+def _resolve_nodejs(arch: str) -> List[BundleArtifact]:
+    from nodeecli.modules.node_releases import IndiceReleases
+
+    release = IndiceReleases.carregar().mais_recente("lts", arch)
+    if not release:
+        raise ValueError(f"Nenhuma versão LTS do Node.js com MSI para {arch}")
+    version = release["version"]
+    base_url = f"https://nodejs.org/dist/{version}"
+    msi_name = f"node-{version}-{arch}.msi"
+
+    shasums = MetadataCache().obter(f"{base_url}/SHASUMS256.txt", ttl=TTL_IMUTAVEL).content
+    checksums: Dict[str, str] = {}
+    for line in shasums.decode("utf-8").splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            checksums[parts[1]] = parts[0]
+    if msi_name not in checksums:
+        raise ValueError(f"{msi_name} não encontrado no SHASUMS256.txt")
+    return [
+        BundleArtifact("nodejs", TIPO_CHECKSUMS, "SHASUMS256.txt", url=f"{base_url}/SHASUMS256.txt",
+                       version=version, content=shasums),
+        BundleArtifact("nodejs", TIPO_INSTALADOR, msi_name, url=f"{base_url}/{msi_name}",
+                       version=version, arch=arch, sha256=checksums[msi_name]),
+    ]
+
+
+def _resolve_cli_tools(arch: str) -> List[BundleArtifact]:
+    return [
+        *_npm_package_tree("gemini-cli", "@google/gemini-cli", arch),
+        *_npm_package_tree("qwen-code", "@qwen-code/qwen-code", arch),
+    ]
+
+
+def _resolve_vscode(arch: str) -> List[BundleArtifact]:
+    from vscode.vscode_installer import ARQUITETURA, NOME_INSTALADOR, resolve_vscode_release
+
+    url, version = resolve_vscode_release()
+    if not url:
+        raise ValueError("Não foi possível resolver a versão mais recente do VS Code")
+    return [BundleArtifact("vscode", TIPO_INSTALADOR, NOME_INSTALADOR, url=url, version=version, arch=ARQUITETURA)]
+
+
+def _resolve_antigravity(arch: str) -> List[BundleArtifact]:
+    from antigravity.installer import ANTIGRAVITY_DOWNLOAD_URL_ARM64, ANTIGRAVITY_DOWNLOAD_URL_X64, get_version
+
+    url = ANTIGRAVITY_DOWNLOAD_URL_ARM64 if arch == "arm64" else ANTIGRAVITY_DOWNLOAD_URL_X64
+    label = "ARM64" if arch == "arm64" else "x64"
+    return [BundleArtifact("antigravity", TIPO_INSTALADOR, f"Antigravity-{label}.exe", url=url,
+                           version=get_version(url), arch=label.lower())]
+
+
+def _resolve_git(arch: str) -> List[BundleArtifact]:
+    from git.git_installer import ARQUITETURA, _resolve_latest_git_url, _version_from_url
+
+    url = _resolve_latest_git_url()
+    if not url:
+        raise ValueError("Não foi possível resolver o instalador mais recente do Git")
+    return [BundleArtifact("git", TIPO_INSTALADOR, url.rsplit("/", 1)[-1], url=url,
+                           version=_version_from_url(url), arch=ARQUITETURA)]
+
+
+def _resolve_mcp_excel(arch: str) -> List[BundleArtifact]:
+    from mcp_excel.mcp_excel_installer import REPO_URL
+
+    uv = _github_release_asset("uv", "astral-sh/uv", "uv-x86_64-pc-windows-msvc.zip", "x64")
+    return [uv, BundleArtifact("mcp_excel", TIPO_REPOSITORIO, "mcp-excel-server.bundle", url=REPO_URL)]
+
+
+def _resolve_opencode(arch: str) -> List[BundleArtifact]:
+    from opencode.installer import BUN_ASSETS, bun_asset_name, resolve_bun_release
+
+    # x64: o build padrão (AVX2) e o baseline; a máquina de destino escolhe pelo processador
+    if arch == "x64":
+        asset_names = [bun_asset_name(arch), bun_asset_name(arch, avx2=False)]
+    elif arch in BUN_ASSETS:
+        asset_names = [bun_asset_name(arch)]
+    else:
+        asset_names = []  # o Bun não publica build para esta arquitetura (ex.: x86)
+
+    artifacts = []
+    for asset_name in asset_names:
+        # Mesma chave no cache de artefatos que a instalação direta do Bun (install_bun_native)
+        url, version, sha256 = resolve_bun_release(asset_name)
+        artifacts.append(BundleArtifact("bun", TIPO_BINARIO, asset_name, url=url, version=version,
+                                        arch=arch, sha256=sha256))
+    return [*artifacts, *_npm_package_tree("opencode", "opencode-ai", arch)]
+
+
+# Artefatos de cada ferramenta de TOOL_SPECS (mesmas chaves).
+BUNDLE_SOURCES: Dict[str, Callable[[str], List[BundleArtifact]]] = {
+    "nodejs": _resolve_nodejs,
+    "cli_tools": _resolve_cli_tools,
+    "vscode": _resolve_vscode,
+    "antigravity": _resolve_antigravity,
+    "git": _resolve_git,
+    "mcp_excel": _resolve_mcp_excel,
+    "opencode": _resolve_opencode,
+}
+
+
+def _check_integrity(path: Path, integrity: str) -> None:
+    """Checks a file against an npm Subresource Integrity string."""
+    algorithm, _, expected = integrity.partition("-")
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    if base64.b64encode(digest.digest()).decode() != expected:
+        raise ValueError(f"Integridade não confere para {path.name} ({algorithm})")
+
+
+def _bundle_git_repository(url: str, target: Path) -> str:
+    """Creates a 'git bundle' with every branch and tag of a remote repository.
+
+    Returns:
+        str: Commit of the default branch (HEAD).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = Path(tmp) / "repo.git"
+        subprocess.run(["git", "clone", "--bare", "--quiet", url, str(bare)], check=True)
+        head = subprocess.run(
+            ["git", "-C", str(bare), "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(["git", "-C", str(bare), "bundle", "create", "--quiet", str(target), "HEAD", "--all"],
+                       check=True)
+    return head
+
+
+def build_bundle(
+    output: str,
+    tools: Optional[Iterable[str]] = None,
+    arch: str = "x64",
+    sources: Optional[Dict[str, Callable[[str], List[BundleArtifact]]]] = None,
+    log: Callable[[str], None] = print,
+) -> Bundle:
+    """
+    Resolves and downloads every artifact the selected tools need into a bundle directory.
+
+    Downloads go through the local artifact cache, so rebuilding a bundle with
+    unchanged versions does not touch the network again.
+    Args:
+        output (str): Bundle directory (created if missing; existing entries are replaced).
+        tools (Iterable[str]): Keys of TOOL_SPECS to include (defaults to every tool).
+        arch (str): Target architecture of the Node.js and Antigravity installers.
+        sources (Dict): Resolver per tool key (defaults to BUNDLE_SOURCES).
+        log (Callable[[str], None]): Progress output.
+    Returns:
+        Bundle: The saved bundle.
+    Raises:
+        ValueError: If a tool key is unknown or an artifact cannot be resolved or verified.
+    """
+    sources = sources if sources is not None else BUNDLE_SOURCES
+    selected = list(tools) if tools else list(sources)
+    unknown = [key for key in selected if key not in sources]
+    if unknown:
+        raise ValueError(f"Ferramentas desconhecidas: {', '.join(unknown)}")
+
+    bundle = Bundle.criar(output)
+    for key in selected:
+        log(f"Resolvendo {key}...")
+        for artifact in sources[key](arch):
+            target = bundle.raiz / artifact.tool / artifact.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            extras = dict(artifact.extras)
+
+            if artifact.content is not None:
+                target.write_bytes(artifact.content)
+            elif artifact.kind == TIPO_REPOSITORIO:
+                log(f"  Empacotando repositório {artifact.url}")
+                artifact.version = _bundle_git_repository(artifact.url, target)
+            else:
+                log(f"  Baixando {artifact.name} {artifact.version or ''}".rstrip())
+                obter_com_cache(artifact.url, target, artifact.tool, artifact.version, artifact.arch,
+                                sha256_esperado=artifact.sha256)
+                if artifact.integrity:
+                    _check_integrity(target, artifact.integrity)
+                    extras["integrity"] = artifact.integrity
+
+            entry = bundle.adicionar(target, artifact.tool, artifact.kind, artifact.version, artifact.arch,
+                                     artifact.url, **extras)
+            log(f"  {entry['arquivo']} ({entry['tamanho'] / (1024 * 1024):.1f} MB)")
+
+    bundle.manifesto["ferramentas"] = sorted(set(bundle.manifesto.get("ferramentas", [])) | set(selected))
+    bundle.salvar()
+    # Arquivos de downloads anteriores que não constam mais do manifesto
+    listed = {entry["arquivo"] for entry in bundle.artefatos}
+    for path in bundle.raiz.rglob("*"):
+        if path.is_file() and path.parent != bundle.raiz and path.relative_to(bundle.raiz).as_posix() not in listed:
+            os.remove(path)
+    return bundle
@@ -0,0 +1,243 @@
+import os
+import subprocess
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from nodeecli.modules.events import (
+    ENV_CANAL_CONTROLE,
+    ENV_CANAL_EVENTOS,
+    EVENTO_ATIVIDADE,
+    EVENTO_AVISO,
+    EVENTO_FASE_FIM,
+    EVENTO_FASE_INICIO,
+    EVENTO_PROGRESSO,
+    EVENTO_RESULTADO,
+    ler_evento,
+)
+
+
+class InstallerEvent:
+    """Base class of the events an installer sends on its event channel."""
+
+    def __init__(self, timestamp: Optional[float]) -> None:
+        self.timestamp = timestamp
+
+
+class PhaseEvent(InstallerEvent):
+    """Start (``finished=False``) or end of an installer phase such as 'download'."""
+
+    def __init__(
+        self, timestamp: Optional[float], phase: str, finished: bool,
+        success: Optional[bool] = None, duration: Optional[float] = None,
+    ) -> None:
+        super().__init__(timestamp)
+        self.phase = phase
+        self.finished = finished
+        self.success = success
+        self.duration = duration
+
+
+class ProgressEvent(InstallerEvent):
+    """Bytes downloaded so far."""
+
+    def __init__(
+        self, timestamp: Optional[float], downloaded: int, total: Optional[int], rate: Optional[float]
+    ) -> None:
+        super().__init__(timestamp)
+        self.downloaded = downloaded
+        self.total = total
+        self.rate = rate
+
+
+class ActivityEvent(InstallerEvent):
+    """Progress of a package manager step (npm/bun), e.g. 'npm: 35 requisições ao registro'."""
+
+    def __init__(
+        self, timestamp: Optional[float], description: str, done: Optional[int], total: Optional[int]
+    ) -> None:
+        super().__init__(timestamp)
+        self.description = description
+        self.done = done
+        self.total = total
+
+
+class WarningEvent(InstallerEvent):
+    """Non-fatal problem reported by the installer."""
+
+    def __init__(self, timestamp: Optional[float], message: str) -> None:
+        super().__init__(timestamp)
+        self.message = message
+
+
+class ResultEvent(InstallerEvent):
+    """Final outcome of the installer run."""
+
+    def __init__(self, timestamp: Optional[float], success: bool, code: int, message: Optional[str] = None) -> None:
+        super().__init__(timestamp)
+        self.success = success
+        self.code = code
+        self.message = message
+
+
+def parse_event(line: str) -> Optional[InstallerEvent]:
+    """
+    Parses one line of the event channel into a typed event.
+
+    Returns None for malformed lines, other protocol versions and unknown event types.
+    """
+    data: Optional[Dict[str, Any]] = ler_evento(line)
+    if data is None:
+        return None
+    kind = data['evento']
+    timestamp = data.get('t')
+    try:
+        if kind == EVENTO_PROGRESSO:
+            return ProgressEvent(
+                timestamp,
+                int(data['baixados']),
+                int(data['total']) if data.get('total') else None,
+                float(data['taxa']) if data.get('taxa') else None,
+            )
+        if kind == EVENTO_ATIVIDADE:
+            return ActivityEvent(
+                timestamp,
+                str(data['descricao']),
+                int(data['concluidos']) if data.get('concluidos') is not None else None,
+                int(data['total']) if data.get('total') else None,
+            )
+        if kind == EVENTO_FASE_INICIO:
+            return PhaseEvent(timestamp, str(data['fase']), finished=False)
+        if kind == EVENTO_FASE_FIM:
+            return PhaseEvent(
+                timestamp, str(data['fase']), finished=True,
+                success=bool(data.get('sucesso')), duration=data.get('duracao'),
+            )
+        if kind == EVENTO_AVISO:
+            return WarningEvent(timestamp, str(data['mensagem']))
+        if kind == EVENTO_RESULTADO:
+            return ResultEvent(timestamp, bool(data['sucesso']), int(data['codigo']), data.get('mensagem'))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None
+
+
+class _ChildPipe:
+    """
+    An ``os.pipe()`` with one end inherited by a single child process.
+
+    The child learns where that end is from an environment variable
+    (``fd:<n>`` on POSIX, ``handle:<n>`` on Windows).
+    """
+
+    env_var = ""
+
+    def __init__(self, child_writes: bool) -> None:
+        read_fd, write_fd = os.pipe()
+        if child_writes:
+            self._child_fd: Optional[int] = write_fd
+            self._parent_fd: Optional[int] = read_fd
+        else:
+            self._child_fd, self._parent_fd = read_fd, write_fd
+        self._handle: Optional[int] = None
+        if os.name == 'nt':
+            import msvcrt
+            # O filho recebe o handle (não o fd) e o reabre com msvcrt.open_osfhandle
+            self._handle = msvcrt.get_osfhandle(self._child_fd)
+            os.set_handle_inheritable(self._handle, True)
+
+    def child_env(self) -> Dict[str, str]:
+        """Environment variable telling the child where its end of the pipe is."""
+        if self._handle is not None:
+            return {self.env_var: f"handle:{self._handle}"}
+        return {self.env_var: f"fd:{self._child_fd}"}
+
+    def close_child_end(self) -> None:
+        """Closes the parent's copy of the child's end."""
+        if self._child_fd is not None:
+            os.close(self._child_fd)
+            self._child_fd = None
+
+
+def inherit_pipes(*pipes: _ChildPipe) -> Dict[str, Any]:
+    """Popen arguments that pass the pipes' child ends to the child (and to no other process)."""
+    if os.name == 'nt':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.lpAttributeList = {"handle_list": [pipe._handle for pipe in pipes]}
+        return {"startupinfo": startupinfo, "close_fds": True}
+    return {"pass_fds": tuple(pipe._child_fd for pipe in pipes)}
+
+
+class EventPipe(_ChildPipe):
+    """
+    Pipe carrying one installer's event stream, separate from its stdout.
+
+    Usage: create it, spawn the process with ``env.update(pipe.child_env())`` and
+    ``**inherit_pipes(pipe)``, then call ``start(on_event)``; ``join()`` after the
+    process exits returns once the remaining events have been delivered.
+    """
+
+    env_var = ENV_CANAL_EVENTOS
+
+    def __init__(self) -> None:
+        super().__init__(child_writes=True)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_event: Callable[[InstallerEvent], None]) -> None:
+        """Closes the parent's write end and delivers the child's events on a reader thread."""
+        self.close_child_end()
+        self._thread = threading.Thread(target=self._read, args=(on_event,), daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Releases both ends when the child could not be started."""
+        self.close_child_end()
+        if self._thread is None and self._parent_fd is not None:
+            os.close(self._parent_fd)
+            self._parent_fd = None
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Waits for the reader thread to drain the pipe."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _read(self, on_event: Callable[[InstallerEvent], None]) -> None:
+        with open(self._parent_fd, 'r', encoding='utf-8', errors='replace') as stream:
+            for line in stream:
+                event = parse_event(line)
+                if event is not None:
+                    on_event(event)
+
+
+class ControlPipe(_ChildPipe):
+    """
+    Pipe the orchestrator uses to ask one installer to cancel.
+
+    The child polls for the request between phases and while downloading
+    (``cancelamento_solicitado()``). The child also treats the pipe closing as a
+    cancellation, so an installer never outlives an orchestrator that crashed.
+    """
+
+    env_var = ENV_CANAL_CONTROLE
+
+    def __init__(self) -> None:
+        super().__init__(child_writes=False)
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Sends the cancellation request."""
+        with self._lock:
+            if self._parent_fd is None:
+                return
+            try:
+                os.write(self._parent_fd, b"cancelar\n")
+            except OSError:
+                # Filho já terminou: nada a cancelar
+                pass
+
+    def close(self) -> None:
+        """Releases both ends (after the child has exited)."""
+        self.close_child_end()
+        with self._lock:
+            if self._parent_fd is not None:
+                os.close(self._parent_fd)
+                self._parent_fd = None
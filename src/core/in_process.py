@@ -0,0 +1,193 @@
+import contextvars
+import importlib
+import io
+import sys
+import threading
+from typing import Callable, List, Optional
+
+from nodeecli.modules.events import CanalEventos, concluir, contexto_execucao
+
+from .events import InstallerEvent, parse_event
+
+# Código de saída de uma execução cancelada (como um Ctrl+C)
+CANCELLED_CODE = 130
+
+# Saída da execução a que pertence o código em andamento (herdada pelas threads
+# iniciadas com contextvars.copy_context(), como as do downloader)
+_current_output: contextvars.ContextVar = contextvars.ContextVar("in_process_output", default=None)
+
+
+class _LineWriter:
+    """Splits the text an installer prints into lines for its run."""
+
+    def __init__(self, on_line: Callable[[str], None]) -> None:
+        self.on_line = on_line
+        self.closed = False
+        self._pending = ""
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self._pending += text
+            *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self.on_line(line)
+
+    def close(self) -> None:
+        """Delivers an unterminated last line; later output (from an abandoned run) is dropped."""
+        with self._lock:
+            pending, self._pending = self._pending, ""
+            self.closed = True
+        if pending:
+            self.on_line(pending)
+
+
+class _EventWriter(io.TextIOBase):
+    """File the run's CanalEventos writes to: each JSON line is parsed and delivered."""
+
+    def __init__(self, on_event: Callable[[InstallerEvent], None]) -> None:
+        super().__init__()
+        self.on_event = on_event
+
+    def write(self, text: str) -> int:
+        for line in text.splitlines():
+            event = parse_event(line)
+            if event is not None:
+                self.on_event(event)
+        return len(text)
+
+
+class RoutedStream(io.TextIOBase):
+    """
+    ``sys.stdout``/``sys.stderr`` replacement used while installers run in-process.
+
+    Text printed by an installer goes to its own run; anything else goes to the
+    original stream.
+    """
+
+    def __init__(self, original) -> None:
+        super().__init__()
+        self.original = original
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.original, "encoding", None) or "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        writer = _current_output.get()
+        if writer is not None:
+            writer.write(text)
+        elif self.original is not None:
+            self.original.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if _current_output.get() is None and self.original is not None:
+            self.original.flush()
+
+
+class InProcessRunner:
+    """
+    In-process execution backend: runs installer modules on worker threads.
+
+    Each run has its own output (stdout/stderr lines), event channel and
+    cancellation flag. These are carried by context variables, so installers
+    need no changes. Runs share the interpreter: ``requests`` is imported once,
+    and the HTTP session keeps its connection pool across tools. Only code that
+    reaches its cancellation checks can be stopped, so work that waits on
+    external programs belongs in the subprocess backend.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the runner (stdout/stderr are redirected only while runs are active)."""
+        self._lock = threading.Lock()
+        self._active = 0
+        self._saved_streams: Optional[tuple] = None
+
+    def run(
+        self,
+        module: str,
+        argv: List[str],
+        on_line: Callable[[str], None],
+        on_event: Callable[[InstallerEvent], None],
+        cancelled: threading.Event,
+        cancel_grace: float = 0.1,
+    ) -> int:
+        """
+        Runs ``module.main(argv)`` on a worker thread and waits for it.
+
+        Args:
+            module (str): Installer module (e.g. ``vscode.vscode_installer``).
+            argv (List[str]): Installer arguments.
+            on_line (Callable[[str], None]): Receives each line the installer prints.
+            on_event (Callable[[InstallerEvent], None]): Receives the installer's events.
+            cancelled (threading.Event): Set to ask the installer to stop.
+            cancel_grace (float): Seconds the installer has to stop once cancelled;
+                after that the run is abandoned (its thread finishes in the background
+                and its output is dropped).
+        Returns:
+            int: The installer's exit code (CANCELLED_CODE if abandoned).
+        """
+        writer = _LineWriter(on_line)
+        channel = CanalEventos(_EventWriter(on_event))
+        result: List[int] = []
+
+        def work() -> None:
+            _current_output.set(writer)
+            with contexto_execucao(channel, cancelled):
+                result.append(run_main(module, argv))
+
+        self._redirect()
+        try:
+            thread = threading.Thread(target=work, name=f"instalador:{module}", daemon=True)
+            thread.start()
+            while thread.is_alive():
+                if cancelled.wait(0.05):
+                    thread.join(cancel_grace)
+                    break
+        finally:
+            writer.close()
+            self._restore()
+        return result[0] if result else CANCELLED_CODE
+
+    def _redirect(self) -> None:
+        with self._lock:
+            self._active += 1
+            if self._active == 1:
+                self._saved_streams = (sys.stdout, sys.stderr)
+                sys.stdout = RoutedStream(sys.stdout)
+                sys.stderr = RoutedStream(sys.stderr)
+
+    def _restore(self) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self._saved_streams is not None:
+                sys.stdout, sys.stderr = self._saved_streams
+                self._saved_streams = None
+
+
+def run_main(module: str, argv: List[str]) -> int:
+    """Imports and runs an installer as its ``__main__`` block would, returning the exit code."""
+    try:
+        installer = importlib.import_module(module)
+        return concluir(installer.main(argv))
+    except KeyboardInterrupt:
+        # Inclui InstalacaoCancelada, levantada pelas verificações de cancelamento
+        print("⚠️  Instalação cancelada pelo usuário.")
+        return concluir(CANCELLED_CODE, "Instalação cancelada pelo usuário")
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            return concluir(e.code or 0)
+        print(e.code)
+        return concluir(1)
+    except Exception as e:
+        print(f"❌ Erro inesperado: {e}")
+        return concluir(1, f"Erro inesperado: {e}")
@@ -3,22 +3,82 @@ import os
 import sys
 import subprocess
 import threading
+import time
 from pathlib import Path
 from queue import Queue
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from nodeecli.modules.bundle import ErroBundle, obter_bundle
+from nodeecli.modules.mirror import ENV_MIRROR
+
+from .events import (
+    ActivityEvent, ControlPipe, EventPipe, InstallerEvent, PhaseEvent, ProgressEvent, ResultEvent, WarningEvent,
+    inherit_pipes,
+)
+from .in_process import InProcessRunner
+from .preflight import probe_versions
+from .process_tree import ProcessTree
+from .scheduler import DependencyScheduler, ScheduledTask
+from .tools import (
+    FETCH_RESOURCES, INSTALLER_SCRIPTS, RESOURCE_LIMITS, TOOL_SPECS, TOOLS_BY_KEY, ToolSpec, installer_module,
+)
+
+# Sufixo das tarefas de download das ferramentas instaladas em fases
+FETCH_SUFFIX = ".fetch"
+# Tempo dado aos instaladores para encerrarem sozinhos antes de a árvore de processos ser encerrada
+CANCEL_GRACE = 0.1
+# Etapas executadas dentro do processo do orquestrador (com in_process=True). O download
+# só usa Python e para nas verificações de cancelamento; as etapas que executam msiexec,
+# setups e npm continuam em subprocessos, que podem ser encerrados com a árvore inteira.
+IN_PROCESS_PHASES = ("fetch",)
+
 
 class InstallationService:
     """Handles the logic of running installation scripts."""
 
-    def __init__(self, message_queue: Queue) -> None:
+    def __init__(
+        self,
+        message_queue: Queue,
+        bundle_path: Optional[str] = None,
+        mirror_url: Optional[str] = None,
+        in_process: bool = True,
+        preflight: bool = True,
+    ) -> None:
         """
         Initializes the InstallationService.
         Args:
             message_queue (Queue): Queue for inter-thread communication.
+            bundle_path (str): Offline bundle (directory or .zip) passed to every
+                installer as ``--from-bundle``; None uses ORQUESTRADOR_BUNDLE, if set,
+                and otherwise downloads from the internet.
+            mirror_url (str): LAN artifact mirror (``mirror serve``) the installers
+                download from, passed as ORQUESTRADOR_MIRROR.
+            in_process (bool): Run the ``IN_PROCESS_PHASES`` on threads of this
+                process (no interpreter startup, shared HTTP connections);
+                False runs every phase in a subprocess.
+            preflight (bool): Probe the installed versions before scheduling and
+                leave out the tools already at their latest version.
         """
         self.message_queue: Queue = message_queue
-        self.current_process: Optional[subprocess.Popen] = None
+        self.bundle_path: Optional[str] = bundle_path
+        self.mirror_url: Optional[str] = mirror_url
+        self.in_process: bool = in_process
+        self.preflight: bool = preflight
+        self._in_process_runner = InProcessRunner()
+        self.current_processes: Dict[str, ProcessTree] = {}
+        self._control_pipes: Dict[str, ControlPipe] = {}
+        # Sinal de cancelamento de cada execução dentro do processo
+        self._in_process_runs: Dict[str, threading.Event] = {}
+        self._processes_lock = threading.Lock()
         self.cancel_requested: bool = False
+        self._cancel_thread: Optional[threading.Thread] = None
+        # Último evento 'resultado' de cada ferramenta
+        self.results: Dict[str, ResultEvent] = {}
+        # Progresso geral: etapas concluídas + fração baixada das etapas em andamento
+        self._progress_lock = threading.Lock()
+        self._steps_total = 0
+        self._steps_completed = 0
+        self._step_fractions: Dict[str, float] = {}
 
     def run_installations(
         self,
@@ -34,160 +94,225 @@ class InstallationService:
     ) -> None:
         """
         Runs the installations in a separate thread.
+
+        Selected tools are scheduled on a dependency graph (see ``TOOL_SPECS``):
+        independent tools run concurrently, limited by ``RESOURCE_LIMITS``. Tools
+        already at their latest version are left out first (see ``_run_preflight``).
         """
         try:
-            total_steps = (
-                int(node_selected)
-                + int(vscode_selected)
-                + int(antigravity_selected)
-                + int(git_selected)
-                + int(mcp_excel_selected)
-                + int(opencode_selected)
-            )
-            completed_steps = 0
-            success_count = 0
-            failure_count = 0
-
-            if total_steps == 0:
+            selected_keys = {
+                "nodejs": node_selected,
+                "cli_tools": node_selected,
+                "vscode": vscode_selected,
+                "antigravity": antigravity_selected,
+                "git": git_selected,
+                "mcp_excel": mcp_excel_selected,
+                "opencode": opencode_selected,
+            }
+            specs = [spec for spec in TOOL_SPECS if selected_keys.get(spec.key)]
+
+            if not specs:
                 self.message_queue.put(('LOG', "Nenhuma ferramenta selecionada para instalação", "WARNING"))
                 self.message_queue.put(('COMPLETE', 0, 0))
                 return
 
-            if node_selected:
-                self.message_queue.put(('LOG', "=== Instalando Node.js + CLI Tools ===", "INFO"))
-                args = self._build_nodejs_args(auto_mode, download_timeout, install_timeout)
-                return_code = self._run_script(args, "Node.js")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "Node.js instalado com sucesso!", "SUCCESS"))
-                else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do Node.js (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
-
-                if self.cancel_requested:
-                    self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
-                    return
-
-            if vscode_selected:
-                self.message_queue.put(('LOG', "=== Instalando Visual Studio Code ===", "INFO"))
-                args = self._build_vscode_args()
-                return_code = self._run_script(args, "VS Code")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "Visual Studio Code instalado com sucesso!", "SUCCESS"))
-                else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do VS Code (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
-
-                if self.cancel_requested:
-                    self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
-                    return
-
-
-            if antigravity_selected:
-                self.message_queue.put(('LOG', "=== Instalando Antigravity IDE ===", "INFO"))
-                args = self._build_antigravity_args()
-                return_code = self._run_script(args, "Antigravity IDE")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "Antigravity IDE instalado com sucesso!", "SUCCESS"))
-                else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do Antigravity IDE (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
-
-                if self.cancel_requested:
-                    self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
-                    return
-
-            if git_selected:
-                self.message_queue.put(('LOG', "=== Instalando Git for Windows ===", "INFO"))
-                args = self._build_git_args()
-                return_code = self._run_script(args, "Git")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "Git instalado com sucesso!", "SUCCESS"))
-                else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do Git (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
-
+            # Bundle offline (bundle_path ou ORQUESTRADOR_BUNDLE), aberto uma vez: um .zip é
+            # extraído aqui e os instaladores recebem o diretório extraído
+            try:
+                bundle = obter_bundle(self.bundle_path)
+            except ErroBundle as e:
+                self.message_queue.put(('LOG', f"Bundle offline inválido: {e}", "ERROR"))
+                self.message_queue.put(('COMPLETE', 0, len(specs)))
+                return
+            if bundle:
+                self.bundle_path = str(bundle.raiz)
+
+            # O bundle offline instala as versões que contém, não as mais recentes
+            up_to_date = 0
+            if self.preflight and not self.bundle_path:
+                pending = self._run_preflight(specs)
+                up_to_date = len(specs) - len(pending)
+                specs = pending
                 if self.cancel_requested:
                     self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
+                    self.message_queue.put(('COMPLETE', up_to_date, 0))
                     return
-
-            if mcp_excel_selected:
-                self.message_queue.put(('LOG', "=== Instalando MCP Excel Server ===", "INFO"))
-                args = self._build_mcp_excel_args()
-                return_code = self._run_script(args, "MCP Excel Server")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "MCP Excel Server instalado com sucesso!", "SUCCESS"))
-                else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do MCP Excel Server (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
-
-                if self.cancel_requested:
-                    self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
+                if not specs:
+                    self.message_queue.put(('PROGRESS', 1.0))
+                    self.message_queue.put(('COMPLETE', up_to_date, 0))
                     return
 
-            if opencode_selected:
-                self.message_queue.put(('LOG', "=== Instalando OpenCode CLI (Bun) ===", "INFO"))
-                args = self._build_opencode_args()
-                return_code = self._run_script(args, "OpenCode CLI")
-
-                if return_code == 0:
-                    success_count += 1
-                    self.message_queue.put(('LOG', "OpenCode CLI instalado com sucesso!", "SUCCESS"))
+            arg_builders: Dict[str, Callable[[str], List[str]]] = {
+                "nodejs": lambda phase: self._build_nodejs_args(auto_mode, download_timeout, install_timeout, phase=phase),
+                "cli_tools": lambda phase: self._build_nodejs_args(auto_mode, download_timeout, install_timeout, phase="cli"),
+                "vscode": self._build_vscode_args,
+                "antigravity": self._build_antigravity_args,
+                "git": self._build_git_args,
+                "mcp_excel": lambda phase: self._build_mcp_excel_args(),
+                "opencode": lambda phase: self._build_opencode_args(),
+            }
+
+            if self.bundle_path:
+                self.message_queue.put(('LOG', f"Instalando a partir do bundle offline: {self.bundle_path}", "INFO"))
+            elif self.mirror_url:
+                self.message_queue.put(('LOG', f"Baixando do espelho de artefatos: {self.mirror_url}", "INFO"))
+
+            selected = {spec.key for spec in specs}
+            scheduler = DependencyScheduler(RESOURCE_LIMITS)
+            for spec in specs:
+                depends_on = [dep for dep in spec.depends_on if dep in selected]
+                if spec.phased:
+                    # Download e instalação em tarefas separadas: o download da próxima
+                    # ferramenta roda enquanto o slot de instalador está ocupado.
+                    fetch_name = f"{spec.key}{FETCH_SUFFIX}"
+                    scheduler.add_task(ScheduledTask(
+                        fetch_name,
+                        self._make_tool_action(spec, arg_builders[spec.key], "fetch"),
+                        resources=FETCH_RESOURCES,
+                        weight=spec.fetch_weight,
+                    ))
+                    depends_on.append(fetch_name)
+                    phase = "install"
                 else:
-                    failure_count += 1
-                    self.message_queue.put(('LOG', f"Falha na instalação do OpenCode CLI (código: {return_code})", "ERROR"))
-
-                completed_steps += 1
-                self.message_queue.put(('PROGRESS', completed_steps / total_steps))
+                    phase = "all"
+                scheduler.add_task(ScheduledTask(
+                    spec.key,
+                    self._make_tool_action(spec, arg_builders[spec.key], phase),
+                    depends_on=depends_on,
+                    resources=spec.resources,
+                    weight=spec.weight,
+                ))
+
+            with self._progress_lock:
+                self._steps_total = len(scheduler.tasks)
+                self._steps_completed = 0
+                self._step_fractions.clear()
+            counters = {"success": up_to_date, "failure": 0}
+            counters_lock = threading.Lock()
+
+            def on_task_done(task: ScheduledTask) -> None:
+                is_fetch = task.name.endswith(FETCH_SUFFIX)
+                spec = TOOLS_BY_KEY[task.name[:-len(FETCH_SUFFIX)] if is_fetch else task.name]
+                fetch_failed = (
+                    spec.phased and not is_fetch
+                    and scheduler.tasks[f"{spec.key}{FETCH_SUFFIX}"].status == ScheduledTask.FAILED
+                )
+                if task.status == ScheduledTask.SKIPPED and not self.cancel_requested and not fetch_failed:
+                    self.message_queue.put(('LOG', f"{spec.title} ignorado: dependência não foi instalada", "WARNING"))
+                elif task.error is not None:
+                    self.message_queue.put(('LOG', f"Erro inesperado ao instalar {spec.label}: {task.error}", "ERROR"))
+
+                with counters_lock:
+                    # Cada ferramenta conta uma única vez: pelo download que falhou
+                    # ou pelo resultado da instalação.
+                    if task.status == ScheduledTask.FAILED:
+                        counters["failure"] += 1
+                    elif not is_fetch:
+                        if task.status == ScheduledTask.SUCCEEDED:
+                            counters["success"] += 1
+                        elif not self.cancel_requested and not fetch_failed:
+                            counters["failure"] += 1
+                with self._progress_lock:
+                    self._steps_completed += 1
+                    self._step_fractions.pop(spec.label, None)
+                self._report_progress()
+
+            scheduler.run(
+                should_cancel=lambda: self.cancel_requested,
+                on_task_done=on_task_done,
+            )
 
-                if self.cancel_requested:
-                    self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
-                    self.message_queue.put(('COMPLETE', success_count, failure_count))
-                    return
+            if self.cancel_requested:
+                self.message_queue.put(('LOG', "Instalação cancelada pelo usuário", "WARNING"))
 
-            self.message_queue.put(('COMPLETE', success_count, failure_count))
+            self.message_queue.put(('COMPLETE', counters["success"], counters["failure"]))
 
         except Exception as e:
             self.message_queue.put(('LOG', f"Erro inesperado durante instalação: {str(e)}", "ERROR"))
             self.message_queue.put(('COMPLETE', 0, 1))
 
+    def _run_preflight(self, specs: List[ToolSpec]) -> List[ToolSpec]:
+        """
+        Probes the installed versions of the selected tools concurrently (see ``probe_versions``).
+
+        Returns:
+            List[ToolSpec]: The tools that still have work to do. A tool whose
+            versions could not be resolved (not installed, offline without cached
+            metadata) stays in the plan.
+        """
+        self.message_queue.put(('LOG', "=== Verificando versões instaladas ===", "INFO"))
+        started = time.monotonic()
+        results = probe_versions(spec.key for spec in specs)
+        pending: List[ToolSpec] = []
+        for spec in specs:
+            result = results.get(spec.key)
+            if result is not None and result.up_to_date:
+                self.message_queue.put(('LOG', f"{spec.title} já está atualizado ({result.describe()})", "SUCCESS"))
+            else:
+                pending.append(spec)
+        self.message_queue.put((
+            'LOG', f"Verificação concluída em {time.monotonic() - started:.1f} s: "
+                   f"{len(pending)} de {len(specs)} ferramenta(s) a instalar", "INFO",
+        ))
+        return pending
+
+    def _make_tool_action(
+        self, spec: ToolSpec, build_args: Callable[[str], List[str]], phase: str
+    ) -> Callable[[], bool]:
+        """Wraps one phase of a tool's script execution into a scheduler action."""
+        def action() -> bool:
+            if phase == "fetch":
+                self.message_queue.put(('LOG', f"=== Baixando {spec.title} ===", "INFO"))
+            else:
+                self.message_queue.put(('LOG', f"=== Instalando {spec.title} ===", "INFO"))
+            args = build_args(phase)
+            if self.bundle_path:
+                args.append(f"--from-bundle={self.bundle_path}")
+            self.results.pop(spec.label, None)
+            if self.in_process and phase in IN_PROCESS_PHASES:
+                return_code = self._run_in_process(spec.key, args, spec.label)
+            else:
+                return_code = self._run_script(args, spec.label)
+
+            result = self.results.get(spec.label)
+            detail = f": {result.message}" if result is not None and result.message else ""
+            if phase == "fetch":
+                if return_code == 0:
+                    self.message_queue.put(('LOG', f"Download do {spec.title} concluído", "INFO"))
+                    return True
+                self.message_queue.put((
+                    'LOG', f"Falha no download do {spec.label} (código: {return_code}){detail}", "ERROR"
+                ))
+                return False
+
+            if return_code == 0:
+                self.message_queue.put(('LOG', f"{spec.title} instalado com sucesso!", "SUCCESS"))
+                return True
+            self.message_queue.put((
+                'LOG', f"Falha na instalação do {spec.label} (código: {return_code}){detail}", "ERROR"
+            ))
+            return False
+        return action
+
     def _run_script(self, args: List[str], tool_name: str) -> int:
         """
         Executes a script in a subprocess and captures its output.
+
+        Stdout lines become log messages. Structured events (phases, download
+        progress, warnings, result) arrive on a separate pipe and are handled by
+        ``_handle_event``; cancellation requests go the other way on a control
+        pipe (see ``cancel_installation``).
         """
+        pipe = EventPipe()
+        control = ControlPipe()
         try:
             env = os.environ.copy()
             env["PYTHONUNBUFFERED"] = "1"
             env["PYTHONIOENCODING"] = "utf-8"
+            if self.mirror_url:
+                env[ENV_MIRROR] = self.mirror_url
+            env.update(pipe.child_env())
+            env.update(control.child_env())
 
             process = subprocess.Popen(
                 args,
@@ -198,29 +323,36 @@ class InstallationService:
                 errors='replace',
                 bufsize=1,
                 env=env,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                **inherit_pipes(pipe, control),
+                **ProcessTree.popen_kwargs(getattr(subprocess, "CREATE_NO_WINDOW", 0)),
             )
-
-            self.current_process = process
-
+            tree = ProcessTree(process)
+            pipe.start(lambda event: self._handle_event(tool_name, event))
+            control.close_child_end()
+
+            with self._processes_lock:
+                self.current_processes[tool_name] = tree
+                self._control_pipes[tool_name] = control
+                # Cancelamento pedido enquanto o processo era criado
+                cancelled = self.cancel_requested
+            if cancelled:
+                self._cancel_trees([(tree, control)])
+
+            # A leitura termina quando o processo e todos os que herdaram o stdout
+            # (npm, msiexec) terminam; o cancelamento encerra a árvore inteira.
             if process.stdout:
                 for line in iter(process.stdout.readline, ''):
+                    line = line.strip()
                     if line:
-                        line = line.strip()
-                        if line:
-                            self.message_queue.put(('LOG', line, 'INFO'))
-
-                    if self.cancel_requested:
-                        process.terminate()
-                        try:
-                            process.wait(timeout=1)
-                        except subprocess.TimeoutExpired:
-                            process.kill()
-                        self.message_queue.put(('LOG', f"Instalação do {tool_name} cancelada", "WARNING"))
-                        break
+                        self.message_queue.put(('LOG', f"[{tool_name}] {line}", 'INFO'))
 
             return_code = process.wait()
-            self.current_process = None
+            if self.cancel_requested:
+                # Programas iniciados pelo instalador que ainda estejam rodando
+                tree.kill()
+                self.message_queue.put(('LOG', f"Instalação do {tool_name} cancelada", "WARNING"))
+            # Entregar os eventos que ainda estão no pipe (ex.: o resultado)
+            pipe.join(timeout=5)
             return return_code
 
         except FileNotFoundError:
@@ -233,21 +365,122 @@ class InstallationService:
             self.message_queue.put(('LOG', f"Erro inesperado ao executar {tool_name}: {str(e)}", "ERROR"))
             return 1
         finally:
-            self.current_process = None
+            pipe.close()
+            with self._processes_lock:
+                tree = self.current_processes.pop(tool_name, None)
+                self._control_pipes.pop(tool_name, None)
+            if tree is not None:
+                tree.close()
+            control.close()
+
+    def _run_in_process(self, key: str, args: List[str], tool_name: str) -> int:
+        """
+        Runs an installer on a thread of this process (see ``InProcessRunner``).
 
-    def cancel_installation(self) -> None:
-        """Cancels the currently running installation."""
-        self.cancel_requested = True
+        ``args`` is the subprocess command line; the installer receives only its own
+        arguments. Output and events reach the queue as they do from ``_run_script``.
+        """
+        argv = args[len(self._installer_command(key)):]
+        if self.mirror_url:
+            # No subprocesso, o espelho chega por ORQUESTRADOR_MIRROR
+            argv.append(f"--mirror={self.mirror_url}")
+
+        cancelled = threading.Event()
+        with self._processes_lock:
+            if self.cancel_requested:
+                cancelled.set()
+            self._in_process_runs[tool_name] = cancelled
+
+        def on_line(line: str) -> None:
+            line = line.strip()
+            if line:
+                self.message_queue.put(('LOG', f"[{tool_name}] {line}", 'INFO'))
+
+        try:
+            return_code = self._in_process_runner.run(
+                installer_module(key), argv, on_line,
+                lambda event: self._handle_event(tool_name, event), cancelled, CANCEL_GRACE,
+            )
+        finally:
+            with self._processes_lock:
+                self._in_process_runs.pop(tool_name, None)
+        if self.cancel_requested:
+            self.message_queue.put(('LOG', f"Instalação do {tool_name} cancelada", "WARNING"))
+        return return_code
+
+    def _handle_event(self, tool_name: str, event: InstallerEvent) -> None:
+        """Turns an installer event into UI messages (called on the pipe reader thread)."""
+        if isinstance(event, ProgressEvent):
+            self.message_queue.put(('DOWNLOAD', tool_name, event.downloaded, event.total, event.rate))
+            if event.total:
+                with self._progress_lock:
+                    self._step_fractions[tool_name] = min(event.downloaded / event.total, 1.0)
+                self._report_progress()
+        elif isinstance(event, ActivityEvent):
+            fraction = min(event.done / event.total, 1.0) if event.total and event.done is not None else None
+            self.message_queue.put(('ACTIVITY', tool_name, event.description, fraction))
+            if fraction is not None:
+                with self._progress_lock:
+                    self._step_fractions[tool_name] = fraction
+                self._report_progress()
+        elif isinstance(event, PhaseEvent):
+            self.message_queue.put(('PHASE', tool_name, event.phase, event.finished, event.success))
+        elif isinstance(event, WarningEvent):
+            self.message_queue.put(('LOG', f"[{tool_name}] {event.message}", "WARNING"))
+        elif isinstance(event, ResultEvent):
+            self.results[tool_name] = event
+
+    def _report_progress(self) -> None:
+        """Sends the overall progress, counting the downloaded fraction of running steps."""
+        with self._progress_lock:
+            if not self._steps_total:
+                return
+            done = self._steps_completed + sum(self._step_fractions.values())
+            progress = min(done / self._steps_total, 1.0)
+        self.message_queue.put(('PROGRESS', progress))
+
+    def cancel_installation(self, wait: bool = False) -> None:
+        """
+        Cancels every running installation; pending tools are not started.
+
+        Each installer is asked to stop on its control pipe and, after
+        ``CANCEL_GRACE`` seconds, its whole process tree is killed (including
+        msiexec/npm processes the installer was waiting on). Downloads running
+        in-process are signalled and abandoned after the same grace period.
+        Args:
+            wait (bool): Block until the process trees are gone (when the application is exiting).
+        """
+        with self._processes_lock:
+            self.cancel_requested = True
+            running = [(tree, self._control_pipes[name]) for name, tree in self.current_processes.items()]
+            in_process_runs = list(self._in_process_runs.values())
         self.message_queue.put(('LOG', "Cancelamento solicitado...", "WARNING"))
 
-        if self.current_process:
+        for cancelled in in_process_runs:
+            cancelled.set()
+
+        for _, control in running:
+            control.cancel()
+        if running:
+            # Fora da thread da interface: a espera pelo encerramento não trava a janela
+            self._cancel_thread = threading.Thread(target=self._cancel_trees, args=(running,), daemon=True)
+            self._cancel_thread.start()
+            if wait:
+                self._cancel_thread.join()
+
+    def _cancel_trees(self, running: List[Tuple[ProcessTree, ControlPipe]]) -> None:
+        """Asks the installers to stop, then kills whatever is left of their process trees."""
+        deadline = time.monotonic() + CANCEL_GRACE
+        for tree, control in running:
+            control.cancel()
+            try:
+                tree.process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                pass
+        for tree, _ in running:
             try:
-                self.current_process.terminate()
-                import time
-                time.sleep(0.1)
-                if self.current_process.poll() is None:
-                    self.current_process.kill()
-                    self.message_queue.put(('LOG', "Processo de instalação forçado a terminar", "WARNING"))
+                # Mesmo com o instalador encerrado, programas iniciados por ele podem continuar
+                tree.kill()
             except Exception as e:
                 self.message_queue.put(('LOG', f"Erro ao tentar cancelar processo: {str(e)}", "ERROR"))
 
@@ -257,17 +490,28 @@ class InstallationService:
             return Path(sys.executable).parent
         return Path(__file__).parent.parent.parent
 
+    def _installer_command(self, key: str) -> List[str]:
+        """
+        Builds the command that starts an installer.
+
+        The frozen build is a single executable: installers run as its ``run <key>``
+        subcommand, reusing the runtime already unpacked next to it. From source,
+        each installer script runs in the current interpreter.
+        """
+        if getattr(sys, 'frozen', False):
+            return [sys.executable, "run", key]
+        return [sys.executable, str(self._get_base_path() / INSTALLER_SCRIPTS[key])]
+
     def _build_nodejs_args(
-        self, auto_mode: bool, download_timeout: int, install_timeout: int
+        self, auto_mode: bool, download_timeout: int, install_timeout: int, phase: str = "all"
     ) -> List[str]:
-        """Builds the arguments for the Node.js installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "nodeecli" / "install_nodejs_refactored.py"
+        """Builds the arguments for the Node.js installation script.
 
-        if getattr(sys, 'frozen', False):
-            args = [str(base_path / 'install_nodejs.exe')]
-        else:
-            args = [sys.executable, str(script_path)]
+        ``phase`` selects the part of the script to run: ``fetch``/``install``
+        (runtime download/installation), ``nodejs`` (both), ``cli``
+        (Gemini/Qwen CLIs only) or ``all``.
+        """
+        args = self._installer_command("nodejs")
 
         if auto_mode:
             args.append("--yes")
@@ -276,51 +520,26 @@ class InstallationService:
         args.extend([
             f"--download-timeout={download_timeout}",
             f"--install-timeout={install_timeout}",
+            f"--phase={phase}",
         ])
         return args
 
-    def _build_vscode_args(self) -> List[str]:
+    def _build_vscode_args(self, phase: str = "all") -> List[str]:
         """Builds the arguments for the VS Code installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "vscode" / "vscode_installer.py"
-
-        if getattr(sys, 'frozen', False):
-            return [str(base_path / 'vscode_installer.exe')]
-        return [sys.executable, str(script_path)]
+        return [*self._installer_command("vscode"), f"--phase={phase}"]
 
-    def _build_antigravity_args(self) -> List[str]:
+    def _build_antigravity_args(self, phase: str = "all") -> List[str]:
         """Builds the arguments for the Antigravity IDE installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "antigravity" / "installer.py"
+        return [*self._installer_command("antigravity"), f"--phase={phase}"]
 
-        if getattr(sys, 'frozen', False):
-            return [str(base_path / 'antigravity_installer.exe')]
-        return [sys.executable, str(script_path)]
-
-    def _build_git_args(self) -> List[str]:
+    def _build_git_args(self, phase: str = "all") -> List[str]:
         """Builds the arguments for the Git installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "git" / "git_installer.py"
-
-        if getattr(sys, 'frozen', False):
-            # Quando empacotado, o exe do Git fica em dist\git_installer\git_installer.exe
-            return [str(base_path.parent / 'git_installer' / 'git_installer.exe')]
-        return [sys.executable, str(script_path)]
+        return [*self._installer_command("git"), f"--phase={phase}"]
 
     def _build_mcp_excel_args(self) -> List[str]:
         """Builds the arguments for the MCP Excel Server installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "mcp_excel" / "mcp_excel_installer.py"
-
-        if getattr(sys, 'frozen', False):
-            return [str(base_path / 'mcp_excel_installer.exe')]
-        return [sys.executable, str(script_path)]
+        return self._installer_command("mcp_excel")
 
     def _build_opencode_args(self) -> List[str]:
         """Builds the arguments for the OpenCode CLI (Bun) installation script."""
-        base_path = self._get_base_path()
-        script_path = base_path / "opencode" / "installer.py"
-
-        if getattr(sys, 'frozen', False):
-            return [str(base_path / 'opencode_installer.exe')]
-        return [sys.executable, str(script_path)]
+        return self._installer_command("opencode")
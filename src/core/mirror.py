@@ -0,0 +1,421 @@
+import hashlib
+import mimetypes
+import os
+import shutil
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from nodeecli.modules.artifact_cache import ArtifactCache
+from nodeecli.modules.http_client import criar_sessao
+from nodeecli.modules.metadata_cache import TTL_PADRAO, MetadataCache
+from nodeecli.modules.mirror import ORIGENS, ORIGENS_REDIRECIONAMENTO, eh_artefato, url_de_origem, url_espelhada
+
+BLOCK_SIZE = 64 * 1024
+
+# Seconds a client waits for new bytes of an artifact that is still being fetched
+STALL_TIMEOUT = 120
+
+# Upstream headers relayed on redirects and metadata passthrough
+RELAYED_HEADERS = ("Content-Type", "Content-Length", "ETag", "Last-Modified", "Cache-Control")
+
+
+class _Transfer:
+    """An artifact being fetched from upstream, readable by clients while it is written."""
+
+    def __init__(self, url: str, path: str) -> None:
+        self.url = url
+        self.path = path
+        self.size: Optional[int] = None
+        self.written = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self.entry: Optional[dict] = None
+        self.headers_ready = threading.Event()
+        self.condition = threading.Condition()
+
+    def available(self, position: int) -> Optional[int]:
+        """
+        Blocks until the byte at ``position`` has been written.
+        Returns:
+            int: Bytes written so far, or None if the transfer failed or stalled.
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.written > position or self.done or self.error is not None, timeout=STALL_TIMEOUT
+            )
+            if self.written > position and self.error is None:
+                return self.written
+            return None
+
+    def wait_done(self) -> None:
+        """Blocks until the upstream fetch finishes (successfully or not)."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.done)
+
+
+def _etag(url: str, size: int) -> str:
+    """Validator of a mirrored artifact (artifacts live at versioned, immutable URLs)."""
+    return '"%s"' % hashlib.sha256(f"{url}#{size}".encode("utf-8")).hexdigest()[:32]
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single 'bytes=' range.
+    Returns:
+        Tuple[int, int]: (start, end) inclusive (start >= size means unsatisfiable),
+        or None to send the whole file.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if not start_text:
+            length = int(end_text)
+            return (max(0, size - length), size - 1) if length else None
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_MirrorHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+        self.server.mirror.log(f"{self.address_string()} {format % args}")
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    @property
+    def base_url(self) -> str:
+        """Mirror URL as seen by the client (used to rewrite redirects and npm tarball URLs)."""
+        return f"http://{self.headers.get('Host') or '%s:%s' % self.server.server_address[:2]}"
+
+    def _handle(self, send_body: bool) -> None:
+        mirror = self.server.mirror
+        prefix, url = url_de_origem(self.path, mirror.origins)
+        if url is None:
+            self._send_empty(404)
+            return
+        mirror.count("requests")
+        try:
+            if eh_artefato(url):
+                self._serve_artifact(prefix, url, send_body)
+            elif prefix in ORIGENS_REDIRECIONAMENTO or not send_body:
+                self._relay(url, send_body)
+            else:
+                self._serve_metadata(prefix, url)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except requests.RequestException as e:
+            mirror.log(f"Falha ao consultar a origem {url}: {e}")
+            self._send_empty(502)
+
+    def _send_empty(self, status: int, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    # ------------------------------------------------------------ artifacts
+
+    def _serve_artifact(self, prefix: str, url: str, send_body: bool) -> None:
+        mirror = self.server.mirror
+        entry, transfer = mirror.lookup(prefix, url)
+        if entry is not None:
+            path, size = entry["caminho"], entry["tamanho"]
+        else:
+            transfer.headers_ready.wait(STALL_TIMEOUT)
+            if transfer.error is not None or not transfer.headers_ready.is_set():
+                self._send_empty(502)
+                return
+            if transfer.size is None:
+                # Origin did not send Content-Length: wait for the whole file
+                transfer.wait_done()
+                if transfer.error is not None:
+                    self._send_empty(502)
+                    return
+                transfer.size = transfer.written
+            path, size = transfer.path, transfer.size
+
+        etag = _etag(url, size)
+        if_range = self.headers.get("If-Range")
+        byte_range = None if if_range and if_range != etag else _parse_range(self.headers.get("Range"), size)
+        if byte_range and byte_range[0] >= size:
+            self._send_empty(416, {"Content-Range": f"bytes */{size}"})
+            return
+
+        start, end = byte_range or (0, size - 1)
+        if byte_range:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", mimetypes.guess_type(url)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1 if size else 0))
+        self.end_headers()
+        if send_body and size:
+            self._copy(path, start, end, transfer if entry is None else None)
+
+    def _copy(self, path: str, start: int, end: int, transfer: Optional[_Transfer]) -> None:
+        """Sends bytes [start, end] of a file, following a transfer still being written."""
+        position = start
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            if transfer is None or transfer.entry is None:
+                raise
+            # The fetch finished and its temporary file was removed: same bytes are in the store
+            f = open(transfer.entry["caminho"], "rb")
+            transfer = None
+        with f:
+            f.seek(start)
+            while position <= end:
+                limit = end + 1
+                if transfer is not None:
+                    written = transfer.available(position)
+                    if written is None:
+                        self.close_connection = True
+                        return
+                    limit = min(limit, written)
+                block = f.read(min(BLOCK_SIZE, limit - position))
+                if not block:
+                    self.close_connection = True
+                    return
+                self.wfile.write(block)
+                position += len(block)
+                self.server.mirror.count("bytes_served", len(block))
+
+    # ------------------------------------------------------------ metadata and redirects
+
+    def _relay(self, url: str, send_body: bool) -> None:
+        """Forwards a request without following redirects (Location is rewritten to the mirror)."""
+        mirror = self.server.mirror
+        with mirror.session.request(self.command, url, allow_redirects=False, stream=True, timeout=(10, 60),
+                                    headers={"Accept-Encoding": "identity"}) as response:
+            self.send_response(response.status_code)
+            for name in RELAYED_HEADERS:
+                if name in response.headers:
+                    self.send_header(name, response.headers[name])
+            location = response.headers.get("Location")
+            if location:
+                self.send_header("Location", url_espelhada(location, self.base_url, mirror.origins))
+            body = response.raw.read() if send_body else b""
+            if "Content-Length" not in response.headers:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+    def _serve_metadata(self, prefix: str, url: str) -> None:
+        """Serves index.json, SHASUMS, GitHub API and npm documents through the metadata cache."""
+        mirror = self.server.mirror
+        try:
+            response = mirror.metadata.obter(url, session=mirror.session, ttl=mirror.metadata_ttl)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 502
+            self._send_empty(status if status < 500 else 502)
+            return
+        mirror.count("metadata_" + response.origem)
+        body = response.content
+        if prefix == "npm":
+            # Tarballs listed in the package document are downloaded through the mirror too
+            body = body.replace(mirror.origins["npm"].encode("utf-8"), f"{self.base_url}/npm/".encode("utf-8"))
+        content_type = mimetypes.guess_type(url)[0]
+        if content_type is None:
+            content_type = "application/json" if body[:1] in (b"{", b"[") else "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _MirrorHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients open several segment connections at once
+    request_queue_size = 128
+    mirror: "MirrorServer"
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients dropping idle keep-alive connections are not errors
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class MirrorServer:
+    """
+    LAN artifact mirror with cache-through semantics.
+
+    Serves the installers' upstream URLs under per-origin prefixes (see
+    ``nodeecli.modules.mirror.ORIGENS``). Artifacts are served from the local
+    artifact cache; on a miss a single upstream fetch is started and every
+    client asking for the same URL is streamed the bytes as they arrive.
+    Metadata goes through the metadata cache with conditional revalidation.
+    """
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        cache: Optional[ArtifactCache] = None,
+        origins: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        metadata_ttl: int = TTL_PADRAO,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Initializes the mirror (call ``start()`` or ``serve_forever()`` to accept clients).
+        Args:
+            host (str): Address to bind.
+            port (int): Port to bind (0 picks a free port).
+            cache (ArtifactCache): Artifact store (defaults to the local artifact cache).
+            origins (Dict[str, str]): Prefix -> upstream base URL (defaults to ORIGENS).
+            session (requests.Session): Session used upstream (never rewritten to a mirror).
+            metadata_ttl (int): Seconds metadata is served without revalidating upstream.
+            log (Callable[[str], None]): Access/error log output (None = silent).
+        """
+        self.cache = cache or ArtifactCache()
+        self.origins = dict(origins or ORIGENS)
+        self.session = session or criar_sessao(espelho="")
+        self.metadata = MetadataCache(self.cache.raiz / "metadata")
+        self.metadata_ttl = metadata_ttl
+        self._log = log
+        self.stats: Dict[str, int] = {}
+        self._stored: Dict[str, dict] = {}
+        self._transfers: Dict[str, _Transfer] = {}
+        self._lock = threading.Lock()
+        self.temp_dir = self.cache.raiz / "mirror-tmp"
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.httpd = _MirrorHTTPServer((host, port), _MirrorHandler)
+        self.httpd.mirror = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the mirror (loopback if bound to every interface)."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def log(self, message: str) -> None:
+        if self._log:
+            self._log(message)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + amount
+
+    def lookup(self, prefix: str, url: str) -> Tuple[Optional[dict], Optional[_Transfer]]:
+        """
+        Finds an artifact in the store, or joins (or starts) its upstream fetch.
+        Returns:
+            Tuple: (cache entry, None) on a hit; (None, transfer) on a miss.
+        """
+        with self._lock:
+            entry = self._stored.get(url)
+            if entry is not None and os.path.isfile(entry["caminho"]):
+                self.stats["hits"] = self.stats.get("hits", 0) + 1
+                return entry, None
+            transfer = self._transfers.get(url)
+            if transfer is not None:
+                self.stats["joined"] = self.stats.get("joined", 0) + 1
+                return None, transfer
+
+        entry = self.cache.procurar(prefix, url=url)
+        with self._lock:
+            if entry is None:
+                # The fetch may have finished while the index was being read
+                entry = self._stored.get(url)
+            if entry is not None:
+                self._stored[url] = entry
+                self.stats["hits"] = self.stats.get("hits", 0) + 1
+                return entry, None
+            transfer = self._transfers.get(url)
+            if transfer is None:
+                name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+                transfer = _Transfer(url, str(self.temp_dir / name))
+                self._transfers[url] = transfer
+                self.stats["misses"] = self.stats.get("misses", 0) + 1
+                threading.Thread(target=self._fetch, args=(prefix, transfer), daemon=True).start()
+            else:
+                self.stats["joined"] = self.stats.get("joined", 0) + 1
+            return None, transfer
+
+    def _fetch(self, prefix: str, transfer: _Transfer) -> None:
+        """Downloads an artifact from upstream into the store, notifying waiting clients."""
+        self.log(f"Baixando da origem: {transfer.url}")
+        try:
+            with self.session.get(transfer.url, stream=True, timeout=(10, 120),
+                                  headers={"Accept-Encoding": "identity"}) as response:
+                response.raise_for_status()
+                length = response.headers.get("Content-Length")
+                transfer.size = int(length) if length and length.isdigit() else None
+                with open(transfer.path, "wb") as f:
+                    transfer.headers_ready.set()
+                    for block in response.iter_content(chunk_size=BLOCK_SIZE):
+                        if not block:
+                            continue
+                        f.write(block)
+                        f.flush()
+                        with transfer.condition:
+                            transfer.written += len(block)
+                            transfer.condition.notify_all()
+            if transfer.size is not None and transfer.written != transfer.size:
+                raise IOError(f"tamanho divergente ({transfer.written} de {transfer.size} bytes)")
+            self.count("upstream_bytes", transfer.written)
+            entry = self.cache.armazenar(transfer.path, prefix, url=transfer.url)
+            entry["caminho"] = str(self.cache.caminho_blob(entry["sha256"]))
+            transfer.entry = entry
+            with self._lock:
+                self._stored[transfer.url] = entry
+        except (requests.RequestException, OSError) as e:
+            transfer.error = str(e)
+            self.log(f"Falha ao baixar {transfer.url}: {e}")
+        finally:
+            with transfer.condition:
+                transfer.done = True
+                transfer.condition.notify_all()
+            transfer.headers_ready.set()
+            with self._lock:
+                self._transfers.pop(transfer.url, None)
+            try:
+                os.remove(transfer.path)
+            except OSError:
+                pass  # still open by a client (Windows); removed on the next start
+
+    def start(self) -> "MirrorServer":
+        """Serves clients from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves clients until interrupted."""
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stops accepting clients and closes the listening socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MirrorServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
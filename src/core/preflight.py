@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from nodeecli.modules.common import versao_registrada
+from nodeecli.modules.metadata_cache import TTL_PADRAO, MetadataCache
+
+from .bundle import NPM_REGISTRY
+
+# Tempo máximo de cada consulta (comando '--version' ou metadados): uma consulta
+# lenta só mantém a ferramenta no plano, não atrasa a instalação das demais
+PROBE_TIMEOUT = 10
+VSCODE_RELEASES_URL = "https://update.code.visualstudio.com/api/releases/stable"
+
+_VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+")
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """Numeric key of a version ('v2.47.1.windows.2' -> (2, 47, 1)); pre-release suffixes are ignored."""
+    match = _VERSION_PATTERN.search(version)
+    parts = [int(part) for part in match.group(0).split(".")] if match else []
+    # '2.47.1' e '2.47.1.0' são a mesma versão
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+class VersionCheck:
+    """Installed and latest known version of one component of a tool."""
+
+    def __init__(self, name: str, installed: Optional[str], latest: Optional[str]) -> None:
+        """
+        Initializes the check.
+        Args:
+            name (str): Component name shown in the log (e.g. 'Gemini CLI').
+            installed (str): Installed version, or None if not installed or not detected.
+            latest (str): Latest version from the (cached) release metadata, or None if unknown.
+        """
+        self.name: str = name
+        self.installed: Optional[str] = installed
+        self.latest: Optional[str] = latest
+
+    @property
+    def up_to_date(self) -> bool:
+        """True only if both versions are known and the installed one is not older."""
+        if not self.installed or not self.latest:
+            return False
+        return version_key(self.installed) >= version_key(self.latest)
+
+
+class PreflightResult:
+    """Outcome of the preflight probe of one tool."""
+
+    def __init__(self, key: str, checks: List[VersionCheck]) -> None:
+        """
+        Initializes the result.
+        Args:
+            key (str): Tool key (see ``TOOL_SPECS``).
+            checks (List[VersionCheck]): One check per component of the tool.
+        """
+        self.key: str = key
+        self.checks: List[VersionCheck] = checks
+
+    @property
+    def up_to_date(self) -> bool:
+        """True if every component is installed at its latest version (nothing to do)."""
+        return bool(self.checks) and all(check.up_to_date for check in self.checks)
+
+    def describe(self) -> str:
+        """Installed versions for the log (e.g. 'Gemini CLI 0.1.5, Qwen CLI 0.0.9')."""
+        return ", ".join(f"{check.name} {check.installed or 'não instalado'}" for check in self.checks)
+
+
+def _command_version(command: str) -> Optional[str]:
+    """Runs ``<command> --version`` and extracts the version it prints."""
+    executable = shutil.which(command)
+    if not executable:
+        return None
+    try:
+        result = subprocess.run(
+            [executable, "--version"], capture_output=True, text=True, encoding="utf-8", errors="replace",
+            timeout=PROBE_TIMEOUT, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_PATTERN.search(result.stdout) if result.returncode == 0 else None
+    return match.group(0) if match else None
+
+
+@lru_cache(maxsize=1)
+def _npm_global_root() -> Optional[Path]:
+    """Global node_modules directory (without starting npm when it is in the default location)."""
+    appdata = os.environ.get("APPDATA")
+    if appdata and (Path(appdata) / "npm" / "node_modules").is_dir():
+        return Path(appdata) / "npm" / "node_modules"
+    npm = shutil.which("npm")
+    if not npm:
+        return None
+    try:
+        result = subprocess.run(
+            [npm, "root", "-g"], capture_output=True, text=True, encoding="utf-8", errors="replace",
+            timeout=PROBE_TIMEOUT, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return Path(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip() else None
+
+
+def _npm_installed(package: str) -> Optional[str]:
+    """Version of a globally installed npm package, read from its package.json."""
+    root = _npm_global_root()
+    if root is None:
+        return None
+    try:
+        return json.loads((root / package / "package.json").read_text(encoding="utf-8")).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _npm_latest(package: str) -> Optional[str]:
+    # Mesma URL usada por build_bundle: a resposta em cache serve aos dois
+    url = f"{NPM_REGISTRY}/{quote(package, safe='@')}/latest"
+    return MetadataCache().obter(url, ttl=TTL_PADRAO, timeout=PROBE_TIMEOUT).json().get("version")
+
+
+def _nodejs_latest() -> Optional[str]:
+    from nodeecli.modules.common import detectar_arquitetura
+    from nodeecli.modules.node_releases import IndiceReleases
+
+    release = IndiceReleases.carregar(timeout=PROBE_TIMEOUT).mais_recente("lts", detectar_arquitetura())
+    return release["version"].lstrip("v") if release else None
+
+
+def _vscode_latest() -> Optional[str]:
+    releases = MetadataCache().obter(VSCODE_RELEASES_URL, ttl=TTL_PADRAO, timeout=PROBE_TIMEOUT).json()
+    return releases[0] if releases else None
+
+
+def _antigravity_latest() -> Optional[str]:
+    from antigravity.installer import get_download_url, get_version
+
+    # O instalador baixa uma versão fixa: a "mais recente" é a da URL
+    return get_version(get_download_url())
+
+
+def _git_latest() -> Optional[str]:
+    from git.git_installer import _resolve_latest_git_url, _version_from_url
+
+    url = _resolve_latest_git_url(timeout=PROBE_TIMEOUT)
+    return _version_from_url(url) if url else None
+
+
+# Consultas de cada ferramenta de TOOL_SPECS: (componente, versão instalada, versão mais recente).
+# Ferramentas sem entrada (mcp_excel: repositório sem versão publicada) sempre são executadas.
+VERSION_PROBES: Dict[str, List[Tuple[str, Callable[[], Optional[str]], Callable[[], Optional[str]]]]] = {
+    "nodejs": [
+        ("Node.js", lambda: versao_registrada("Node.js") or _command_version("node"), _nodejs_latest),
+    ],
+    "cli_tools": [
+        ("Gemini CLI", lambda: _npm_installed("@google/gemini-cli"), lambda: _npm_latest("@google/gemini-cli")),
+        ("Qwen CLI", lambda: _npm_installed("@qwen-code/qwen-code"), lambda: _npm_latest("@qwen-code/qwen-code")),
+    ],
+    "vscode": [
+        ("VS Code", lambda: versao_registrada("Microsoft Visual Studio Code"), _vscode_latest),
+    ],
+    "antigravity": [
+        ("Antigravity", lambda: versao_registrada("Antigravity"), _antigravity_latest),
+    ],
+    "git": [
+        ("Git", lambda: versao_registrada("Git") or _command_version("git"), _git_latest),
+    ],
+    "opencode": [
+        ("OpenCode CLI", lambda: _command_version("opencode"), lambda: _npm_latest("opencode-ai")),
+    ],
+}
+
+
+def _safe_call(probe: Callable[[], Optional[str]]) -> Optional[str]:
+    """Runs a probe; any failure (offline without cached metadata, unreadable registry) means unknown."""
+    try:
+        return probe()
+    except Exception:
+        return None
+
+
+def probe_versions(keys: Iterable[str]) -> Dict[str, PreflightResult]:
+    """
+    Resolves the installed and latest version of each tool concurrently.
+
+    Every probe (installed version and latest version of every component) runs
+    on its own thread, so the pass takes as long as the slowest probe. Latest
+    versions come from the metadata cache: within its TTL no request is made.
+    Args:
+        keys (Iterable[str]): Tool keys; keys without an entry in ``VERSION_PROBES`` are ignored.
+    Returns:
+        Dict[str, PreflightResult]: Result per probed tool.
+    """
+    probes = {key: VERSION_PROBES[key] for key in keys if key in VERSION_PROBES}
+    if not probes:
+        return {}
+    workers = sum(2 * len(components) for components in probes.values())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preflight") as pool:
+        futures = {
+            key: [(name, pool.submit(_safe_call, installed), pool.submit(_safe_call, latest))
+                  for name, installed, latest in components]
+            for key, components in probes.items()
+        }
+        results: Dict[str, PreflightResult] = {}
+        for key, checks in futures.items():
+            resolved = [VersionCheck(name, installed.result(), latest.result()) for name, installed, latest in checks]
+            results[key] = PreflightResult(key, resolved)
+    return results
@@ -0,0 +1,116 @@
+import os
+import signal
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# CreateProcess: a thread principal só começa a executar após ResumeThread/NtResumeProcess
+CREATE_SUSPENDED = 0x00000004
+
+
+class ProcessTree:
+    """
+    A child process together with everything it starts (msiexec, npm, setup programs).
+
+    On POSIX the child leads a new session, so its process group collects the
+    descendants; on Windows it is started suspended, assigned to a job object
+    and only then resumed, so nothing it spawns can escape the job. ``kill()``
+    ends the whole tree, including processes whose parent has already exited.
+    """
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        """Takes ownership of a process started with ``**ProcessTree.popen_kwargs()``."""
+        self.process = process
+        self._job: Optional[int] = None
+        if os.name == 'nt':
+            try:
+                self._job = _create_job(process)
+            finally:
+                # Retomado mesmo sem job object, senão o processo ficaria suspenso
+                _resume(process)
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def popen_kwargs(creationflags: int = 0) -> Dict[str, Any]:
+        """Popen arguments that make the new process the root of its own tree.
+
+        Args:
+            creationflags (int): Additional Windows creation flags (e.g. CREATE_NO_WINDOW).
+        """
+        if os.name == 'nt':
+            # Suspenso até entrar no job object (ver __init__)
+            return {"creationflags": creationflags | CREATE_SUSPENDED}
+        return {"creationflags": creationflags, "start_new_session": True}
+
+    def kill(self) -> None:
+        """Kills every process of the tree that is still running (no-op after ``close()``)."""
+        with self._lock:
+            if self._closed:
+                return
+            if os.name == 'nt':
+                if self._job is not None and _kernel32().TerminateJobObject(self._job, 1):
+                    return
+                # Sem job object: taskkill percorre a árvore a partir do processo raiz
+                subprocess.run(
+                    ["taskkill", "/T", "/F", "/PID", str(self.process.pid)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+                )
+                return
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                # Grupo já vazio
+                pass
+
+    def close(self) -> None:
+        """Stops tracking the tree and releases the job object (the processes keep running)."""
+        with self._lock:
+            self._closed = True
+            if self._job is not None:
+                _kernel32().CloseHandle(self._job)
+                self._job = None
+
+
+@lru_cache(maxsize=None)
+def _kernel32():
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.CreateJobObjectW.argtypes = (wintypes.LPVOID, wintypes.LPCWSTR)
+    kernel32.AssignProcessToJobObject.argtypes = (wintypes.HANDLE, wintypes.HANDLE)
+    kernel32.TerminateJobObject.argtypes = (wintypes.HANDLE, wintypes.UINT)
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    return kernel32
+
+
+def _resume(process: subprocess.Popen) -> None:
+    """Resumes a process started with CREATE_SUSPENDED.
+
+    Popen closes the handle of the main thread, so the whole process is resumed
+    through its handle (NtResumeProcess).
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    ntdll = ctypes.WinDLL("ntdll")
+    ntdll.NtResumeProcess.argtypes = (wintypes.HANDLE,)
+    ntdll.NtResumeProcess(int(process._handle))
+
+
+def _create_job(process: subprocess.Popen) -> Optional[int]:
+    """Creates a job object holding the process (None if Windows refuses it)."""
+    kernel32 = _kernel32()
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return None
+    # Processos criados pelo filho entram no mesmo job automaticamente
+    if not kernel32.AssignProcessToJobObject(job, int(process._handle)):
+        kernel32.CloseHandle(job)
+        return None
+    return job
@@ -0,0 +1,224 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class ScheduledTask:
+    """A unit of work with declared dependencies and resource claims."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(
+        self,
+        name: str,
+        action: Callable[[], bool],
+        depends_on: Iterable[str] = (),
+        resources: Iterable[str] = (),
+        weight: float = 1.0,
+    ) -> None:
+        """
+        Initializes the task.
+        Args:
+            name (str): Unique task name inside the scheduler.
+            action (Callable[[], bool]): Work to run; returns True on success.
+            depends_on (Iterable[str]): Names of tasks that must succeed first.
+            resources (Iterable[str]): Resource slots held while the task runs.
+            weight (float): Estimated duration, used to prioritise the critical path.
+        """
+        self.name: str = name
+        self.action: Callable[[], bool] = action
+        self.depends_on: List[str] = list(depends_on)
+        self.resources: List[str] = list(resources)
+        self.weight: float = weight
+        self.status: str = ScheduledTask.PENDING
+        self.error: Optional[BaseException] = None
+        self.priority: float = weight
+
+    @property
+    def finished(self) -> bool:
+        """True once the task left the pending/running states."""
+        return self.status in (ScheduledTask.SUCCEEDED, ScheduledTask.FAILED, ScheduledTask.SKIPPED)
+
+
+class DependencyScheduler:
+    """Runs tasks concurrently, honouring dependencies and per-resource limits.
+
+    A task starts as soon as every dependency has succeeded and every resource
+    it claims has a free slot. Tasks whose dependencies fail (or are skipped)
+    are skipped. Among ready tasks, the one with the longest remaining chain
+    (critical path) starts first.
+    """
+
+    def __init__(self, resource_limits: Optional[Dict[str, int]] = None) -> None:
+        """
+        Initializes the scheduler.
+        Args:
+            resource_limits (Dict[str, int]): Concurrent slots per resource name.
+                Resources not listed are unlimited.
+        """
+        self.resource_limits: Dict[str, int] = dict(resource_limits or {})
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self._in_use: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    def add_task(self, task: ScheduledTask) -> None:
+        """Registers a task. Names must be unique."""
+        if task.name in self.tasks:
+            raise ValueError(f"Tarefa duplicada: {task.name}")
+        self.tasks[task.name] = task
+
+    def _validate(self) -> None:
+        """Checks for unknown dependencies and cycles, and computes priorities."""
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                if dep not in self.tasks:
+                    raise ValueError(f"Dependência desconhecida '{dep}' em '{task.name}'")
+            for resource in set(task.resources):
+                limit = self.resource_limits.get(resource)
+                if limit is not None and task.resources.count(resource) > limit:
+                    raise ValueError(f"Tarefa '{task.name}' excede o limite do recurso '{resource}'")
+
+        dependents: Dict[str, List[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                dependents[dep].append(task.name)
+
+        # Ordenação topológica (Kahn) para detectar ciclos
+        remaining = {name: len(task.depends_on) for name, task in self.tasks.items()}
+        order: List[str] = [name for name, count in remaining.items() if count == 0]
+        index = 0
+        while index < len(order):
+            for child in dependents[order[index]]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    order.append(child)
+            index += 1
+        if len(order) != len(self.tasks):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Ciclo de dependências entre: {', '.join(cyclic)}")
+
+        # Prioridade = peso da tarefa + maior cadeia de dependentes
+        for name in reversed(order):
+            task = self.tasks[name]
+            task.priority = task.weight + max(
+                (self.tasks[child].priority for child in dependents[name]), default=0.0
+            )
+
+    def _resources_available(self, task: ScheduledTask) -> bool:
+        """Returns True if every resource claimed by the task has a free slot."""
+        needed: Dict[str, int] = {}
+        for resource in task.resources:
+            needed[resource] = needed.get(resource, 0) + 1
+        for resource, count in needed.items():
+            limit = self.resource_limits.get(resource)
+            if limit is not None and self._in_use.get(resource, 0) + count > limit:
+                return False
+        return True
+
+    def _acquire(self, task: ScheduledTask) -> None:
+        for resource in task.resources:
+            self._in_use[resource] = self._in_use.get(resource, 0) + 1
+
+    def _release(self, task: ScheduledTask) -> None:
+        for resource in task.resources:
+            self._in_use[resource] -= 1
+
+    def _worker(
+        self,
+        task: ScheduledTask,
+        on_task_done: Optional[Callable[[ScheduledTask], None]],
+    ) -> None:
+        """Runs a single task and publishes its outcome."""
+        try:
+            succeeded = bool(task.action())
+        except Exception as e:  # a falha de uma tarefa não derruba o agendador
+            task.error = e
+            succeeded = False
+
+        with self._condition:
+            task.status = ScheduledTask.SUCCEEDED if succeeded else ScheduledTask.FAILED
+            self._release(task)
+
+        if on_task_done:
+            on_task_done(task)
+
+        with self._condition:
+            self._condition.notify_all()
+
+    def run(
+        self,
+        should_cancel: Callable[[], bool] = lambda: False,
+        on_task_start: Optional[Callable[[ScheduledTask], None]] = None,
+        on_task_done: Optional[Callable[[ScheduledTask], None]] = None,
+        poll_interval: float = 0.1,
+    ) -> Dict[str, str]:
+        """
+        Runs every registered task and blocks until all of them finished.
+        Args:
+            should_cancel (Callable[[], bool]): Once True, no new task starts.
+            on_task_start (Callable): Called (on the scheduler thread) before a task starts.
+            on_task_done (Callable): Called (on the worker thread) after a task finishes
+                or is skipped.
+            poll_interval (float): Upper bound for re-checking should_cancel.
+        Returns:
+            Dict[str, str]: Final status of each task.
+        """
+        self._validate()
+        threads: List[threading.Thread] = []
+
+        while True:
+            skipped: List[ScheduledTask] = []
+            to_start: List[ScheduledTask] = []
+
+            with self._condition:
+                cancelled = should_cancel()
+                pending = [t for t in self.tasks.values() if t.status == ScheduledTask.PENDING]
+                running = any(t.status == ScheduledTask.RUNNING for t in self.tasks.values())
+
+                for task in pending:
+                    dep_status = [self.tasks[dep].status for dep in task.depends_on]
+                    if cancelled or any(
+                        s in (ScheduledTask.FAILED, ScheduledTask.SKIPPED) for s in dep_status
+                    ):
+                        task.status = ScheduledTask.SKIPPED
+                        skipped.append(task)
+
+                ready = [
+                    t for t in pending
+                    if t.status == ScheduledTask.PENDING
+                    and all(self.tasks[dep].status == ScheduledTask.SUCCEEDED for dep in t.depends_on)
+                ]
+                ready.sort(key=lambda t: t.priority, reverse=True)
+                for task in ready:
+                    if self._resources_available(task):
+                        self._acquire(task)
+                        task.status = ScheduledTask.RUNNING
+                        to_start.append(task)
+
+                if not to_start and not skipped:
+                    if all(t.finished for t in self.tasks.values()):
+                        break
+                    if running or pending:
+                        self._condition.wait(timeout=poll_interval)
+                        continue
+
+            for task in skipped:
+                if on_task_done:
+                    on_task_done(task)
+
+            for task in to_start:
+                if on_task_start:
+                    on_task_start(task)
+                thread = threading.Thread(
+                    target=self._worker, args=(task, on_task_done), daemon=True
+                )
+                threads.append(thread)
+                thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return {name: task.status for name, task in self.tasks.items()}
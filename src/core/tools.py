@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List, Tuple
+
+
+# Limites de concorrência por recurso compartilhado.
+# "installer" representa o único slot do Windows Installer/Inno Setup:
+# msiexec recusa instalações simultâneas (erro 1618) e os setups Inno
+# competem pelos mesmos arquivos/registro.
+RESOURCE_LIMITS: Dict[str, int] = {
+    "network": 3,
+    "disk": 2,
+    "installer": 1,
+}
+
+
+class ToolSpec:
+    """Static description of an installable tool and its scheduling needs."""
+
+    def __init__(
+        self,
+        key: str,
+        label: str,
+        title: str,
+        depends_on: Iterable[str] = (),
+        resources: Iterable[str] = (),
+        weight: float = 60.0,
+        fetch_weight: float = 0.0,
+    ) -> None:
+        """
+        Initializes the tool specification.
+        Args:
+            key (str): Stable identifier used by the scheduler.
+            label (str): Short name used in status/failure messages.
+            title (str): Full name used in headers and success messages.
+            depends_on (Iterable[str]): Keys of tools that must be installed first.
+            resources (Iterable[str]): Resources held while the tool (or its install
+                phase) runs.
+            weight (float): Estimated duration in seconds (critical-path priority).
+            fetch_weight (float): Estimated download time in seconds. A non-zero value
+                means the tool exposes separate fetch/install phases, so its download
+                can be pipelined with another tool's installation.
+        """
+        self.key: str = key
+        self.label: str = label
+        self.title: str = title
+        self.depends_on: Tuple[str, ...] = tuple(depends_on)
+        self.resources: Tuple[str, ...] = tuple(resources)
+        self.weight: float = weight
+        self.fetch_weight: float = fetch_weight
+
+    @property
+    def phased(self) -> bool:
+        """True if the tool downloads and installs in separate phases."""
+        return self.fetch_weight > 0
+
+
+# Recursos usados pela etapa de download das ferramentas em fases.
+FETCH_RESOURCES: Tuple[str, ...] = ("network",)
+
+# Ordem da lista = ordem de exibição e critério de desempate do agendador.
+# Ferramentas com fetch_weight > 0 são divididas em duas tarefas: "<key>.fetch"
+# (recursos FETCH_RESOURCES) e "<key>" (instalação, recursos declarados).
+TOOL_SPECS: List[ToolSpec] = [
+    ToolSpec("nodejs", "Node.js", "Node.js", resources=("installer",), weight=45, fetch_weight=30),
+    ToolSpec("cli_tools", "CLI Tools", "Gemini CLI + Qwen CLI", depends_on=("nodejs",),
+             resources=("network", "disk"), weight=120),
+    ToolSpec("vscode", "VS Code", "Visual Studio Code", resources=("installer",), weight=60, fetch_weight=60),
+    ToolSpec("antigravity", "Antigravity IDE", "Antigravity IDE", resources=("installer",), weight=60,
+             fetch_weight=90),
+    ToolSpec("git", "Git", "Git for Windows", resources=("installer",), weight=45, fetch_weight=45),
+    ToolSpec("mcp_excel", "MCP Excel Server", "MCP Excel Server", depends_on=("git",),
+             resources=("network", "disk"), weight=90),
+    ToolSpec("opencode", "OpenCode CLI", "OpenCode CLI (Bun)", resources=("network", "disk"), weight=90),
+]
+
+TOOLS_BY_KEY: Dict[str, ToolSpec] = {spec.key: spec for spec in TOOL_SPECS}
+
+# Script de cada instalador, relativo à raiz do projeto. No executável
+# empacotado, os mesmos módulos são executados pelo subcomando "run <chave>".
+INSTALLER_SCRIPTS: Dict[str, str] = {
+    "nodejs": "nodeecli/install_nodejs_refactored.py",
+    "vscode": "vscode/vscode_installer.py",
+    "antigravity": "antigravity/installer.py",
+    "git": "git/git_installer.py",
+    "mcp_excel": "mcp_excel/mcp_excel_installer.py",
+    "opencode": "opencode/installer.py",
+}
+
+
+def installer_module(key: str) -> str:
+    """Returns the importable module name of an installer script (e.g. ``vscode.vscode_installer``)."""
+    return INSTALLER_SCRIPTS[key][:-len(".py")].replace("/", ".")
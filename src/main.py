@@ -6,27 +6,76 @@ Orquestrador de Instalações - Ponto de Entrada da Aplicação
 """
 import sys
 import os
-import ctypes
 
 # Adicionar o diretório raiz do projeto ao sys.path
 # Isso garante que as importações de 'src' funcionem corretamente
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from src.ui.main_view import MainView
-from src.app.orchestrator import OrchestratorApp
+# Abre a janela, imprime o tempo de cada etapa até a primeira pintura e fecha
+STARTUP_PROFILE_FLAG = "--startup-profile"
 
-def main() -> None:
-    """Ponto de entrada da aplicação."""
-    # Configuração de High-DPI para Windows
+
+def _attach_console() -> None:
+    """No executável empacotado (sem console próprio), escreve no terminal que o iniciou."""
+    if sys.stdout is not None or not getattr(sys, 'frozen', False):
+        return
+    try:
+        import ctypes
+        if ctypes.windll.kernel32.AttachConsole(-1):  # ATTACH_PARENT_PROCESS
+            sys.stdout = sys.stderr = open('CONOUT$', 'w', encoding='utf-8')
+    except (AttributeError, OSError):
+        pass
+
+
+def _set_dpi_awareness() -> None:
+    """Configuração de High-DPI para Windows."""
     try:
+        import ctypes
         ctypes.windll.shcore.SetProcessDpiAwareness(1)
     except (AttributeError, OSError):
         pass  # Não é Windows ou ocorreu um erro
 
+
+def main() -> int:
+    """Ponto de entrada da aplicação (GUI sem argumentos; subcomandos de src/cli.py com argumentos)."""
+    profile = None
+    if sys.argv[1:] == [STARTUP_PROFILE_FLAG]:
+        from src.app.startup_profile import StartupProfile
+        profile = StartupProfile()
+        profile.track_imports()
+        _attach_console()
+    elif len(sys.argv) > 1:
+        _attach_console()
+        if sys.argv[1] == "run":
+            # Instaladores iniciados pelo executável empacotado: sem os imports dos demais subcomandos
+            from src.runner import main as run_main
+            return run_main(sys.argv[2:])
+        from src.cli import main as cli_main
+        return cli_main(sys.argv[1:])
+
+    from src.ui.main_view import MainView
+    from src.app.orchestrator import OrchestratorApp
+    if profile:
+        profile.mark("Imports")
+
+    _set_dpi_awareness()
     root = MainView()
+    if profile:
+        profile.mark("Janela (MainView)")
     app = OrchestratorApp(root)
+    if profile:
+        profile.mark("Orquestrador")
+
+        def painted() -> None:
+            profile.print_report()
+            root.destroy()
+
+        profile.watch_first_paint(root, painted)
     app.run()
+    if profile:
+        return 0 if profile.within_budget() else 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
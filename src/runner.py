@@ -0,0 +1,41 @@
+"""
+Orquestrador de Instalações - Execução de um instalador no próprio processo
+
+O executável empacotado é único: o orquestrador inicia cada instalador como
+``OrquestradorInstalacoes.exe run <ferramenta> [argumentos]``, reaproveitando o
+runtime já descompactado. src/main.py chama este módulo diretamente, sem os
+imports dos demais subcomandos.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from .core.in_process import run_main
+from .core.tools import INSTALLER_SCRIPTS, installer_module
+
+
+def run_installer(tool: str, argv: List[str]) -> int:
+    """
+    Imports an installer module and runs its ``main(argv)``.
+    Args:
+        tool (str): Installer key (see ``INSTALLER_SCRIPTS``).
+        argv (List[str]): Arguments passed on to the installer.
+    Returns:
+        int: The installer's exit code (also sent as the 'resultado' event).
+    """
+    return run_main(installer_module(tool), argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parses ``<ferramenta> [argumentos]`` and runs the installer.
+    Args:
+        argv (List[str]): Arguments after ``run`` (defaults to sys.argv[2:]).
+    Returns:
+        int: Exit code.
+    """
+    parser = argparse.ArgumentParser(prog="orquestrador run", description="Executa um instalador")
+    parser.add_argument("tool", choices=list(INSTALLER_SCRIPTS), help="Instalador a executar")
+    parser.add_argument("installer_args", nargs=argparse.REMAINDER, help="Argumentos repassados ao instalador")
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+    return run_installer(args.tool, args.installer_args)
@@ -0,0 +1,159 @@
+import sys
+from typing import Dict, List, Optional
+
+import customtkinter as ctk
+from customtkinter import CTkFont
+
+from ..app.log_buffer import LOG_LEVELS, LogBuffer, LogEntry
+
+ALL_LEVELS = "Todos"
+# Intervalo entre redesenhos (no máximo um por quadro, mesmo com muitas linhas chegando)
+FRAME_MS = 16
+# Espera após a última tecla antes de aplicar a busca
+SEARCH_DELAY_MS = 150
+
+
+class LogConsole(ctk.CTkFrame):
+    """Log console that renders only the visible lines of a bounded LogBuffer."""
+
+    def __init__(self, master, buffer: LogBuffer, **kwargs) -> None:
+        """Initializes the console with its toolbar (level filter, search) and text area."""
+        super().__init__(master, **kwargs)
+        self.buffer = buffer
+        self.offset = 0
+        # Acompanhar o fim do log até o usuário rolar para cima
+        self.follow = True
+        self._render_pending = False
+        self._search_job: Optional[str] = None
+
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.level_menu = ctk.CTkOptionMenu(
+            self, values=[ALL_LEVELS, *LOG_LEVELS], width=110, command=lambda _: self._apply_filter()
+        )
+        self.level_menu.grid(row=0, column=0, padx=(0, 5), pady=(0, 5), sticky="w")
+
+        self.search_entry = ctk.CTkEntry(self, placeholder_text="Buscar no log...")
+        self.search_entry.grid(row=0, column=1, pady=(0, 5), sticky="ew")
+        self.search_entry.bind("<KeyRelease>", self._on_search_typed)
+
+        self.count_label = ctk.CTkLabel(self, text="")
+        self.count_label.grid(row=0, column=2, columnspan=2, padx=(5, 0), pady=(0, 5))
+
+        self.font = CTkFont(family="Consolas", size=12)
+        self.textbox = ctk.CTkTextbox(self, wrap="none", activate_scrollbars=False, font=self.font)
+        self.textbox.grid(row=1, column=0, columnspan=3, sticky="nsew")
+        self.textbox.configure(state="disabled")
+        self.textbox.tag_config("MATCH", background="#5C4B00")
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=3, sticky="ns")
+
+        self.textbox.bind("<Configure>", lambda event: self.schedule_render())
+        if sys.platform.startswith("linux"):
+            self.textbox.bind("<Button-4>", lambda event: self._scroll_lines(-3))
+            self.textbox.bind("<Button-5>", lambda event: self._scroll_lines(3))
+        else:
+            self.textbox.bind("<MouseWheel>", lambda event: self._scroll_lines(-3 * event.delta // 120))
+
+    def set_level_colors(self, colors: Dict[str, str]) -> None:
+        """Sets the text color of each log level."""
+        for level, color in colors.items():
+            self.textbox.tag_config(level, foreground=color)
+
+    def append(self, entries: List[tuple]) -> None:
+        """Adds (message, level) entries; the console is redrawn on the next frame."""
+        if self.buffer.append(entries):
+            self.schedule_render()
+
+    def clear(self) -> None:
+        """Empties the console."""
+        self.buffer.clear()
+        self.offset = 0
+        self.follow = True
+        self.schedule_render()
+
+    def schedule_render(self) -> None:
+        """Requests a redraw, merging requests made within the same frame."""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after(FRAME_MS, self.render)
+
+    def render(self) -> None:
+        """Draws the visible window of the filtered view."""
+        self._render_pending = False
+        visible = self._visible_lines()
+        size = len(self.buffer.view)
+        max_offset = max(size - visible, 0)
+        self.offset = max_offset if self.follow else min(self.offset, max_offset)
+        lines = self.buffer.window(self.offset, visible)
+
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self._insert_lines(lines)
+        if self.buffer.query:
+            self._highlight(lines, self.buffer.query)
+        self.textbox.configure(state="disabled")
+
+        if size:
+            self.scrollbar.set(self.offset / size, min((self.offset + visible) / size, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.buffer.filtered:
+            self.count_label.configure(text=f"{size} de {len(self.buffer.entries)} linhas")
+        else:
+            self.count_label.configure(text=f"{size} linhas")
+
+    def _insert_lines(self, lines: List[LogEntry]) -> None:
+        # Uma inserção por sequência de linhas do mesmo nível
+        start = 0
+        while start < len(lines):
+            level = lines[start].level
+            end = start
+            while end < len(lines) and lines[end].level == level:
+                end += 1
+            text = "\n".join(entry.text() for entry in lines[start:end])
+            if end < len(lines):
+                text += "\n"
+            self.textbox.insert("end", text, level)
+            start = end
+
+    def _highlight(self, lines: List[LogEntry], query: str) -> None:
+        for row, entry in enumerate(lines, start=1):
+            text = entry.text().lower()
+            column = text.find(query)
+            while column != -1:
+                self.textbox.tag_add("MATCH", f"{row}.{column}", f"{row}.{column + len(query)}")
+                column = text.find(query, column + len(query))
+
+    def _visible_lines(self) -> int:
+        return max(self.textbox.winfo_height() // max(self.font.metrics("linespace"), 1), 1)
+
+    def _scroll_lines(self, lines: int) -> None:
+        self._scroll_to(self.offset + lines)
+
+    def _scroll_to(self, offset: int) -> None:
+        max_offset = max(len(self.buffer.view) - self._visible_lines(), 0)
+        self.offset = min(max(offset, 0), max_offset)
+        self.follow = self.offset >= max_offset
+        self.schedule_render()
+
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(value) * len(self.buffer.view)))
+        elif action == "scroll":
+            step = self._visible_lines() if unit == "pages" else 1
+            self._scroll_lines(int(value) * step)
+
+    def _on_search_typed(self, event=None) -> None:
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._search_job = None
+        level = self.level_menu.get()
+        self.buffer.set_filter(None if level == ALL_LEVELS else [level], self.search_entry.get())
+        self.follow = True
+        self.schedule_render()
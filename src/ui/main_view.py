@@ -2,7 +2,12 @@
 import tkinter
 import customtkinter as ctk
 from customtkinter import CTkFont
-from typing import Callable
+from typing import Callable, Dict, List, Optional, Tuple
+from ..app.log_buffer import LogBuffer, new_session_history
+from .log_console import LogConsole
+
+# Tamanho inicial da janela (em unidades da CustomTkinter, antes da escala de DPI)
+WINDOW_SIZE = (900, 650)
 
 class MainView(ctk.CTk):
     """Main view of the application."""
@@ -12,7 +17,7 @@ class MainView(ctk.CTk):
         super().__init__()
 
         self.title("Orquestrador de Instalações")
-        self.geometry("900x650")
+        self.center_window()
         self.minsize(800, 600)
 
         ctk.set_default_color_theme("blue")
@@ -25,7 +30,8 @@ class MainView(ctk.CTk):
 
         self._create_sidebar()
         self._create_main_area()
-        self.center_window()
+        # O histórico em disco (com a limpeza das sessões antigas) fica para depois da primeira pintura
+        self.after_idle(self._open_log_history)
 
     def _create_sidebar(self) -> None:
         """Creates the left sidebar with controls."""
@@ -133,8 +139,10 @@ class MainView(ctk.CTk):
         self.main_frame.grid_columnconfigure(0, weight=1)
         self.main_frame.grid_rowconfigure(0, weight=1)
 
-        self.console_textbox = ctk.CTkTextbox(self.main_frame, state="disabled")
-        self.console_textbox.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        # Console limitada às últimas linhas; o histórico completo da sessão vai para o disco
+        self.log_buffer = LogBuffer()
+        self.log_console = LogConsole(self.main_frame, self.log_buffer, fg_color="transparent")
+        self.log_console.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         self._setup_log_tags()
 
         self.status_label = ctk.CTkLabel(self.main_frame, text="Pronto para iniciar instalações")
@@ -144,14 +152,24 @@ class MainView(ctk.CTk):
         self.progress_bar.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
         self.progress_bar.set(0)
 
+        # Uma linha por ferramenta em andamento: etapa/bytes baixados e barra própria.
+        # O quadro só é criado na primeira linha (fica oculto até a instalação começar).
+        self.tool_progress_frame: Optional[ctk.CTkFrame] = None
+        self.tool_progress_rows: Dict[str, Tuple[ctk.CTkLabel, ctk.CTkProgressBar]] = {}
+
     def center_window(self) -> None:
-        """Centers the window on the screen."""
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-        x = (self.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f"{width}x{height}+{x}+{y}")
+        """Sizes the window to ``WINDOW_SIZE`` centered on the screen (without waiting for the layout)."""
+        width, height = WINDOW_SIZE
+        scaling = ctk.ScalingTracker.get_window_scaling(self)
+        # A CustomTkinter escala largura e altura, mas não a posição
+        x = (self.winfo_screenwidth() - round(width * scaling)) // 2
+        y = (self.winfo_screenheight() - round(height * scaling)) // 2
+        self.geometry(f"{width}x{height}+{max(x, 0)}+{max(y, 0)}")
+
+    def _open_log_history(self) -> None:
+        """Starts the session history file of the log console."""
+        if self.log_buffer.history_path is None:
+            self.log_buffer.history_path = new_session_history()
 
     def _setup_log_tags(self) -> None:
         """Sets up tags for log coloring."""
@@ -168,18 +186,54 @@ class MainView(ctk.CTk):
             "ERROR": "#FF6B6B",
             "SUCCESS": "#51CF66",
         }
-        for level, color in colors.items():
-            self.console_textbox.tag_config(level, foreground=color)
+        self.log_console.set_level_colors(colors)
 
     def log_message(self, message: str, level: str) -> None:
         """Adds a message to the log console."""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.console_textbox.configure(state="normal")
-        self.console_textbox.insert("end", f"[{timestamp}] {message}\n", level)
-        self.console_textbox.configure(state="disabled")
-        self.console_textbox.see("end")
-        self.update()
+        self.log_console.append([(message, level)])
+
+    def log_messages(self, entries: List[Tuple[str, str]]) -> None:
+        """Adds (message, level) entries to the log console (drawn once per frame)."""
+        self.log_console.append(entries)
+
+    def clear_log(self) -> None:
+        """Empties the log console (the session history on disk is kept)."""
+        self.log_console.clear()
+
+    def destroy(self) -> None:
+        """Closes the log history before destroying the window."""
+        self.log_buffer.close()
+        super().destroy()
+
+    def show_tool_progress(self, tool: str, text: str, fraction: Optional[float] = None) -> None:
+        """Updates (creating on first use) the progress row of a tool."""
+        row = self.tool_progress_rows.get(tool)
+        if row is None:
+            if self.tool_progress_frame is None:
+                self.tool_progress_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+                self.tool_progress_frame.grid(row=3, column=0, padx=10, pady=(0, 10), sticky="ew")
+                self.tool_progress_frame.grid_columnconfigure(1, weight=1)
+            index = len(self.tool_progress_rows)
+            label = ctk.CTkLabel(self.tool_progress_frame, text="", anchor="w")
+            label.grid(row=index, column=0, padx=(0, 10), sticky="w")
+            bar = ctk.CTkProgressBar(self.tool_progress_frame, height=6)
+            bar.grid(row=index, column=1, sticky="ew")
+            bar.set(0)
+            row = self.tool_progress_rows[tool] = (label, bar)
+            self.tool_progress_frame.grid()
+        label, bar = row
+        label.configure(text=text)
+        if fraction is not None:
+            bar.set(fraction)
+
+    def clear_tool_progress(self) -> None:
+        """Removes every tool progress row."""
+        for label, bar in self.tool_progress_rows.values():
+            label.destroy()
+            bar.destroy()
+        self.tool_progress_rows.clear()
+        if self.tool_progress_frame is not None:
+            self.tool_progress_frame.grid_remove()
 
     def set_on_closing_callback(self, callback: Callable[[], None]) -> None:
         """Sets the callback for the window closing event."""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Testes do armazenamento da console de logs (src/app/log_buffer.py).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.app.log_buffer import LogBuffer, new_session_history
+
+
+def _linhas(n, inicio=0):
+    niveis = ('INFO', 'INFO', 'INFO', 'WARNING', 'ERROR')
+    return [(f"linha {i}", niveis[i % len(niveis)]) for i in range(inicio, inicio + n)]
+
+
+def test_memory_is_bounded_and_history_is_complete():
+    """100 mil linhas: a memória guarda as últimas; o arquivo de histórico guarda todas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        historico = Path(tmp) / 'logs' / 'sessao.log'
+        buffer = LogBuffer(capacity=1000, history_path=historico)
+        for lote in range(100):
+            buffer.append(_linhas(1000, lote * 1000))
+        buffer.close()
+
+        assert len(buffer.entries) == len(buffer.view) == 1000
+        assert buffer.entries[0].message == 'linha 99000'
+        assert buffer.window(998, 10)[-1].message == 'linha 99999'
+        with open(historico, encoding='utf-8') as f:
+            linhas = f.read().splitlines()
+        assert len(linhas) == 100_000 and linhas[-1].endswith('[ERROR] linha 99999')
+        print("✓ 1000 linhas em memória, 100000 no histórico")
+
+
+def test_filter_and_search_follow_new_lines():
+    """Filtro de nível e busca valem para as linhas já recebidas e para as novas."""
+    buffer = LogBuffer(capacity=100)
+    buffer.append(_linhas(50))
+    buffer.set_filter(['WARNING', 'ERROR'])
+    assert len(buffer.view) == 20 and buffer.filtered
+    assert {entry.level for entry in buffer.view} == {'WARNING', 'ERROR'}
+
+    assert buffer.append(_linhas(5, 50)) == 2
+    buffer.set_filter(None, '  LINHA 4 ')
+    assert [entry.message for entry in buffer.view] == ['linha 4'] + [f'linha {i}' for i in range(40, 50)]
+    assert buffer.append([('LINHA 400 concluída', 'SUCCESS'), ('outra', 'INFO')]) == 1
+
+    buffer.set_filter()
+    assert len(buffer.view) == 57 and not buffer.filtered
+    print("✓ 20 avisos/erros de 50 linhas; busca sem diferenciar maiúsculas")
+
+
+def test_filtered_view_drops_evicted_lines():
+    """Linhas descartadas do buffer saem também da visão filtrada."""
+    buffer = LogBuffer(capacity=10)
+    buffer.set_filter(['ERROR'])
+    buffer.append(_linhas(30))
+    assert [entry.message for entry in buffer.view] == ['linha 24', 'linha 29']
+    assert all(entry in buffer.entries for entry in buffer.view)
+
+    buffer.clear()
+    assert not buffer.entries and not buffer.view
+    print("✓ visão filtrada acompanha o descarte das linhas antigas")
+
+
+def test_session_history_files_are_rotated():
+    """Cada sessão tem o seu arquivo; as mais antigas são removidas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        diretorio = Path(tmp)
+        for i in range(5):
+            (diretorio / f'sessao-20260101-00000{i}.log').write_text('x')
+        caminho = new_session_history(diretorio, keep=3)
+        restantes = sorted(p.name for p in diretorio.glob('sessao-*.log'))
+        assert restantes == ['sessao-20260101-000003.log', 'sessao-20260101-000004.log']
+        assert caminho.parent == diretorio and caminho.name.startswith('sessao-')
+
+        # Sem acesso ao diretório do histórico: a console continua funcionando
+        bloqueado = diretorio / 'arquivo'
+        bloqueado.write_text('x')
+        buffer = LogBuffer(history_path=bloqueado / 'sessao.log')
+        buffer.append([('linha', 'INFO')])
+        assert buffer.history_path is None and len(buffer.view) == 1
+        print("✓ 2 sessões antigas mantidas + a nova; falha no disco não afeta a console")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA CONSOLE DE LOGS")
+    print("=" * 60)
+
+    tests = [
+        ("Memória limitada", test_memory_is_bounded_and_history_is_complete),
+        ("Filtro e busca", test_filter_and_search_follow_new_lines),
+        ("Descarte", test_filtered_view_drops_evicted_lines),
+        ("Histórico por sessão", test_session_history_files_are_rotated),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Testes da fila de mensagens da interface (src/app/message_pump.py).
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.app.message_pump import WakeupQueue, drain
+
+
+class RelogioFalso:
+    """Relógio que avança um passo fixo a cada leitura."""
+
+    def __init__(self, passo):
+        self.passo = passo
+        self.agora = 0.0
+
+    def __call__(self):
+        self.agora += self.passo
+        return self.agora
+
+
+def test_redundant_updates_are_collapsed():
+    """PROGRESS e DOWNLOAD ficam só com o último valor; logs mantêm a ordem."""
+    fila = WakeupQueue()
+    for i in range(10_000):
+        fila.put(('PROGRESS', i / 10_000))
+        fila.put(('DOWNLOAD', 'Git', i, 10_000, 1.0))
+    fila.put(('LOG', 'primeira', 'INFO'))
+    fila.put(('PHASE', 'VS Code', 'download', False, None))
+    fila.put(('DOWNLOAD', 'VS Code', 10, 100, 1.0))
+    fila.put(('LOG', 'segunda', 'WARNING'))
+
+    batch, more = drain(fila, budget=10.0)
+    assert not more and batch.received == 20_004
+    assert batch.progress == 0.9999
+    assert batch.logs == [('primeira', 'INFO'), ('segunda', 'WARNING')]
+    assert list(batch.tool_updates) == ['Git', 'VS Code']
+    assert batch.tool_updates['Git'] == ('DOWNLOAD', 'Git', 9_999, 10_000, 1.0)
+    assert batch.tool_updates['VS Code'][0] == 'DOWNLOAD'
+    assert batch.applied == 4
+    print(f"✓ {batch.received} mensagens viraram {batch.applied} atualizações da interface")
+
+
+def test_budget_limits_each_pass():
+    """Cada passada respeita o orçamento de tempo; o restante fica na fila."""
+    fila = WakeupQueue()
+    for i in range(100):
+        fila.put(('LOG', f'linha {i}', 'INFO'))
+
+    batch, more = drain(fila, budget=0.010, clock=RelogioFalso(0.001))
+    assert more and len(batch.logs) == 10, len(batch.logs)
+    batch, more = drain(fila, budget=10.0)
+    assert not more and batch.logs[0] == ('linha 10', 'INFO') and len(batch.logs) == 90
+    print("✓ 10 mensagens na primeira passada (10 ms a 1 ms cada), 90 na segunda")
+
+
+def test_complete_ends_the_pass():
+    """COMPLETE encerra a passada: o que veio antes é aplicado primeiro."""
+    fila = WakeupQueue()
+    fila.put(('LOG', 'fim', 'SUCCESS'))
+    fila.put(('COMPLETE', 2, 0))
+    batch, more = drain(fila, budget=10.0)
+    assert batch.logs == [('fim', 'SUCCESS')] and batch.complete == ('COMPLETE', 2, 0) and not more
+    print("✓ COMPLETE processado depois dos logs anteriores")
+
+
+def test_wakeup_once_per_batch():
+    """Uma rajada de mensagens gera um único aviso até o consumidor esvaziar a fila."""
+    avisos = []
+    fila = WakeupQueue(lambda: avisos.append(time.perf_counter()))
+    for i in range(1_000):
+        fila.put(('PROGRESS', i))
+    assert len(avisos) == 1
+
+    drain(fila, budget=10.0)
+    fila.put(('PROGRESS', 1))
+    assert fila.rearm() is True and len(avisos) == 1  # chegou mensagem antes do rearm
+    drain(fila, budget=10.0)
+    assert fila.rearm() is False
+    fila.put(('PROGRESS', 2))
+    assert len(avisos) == 2
+    print("✓ 1 aviso para 1000 mensagens; rearm detecta mensagens novas")
+
+
+def test_producer_at_high_rate():
+    """Com 50 mil mensagens por segundo, passadas curtas e poucos avisos."""
+    avisos = threading.Semaphore(0)
+    fila = WakeupQueue(avisos.release)
+    total = 50_000
+
+    def produtor():
+        for i in range(total):
+            fila.put(('LOG', f'linha {i}', 'INFO') if i % 10 == 0 else ('PROGRESS', i / total))
+            if i % 500 == 0:
+                time.sleep(0.01)
+
+    thread = threading.Thread(target=produtor)
+    thread.start()
+    recebidas, passadas, maior = 0, 0, 0.0
+    while recebidas < total:
+        avisos.acquire(timeout=5)
+        while True:
+            inicio = time.perf_counter()
+            batch, more = drain(fila, budget=0.008)
+            maior = max(maior, time.perf_counter() - inicio)
+            recebidas += batch.received
+            passadas += 1
+            if not more and not fila.rearm():
+                break
+    thread.join()
+
+    assert recebidas == total
+    assert passadas < total / 20, passadas
+    assert maior < 0.1, maior
+    print(f"✓ {total} mensagens em {passadas} passadas (maior passada: {maior * 1000:.1f} ms)")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA FILA DE MENSAGENS DA INTERFACE")
+    print("=" * 60)
+
+    tests = [
+        ("Atualizações redundantes", test_redundant_updates_are_collapsed),
+        ("Orçamento por passada", test_budget_limits_each_pass),
+        ("Fim da instalação", test_complete_ends_the_pass),
+        ("Aviso por lote", test_wakeup_once_per_batch),
+        ("Produtor rápido", test_producer_at_high_rate),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
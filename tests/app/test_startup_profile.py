@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Testes do perfil de inicialização da GUI (src/app/startup_profile.py,
+main.py --startup-profile).
+"""
+
+import builtins
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.app.startup_profile import StartupProfile, process_age
+
+# Pacote lento que importa outro pacote lento: cada um deve aparecer com o próprio tempo
+PACOTES = {
+    'perfil_externo': """
+        import time
+        time.sleep(0.05)
+        import perfil_interno
+    """,
+    'perfil_interno': """
+        import time
+        time.sleep(0.1)
+    """,
+}
+
+
+def test_import_time_by_package():
+    """O tempo de import é atribuído ao pacote que o gastou, não a quem o importou."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome, codigo in PACOTES.items():
+            Path(tmp, f'{nome}.py').write_text(textwrap.dedent(codigo), encoding='utf-8')
+        sys.path.insert(0, tmp)
+        original = builtins.__import__
+        profile = StartupProfile()
+        try:
+            profile.track_imports()
+            import perfil_externo  # noqa: F401
+            profile.mark("Imports")
+        finally:
+            profile.stop_tracking()
+            sys.path.remove(tmp)
+            for nome in PACOTES:
+                sys.modules.pop(nome, None)
+
+    assert builtins.__import__ is original
+    assert 0.05 <= profile.imports['perfil_externo'] < 0.09, profile.imports
+    assert 0.1 <= profile.imports['perfil_interno'] < 0.14, profile.imports
+    relatorio = profile.report()
+    assert 'perfil_interno' in relatorio and 'Imports' in relatorio, relatorio
+    print(relatorio)
+    print("✓ tempo próprio de cada pacote")
+
+
+def test_first_paint_budget():
+    """O relatório compara a primeira pintura, desde a criação do processo, com o orçamento."""
+    profile = StartupProfile()
+    profile.before_main = 0.2
+    profile.mark("Janela (MainView)")
+    time.sleep(0.05)
+    profile.mark("Primeira pintura")
+
+    assert 0.25 <= profile.first_paint < 0.3, profile.first_paint
+    assert profile.within_budget(0.5) and not profile.within_budget(0.1)
+    assert 'dentro do orçamento' in profile.report(0.5)
+    assert 'ACIMA DO ORÇAMENTO' in profile.report(0.1)
+    print(f"✓ primeira pintura em {profile.first_paint * 1000:.0f} ms")
+
+
+def test_process_age():
+    """A idade do processo inclui a inicialização do interpretador."""
+    idade = process_age()
+    if idade is None:
+        print("✓ idade do processo indisponível neste sistema")
+        return
+    assert 0 < idade < 600, idade
+    print(f"✓ processo criado há {idade * 1000:.0f} ms")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO PERFIL DE INICIALIZAÇÃO")
+    print("=" * 60)
+
+    tests = [
+        ("Imports por pacote", test_import_time_by_package),
+        ("Orçamento da primeira pintura", test_first_paint_budget),
+        ("Idade do processo", test_process_age),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
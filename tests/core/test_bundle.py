@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Testes do bundle offline (src/core/bundle.py e nodeecli/modules/bundle.py).
+
+Os artefatos são servidos por um servidor HTTP local; o repositório Git é
+criado em um diretório temporário.
+"""
+
+import base64
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from queue import Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.bundle import TIPO_CHECKSUMS, TIPO_INSTALADOR, TIPO_PACOTE_NPM, Bundle, ErroBundle
+from src.core.bundle import BundleArtifact, _bundle_git_repository, build_bundle
+from tests.http_stub import ServidorHttpLocal
+
+
+INSTALADOR = os.urandom(300 * 1024)
+TARBALL = os.urandom(40 * 1024)
+
+
+def _fontes(servidor, integridade=None):
+    integridade = integridade or "sha512-" + base64.b64encode(hashlib.sha512(TARBALL).digest()).decode()
+    return {
+        "nodejs": lambda arch: [
+            BundleArtifact("nodejs", TIPO_CHECKSUMS, "SHASUMS256.txt", version="v22.11.0", content=b"abc  x.msi\n"),
+        ],
+        "vscode": lambda arch: [
+            BundleArtifact("vscode", TIPO_INSTALADOR, "VSCodeUserSetup-x64.exe", url=servidor.url("/setup.exe"),
+                           version="1.95.3", arch="x64", sha256=hashlib.sha256(INSTALADOR).hexdigest()),
+        ],
+        "cli_tools": lambda arch: [
+            BundleArtifact("gemini-cli", TIPO_PACOTE_NPM, "gemini-cli-1.0.0.tgz", url=servidor.url("/pkg.tgz"),
+                           version="1.0.0", integrity=integridade, extras={"pacote": "@google/gemini-cli"}),
+        ],
+    }
+
+
+def _com_cache_temporario(tmp):
+    anterior = os.environ.get('ORQUESTRADOR_CACHE_DIR')
+    os.environ['ORQUESTRADOR_CACHE_DIR'] = os.path.join(tmp, 'cache')
+    return anterior
+
+
+def _restaurar_cache(anterior):
+    if anterior is None:
+        os.environ.pop('ORQUESTRADOR_CACHE_DIR', None)
+    else:
+        os.environ['ORQUESTRADOR_CACHE_DIR'] = anterior
+
+
+def test_build_verify_and_archive():
+    """O bundle gerado confere, pode ser compactado e reaberto do .zip."""
+    arquivos = {'/setup.exe': INSTALADOR, '/pkg.tgz': TARBALL}
+    with ServidorHttpLocal(arquivos) as servidor, tempfile.TemporaryDirectory() as tmp:
+        anterior = _com_cache_temporario(tmp)
+        try:
+            bundle = build_bundle(os.path.join(tmp, 'bundle'), sources=_fontes(servidor), log=lambda msg: None)
+        finally:
+            _restaurar_cache(anterior)
+
+        assert bundle.verificar() == []
+        assert bundle.manifesto['ferramentas'] == ['cli_tools', 'nodejs', 'vscode']
+        assert bundle.procurar('gemini-cli', tipo=TIPO_PACOTE_NPM)['pacote'] == '@google/gemini-cli'
+
+        reaberto = Bundle.abrir(bundle.compactar(os.path.join(tmp, 'bundle.zip')))
+        entrada = reaberto.procurar('vscode', arquitetura='x64')
+        destino = reaberto.materializar(entrada, os.path.join(tmp, 'staging', 'setup.exe'))
+        assert Path(destino).read_bytes() == INSTALADOR
+        print(f"✓ {len(bundle.artefatos)} artefatos conferidos, compactados e reabertos")
+
+
+def test_corrupted_artifact_is_rejected():
+    """Um artefato alterado depois da geração é detectado e não é usado."""
+    with ServidorHttpLocal({'/setup.exe': INSTALADOR, '/pkg.tgz': TARBALL}) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        anterior = _com_cache_temporario(tmp)
+        try:
+            bundle = build_bundle(os.path.join(tmp, 'bundle'), tools=['vscode'], sources=_fontes(servidor),
+                                  log=lambda msg: None)
+        finally:
+            _restaurar_cache(anterior)
+
+        entrada = bundle.procurar('vscode')
+        with open(bundle.caminho(entrada), 'r+b') as f:
+            f.write(b'X')
+
+        assert [problema for _, problema in bundle.verificar()] == ['SHA-256 não confere']
+        try:
+            bundle.materializar(entrada, os.path.join(tmp, 'setup.exe'))
+            assert False, "artefato corrompido não deveria ser materializado"
+        except ErroBundle:
+            pass
+        assert not os.path.exists(os.path.join(tmp, 'setup.exe'))
+        print("✓ artefato corrompido detectado")
+
+
+def test_npm_integrity_mismatch_fails_build():
+    """Tarball que não confere com o 'integrity' do registro interrompe a geração."""
+    with ServidorHttpLocal({'/setup.exe': INSTALADOR, '/pkg.tgz': TARBALL}) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        anterior = _com_cache_temporario(tmp)
+        try:
+            fontes = _fontes(servidor, integridade="sha512-" + base64.b64encode(b"0" * 64).decode())
+            build_bundle(os.path.join(tmp, 'bundle'), tools=['cli_tools'], sources=fontes, log=lambda msg: None)
+            assert False, "integridade inválida deveria falhar"
+        except ValueError as e:
+            assert 'Integridade' in str(e)
+        finally:
+            _restaurar_cache(anterior)
+        print("✓ integridade do tarball npm verificada")
+
+
+def test_repository_clone_from_git_bundle():
+    """O repositório do MCP Excel é clonado do 'git bundle' sem acessar o remoto."""
+    from mcp_excel.mcp_excel_installer import REPO_URL, preparar_repositorio
+
+    with tempfile.TemporaryDirectory() as tmp:
+        origem = Path(tmp) / 'origem'
+        origem.mkdir()
+        git = ["git", "-c", "user.name=Teste", "-c", "user.email=teste@exemplo", "-C", str(origem)]
+        subprocess.run(["git", "init", "--quiet", str(origem)], check=True)
+        (origem / 'pyproject.toml').write_text('[project]\nname = "exemplo"\n')
+        subprocess.run(git + ["add", "."], check=True)
+        subprocess.run(git + ["commit", "--quiet", "-m", "inicial"], check=True)
+
+        arquivo_bundle = Path(tmp) / 'repo.bundle'
+        head = _bundle_git_repository(str(origem), arquivo_bundle)
+
+        destino = Path(tmp) / 'projeto'
+        assert preparar_repositorio(destino, str(arquivo_bundle))
+        assert (destino / 'pyproject.toml').is_file()
+        remoto = subprocess.run(["git", "-C", str(destino), "remote", "get-url", "origin"],
+                                capture_output=True, text=True).stdout.strip()
+        assert remoto == REPO_URL
+        atual = subprocess.run(["git", "-C", str(destino), "rev-parse", "HEAD"],
+                               capture_output=True, text=True).stdout.strip()
+        assert atual == head
+        # Reexecução: atualização a partir do mesmo bundle (fast-forward sem mudanças)
+        assert preparar_repositorio(destino, str(arquivo_bundle))
+        print("✓ clone e atualização a partir do git bundle")
+
+
+def test_installation_service_passes_bundle():
+    """Com bundle_path, todo instalador recebe --from-bundle; um bundle inexistente não inicia nenhum."""
+    from src.core.installation_service import InstallationService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Bundle.criar(tmp).salvar()
+        chamadas = []
+        service = InstallationService(Queue(), bundle_path=tmp)
+        service._run_script = lambda args, tool_name: chamadas.append(args) or 0
+        service.run_installations(True, True, False, False, False, True, True, 300, 600)
+
+    assert chamadas and all(f"--from-bundle={Path(tmp)}" in args for args in chamadas)
+
+    fila = Queue()
+    service = InstallationService(fila, bundle_path=os.path.join(tmp, "nao-existe.zip"))
+    service._run_script = lambda args, tool_name: 1 / 0
+    service.run_installations(True, True, False, False, False, True, True, 300, 600)
+    assert list(fila.queue)[-1] == ('COMPLETE', 0, 4), list(fila.queue)
+    print(f"✓ {len(chamadas)} execuções com --from-bundle; bundle inexistente rejeitado")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO BUNDLE OFFLINE")
+    print("=" * 60)
+
+    tests = [
+        ("Geração, verificação e .zip", test_build_verify_and_archive),
+        ("Artefato corrompido", test_corrupted_artifact_is_rejected),
+        ("Integridade npm", test_npm_integrity_mismatch_fails_build),
+        ("Repositório via git bundle", test_repository_clone_from_git_bundle),
+        ("InstallationService", test_installation_service_passes_bundle),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
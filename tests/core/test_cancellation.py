@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Testes do cancelamento dos instaladores: pipe de controle
+(nodeecli/modules/events.py, src/core/events.py) e encerramento da árvore
+de processos (src/core/process_tree.py).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from pathlib import Path
+from queue import Empty, Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.events import ControlPipe, inherit_pipes
+from src.core.installation_service import InstallationService
+
+# Prazo pedido para o cancelamento ter efeito
+LIMITE_CANCELAMENTO = 0.2
+
+# Instalador que consulta o cancelamento durante o "download" e entre as etapas
+INSTALADOR_COOPERATIVO = textwrap.dedent(f"""
+    import sys, time
+    sys.path.insert(0, {project_root!r})
+    from nodeecli.modules.events import cancelamento_solicitado, concluir, fase
+
+    try:
+        with fase('download'):
+            print("Baixando...")
+            while not cancelamento_solicitado():
+                time.sleep(0.01)
+        with fase('instalacao'):
+            print("Instalando...")
+    except KeyboardInterrupt:
+        print("Cancelado")
+        sys.exit(concluir(2))
+""")
+
+# Instalador parado em um programa externo (como msiexec ou npm), sem consultar nada
+INSTALADOR_BLOQUEADO = textwrap.dedent("""
+    import subprocess, sys
+    neto = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    with open(sys.argv[1], 'w') as arquivo:
+        arquivo.write(str(neto.pid))
+    print("Instalando...")
+    neto.wait()
+""")
+
+
+def _processo_vivo(pid):
+    """True se o processo ainda existe."""
+    if os.name == 'nt':
+        saida = subprocess.run(['tasklist', '/FI', f'PID eq {pid}', '/NH'], capture_output=True, text=True).stdout
+        return str(pid) in saida
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _esperar_log(fila, texto, timeout=10):
+    """Consome a fila até a linha de log com o texto."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            mensagem = fila.get(timeout=0.05)
+        except Empty:
+            continue
+        if mensagem[0] == 'LOG' and texto in mensagem[1]:
+            return
+    raise AssertionError(f"log '{texto}' não chegou")
+
+
+def _executar_em_thread(service, args, tool_name):
+    """Roda _run_script em outra thread; o código de saída fica em resultado[0]."""
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(service._run_script(args, tool_name)))
+    thread.start()
+    return thread, resultado
+
+
+def test_cooperative_cancel():
+    """O instalador percebe o pedido no laço de download e não inicia a etapa seguinte."""
+    fila = Queue()
+    service = InstallationService(fila)
+    thread, resultado = _executar_em_thread(service, [sys.executable, '-c', INSTALADOR_COOPERATIVO], 'VS Code')
+    _esperar_log(fila, 'Baixando...')
+
+    inicio = time.monotonic()
+    service.cancel_installation()
+    thread.join(timeout=5)
+    decorrido = time.monotonic() - inicio
+
+    assert resultado == [2], resultado
+    mensagens = list(fila.queue)
+    logs = [m[1] for m in mensagens if m[0] == 'LOG']
+    assert '[VS Code] Cancelado' in logs and '[VS Code] Instalando...' not in logs, logs
+    assert ('PHASE', 'VS Code', 'instalacao', False, None) not in mensagens
+    assert decorrido < LIMITE_CANCELAMENTO, decorrido
+    print(f"✓ instalador encerrado sozinho em {decorrido * 1000:.0f} ms (código 2)")
+
+
+def test_blocked_child_tree_is_killed():
+    """Um instalador parado em um programa externo é encerrado junto com esse programa."""
+    fila = Queue()
+    service = InstallationService(fila)
+    with tempfile.TemporaryDirectory() as tmp:
+        arquivo_pid = Path(tmp) / 'neto.pid'
+        args = [sys.executable, '-c', INSTALADOR_BLOQUEADO, str(arquivo_pid)]
+        thread, resultado = _executar_em_thread(service, args, 'Node.js')
+        _esperar_log(fila, 'Instalando...')
+        neto = int(arquivo_pid.read_text())
+
+        inicio = time.monotonic()
+        service.cancel_installation()
+        thread.join(timeout=5)
+        decorrido = time.monotonic() - inicio
+
+    assert not thread.is_alive() and resultado and resultado[0] != 0, resultado
+    limite = time.monotonic() + 2
+    while _processo_vivo(neto) and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert not _processo_vivo(neto), "processo iniciado pelo instalador ficou órfão"
+    assert decorrido < LIMITE_CANCELAMENTO, decorrido
+    print(f"✓ árvore de processos encerrada em {decorrido * 1000:.0f} ms, sem órfãos")
+
+
+def test_closed_control_pipe_cancels():
+    """Se o orquestrador terminar (pipe fechado), o instalador se cancela sozinho."""
+    control = ControlPipe()
+    env = dict(os.environ, **control.child_env())
+    process = subprocess.Popen([sys.executable, '-c', INSTALADOR_COOPERATIVO], env=env,
+                               stdout=subprocess.PIPE, text=True, **inherit_pipes(control))
+    control.close_child_end()
+    assert process.stdout.readline().strip() == 'Baixando...'
+    control.close()
+    try:
+        assert process.wait(timeout=5) == 2
+    finally:
+        process.stdout.close()
+    print("✓ pipe fechado tratado como cancelamento")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO CANCELAMENTO")
+    print("=" * 60)
+
+    tests = [
+        ("Cancelamento cooperativo", test_cooperative_cancel),
+        ("Árvore de processos encerrada", test_blocked_child_tree_is_killed),
+        ("Pipe de controle fechado", test_closed_control_pipe_cancels),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
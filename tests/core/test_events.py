@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Testes do canal de eventos entre os instaladores e o InstallationService
+(nodeecli/modules/events.py e src/core/events.py).
+"""
+
+import os
+import sys
+import textwrap
+from queue import Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.events import ENV_CANAL_EVENTOS
+from src.core.events import ActivityEvent, PhaseEvent, ProgressEvent, ResultEvent, WarningEvent, parse_event
+from src.core.installation_service import InstallationService
+
+
+# Instalador de mentira: log no stdout, eventos no canal do orquestrador
+INSTALADOR = textwrap.dedent(f"""
+    import os, subprocess, sys
+    sys.path.insert(0, {project_root!r})
+    from nodeecli.modules.events import avisar, concluir, emitir, fase
+
+    print("Baixando instalador...")
+    with fase('download'):
+        for baixados in (0, 50 * 1024 * 1024, 100 * 1024 * 1024):
+            emitir('progresso', baixados=baixados, total=100 * 1024 * 1024, taxa=25 * 1024 * 1024)
+    avisar("Executando sem privilégios de administrador")
+    # Programas executados pelo instalador não herdam o canal
+    filho = "import os; print('filho:', os.environ.get({ENV_CANAL_EVENTOS!r}))"
+    subprocess.run([sys.executable, '-c', filho])
+    with fase('instalacao') as etapa:
+        etapa.sucesso = False
+    print("Fim")
+    sys.exit(concluir(3, "código de saída do setup: 3"))
+""")
+
+
+def _mensagens(fila):
+    mensagens = []
+    while not fila.empty():
+        mensagens.append(fila.get())
+    return mensagens
+
+
+def test_parse_event():
+    """Linhas válidas viram eventos tipados; outras versões e tipos são ignorados."""
+    evento = parse_event('{"v": 1, "evento": "progresso", "t": 1.0, "baixados": 10, "total": 100, "taxa": 5}')
+    assert isinstance(evento, ProgressEvent)
+    assert (evento.downloaded, evento.total, evento.rate) == (10, 100, 5.0)
+
+    evento = parse_event('{"v": 1, "evento": "fase_fim", "fase": "download", "sucesso": true, "duracao": 2.5}')
+    assert isinstance(evento, PhaseEvent) and evento.finished and evento.success and evento.duration == 2.5
+    evento = parse_event('{"v": 1, "evento": "atividade", "descricao": "npm: 35 requisições", "concluidos": 35, "total": null}')
+    assert isinstance(evento, ActivityEvent)
+    assert (evento.description, evento.done, evento.total) == ("npm: 35 requisições", 35, None)
+    assert isinstance(parse_event('{"v": 1, "evento": "aviso", "mensagem": "x"}'), WarningEvent)
+    assert isinstance(parse_event('{"v": 1, "evento": "resultado", "sucesso": false, "codigo": 2}'), ResultEvent)
+
+    assert parse_event('{"v": 2, "evento": "progresso", "baixados": 10}') is None
+    assert parse_event('{"v": 1, "evento": "desconhecido"}') is None
+    assert parse_event('{"v": 1, "evento": "progresso"}') is None
+    assert parse_event('✅ Download concluído!') is None
+    print("✓ 5 tipos interpretados; versão, tipo e campos inválidos descartados")
+
+
+def test_run_script_separates_events_from_log():
+    """O log segue pelo stdout; fases, progresso, avisos e resultado pelo canal."""
+    fila = Queue()
+    service = InstallationService(fila)
+    return_code = service._run_script([sys.executable, '-c', INSTALADOR], 'VS Code')
+    assert return_code == 3
+
+    mensagens = _mensagens(fila)
+    logs = [m[1] for m in mensagens if m[0] == 'LOG' and m[2] == 'INFO']
+    assert logs == ['[VS Code] Baixando instalador...', '[VS Code] filho: None', '[VS Code] Fim'], logs
+    assert ('LOG', '[VS Code] Executando sem privilégios de administrador', 'WARNING') in mensagens
+
+    downloads = [m[2:] for m in mensagens if m[0] == 'DOWNLOAD']
+    assert [d[0] for d in downloads] == [0, 50 * 1024 * 1024, 100 * 1024 * 1024]
+    phases = [m[2:] for m in mensagens if m[0] == 'PHASE']
+    assert phases == [
+        ('download', False, None), ('download', True, True),
+        ('instalacao', False, None), ('instalacao', True, False),
+    ], phases
+
+    result = service.results['VS Code']
+    assert not result.success and result.code == 3 and 'setup' in result.message
+    print(f"✓ {len(logs)} linhas de log, {len(downloads)} eventos de progresso, 4 de fase e o resultado")
+
+
+def test_download_progress_moves_overall_bar():
+    """A barra geral avança com os bytes baixados, não só quando uma etapa termina."""
+    fila = Queue()
+    service = InstallationService(fila)
+    service._steps_total = 2
+    service._run_script([sys.executable, '-c', INSTALADOR], 'VS Code')
+
+    progress = [m[1] for m in _mensagens(fila) if m[0] == 'PROGRESS']
+    assert progress == [0.0, 0.25, 0.5], progress
+    print(f"✓ progresso geral durante o download: {progress}")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO CANAL DE EVENTOS")
+    print("=" * 60)
+
+    tests = [
+        ("Interpretação dos eventos", test_parse_event),
+        ("Log e eventos separados", test_run_script_separates_events_from_log),
+        ("Progresso geral", test_download_progress_moves_overall_bar),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Testes da execução dos instaladores dentro do processo do orquestrador
+(src/core/in_process.py): saída e eventos separados por execução,
+cancelamento e sessão HTTP compartilhada.
+"""
+
+import os
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.events import PhaseEvent, ResultEvent
+from src.core.in_process import CANCELLED_CODE, InProcessRunner
+from src.core.installation_service import InstallationService
+
+# Prazo pedido para o cancelamento ter efeito
+LIMITE_CANCELAMENTO = 0.2
+
+# Instalador de teste: imprime linhas com o próprio nome (também de uma thread
+# auxiliar, como as do downloader) e, com --esperar, aguarda o cancelamento
+INSTALADOR_FALSO = textwrap.dedent("""
+    import contextvars, sys, threading, time
+    from nodeecli.modules.events import cancelamento_solicitado, fase
+    from nodeecli.modules.http_client import configurar_http
+
+    def main(argv):
+        nome = argv[0]
+        configurar_http()
+        with fase('download'):
+            for i in range(20):
+                print(f"{nome} {i}")
+                time.sleep(0.001)
+            auxiliar = threading.Thread(target=contextvars.copy_context().run, args=(print, f"{nome} auxiliar"))
+            auxiliar.start()
+            auxiliar.join()
+            if '--esperar' in argv:
+                while not cancelamento_solicitado():
+                    time.sleep(0.01)
+            if '--bloquear' in argv:
+                time.sleep(1)
+        with fase('instalacao'):
+            print(f"{nome} instalado")
+        if '--sair' in argv:
+            sys.exit(3)
+        return 0
+""")
+
+
+def _com_instalador_falso(test_func):
+    """Disponibiliza o instalador de teste como o módulo 'instalador_falso'."""
+    def wrapper():
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, 'instalador_falso.py').write_text(INSTALADOR_FALSO, encoding='utf-8')
+            sys.path.insert(0, tmp)
+            try:
+                test_func()
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop('instalador_falso', None)
+    wrapper.__name__ = test_func.__name__
+    wrapper.__doc__ = test_func.__doc__
+    return wrapper
+
+
+def _executar(runner, argv, cancelado=None):
+    """Roda o instalador de teste em outra thread; linhas, eventos e código ficam no dicionário."""
+    execucao = {'linhas': [], 'eventos': [], 'cancelado': cancelado or threading.Event()}
+    execucao['thread'] = threading.Thread(target=lambda: execucao.setdefault('codigo', runner.run(
+        'instalador_falso', argv, execucao['linhas'].append, execucao['eventos'].append, execucao['cancelado'],
+    )))
+    execucao['thread'].start()
+    return execucao
+
+
+@_com_instalador_falso
+def test_concurrent_runs_are_isolated():
+    """Execuções simultâneas recebem só a própria saída e os próprios eventos."""
+    runner = InProcessRunner()
+    stdout = sys.stdout
+    execucoes = {nome: _executar(runner, [nome]) for nome in ('vscode', 'git', 'nodejs')}
+    for execucao in execucoes.values():
+        execucao['thread'].join(timeout=10)
+
+    for nome, execucao in execucoes.items():
+        assert execucao['codigo'] == 0, execucao
+        esperado = [f"{nome} {i}" for i in range(20)] + [f"{nome} auxiliar", f"{nome} instalado"]
+        assert execucao['linhas'] == esperado, execucao['linhas']
+        fases = [(e.phase, e.finished) for e in execucao['eventos'] if isinstance(e, PhaseEvent)]
+        assert fases == [('download', False), ('download', True), ('instalacao', False), ('instalacao', True)], fases
+        assert isinstance(execucao['eventos'][-1], ResultEvent) and execucao['eventos'][-1].success
+    assert sys.stdout is stdout, "stdout não foi restaurado"
+    print(f"✓ {len(execucoes)} execuções simultâneas sem mistura de saída ou eventos")
+
+
+@_com_instalador_falso
+def test_cancel_one_run():
+    """Cancelar uma execução a encerra rapidamente, sem afetar as demais."""
+    runner = InProcessRunner()
+    cooperativa = _executar(runner, ['vscode', '--esperar'])
+    bloqueada = _executar(runner, ['git', '--bloquear'])
+    outra = _executar(runner, ['nodejs'])
+    while len(cooperativa['linhas']) < 21 or len(bloqueada['linhas']) < 21:
+        time.sleep(0.01)
+
+    inicio = time.monotonic()
+    cooperativa['cancelado'].set()
+    bloqueada['cancelado'].set()
+    cooperativa['thread'].join(timeout=5)
+    bloqueada['thread'].join(timeout=5)
+    decorrido = time.monotonic() - inicio
+    outra['thread'].join(timeout=5)
+
+    assert cooperativa['codigo'] == CANCELLED_CODE and bloqueada['codigo'] == CANCELLED_CODE
+    assert 'Instalação cancelada pelo usuário' in cooperativa['linhas'][-1], cooperativa['linhas']
+    assert not any('instalado' in linha for linha in cooperativa['linhas'] + bloqueada['linhas'])
+    assert outra['codigo'] == 0, outra
+    assert decorrido < LIMITE_CANCELAMENTO, decorrido
+    print(f"✓ execuções canceladas em {decorrido * 1000:.0f} ms; a outra terminou normalmente")
+
+
+@_com_instalador_falso
+def test_system_exit_code():
+    """sys.exit() do instalador vira o código de saída da execução, sem encerrar o orquestrador."""
+    execucao = _executar(InProcessRunner(), ['git', '--sair'])
+    execucao['thread'].join(timeout=5)
+    assert execucao['codigo'] == 3, execucao
+    assert isinstance(execucao['eventos'][-1], ResultEvent) and not execucao['eventos'][-1].success
+    print("✓ sys.exit(3) retornado como código 3")
+
+
+@_com_instalador_falso
+def test_http_session_is_shared():
+    """Instaladores executados no mesmo processo reutilizam a sessão HTTP (e suas conexões)."""
+    from nodeecli.modules import http_client
+
+    sessoes = []
+    for nome in ('vscode', 'git'):
+        execucao = _executar(InProcessRunner(), [nome])
+        execucao['thread'].join(timeout=5)
+        sessoes.append(http_client.obter_sessao())
+    assert sessoes[0] is sessoes[1]
+    assert http_client.configurar_http(insecure=True) is not sessoes[0]
+    http_client.configurar_http()
+    print("✓ mesma sessão HTTP entre execuções com as mesmas opções")
+
+
+def test_service_runs_fetch_in_process():
+    """O serviço executa os downloads dentro do processo e repassa saída e eventos à fila."""
+    fila = Queue()
+    service = InstallationService(fila)
+    args = service._build_git_args("fetch") + ['--help']
+    assert service._run_in_process('git', args, 'Git') == 0
+    logs = [m[1] for m in list(fila.queue) if m[0] == 'LOG']
+    assert logs and logs[0].startswith('[Git] usage:'), logs
+    assert service.results['Git'].success
+    print("✓ etapa de download do Git executada dentro do processo")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA EXECUÇÃO DENTRO DO PROCESSO")
+    print("=" * 60)
+
+    tests = [
+        ("Execuções simultâneas isoladas", test_concurrent_runs_are_isolated),
+        ("Cancelamento de uma execução", test_cancel_one_run),
+        ("Código de sys.exit()", test_system_exit_code),
+        ("Sessão HTTP compartilhada", test_http_session_is_shared),
+        ("Download pelo serviço", test_service_runs_fetch_in_process),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Testes do espelho de artefatos (src/core/mirror.py).
+
+Um servidor HTTP local faz o papel das origens (nodejs.org, registro npm,
+update.code.visualstudio.com); o espelho guarda os artefatos em um cache
+temporário.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import requests
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.artifact_cache import ArtifactCache
+from nodeecli.modules.downloader import baixar_arquivo, calcular_sha256
+from nodeecli.modules.http_client import criar_sessao
+from src.core.mirror import MirrorServer
+from tests.http_stub import ServidorHttpLocal
+
+
+INSTALADOR = os.urandom(12 * 1024 * 1024)
+
+
+def _origens(origem):
+    return {
+        'dist': origem.url('/dist/'),
+        'npm': origem.url('/npm/'),
+        'vscode': origem.url('/vscode/'),
+    }
+
+
+def _espelho(origem, tmp):
+    return MirrorServer('127.0.0.1', 0, cache=ArtifactCache(os.path.join(tmp, 'espelho')),
+                        origins=_origens(origem), session=criar_sessao(espelho=''))
+
+
+def _get_origem(origem, caminho):
+    return [r for r in origem.requisicoes if r[0] == 'GET' and r[1] == caminho]
+
+
+def test_cache_through():
+    """Primeiro download busca na origem; o segundo é servido do cache do espelho."""
+    with ServidorHttpLocal({'/dist/v22.11.0/node.msi': INSTALADOR}) as origem, \
+            tempfile.TemporaryDirectory() as tmp, _espelho(origem, tmp) as espelho:
+        url = f"{espelho.url}/dist/v22.11.0/node.msi"
+        for i in range(2):
+            destino = os.path.join(tmp, f'node{i}.msi')
+            resultado = baixar_arquivo(url, destino, session=requests.Session())
+            assert resultado['segmentos'] > 1
+            with open(destino, 'rb') as f:
+                assert f.read() == INSTALADOR
+
+        assert len(_get_origem(origem, '/dist/v22.11.0/node.msi')) == 1
+        assert espelho.stats['misses'] == 1 and espelho.stats['hits'] > 0
+        assert espelho.cache.procurar('dist', url=origem.url('/dist/v22.11.0/node.msi'))
+        print(f"✓ 1 busca na origem para 2 downloads ({espelho.stats['requests']} requisições ao espelho)")
+
+
+def test_concurrent_clients_share_one_fetch():
+    """Clientes simultâneos recebem o artefato enquanto ele ainda chega da origem."""
+    with ServidorHttpLocal({'/dist/v22.11.0/node.msi': INSTALADOR}, bytes_por_segundo=24 * 1024 * 1024) as origem, \
+            tempfile.TemporaryDirectory() as tmp, _espelho(origem, tmp) as espelho:
+        url = f"{espelho.url}/dist/v22.11.0/node.msi"
+        erros = []
+
+        def cliente(indice):
+            try:
+                baixar_arquivo(url, os.path.join(tmp, f'cliente{indice}.msi'), session=requests.Session())
+            except Exception as e:
+                erros.append(e)
+
+        threads = [threading.Thread(target=cliente, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+
+        assert not erros, erros
+        hashes = {calcular_sha256(os.path.join(tmp, f'cliente{i}.msi')) for i in range(8)}
+        assert hashes == {hashlib.sha256(INSTALADOR).hexdigest()}
+        assert len(_get_origem(origem, '/dist/v22.11.0/node.msi')) == 1
+        assert origem.bytes_enviados == len(INSTALADOR)
+        print(f"✓ 8 clientes, 1 busca na origem ({espelho.stats.get('joined', 0)} requisições aguardaram a busca)")
+
+
+def test_npm_documents_point_to_mirror():
+    """Os tarballs listados pelo registro npm passam a ser baixados pelo espelho."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with ServidorHttpLocal({}) as origem, _espelho(origem, tmp) as espelho:
+            documento = {'versions': {'1.0.0': {'dist': {'tarball': origem.url('/npm/pkg/-/pkg-1.0.0.tgz')}}}}
+            origem.arquivos['/npm/pkg'] = json.dumps(documento).encode()
+            origem.arquivos['/npm/pkg/-/pkg-1.0.0.tgz'] = b'tarball'
+
+            for _ in range(2):
+                resposta = requests.get(f"{espelho.url}/npm/pkg", timeout=5)
+                assert resposta.headers['Content-Type'] == 'application/json'
+            tarball = resposta.json()['versions']['1.0.0']['dist']['tarball']
+            assert tarball == f"{espelho.url}/npm/pkg/-/pkg-1.0.0.tgz", tarball
+            assert requests.get(tarball, timeout=5).content == b'tarball'
+            assert len(_get_origem(origem, '/npm/pkg')) == 1
+        print("✓ documento do pacote reescrito e guardado no cache de metadados")
+
+
+def test_redirects_are_rewritten():
+    """O redirecionamento 'latest' do VS Code aponta para o instalador no espelho."""
+    with ServidorHttpLocal({'/dist/VSCodeUserSetup-x64-1.95.3.exe': b'setup'}) as origem, \
+            tempfile.TemporaryDirectory() as tmp:
+        # Location absoluto da origem, conhecido só depois de abrir a porta
+        origem.httpd.redirecionamentos['/vscode/latest/win32-x64-user/stable'] = \
+            origem.url('/dist/VSCodeUserSetup-x64-1.95.3.exe')
+        with _espelho(origem, tmp) as espelho:
+            resposta = requests.head(f"{espelho.url}/vscode/latest/win32-x64-user/stable",
+                                     allow_redirects=False, timeout=5)
+            assert resposta.status_code == 302
+            assert resposta.headers['Location'] == f"{espelho.url}/dist/VSCodeUserSetup-x64-1.95.3.exe"
+            assert requests.get(resposta.headers['Location'], timeout=5).content == b'setup'
+            assert requests.get(f"{espelho.url}/desconhecido/x.exe", timeout=5).status_code == 404
+        print("✓ Location reescrito para o espelho")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO ESPELHO DE ARTEFATOS")
+    print("=" * 60)
+
+    tests = [
+        ("Cache-through", test_cache_through),
+        ("Clientes simultâneos", test_concurrent_clients_share_one_fetch),
+        ("Registro npm", test_npm_documents_point_to_mirror),
+        ("Redirecionamentos", test_redirects_are_rewritten),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
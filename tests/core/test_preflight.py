@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Testes da verificação prévia das versões instaladas (src/core/preflight.py):
+comparação de versões, consultas simultâneas e remoção das ferramentas
+atualizadas do plano de instalação.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from queue import Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.bundle import ENV_BUNDLE, Bundle
+from src.core import installation_service, preflight
+from src.core.preflight import PreflightResult, VersionCheck, probe_versions
+
+# Duração de cada consulta falsa
+ATRASO_CONSULTA = 0.2
+
+
+def test_version_comparison():
+    """Só é atualizado quem tem as duas versões conhecidas e a instalada não é mais antiga."""
+    assert VersionCheck("Node.js", "22.11.0", "v22.11.0").up_to_date
+    assert VersionCheck("Git", "2.47.1.0", "2.47.1").up_to_date
+    assert VersionCheck("Node.js", "23.1.0", "22.11.0").up_to_date
+    assert not VersionCheck("VS Code", "1.94.2", "1.95.0").up_to_date
+    assert not VersionCheck("VS Code", None, "1.95.0").up_to_date
+    assert not VersionCheck("VS Code", "1.95.0", None).up_to_date
+
+    cli = PreflightResult("cli_tools", [VersionCheck("Gemini CLI", "0.1.5", "0.1.5"),
+                                        VersionCheck("Qwen CLI", "0.0.8", "0.0.9")])
+    assert not cli.up_to_date
+    assert cli.describe() == "Gemini CLI 0.1.5, Qwen CLI 0.0.8"
+    assert not PreflightResult("mcp_excel", []).up_to_date
+    print("✓ versões comparadas numericamente; versão desconhecida mantém a ferramenta")
+
+
+def test_probes_run_concurrently():
+    """Todas as consultas rodam ao mesmo tempo: a verificação dura o tempo da mais lenta."""
+    def lenta(versao):
+        def consulta():
+            time.sleep(ATRASO_CONSULTA)
+            return versao
+        return consulta
+
+    def falha():
+        raise OSError("sem rede e sem cache")
+
+    originais = dict(preflight.VERSION_PROBES)
+    preflight.VERSION_PROBES.clear()
+    preflight.VERSION_PROBES.update({
+        "nodejs": [("Node.js", lenta("22.11.0"), lenta("22.11.0"))],
+        "cli_tools": [("Gemini CLI", lenta("0.1.5"), lenta("0.1.5")), ("Qwen CLI", lenta("0.0.9"), lenta("0.0.9"))],
+        "vscode": [("VS Code", lenta("1.94.2"), lenta("1.95.0"))],
+        "git": [("Git", lenta("2.47.1"), falha)],
+    })
+    try:
+        inicio = time.perf_counter()
+        resultados = probe_versions(["nodejs", "cli_tools", "vscode", "git", "mcp_excel"])
+        decorrido = time.perf_counter() - inicio
+    finally:
+        preflight.VERSION_PROBES.clear()
+        preflight.VERSION_PROBES.update(originais)
+
+    assert decorrido < 2 * ATRASO_CONSULTA, decorrido
+    assert set(resultados) == {"nodejs", "cli_tools", "vscode", "git"}, resultados
+    assert resultados["nodejs"].up_to_date and resultados["cli_tools"].up_to_date
+    assert not resultados["vscode"].up_to_date
+    assert not resultados["git"].up_to_date and resultados["git"].checks[0].latest is None
+    print(f"✓ 10 consultas em {decorrido * 1000:.0f} ms (cada uma leva {ATRASO_CONSULTA * 1000:.0f} ms)")
+
+
+def test_up_to_date_tools_are_not_scheduled():
+    """Ferramentas atualizadas saem do plano antes de qualquer download; as dependentes continuam."""
+    atualizadas = {"nodejs", "git"}
+
+    def probe_falso(keys):
+        return {key: PreflightResult(key, [VersionCheck(key, "1.0", "1.0" if key in atualizadas else "2.0")])
+                for key in keys}
+
+    fila = Queue()
+    service = installation_service.InstallationService(fila, in_process=False)
+    executados = []
+    lock = threading.Lock()
+
+    def fake_run_script(args, tool_name):
+        with lock:
+            executados.append(tool_name)
+        return 0
+
+    service._run_script = fake_run_script
+    original = installation_service.probe_versions
+    installation_service.probe_versions = probe_falso
+    try:
+        service.run_installations(True, True, False, True, True, False, True, 300, 600)
+    finally:
+        installation_service.probe_versions = original
+
+    mensagens = list(fila.queue)
+    assert sorted(set(executados)) == ["CLI Tools", "MCP Excel Server", "VS Code"], executados
+    assert mensagens[-1] == ('COMPLETE', 5, 0), mensagens[-1]
+    logs = [m[1] for m in mensagens if m[0] == 'LOG']
+    assert "Git for Windows já está atualizado (git 1.0)" in logs, logs
+    assert not any("ignorado" in log for log in logs), logs
+    print(f"✓ instalados: {sorted(set(executados))}; Node.js e Git já atualizados")
+
+
+def test_nothing_to_do_finishes_without_installers():
+    """Com tudo atualizado, a instalação termina sem executar nenhum instalador."""
+    fila = Queue()
+    service = installation_service.InstallationService(fila)
+    service._run_script = lambda args, tool_name: 1 / 0
+    service._run_in_process = lambda key, args, tool_name: 1 / 0
+    original = installation_service.probe_versions
+    installation_service.probe_versions = lambda keys: {
+        key: PreflightResult(key, [VersionCheck(key, "1.0", "1.0")]) for key in keys
+    }
+    try:
+        service.run_installations(False, True, True, True, False, False, True, 300, 600)
+    finally:
+        installation_service.probe_versions = original
+
+    mensagens = list(fila.queue)
+    assert mensagens[-2:] == [('PROGRESS', 1.0), ('COMPLETE', 3, 0)], mensagens[-2:]
+    print("✓ 3 ferramentas atualizadas, nenhum instalador executado")
+
+
+def test_bundle_from_environment_skips_preflight():
+    """Um bundle em ORQUESTRADOR_BUNDLE (sem bundle_path, como na GUI) também dispensa a verificação."""
+    fila = Queue()
+    service = installation_service.InstallationService(fila, in_process=False)
+    executados = []
+    service._run_script = lambda args, tool_name: executados.append(args) or 0
+    original = installation_service.probe_versions
+    installation_service.probe_versions = lambda keys: 1 / 0
+    anterior = os.environ.get(ENV_BUNDLE)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            Bundle.criar(tmp).salvar()
+            os.environ[ENV_BUNDLE] = tmp
+            service.run_installations(False, True, False, True, False, False, True, 300, 600)
+    finally:
+        installation_service.probe_versions = original
+        if anterior is None:
+            os.environ.pop(ENV_BUNDLE, None)
+        else:
+            os.environ[ENV_BUNDLE] = anterior
+
+    assert list(fila.queue)[-1] == ('COMPLETE', 2, 0), list(fila.queue)[-1]
+    assert executados and all(any(a.startswith("--from-bundle=") for a in args) for args in executados)
+    print(f"✓ bundle da variável de ambiente: {len(executados)} execuções, sem verificação prévia")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA VERIFICAÇÃO PRÉVIA DE VERSÕES")
+    print("=" * 60)
+
+    tests = [
+        ("Comparação de versões", test_version_comparison),
+        ("Consultas simultâneas", test_probes_run_concurrently),
+        ("Ferramentas atualizadas fora do plano", test_up_to_date_tools_are_not_scheduled),
+        ("Nada a instalar", test_nothing_to_do_finishes_without_installers),
+        ("Bundle da variável de ambiente", test_bundle_from_environment_skips_preflight),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Testes do subcomando "run" (src/runner.py), pelo qual o executável único
+empacotado inicia os instaladores.
+"""
+
+import os
+import sys
+from pathlib import Path
+from queue import Queue
+from unittest import mock
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.installation_service import InstallationService
+from src.core.tools import INSTALLER_SCRIPTS, installer_module
+
+
+def test_installer_commands():
+    """Do código-fonte, cada instalador é um script; empacotado, é "<exe> run <ferramenta>"."""
+    service = InstallationService(Queue())
+    for key, script in INSTALLER_SCRIPTS.items():
+        assert Path(project_root, script).is_file(), script
+        assert Path(project_root, *installer_module(key).split('.')).with_suffix('.py').is_file()
+
+    args = service._build_vscode_args("fetch")
+    assert args == [sys.executable, str(Path(project_root) / 'vscode' / 'vscode_installer.py'), '--phase=fetch']
+
+    exe = r'C:\Programas\OrquestradorInstalacoes\OrquestradorInstalacoes.exe'
+    with mock.patch.object(sys, 'frozen', True, create=True), mock.patch.object(sys, 'executable', exe):
+        assert service._build_vscode_args("fetch") == [exe, 'run', 'vscode', '--phase=fetch']
+        assert service._build_mcp_excel_args() == [exe, 'run', 'mcp_excel']
+        assert service._build_nodejs_args(True, 60, 120, phase="cli")[:4] == [exe, 'run', 'nodejs', '--yes']
+    print(f"✓ {len(INSTALLER_SCRIPTS)} instaladores: script do código-fonte ou 'run' no executável")
+
+
+def test_run_dispatches_to_installer():
+    """"main.py run <ferramenta>" executa o instalador com os argumentos repassados."""
+    fila = Queue()
+    service = InstallationService(fila)
+    main_py = os.path.join(project_root, 'src', 'main.py')
+    for key in INSTALLER_SCRIPTS:
+        return_code = service._run_script([sys.executable, main_py, 'run', key, '--help'], key)
+        logs = [m[1] for m in list(fila.queue) if m[0] == 'LOG']
+        fila.queue.clear()
+        assert return_code == 0, (key, logs)
+        assert logs and logs[0].startswith(f'[{key}] usage:'), (key, logs)
+    print(f"✓ --help repassado a {len(INSTALLER_SCRIPTS)} instaladores")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO SUBCOMANDO RUN")
+    print("=" * 60)
+
+    tests = [
+        ("Comandos dos instaladores", test_installer_commands),
+        ("Despacho para o instalador", test_run_dispatches_to_installer),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Testes do agendador de instalações baseado em grafo de dependências.
+
+Usa tarefas simuladas (sleep) — nenhuma instalação real é executada.
+"""
+
+import os
+import sys
+import threading
+import time
+from queue import Queue
+
+# Adicionar a raiz do projeto ao sys.path para garantir que src seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.scheduler import DependencyScheduler, ScheduledTask
+
+
+def _sleeper(duration, log=None, name=None, result=True):
+    def action():
+        if log is not None:
+            log.append(("start", name, time.perf_counter()))
+        time.sleep(duration)
+        if log is not None:
+            log.append(("end", name, time.perf_counter()))
+        return result
+    return action
+
+
+def test_independent_tasks_run_concurrently():
+    """Tarefas independentes devem levar ~o caminho crítico, não a soma."""
+    scheduler = DependencyScheduler()
+    for name in ("a", "b", "c", "d"):
+        scheduler.add_task(ScheduledTask(name, _sleeper(0.2)))
+    scheduler.add_task(ScheduledTask("e", _sleeper(0.2), depends_on=["a"]))
+
+    inicio = time.perf_counter()
+    status = scheduler.run()
+    duracao = time.perf_counter() - inicio
+
+    assert all(s == ScheduledTask.SUCCEEDED for s in status.values())
+    # Caminho crítico: a -> e = 0.4s; soma seria 1.0s
+    assert duracao < 0.7, f"duração {duracao:.2f}s indica execução sequencial"
+    print(f"✓ 5 tarefas (caminho crítico 0.4s) concluídas em {duracao:.2f}s")
+
+
+def test_dependencies_are_respected():
+    """Uma tarefa só começa após suas dependências terminarem."""
+    log = []
+    scheduler = DependencyScheduler()
+    scheduler.add_task(ScheduledTask("git", _sleeper(0.1, log, "git")))
+    scheduler.add_task(ScheduledTask("mcp_excel", _sleeper(0.05, log, "mcp_excel"), depends_on=["git"]))
+    scheduler.run()
+
+    fim_git = next(t for ev, n, t in log if ev == "end" and n == "git")
+    inicio_mcp = next(t for ev, n, t in log if ev == "start" and n == "mcp_excel")
+    assert inicio_mcp >= fim_git
+    print("✓ mcp_excel iniciou somente após git")
+
+
+def test_failed_dependency_skips_dependents():
+    """Falha em uma dependência deve pular as tarefas dependentes."""
+    scheduler = DependencyScheduler()
+    scheduler.add_task(ScheduledTask("nodejs", _sleeper(0.01, result=False)))
+    scheduler.add_task(ScheduledTask("cli_tools", _sleeper(0.01), depends_on=["nodejs"]))
+    scheduler.add_task(ScheduledTask("vscode", _sleeper(0.01)))
+    status = scheduler.run()
+
+    assert status == {
+        "nodejs": ScheduledTask.FAILED,
+        "cli_tools": ScheduledTask.SKIPPED,
+        "vscode": ScheduledTask.SUCCEEDED,
+    }
+    print("✓ cli_tools ignorado após falha do nodejs")
+
+
+def test_resource_limit_serializes_installer_slot():
+    """O recurso 'installer' com limite 1 nunca deve ter duas tarefas ativas."""
+    ativos = {"atual": 0, "maximo": 0}
+    lock = threading.Lock()
+
+    def action():
+        with lock:
+            ativos["atual"] += 1
+            ativos["maximo"] = max(ativos["maximo"], ativos["atual"])
+        time.sleep(0.05)
+        with lock:
+            ativos["atual"] -= 1
+        return True
+
+    scheduler = DependencyScheduler({"installer": 1})
+    for name in ("nodejs", "vscode", "git", "antigravity"):
+        scheduler.add_task(ScheduledTask(name, action, resources=["installer"]))
+    scheduler.run()
+
+    assert ativos["maximo"] == 1
+    print("✓ slot único de instalador respeitado")
+
+
+def test_cycle_is_rejected():
+    """Ciclos no grafo devem ser rejeitados antes da execução."""
+    scheduler = DependencyScheduler()
+    scheduler.add_task(ScheduledTask("a", _sleeper(0), depends_on=["b"]))
+    scheduler.add_task(ScheduledTask("b", _sleeper(0), depends_on=["a"]))
+    try:
+        scheduler.run()
+    except ValueError:
+        print("✓ ciclo detectado")
+        return
+    raise AssertionError("ciclo não detectado")
+
+
+def test_cancel_skips_pending_tasks():
+    """Após o cancelamento nenhuma tarefa nova é iniciada."""
+    cancelado = threading.Event()
+
+    def primeira():
+        cancelado.set()
+        return True
+
+    scheduler = DependencyScheduler()
+    scheduler.add_task(ScheduledTask("a", primeira))
+    scheduler.add_task(ScheduledTask("b", _sleeper(0), depends_on=["a"]))
+    status = scheduler.run(should_cancel=cancelado.is_set)
+
+    assert status["b"] == ScheduledTask.SKIPPED
+    print("✓ tarefas pendentes ignoradas após cancelamento")
+
+
+def test_installation_service_uses_dependency_graph():
+    """O InstallationService agenda as ferramentas selecionadas pelo grafo."""
+    from src.core.installation_service import InstallationService
+
+    fila = Queue()
+    # Todas as etapas pelo backend de subprocessos, substituído abaixo; sem consultar as versões instaladas
+    service = InstallationService(fila, in_process=False, preflight=False)
+    ordem = []
+    lock = threading.Lock()
+
+    def fake_run_script(args, tool_name):
+        with lock:
+            ordem.append(tool_name)
+        time.sleep(0.02)
+        return 0
+
+    service._run_script = fake_run_script
+    service.run_installations(True, False, False, True, True, False, True, 300, 600)
+
+    mensagens = []
+    while not fila.empty():
+        mensagens.append(fila.get())
+
+    assert mensagens[-1] == ('COMPLETE', 4, 0), mensagens[-1]
+    assert ordem.index("MCP Excel Server") > ordem.index("Git")
+    assert ordem.index("CLI Tools") > ordem.index("Node.js")
+    print(f"✓ ordem respeitando dependências: {ordem}")
+
+
+def test_fetch_pipelines_with_install():
+    """O download de uma ferramenta deve ocorrer enquanto outra instala."""
+    from src.core.installation_service import InstallationService
+
+    fila = Queue()
+    # Todas as etapas pelo backend de subprocessos, substituído abaixo; sem consultar as versões instaladas
+    service = InstallationService(fila, in_process=False, preflight=False)
+    eventos = []
+    lock = threading.Lock()
+
+    def fake_run_script(args, tool_name):
+        fase = next(a.split("=", 1)[1] for a in args if a.startswith("--phase="))
+        with lock:
+            eventos.append(("start", tool_name, fase, time.perf_counter()))
+        time.sleep(0.1)
+        with lock:
+            eventos.append(("end", tool_name, fase, time.perf_counter()))
+        return 0
+
+    service._run_script = fake_run_script
+    inicio = time.perf_counter()
+    # VS Code, Antigravity e Git: três downloads + três instalações (slot único)
+    service.run_installations(False, True, True, True, False, False, True, 300, 600)
+    duracao = time.perf_counter() - inicio
+
+    instalacoes = [(t, n) for ev, n, f, t in eventos if ev == "start" and f == "install"]
+    downloads = [(n, t) for ev, n, f, t in eventos if ev == "end" and f == "fetch"]
+    assert len(instalacoes) == 3 and len(downloads) == 3
+    # Soma sequencial seria 0.6s; com pipeline: downloads em paralelo + 3 instalações
+    assert duracao < 0.55, f"duração {duracao:.2f}s indica ausência de pipeline"
+    print(f"✓ 3 ferramentas (download + instalação) em {duracao:.2f}s")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO AGENDADOR DE INSTALAÇÕES")
+    print("=" * 60)
+
+    tests = [
+        ("Execução concorrente", test_independent_tasks_run_concurrently),
+        ("Dependências", test_dependencies_are_respected),
+        ("Falha de dependência", test_failed_dependency_skips_dependents),
+        ("Limite de recursos", test_resource_limit_serializes_installer_slot),
+        ("Detecção de ciclos", test_cycle_is_rejected),
+        ("Cancelamento", test_cancel_skips_pending_tasks),
+        ("InstallationService", test_installation_service_uses_dependency_graph),
+        ("Pipeline download/instalação", test_fetch_pipelines_with_install),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
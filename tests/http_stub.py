@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local usado como substituto dos CDNs nos testes e benchmarks.
+
+Serve arquivos em memória com suporte opcional a Range/If-Range, ETag
+(com 304 para If-None-Match), redirecionamentos, limite de banda por
+conexão (para simular o teto de um único fluxo TCP) e quedas de conexão no
+meio da resposta (para testar retomada).
+"""
+
+import hashlib
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # silenciar logs do servidor
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.sockets_abertos.add(self.connection)
+
+    def finish(self):
+        with self.server.lock:
+            self.server.sockets_abertos.discard(self.connection)
+        super().finish()
+
+    def _enviar(self, corpo):
+        limite = self.server.bytes_por_segundo
+        with self.server.lock:
+            cortar_apos = None
+            if self.server.cortes_restantes > 0 and len(corpo) > self.server.cortar_apos:
+                self.server.cortes_restantes -= 1
+                cortar_apos = self.server.cortar_apos
+        bloco = 64 * 1024
+        inicio = time.perf_counter()
+        enviados = 0
+        for offset in range(0, len(corpo), bloco):
+            parte = corpo[offset:offset + bloco]
+            if cortar_apos is not None and enviados + len(parte) > cortar_apos:
+                # Simular queda de conexão: enviar parte dos bytes e fechar
+                parte = parte[:max(0, cortar_apos - enviados)]
+                try:
+                    self.wfile.write(parte)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                with self.server.lock:
+                    self.server.bytes_enviados += len(parte)
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            try:
+                self.wfile.write(parte)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            enviados += len(parte)
+            with self.server.lock:
+                self.server.bytes_enviados += len(parte)
+            if limite:
+                atraso = enviados / limite - (time.perf_counter() - inicio)
+                if atraso > 0:
+                    time.sleep(atraso)
+
+    def _responder(self, incluir_corpo):
+        with self.server.lock:
+            self.server.requisicoes.append((self.command, self.path, dict(self.headers)))
+            self.server.conexoes.add(self.client_address)
+        caminho = self.path.split("?", 1)[0]
+        destino = self.server.redirecionamentos.get(caminho)
+        if destino is not None:
+            self.send_response(302)
+            self.send_header("Location", destino)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        conteudo = self.server.arquivos.get(caminho)
+        if conteudo is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.sha256(conteudo).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        faixa = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if faixa and if_range and if_range != etag:
+            faixa = None  # validador não confere: enviar o arquivo completo
+
+        if faixa and self.server.suporta_range and faixa.startswith("bytes="):
+            inicio_txt, _, fim_txt = faixa[len("bytes="):].partition("-")
+            inicio = int(inicio_txt)
+            fim = int(fim_txt) if fim_txt else len(conteudo) - 1
+            fim = min(fim, len(conteudo) - 1)
+            if inicio >= len(conteudo):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(conteudo)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            corpo = conteudo[inicio:fim + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {inicio}-{fim}/{len(conteudo)}")
+        else:
+            corpo = conteudo
+            self.send_response(200)
+
+        if self.server.suporta_range:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Content-Type", "application/octet-stream")
+        self.end_headers()
+        if incluir_corpo:
+            self._enviar(corpo)
+
+    def do_GET(self):
+        self._responder(incluir_corpo=True)
+
+    def do_HEAD(self):
+        self._responder(incluir_corpo=False)
+
+
+class ServidorHttpLocal:
+    """
+    Servidor HTTP em thread de fundo.
+
+    Uso:
+        with ServidorHttpLocal({'/arquivo.exe': dados}) as servidor:
+            url = servidor.url('/arquivo.exe')
+
+    Com cortar_apos=N e cortes=K, as K primeiras respostas com corpo maior
+    que N bytes são interrompidas depois de N bytes. redirecionamentos mapeia
+    caminhos para a URL informada no Location de uma resposta 302.
+    """
+
+    def __init__(self, arquivos, suporta_range=True, bytes_por_segundo=None, cortar_apos=None, cortes=0,
+                 redirecionamentos=None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.arquivos = dict(arquivos)
+        self.httpd.redirecionamentos = dict(redirecionamentos or {})
+        self.httpd.suporta_range = suporta_range
+        self.httpd.bytes_por_segundo = bytes_por_segundo
+        self.httpd.cortar_apos = cortar_apos
+        self.httpd.cortes_restantes = cortes if cortar_apos is not None else 0
+        self.httpd.bytes_enviados = 0
+        self.httpd.requisicoes = []
+        self.httpd.conexoes = set()
+        self.httpd.sockets_abertos = set()
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def requisicoes(self):
+        """Lista de (método, caminho, headers) recebidos."""
+        return self.httpd.requisicoes
+
+    @property
+    def conexoes(self):
+        """Endereços (host, porta) dos clientes — uma entrada por conexão TCP."""
+        return self.httpd.conexoes
+
+    @property
+    def bytes_enviados(self):
+        """Total de bytes de corpo enviados (para medir quanto foi baixado de novo)."""
+        return self.httpd.bytes_enviados
+
+    @property
+    def arquivos(self):
+        """Arquivos servidos (caminho -> bytes); pode ser alterado durante o teste."""
+        return self.httpd.arquivos
+
+    def url(self, caminho):
+        host, porta = self.httpd.server_address[:2]
+        return f"http://{host}:{porta}{caminho}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        # Fechar também as conexões keep-alive ainda abertas pelos clientes
+        with self.httpd.lock:
+            abertos = list(self.httpd.sockets_abertos)
+        for sock in abertos:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Testes do provisionamento incremental do MCP Excel Server (mcp_excel/mcp_excel_installer.py):
+impressão digital do clone e do ambiente virtual, com um 'uv' falso que registra
+as chamadas e um repositório Git local no lugar do remoto.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que mcp_excel seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from mcp_excel.mcp_excel_installer import (
+    ARQUIVO_IMPRESSAO, preparar_repositorio, provisionar_ambiente, _python_venv,
+)
+
+# uv falso: 'venv' cria um .venv mínimo (pyvenv.cfg e o interpretador); o resto só é registrado
+UV_FALSO = textwrap.dedent("""
+    import json, os, sys
+    from pathlib import Path
+
+    with open(os.environ['UV_FALSO_LOG'], 'a') as log:
+        log.write(json.dumps(sys.argv[1:]) + '\\n')
+    if sys.argv[1] == 'venv':
+        venv = Path.cwd() / '.venv'
+        pasta = venv / ('Scripts' if os.name == 'nt' else 'bin')
+        pasta.mkdir(parents=True, exist_ok=True)
+        (venv / 'pyvenv.cfg').write_text(f"home = {Path(sys.executable).parent}\\n")
+        python = pasta / ('python.exe' if os.name == 'nt' else 'python')
+        if not python.exists():
+            python.symlink_to(sys.executable)
+""")
+
+
+def _git(repositorio, *args):
+    subprocess.run(["git", "-c", "user.name=Teste", "-c", "user.email=teste@exemplo", "-C", str(repositorio),
+                    *args], check=True, capture_output=True)
+
+
+def _com_repositorio_e_uv(test_func):
+    """Executa o teste com um repositório de origem (pyproject.toml e uv.lock) e o uv falso no PATH."""
+    def wrapper():
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            origem = tmp / 'origem'
+            origem.mkdir()
+            subprocess.run(["git", "init", "--quiet", str(origem)], check=True)
+            (origem / 'pyproject.toml').write_text('[project]\nname = "mcp-excel-server"\n')
+            (origem / 'uv.lock').write_text('version = 1\n')
+            _git(origem, "add", ".")
+            _git(origem, "commit", "--quiet", "-m", "inicial")
+
+            (tmp / 'bin').mkdir()
+            (tmp / 'bin' / 'uv.py').write_text(UV_FALSO)
+            (tmp / 'bin' / 'uv').write_text(f'#!/bin/sh\nexec "{sys.executable}" "{tmp / "bin" / "uv.py"}" "$@"\n')
+            (tmp / 'bin' / 'uv.cmd').write_text(f'@"{sys.executable}" "{tmp / "bin" / "uv.py"}" %*\r\n')
+            os.chmod(tmp / 'bin' / 'uv', 0o755)
+            anteriores = {chave: os.environ.get(chave) for chave in ('PATH', 'UV_FALSO_LOG')}
+            os.environ['PATH'] = f"{tmp / 'bin'}{os.pathsep}{os.environ['PATH']}"
+            os.environ['UV_FALSO_LOG'] = str(tmp / 'uv.log')
+            try:
+                test_func(tmp, origem)
+            finally:
+                for chave, valor in anteriores.items():
+                    if valor is None:
+                        os.environ.pop(chave, None)
+                    else:
+                        os.environ[chave] = valor
+    wrapper.__name__ = test_func.__name__
+    wrapper.__doc__ = test_func.__doc__
+    return wrapper
+
+
+def _instalar(origem, projeto):
+    """Clona/atualiza e provisiona; retorna (código, saída, chamadas do uv nesta execução)."""
+    log = Path(os.environ['UV_FALSO_LOG'])
+    antes = log.read_text().splitlines() if log.exists() else []
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        assert preparar_repositorio(projeto, str(origem))
+        codigo = provisionar_ambiente(projeto)
+    depois = log.read_text().splitlines() if log.exists() else []
+    return codigo, saida.getvalue(), [json.loads(linha)[0] for linha in depois[len(antes):]]
+
+
+@_com_repositorio_e_uv
+def test_unchanged_rerun_is_skipped(tmp, origem):
+    """Sem mudanças, a reexecução não chama fetch/pull nem o uv e termina em menos de 1 s."""
+    projeto = tmp / 'mcp-excel-server'
+    codigo, _, chamadas = _instalar(origem, projeto)
+    assert codigo == 0 and chamadas == ['venv', 'sync'], chamadas
+    assert (projeto / '.venv' / ARQUIVO_IMPRESSAO).is_file()
+
+    inicio = time.perf_counter()
+    codigo, saida, chamadas = _instalar(origem, projeto)
+    decorrido = time.perf_counter() - inicio
+    assert codigo == 0 and chamadas == [], chamadas
+    assert 'Repositório já atualizado' in saida and 'já atualizados' in saida, saida
+    assert decorrido < 1.0, decorrido
+    print(f"✓ reexecução sem mudanças em {decorrido * 1000:.0f} ms, sem chamadas ao uv")
+
+
+@_com_repositorio_e_uv
+def test_lock_change_syncs_without_recreating_venv(tmp, origem):
+    """Um uv.lock novo no remoto: pull e 'uv sync --frozen --compile-bytecode', com o mesmo .venv."""
+    projeto = tmp / 'mcp-excel-server'
+    _instalar(origem, projeto)
+    (origem / 'uv.lock').write_text('version = 1\n# nova dependência\n')
+    _git(origem, "commit", "--quiet", "-am", "lock")
+
+    codigo, saida, chamadas = _instalar(origem, projeto)
+    assert codigo == 0 and chamadas == ['sync'], chamadas
+    assert 'Ambiente virtual existente reaproveitado' in saida, saida
+    argumentos = json.loads(Path(os.environ['UV_FALSO_LOG']).read_text().splitlines()[-1])
+    assert argumentos == ['sync', '--frozen', '--compile-bytecode'], argumentos
+    print("✓ só 'uv sync' após a mudança do uv.lock")
+
+
+@_com_repositorio_e_uv
+def test_broken_venv_is_recreated(tmp, origem):
+    """Sem o interpretador do .venv, o ambiente é recriado e as dependências reinstaladas."""
+    projeto = tmp / 'mcp-excel-server'
+    _instalar(origem, projeto)
+    _python_venv(projeto).unlink()
+
+    codigo, _, chamadas = _instalar(origem, projeto)
+    assert codigo == 0 and chamadas == ['venv', 'sync'], chamadas
+    print("✓ .venv sem interpretador recriado")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO PROVISIONAMENTO INCREMENTAL DO MCP EXCEL")
+    print("=" * 60)
+
+    tests = [
+        ("Reexecução sem mudanças", test_unchanged_rerun_is_skipped),
+        ("Mudança do uv.lock", test_lock_change_syncs_without_recreating_venv),
+        ("Ambiente virtual quebrado", test_broken_venv_is_recreated),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de artefatos (nodeecli/modules/artifact_cache.py).
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.artifact_cache import ArtifactCache, obter_com_cache, obter_do_cache
+from tests.http_stub import ServidorHttpLocal
+
+
+def _criar_arquivo(diretorio, nome, tamanho):
+    caminho = os.path.join(diretorio, nome)
+    with open(caminho, 'wb') as f:
+        f.write(os.urandom(tamanho))
+    return caminho
+
+
+def test_store_and_lookup():
+    """Artefato armazenado é encontrado por (ferramenta, versão, arquitetura, URL)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArtifactCache(os.path.join(tmp, 'cache'))
+        origem = _criar_arquivo(tmp, 'setup.exe', 1024)
+        entrada = cache.armazenar(origem, 'vscode', '1.95.3', 'x64', 'https://exemplo/setup.exe')
+        with open(origem, 'rb') as f:
+            assert entrada['sha256'] == hashlib.sha256(f.read()).hexdigest()
+
+        assert cache.procurar('vscode', '1.95.3', 'x64')
+        assert cache.procurar('vscode', '1.95.4', 'x64') is None
+        assert cache.procurar('git') is None
+
+        destino = os.path.join(tmp, 'staging', 'setup.exe')
+        assert obter_do_cache('vscode', destino, cache=cache)
+        os.remove(destino)  # o instalador apaga a cópia; o blob continua no cache
+        assert cache.procurar('vscode', url='https://exemplo/setup.exe')
+        print("✓ artefato armazenado, encontrado e materializado")
+
+
+def test_lru_eviction():
+    """Acima do orçamento, o artefato usado há mais tempo é removido."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArtifactCache(os.path.join(tmp, 'cache'), orcamento_bytes=2500)
+        cache.armazenar(_criar_arquivo(tmp, 'a.exe', 1000), 'nodejs', 'v20', 'x64')
+        time.sleep(0.01)
+        cache.armazenar(_criar_arquivo(tmp, 'b.exe', 1000), 'git', '2.47', 'x64')
+        time.sleep(0.01)
+        cache.procurar('nodejs')  # nodejs passa a ser o mais recente
+        time.sleep(0.01)
+        cache.armazenar(_criar_arquivo(tmp, 'c.exe', 1000), 'vscode', '1.95', 'x64')
+
+        ferramentas = {e['ferramenta'] for e in cache.listar()}
+        assert ferramentas == {'nodejs', 'vscode'}, ferramentas
+        assert cache.tamanho_total() <= 2500
+
+        removidas = cache.podar(0)
+        assert len(removidas) == 2 and cache.listar() == []
+        print("✓ remoção LRU respeita o orçamento")
+
+
+def test_repeat_download_skips_network():
+    """A segunda obtenção do mesmo artefato não faz nenhuma requisição."""
+    conteudo = os.urandom(256 * 1024)
+    with ServidorHttpLocal({'/setup.exe': conteudo}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        cache = ArtifactCache(os.path.join(tmp, 'cache'))
+        url = servidor.url('/setup.exe')
+        destino = os.path.join(tmp, 'staging', 'setup.exe')
+        os.makedirs(os.path.dirname(destino))
+
+        primeiro = obter_com_cache(url, destino, 'git', '2.47.1', 'x64', cache=cache)
+        requisicoes = len(servidor.requisicoes)
+        os.remove(destino)
+
+        segundo = obter_com_cache(url, destino, 'git', '2.47.1', 'x64', cache=cache)
+        assert primeiro['origem'] == 'rede' and segundo['origem'] == 'cache'
+        assert len(servidor.requisicoes) == requisicoes
+        with open(destino, 'rb') as f:
+            assert f.read() == conteudo
+        print("✓ reinstalação servida pelo cache sem acessar a rede")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO CACHE DE ARTEFATOS")
+    print("=" * 60)
+
+    tests = [
+        ("Armazenar e procurar", test_store_and_lookup),
+        ("Remoção LRU", test_lru_eviction),
+        ("Reinstalação sem rede", test_repeat_download_skips_network),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
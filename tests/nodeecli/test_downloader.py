@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Testes do downloader segmentado (nodeecli/modules/downloader.py).
+
+Usa um servidor HTTP local — nenhum acesso à internet é necessário.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.downloader import ErroChecksum, ErroDownload, baixar_arquivo
+from tests.http_stub import ServidorHttpLocal
+
+
+CONTEUDO = os.urandom(9 * 1024 * 1024 + 123)
+SHA256 = hashlib.sha256(CONTEUDO).hexdigest()
+
+
+def _destino(diretorio):
+    return os.path.join(diretorio, "instalador.exe")
+
+
+def test_segmented_download():
+    """Servidor com Range: download em várias faixas, conteúdo idêntico."""
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        resultado = baixar_arquivo(servidor.url("/setup.exe"), _destino(tmp), segmentos=4,
+                                   sha256_esperado=SHA256)
+        with open(resultado['caminho'], 'rb') as f:
+            assert f.read() == CONTEUDO
+        assert resultado['segmentos'] == 4
+        assert not os.path.exists(_destino(tmp) + ".part")
+        faixas = [h.get("Range") for m, p, h in servidor.requisicoes if m == "GET"]
+        assert len(faixas) == 5  # sonda + 4 segmentos
+        print(f"✓ download em {resultado['segmentos']} segmentos conferido por SHA-256")
+
+
+def test_fallback_without_range():
+    """Servidor sem Range: download em fluxo único a partir da própria sonda."""
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}, suporta_range=False) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        resultado = baixar_arquivo(servidor.url("/setup.exe"), _destino(tmp), sha256_esperado=SHA256)
+        assert resultado['segmentos'] == 1
+        assert len(servidor.requisicoes) == 1
+        print("✓ fallback para fluxo único sem requisições extras")
+
+
+def test_checksum_mismatch_is_rejected():
+    """Checksum divergente: erro e nenhum arquivo final."""
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        try:
+            baixar_arquivo(servidor.url("/setup.exe"), _destino(tmp), sha256_esperado="0" * 64)
+        except ErroChecksum:
+            assert not os.path.exists(_destino(tmp))
+            assert not os.path.exists(_destino(tmp) + ".part")
+            print("✓ checksum inválido rejeitado")
+            return
+    raise AssertionError("checksum inválido não foi detectado")
+
+
+def test_missing_file_raises():
+    """404 vira ErroDownload."""
+    with ServidorHttpLocal({}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        try:
+            baixar_arquivo(servidor.url("/nada.exe"), _destino(tmp))
+        except ErroDownload:
+            print("✓ 404 reportado como ErroDownload")
+            return
+    raise AssertionError("404 não gerou ErroDownload")
+
+
+def test_retry_resumes_interrupted_range():
+    """Queda de conexão no meio de uma faixa: a nova tentativa continua do ponto gravado."""
+    corte = 2 * 1024 * 1024
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}, cortar_apos=corte, cortes=1) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        resultado = baixar_arquivo(servidor.url("/setup.exe"), _destino(tmp), segmentos=1,
+                                   sha256_esperado=SHA256)
+        assert resultado['sha256'] == SHA256
+        faixas = [h.get("Range") for m, p, h in servidor.requisicoes if m == "GET"]
+        assert faixas[-1] == f"bytes={corte}-{len(CONTEUDO) - 1}", faixas
+        assert servidor.bytes_enviados < len(CONTEUDO) + 64 * 1024
+        print("✓ nova tentativa pediu apenas os bytes restantes")
+
+
+def test_resume_across_runs():
+    """Download cancelado deixa .part + sidecar; a próxima execução retoma."""
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        destino = _destino(tmp)
+        progresso = []
+
+        def ao_progresso(baixados, total):
+            progresso.append(baixados)
+
+        try:
+            baixar_arquivo(servidor.url("/setup.exe"), destino, segmentos=4, ao_progresso=ao_progresso,
+                           cancelar=lambda: bool(progresso) and progresso[-1] > len(CONTEUDO) // 2)
+            raise AssertionError("download deveria ter sido cancelado")
+        except ErroDownload:
+            pass
+        assert os.path.exists(destino + ".part")
+        assert os.path.exists(destino + ".part.json")
+
+        enviados_antes = servidor.bytes_enviados
+        resultado = baixar_arquivo(servidor.url("/setup.exe"), destino, segmentos=4, sha256_esperado=SHA256)
+        reenviados = servidor.bytes_enviados - enviados_antes
+        assert resultado['retomado']
+        assert reenviados < len(CONTEUDO) * 0.75, reenviados
+        assert not os.path.exists(destino + ".part.json")
+        print(f"✓ retomada baixou {reenviados / (1024 * 1024):.1f} de {len(CONTEUDO) / (1024 * 1024):.1f} MB")
+
+
+def test_changed_file_restarts():
+    """ETag diferente: o .part anterior é descartado e o download recomeça."""
+    novo = os.urandom(len(CONTEUDO))
+    with ServidorHttpLocal({"/setup.exe": CONTEUDO}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        destino = _destino(tmp)
+        try:
+            baixar_arquivo(servidor.url("/setup.exe"), destino, cancelar=lambda: True)
+        except ErroDownload:
+            pass
+        servidor.arquivos["/setup.exe"] = novo
+        resultado = baixar_arquivo(servidor.url("/setup.exe"), destino,
+                                   sha256_esperado=hashlib.sha256(novo).hexdigest())
+        assert not resultado['retomado']
+        print("✓ arquivo remoto alterado: download recomeçou do zero")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO DOWNLOADER SEGMENTADO")
+    print("=" * 60)
+
+    tests = [
+        ("Download segmentado", test_segmented_download),
+        ("Fallback sem Range", test_fallback_without_range),
+        ("Checksum divergente", test_checksum_mismatch_is_rejected),
+        ("Arquivo inexistente", test_missing_file_raises),
+        ("Retomada na mesma execução", test_retry_resumes_interrupted_range),
+        ("Retomada entre execuções", test_resume_across_runs),
+        ("Arquivo remoto alterado", test_changed_file_restarts),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
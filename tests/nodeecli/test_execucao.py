@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Testes da execução com a saída transmitida (nodeecli/modules/execucao.py):
+linhas repassadas durante a execução, contadores do npm/bun, cauda limitada,
+timeout, cancelamento e aviso de silêncio.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules import execucao
+from nodeecli.modules.events import CanalEventos, InstalacaoCancelada, contexto_execucao
+from nodeecli.modules.execucao import LINHAS_CAUDA, executar_transmitindo
+
+# Saída de um 'npm install -g --loglevel=http', com uma pausa antes do fim
+NPM_LENTO = textwrap.dedent("""
+    import sys, time
+    for pacote, cache in (('a', 'cache hit'), ('b', 'cache hit'), ('c', 'cache revalidated')):
+        print(f'npm http fetch GET 200 https://registry.npmjs.org/{pacote} 12ms ({cache})', file=sys.stderr, flush=True)
+    print('added 5 packages in 1s', flush=True)
+    time.sleep(0.6)
+    print('fim', flush=True)
+""")
+
+# Programa que inicia um filho (como npm.cmd -> node) e os dois ficam parados
+TRAVADO = textwrap.dedent("""
+    import subprocess, sys, time
+    subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    print('iniciado', flush=True)
+    time.sleep(30)
+""")
+
+
+class _SaidaCronometrada(io.StringIO):
+    """stdout que registra o instante de cada linha impressa."""
+
+    def __init__(self):
+        super().__init__()
+        self.linhas = []
+
+    def write(self, texto):
+        for linha in texto.splitlines():
+            if linha:
+                self.linhas.append((time.monotonic(), linha))
+        return super().write(texto)
+
+
+def _executar(script, canal=None, cancelamento=None, **kwargs):
+    """Executa o script com um canal de eventos próprio; retorna (resultado ou exceção, eventos)."""
+    canal = canal or CanalEventos(io.StringIO())
+    with contexto_execucao(canal, cancelamento or threading.Event()):
+        try:
+            resultado = executar_transmitindo([sys.executable, '-c', script], **kwargs)
+        except BaseException as e:
+            resultado = e
+    eventos = [json.loads(linha) for linha in canal.arquivo.getvalue().splitlines()]
+    return resultado, eventos
+
+
+def test_lines_are_streamed_while_running():
+    """As linhas chegam ao log durante a execução; as requisições são contadas, não repassadas."""
+    saida = _SaidaCronometrada()
+    stdout_original = sys.stdout
+    sys.stdout = saida
+    try:
+        resultado, eventos = _executar(NPM_LENTO, rotulo='npm')
+        fim = time.monotonic()
+    finally:
+        sys.stdout = stdout_original
+
+    textos = [linha for _, linha in saida.linhas]
+    assert textos[:2] == ['   added 5 packages in 1s', '   fim'], textos
+    assert not any('fetch' in texto for texto in textos), textos
+    # A primeira linha foi impressa antes da pausa, não no fim
+    assert fim - saida.linhas[0][0] >= 0.4, fim - saida.linhas[0][0]
+    assert resultado.sucesso and (resultado.requisicoes, resultado.do_cache, resultado.pacotes) == (3, 2, 5)
+    assert 'npm: 3 requisições ao registro (2 do cache local)' in textos[-1], textos
+
+    atividades = [e for e in eventos if e['evento'] == 'atividade']
+    assert atividades and atividades[-1]['descricao'] == 'npm: 3 requisições ao registro', atividades
+    assert atividades[-1]['concluidos'] == 3
+    print(f"✓ {len(textos)} linhas repassadas, {len(atividades)} eventos de atividade")
+
+
+def test_tail_is_bounded():
+    """Só as últimas linhas ficam em memória; o detalhe do erro ignora as linhas sem informação."""
+    script = textwrap.dedent("""
+        import sys
+        for i in range(5000):
+            print(f'linha {i}')
+        sys.stdout.flush()
+        print('npm ERR! code E404', file=sys.stderr)
+        print('npm ERR! 404 Not Found - GET https://registry.npmjs.org/inexistente', file=sys.stderr)
+        print('npm ERR! A complete log of this run can be found in: x.log', file=sys.stderr)
+        sys.exit(1)
+    """)
+    resultado, _ = _executar(script, ecoar=False)
+    assert not resultado.sucesso and resultado.returncode == 1
+    assert len(resultado.cauda) == LINHAS_CAUDA, len(resultado.cauda)
+    assert resultado.detalhe_erro() == 'npm ERR! 404 Not Found - GET https://registry.npmjs.org/inexistente'
+    print(f"✓ {LINHAS_CAUDA} de 5003 linhas guardadas; detalhe: {resultado.detalhe_erro()}")
+
+
+def test_timeout_kills_process_tree():
+    """No timeout, o programa e o processo que ele iniciou são encerrados."""
+    inicio = time.perf_counter()
+    resultado, _ = _executar(TRAVADO, timeout=0.5, ecoar=False)
+    decorrido = time.perf_counter() - inicio
+    assert isinstance(resultado, subprocess.TimeoutExpired), resultado
+    assert 'iniciado' in resultado.output
+    assert decorrido < 5, decorrido
+    print(f"✓ árvore encerrada {decorrido:.1f} s após o início (timeout de 0.5 s)")
+
+
+def test_cancellation_stops_program():
+    """O pedido de cancelamento do orquestrador encerra o programa em execução."""
+    cancelamento = threading.Event()
+    threading.Timer(0.3, cancelamento.set).start()
+    inicio = time.perf_counter()
+    resultado, _ = _executar(TRAVADO, cancelamento=cancelamento, ecoar=False)
+    decorrido = time.perf_counter() - inicio
+    assert isinstance(resultado, InstalacaoCancelada), resultado
+    assert decorrido < 5, decorrido
+    print(f"✓ cancelado em {decorrido:.1f} s")
+
+
+def test_silence_warning():
+    """Um programa sem saída por muito tempo gera um aviso (instalação lenta ou travada)."""
+    original = execucao.SILENCIO_AVISO
+    execucao.SILENCIO_AVISO = 0.3
+    try:
+        resultado, eventos = _executar("import time; time.sleep(0.8)", rotulo='bun')
+    finally:
+        execucao.SILENCIO_AVISO = original
+    assert resultado.sucesso
+    avisos = [e['mensagem'] for e in eventos if e['evento'] == 'aviso']
+    assert avisos and avisos[0].startswith('bun sem saída há'), avisos
+    assert len(avisos) <= 2, avisos
+    print(f"✓ aviso: {avisos[0]}")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA EXECUÇÃO COM SAÍDA TRANSMITIDA")
+    print("=" * 60)
+
+    tests = [
+        ("Linhas transmitidas", test_lines_are_streamed_while_running),
+        ("Cauda limitada", test_tail_is_bounded),
+        ("Timeout", test_timeout_kills_process_tree),
+        ("Cancelamento", test_cancellation_stops_program),
+        ("Aviso de silêncio", test_silence_warning),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Testes do cliente HTTP compartilhado (nodeecli/modules/http_client.py).
+"""
+
+import contextvars
+import os
+import sys
+import tempfile
+import threading
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.http_client import (
+    aquecer_conexoes, configurar_http, criar_sessao, definir_opcoes_http, obter_sessao,
+)
+from nodeecli.modules.metadata_cache import MetadataCache
+from nodeecli.modules.mirror import ENV_MIRROR, configurar_npm, url_espelhada
+from tests.http_stub import ServidorHttpLocal
+
+
+def test_keep_alive_reuse():
+    """Metadados e conteúdo do mesmo host reaproveitam a mesma conexão."""
+    with ServidorHttpLocal({'/index.json': b'[]', '/setup.exe': os.urandom(4096)}) as servidor, \
+            tempfile.TemporaryDirectory() as tmp:
+        session = criar_sessao()
+        MetadataCache(tmp).obter(servidor.url('/index.json'), session=session)
+        for _ in range(3):
+            assert session.get(servidor.url('/setup.exe')).status_code == 200
+        assert len(servidor.conexoes) == 1, servidor.conexoes
+        print("✓ 4 requisições em uma única conexão TCP")
+
+
+def test_shared_session_and_options():
+    """Sessão única por processo; proxy e CA aplicados de forma consistente."""
+    assert obter_sessao() is obter_sessao()
+    with tempfile.NamedTemporaryFile(suffix='.pem', delete=False) as ca:
+        caminho_ca = ca.name
+    try:
+        session = configurar_http(proxy='http://proxy.local:8080', cacert=caminho_ca)
+        assert obter_sessao() is session
+        assert session.proxies['https'] == 'http://proxy.local:8080'
+        assert session.verify == caminho_ca
+    finally:
+        configurar_http()
+        os.unlink(caminho_ca)
+
+    try:
+        criar_sessao(cacert=os.path.join(tempfile.gettempdir(), 'nao-existe.pem'))
+        raise AssertionError("CA inexistente deveria falhar")
+    except FileNotFoundError:
+        pass
+    print("✓ sessão compartilhada com proxy/CA")
+
+
+def test_concurrent_runs_keep_their_sessions():
+    """Execuções simultâneas com opções diferentes não trocam nem fecham a sessão uma da outra."""
+    sessoes = {}
+    definidas = threading.Barrier(2)
+
+    def executar(nome, proxy):
+        definir_opcoes_http(proxy=proxy)
+        sessao = obter_sessao()
+        definidas.wait(timeout=5)
+        # A outra execução já definiu as suas opções: esta continua com a mesma sessão, aberta
+        sessoes[nome] = (sessao, obter_sessao(), sessao.adapters['https://'].poolmanager.pools)
+
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(executar, nome, proxy))
+        for nome, proxy in (('nodejs', 'http://proxy.local:8080'), ('git', None))
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert sessoes['nodejs'][0] is sessoes['nodejs'][1]
+        assert sessoes['git'][0] is sessoes['git'][1]
+        assert sessoes['nodejs'][0] is not sessoes['git'][0]
+        assert sessoes['nodejs'][0].proxies['https'] == 'http://proxy.local:8080'
+        assert not sessoes['git'][0].proxies
+    finally:
+        configurar_http()
+    print("✓ uma sessão por conjunto de opções, sem fechar a das outras execuções")
+
+
+def test_warm_up_handles_unreachable_hosts():
+    """Hosts que não resolvem não interrompem o aquecimento."""
+    resultado = aquecer_conexoes(hosts=('host-inexistente.invalid',), timeout=1)
+    assert resultado == {'host-inexistente.invalid': False}
+    print("✓ aquecimento tolera hosts inacessíveis")
+
+
+def test_mirror_rewrites_known_origins():
+    """Com espelho, as URLs das origens conhecidas são atendidas por ele."""
+    assert url_espelhada('https://nodejs.org/dist/v22.11.0/SHASUMS256.txt', 'http://espelho:8080') == \
+        'http://espelho:8080/dist/v22.11.0/SHASUMS256.txt'
+    assert url_espelhada('https://exemplo.com/a.exe', 'http://espelho:8080') == 'https://exemplo.com/a.exe'
+
+    with ServidorHttpLocal({'/dist/index.json': b'[]'}) as servidor:
+        session = criar_sessao(espelho=servidor.url(''))
+        resposta = session.get('https://nodejs.org/dist/index.json', timeout=5)
+        assert resposta.status_code == 200 and resposta.content == b'[]'
+        assert servidor.requisicoes[0][1] == '/dist/index.json'
+
+    anterior = {nome: os.environ.get(nome) for nome in (ENV_MIRROR, 'npm_config_registry')}
+    os.environ[ENV_MIRROR] = 'espelho:8080'
+    try:
+        assert criar_sessao().espelho == 'http://espelho:8080'
+        assert not hasattr(criar_sessao(espelho=''), 'espelho')
+        # A sessão não altera o ambiente do processo; o npm é configurado à parte
+        assert configurar_http().espelho == 'http://espelho:8080'
+        assert os.environ.get('npm_config_registry') == anterior['npm_config_registry']
+        configurar_npm('http://espelho:8080')
+        assert os.environ['npm_config_registry'] == 'http://espelho:8080/npm/'
+    finally:
+        for nome, valor in anterior.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
+        configurar_http()
+    print("✓ URLs reescritas para o espelho (sessão e npm)")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO CLIENTE HTTP COMPARTILHADO")
+    print("=" * 60)
+
+    tests = [
+        ("Reuso de conexão", test_keep_alive_reuse),
+        ("Sessão compartilhada", test_shared_session_and_options),
+        ("Execuções simultâneas", test_concurrent_runs_keep_their_sessions),
+        ("Aquecimento", test_warm_up_handles_unreachable_hosts),
+        ("Espelho", test_mirror_rewrites_known_origins),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Testes da importação adiada (nodeecli/modules/importacao.py): --help dos
+instaladores e a configuração da sessão HTTP não importam requests.
+"""
+
+import os
+import subprocess
+import sys
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules import http_client
+from nodeecli.modules.importacao import ModuloAdiado, importar_adiado
+from src.core.tools import INSTALLER_SCRIPTS
+
+# Executa o instalador como script e informa quais módulos da pilha HTTP foram importados
+VERIFICAR_IMPORTS = """
+import runpy, sys
+sys.argv = [sys.argv[1], '--help']
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+except SystemExit:
+    pass
+carregados = [m for m in ('requests', 'urllib3', 'ssl', 'http.client') if m in sys.modules]
+sys.__stdout__.write('CARREGADOS=' + ','.join(carregados))
+"""
+
+
+def test_installer_help_skips_http_stack():
+    """--help de cada instalador não importa requests, urllib3 nem ssl."""
+    for ferramenta, script in INSTALLER_SCRIPTS.items():
+        resultado = subprocess.run(
+            [sys.executable, '-c', VERIFICAR_IMPORTS, os.path.join(project_root, script)],
+            capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=60,
+        )
+        carregados = resultado.stdout.rpartition('CARREGADOS=')[2].strip()
+        assert 'CARREGADOS=' in resultado.stdout, resultado.stderr
+        assert carregados == '', f"{ferramenta}: {carregados}"
+    print(f"✓ {len(INSTALLER_SCRIPTS)} instaladores sem a pilha HTTP no --help")
+
+
+def test_deferred_module():
+    """O módulo só é importado no primeiro acesso a um atributo."""
+    modulo = importar_adiado('wave')
+    if isinstance(modulo, ModuloAdiado):
+        assert not modulo.carregado
+    assert modulo.open is sys.modules['wave'].open
+    assert importar_adiado('wave') is sys.modules['wave']
+
+    try:
+        importar_adiado('modulo_que_nao_existe')
+    except ModuleNotFoundError as e:
+        assert e.name == 'modulo_que_nao_existe'
+    else:
+        raise AssertionError("módulo inexistente não foi detectado")
+    print("✓ importação no primeiro uso; módulo ausente detectado sem importar")
+
+
+def test_http_options_without_session():
+    """definir_opcoes_http só guarda as opções; a sessão é criada na primeira requisição."""
+    try:
+        assert http_client.definir_opcoes_http(espelho='https://espelho.local') == 'https://espelho.local'
+        assert http_client._opcoes_execucao.get() not in http_client._sessoes
+        session = http_client.obter_sessao()
+        assert session.espelho == 'https://espelho.local'
+        assert http_client.obter_sessao() is session
+    finally:
+        http_client.configurar_http()
+    print("✓ sessão criada sob demanda com as opções definidas")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA IMPORTAÇÃO ADIADA")
+    print("=" * 60)
+
+    tests = [
+        ("--help sem a pilha HTTP", test_installer_help_skips_http_stack),
+        ("Módulo adiado", test_deferred_module),
+        ("Opções HTTP sem sessão", test_http_options_without_session),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de metadados (nodeecli/modules/metadata_cache.py).
+"""
+
+import os
+import sys
+import tempfile
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.metadata_cache import MetadataCache, RespostaMetadados
+from tests.http_stub import ServidorHttpLocal
+
+
+INDICE = b'[{"version": "v22.11.0", "lts": "Jod"}]'
+
+
+def test_fresh_copy_skips_network():
+    """Dentro do TTL, a segunda consulta não faz nenhuma requisição."""
+    with ServidorHttpLocal({'/index.json': INDICE}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        cache = MetadataCache(tmp)
+        url = servidor.url('/index.json')
+        assert cache.obter(url, ttl=60).origem == RespostaMetadados.REDE
+        resposta = cache.obter(url, ttl=60)
+        assert resposta.origem == RespostaMetadados.CACHE
+        assert resposta.json()[0]['version'] == 'v22.11.0'
+        assert len(servidor.requisicoes) == 1
+        print("✓ cópia dentro do TTL servida sem rede")
+
+
+def test_expired_copy_is_revalidated():
+    """TTL vencido: revalidação com If-None-Match e resposta 304."""
+    with ServidorHttpLocal({'/index.json': INDICE}) as servidor, tempfile.TemporaryDirectory() as tmp:
+        cache = MetadataCache(tmp)
+        url = servidor.url('/index.json')
+        cache.obter(url, ttl=0)
+        resposta = cache.obter(url, ttl=0)
+        assert resposta.origem == RespostaMetadados.REVALIDADO
+        assert resposta.content == INDICE
+        assert 'If-None-Match' in servidor.requisicoes[-1][2]
+
+        servidor.arquivos['/index.json'] = b'[]'
+        resposta = cache.obter(url, ttl=0)
+        assert resposta.origem == RespostaMetadados.REDE and resposta.json() == []
+        print("✓ revalidação condicional (304) e atualização quando o conteúdo muda")
+
+
+def test_offline_uses_stale_copy():
+    """Servidor inacessível: usa a última cópia conhecida."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MetadataCache(tmp)
+        with ServidorHttpLocal({'/index.json': INDICE}) as servidor:
+            url = servidor.url('/index.json')
+            cache.obter(url)
+        resposta = cache.obter(url, ttl=0, timeout=2)
+        assert resposta.origem == RespostaMetadados.OBSOLETO
+        assert resposta.content == INDICE
+        print("✓ cópia obsoleta usada sem conexão")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO CACHE DE METADADOS")
+    print("=" * 60)
+
+    tests = [
+        ("Cópia dentro do TTL", test_fresh_copy_skips_network),
+        ("Revalidação condicional", test_expired_copy_is_revalidated),
+        ("Sem conexão", test_offline_uses_stale_copy),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,17 +40,10 @@ def test_imports():
         return False
     
     try:
-        from nodeecli.modules.gemini_cli_installer import GeminiCliInstaller
-        print("✓ Módulo gemini_cli_installer importado com sucesso")
+        from nodeecli.modules.npm_global import InstaladorNpmGlobal, PacoteNpm
+        print("✓ Módulo npm_global importado com sucesso")
     except ImportError as e:
-        print(f"❌ Erro ao importar módulo gemini_cli_installer: {e}")
-        return False
-    
-    try:
-        from nodeecli.modules.qwen_cli_installer import QwenCliInstaller
-        print("✓ Módulo qwen_cli_installer importado com sucesso")
-    except ImportError as e:
-        print(f"❌ Erro ao importar módulo qwen_cli_installer: {e}")
+        print(f"❌ Erro ao importar módulo npm_global: {e}")
         return False
     
     return True
@@ -101,8 +94,7 @@ def test_installers_initialization():
     try:
         from nodeecli.modules.common import Logger
         from nodeecli.modules.nodejs_installer import NodejsInstaller
-        from nodeecli.modules.gemini_cli_installer import GeminiCliInstaller
-        from nodeecli.modules.qwen_cli_installer import QwenCliInstaller
+        from nodeecli.modules.npm_global import InstaladorNpmGlobal
         
         logger = Logger(verbose=False)
         
@@ -117,27 +109,9 @@ def test_installers_initialization():
         else:
             print("✓ Verificação de Node.js funcionando (não detectado)")
         
-        # Testar inicialização do instalador Gemini CLI
-        gemini_installer = GeminiCliInstaller(logger)
-        print("✓ GeminiCliInstaller inicializado com sucesso")
-        
-        # Testar verificação de instalação do Gemini CLI
-        gemini_installed, gemini_version, gemini_path = gemini_installer.verificar_instalacao()
-        if gemini_installed:
-            print(f"✓ Gemini CLI detectado: {gemini_version or 'versão desconhecida'} em {gemini_path}")
-        else:
-            print("✓ Verificação de Gemini CLI funcionando (não detectado)")
-        
-        # Testar inicialização do instalador Qwen CLI
-        qwen_installer = QwenCliInstaller(logger)
-        print("✓ QwenCliInstaller inicializado com sucesso")
-        
-        # Testar verificação de instalação do Qwen CLI
-        qwen_installed, qwen_version, qwen_path = qwen_installer.verificar_instalacao()
-        if qwen_installed:
-            print(f"✓ Qwen CLI detectado: {qwen_version or 'versão desconhecida'} em {qwen_path}")
-        else:
-            print("✓ Verificação de Qwen CLI funcionando (não detectado)")
+        # Testar inicialização do instalador das CLIs npm (Gemini CLI e Qwen CLI)
+        npm_installer = InstaladorNpmGlobal(logger)
+        print("✓ InstaladorNpmGlobal inicializado com sucesso")
         
         logger.close()
         return True
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Testes do índice de releases do Node.js (nodeecli/modules/node_releases.py).
+"""
+
+import os
+import sys
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.node_releases import IndiceReleases
+
+
+# Recorte do formato de https://nodejs.org/dist/index.json
+RELEASES = [
+    {'version': 'v23.3.0', 'lts': False, 'files': ['win-x64-msi', 'win-arm64-msi']},
+    {'version': 'v22.11.0', 'lts': 'Jod', 'files': ['win-x64-msi', 'win-arm64-msi']},
+    {'version': 'v20.18.1', 'lts': 'Iron', 'files': ['win-x64-msi', 'win-x86-msi', 'win-arm64-msi']},
+    {'version': 'v20.9.0', 'lts': 'Iron', 'files': ['win-x64-msi', 'win-x86-msi']},
+    {'version': 'v18.20.5', 'lts': 'Hydrogen', 'files': ['win-x64-msi', 'win-x86-msi']},
+]
+
+
+def test_latest_by_track():
+    """LTS e current mais recentes."""
+    indice = IndiceReleases(list(reversed(RELEASES)))
+    assert indice.mais_recente('lts')['version'] == 'v22.11.0'
+    assert indice.mais_recente('current')['version'] == 'v23.3.0'
+    print("✓ versões mais recentes por trilha")
+
+
+def test_latest_with_arch():
+    """LTS mais recente com MSI x86, resolvida sem requisições por versão."""
+    indice = IndiceReleases(RELEASES)
+    assert indice.mais_recente('lts', 'x86')['version'] == 'v20.18.1'
+    assert indice.mais_recente('lts', 'arm64')['version'] == 'v22.11.0'
+    print("✓ LTS mais recente por arquitetura")
+
+
+def test_msi_lookup():
+    """Disponibilidade do MSI por versão/arquitetura (fallback ARM64 -> x64)."""
+    indice = IndiceReleases(RELEASES)
+    assert not indice.tem_msi('v20.9.0', 'arm64')
+    assert indice.tem_msi('v20.9.0', 'x64')
+    assert indice.versao('20.9.0')['lts'] == 'Iron'
+    assert indice.versao('v1.0.0') is None
+    assert not indice.tem_msi('v1.0.0', 'x64')
+    print("✓ consulta de MSI por arquitetura")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO ÍNDICE DE RELEASES DO NODE.JS")
+    print("=" * 60)
+
+    tests = [
+        ("Mais recente por trilha", test_latest_by_track),
+        ("Mais recente por arquitetura", test_latest_with_arch),
+        ("Consulta de MSI", test_msi_lookup),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Testes da instalação em lote de pacotes npm globais (nodeecli/modules/npm_global.py),
+com um npm falso que registra as chamadas.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.npm_global import InstaladorNpmGlobal, PacoteNpm, ResultadoPacote
+
+# Tempo que cada comando instalado leva para responder ao --version
+ATRASO_VERSAO = 0.3
+
+# npm falso: 'ls -g --json' lista o estado.json; 'install -g <nome>@<versão>...' grava as
+# versões e cria o comando de cada pacote. Pacotes em 'quebrados' fazem a instalação falhar.
+NPM_FALSO = textwrap.dedent("""
+    import json, os, sys
+    from pathlib import Path
+
+    pasta = Path(__file__).parent
+    estado = json.loads((pasta / 'estado.json').read_text())
+    with open(pasta / 'chamadas.log', 'a') as log:
+        log.write(json.dumps(sys.argv[1:]) + '\\n')
+
+    if sys.argv[1] == 'ls':
+        print(json.dumps({'dependencies': {n: {'version': v} for n, v in estado['instalados'].items()}}))
+        sys.exit(0)
+
+    especificacoes = [a for a in sys.argv[3:] if not a.startswith('-')]
+    if any(e.rpartition('@')[0] in estado['quebrados'] for e in especificacoes):
+        print('npm ERR! 404 Not Found', file=sys.stderr)
+        sys.exit(1)
+    for especificacao in especificacoes:
+        nome, _, versao = especificacao.rpartition('@')
+        estado['instalados'][nome] = versao
+        comando = estado['comandos'][nome]
+        script = pasta / f'{comando}.py'
+        script.write_text(f"import time; time.sleep({estado['atraso']}); print('{versao}')")
+        (pasta / comando).write_text(f'#!/bin/sh\\nexec "{sys.executable}" "{script}" "$@"\\n')
+        (pasta / f'{comando}.cmd').write_text(f'@"{sys.executable}" "{script}" %*\\r\\n')
+        os.chmod(pasta / comando, 0o755)
+    (pasta / 'estado.json').write_text(json.dumps(estado))
+""")
+
+PACOTES = [
+    PacoteNpm('@google/gemini-cli', 'gemini', 'Gemini CLI'),
+    PacoteNpm('@qwen-code/qwen-code', 'qwen', 'Qwen CLI'),
+]
+COMANDOS = {'@google/gemini-cli': 'gemini', '@qwen-code/qwen-code': 'qwen', 'pacote-quebrado': 'quebrado'}
+MAIS_RECENTES = {'@google/gemini-cli': '0.2.0', '@qwen-code/qwen-code': '0.0.9', 'pacote-quebrado': '1.0.0'}
+
+
+def _com_npm_falso(instalados, quebrados=()):
+    """Executa o teste com o npm falso no início do PATH; o teste recebe a pasta do npm."""
+    def decorador(test_func):
+        def wrapper():
+            with tempfile.TemporaryDirectory() as tmp:
+                pasta = Path(tmp)
+                (pasta / 'npm.py').write_text(NPM_FALSO)
+                (pasta / 'npm').write_text(f'#!/bin/sh\nexec "{sys.executable}" "{pasta / "npm.py"}" "$@"\n')
+                (pasta / 'npm.cmd').write_text(f'@"{sys.executable}" "{pasta / "npm.py"}" %*\r\n')
+                os.chmod(pasta / 'npm', 0o755)
+                (pasta / 'estado.json').write_text(json.dumps({
+                    'instalados': {}, 'quebrados': list(quebrados), 'comandos': COMANDOS, 'atraso': ATRASO_VERSAO,
+                }))
+                # Pacotes já instalados antes do teste (e os seus comandos)
+                if instalados:
+                    especificacoes = [f"{nome}@{versao}" for nome, versao in instalados.items()]
+                    subprocess.run([sys.executable, str(pasta / 'npm.py'), 'install', '-g', *especificacoes],
+                                   check=True)
+                    (pasta / 'chamadas.log').unlink()
+                path_original = os.environ['PATH']
+                os.environ['PATH'] = tmp + os.pathsep + path_original
+                try:
+                    test_func(pasta)
+                finally:
+                    os.environ['PATH'] = path_original
+        wrapper.__name__ = test_func.__name__
+        wrapper.__doc__ = test_func.__doc__
+        return wrapper
+    return decorador
+
+
+def _instalador():
+    """Instalador com as versões do registro fixas (sem acesso à rede)."""
+    instalador = InstaladorNpmGlobal()
+    instalador.versao_mais_recente = MAIS_RECENTES.get
+    return instalador
+
+
+def _chamadas(pasta):
+    """Argumentos de cada execução do npm falso."""
+    return [json.loads(linha) for linha in (pasta / 'chamadas.log').read_text().splitlines()]
+
+
+@_com_npm_falso({'@google/gemini-cli': '0.2.0'})
+def test_only_missing_packages_are_installed(pasta):
+    """Uma listagem, uma instalação só com o pacote ausente; comandos verificados em paralelo."""
+    inicio = time.perf_counter()
+    resultados = _instalador().instalar(PACOTES)
+    decorrido = time.perf_counter() - inicio
+
+    chamadas = _chamadas(pasta)
+    assert [c[0] for c in chamadas] == ['ls', 'install'], chamadas
+    assert '--prefer-offline' in chamadas[1] and chamadas[1][-1] == '@qwen-code/qwen-code@0.0.9', chamadas[1]
+    gemini, qwen = resultados['@google/gemini-cli'], resultados['@qwen-code/qwen-code']
+    assert gemini.acao == ResultadoPacote.ATUAL and qwen.acao == ResultadoPacote.INSTALADO
+    assert gemini.sucesso and qwen.sucesso
+    assert (gemini.versao_comando, qwen.versao_comando) == ('0.2.0', '0.0.9')
+    # Dois comandos de ATRASO_VERSAO cada: em paralelo, bem menos que a soma
+    assert decorrido < 2 * ATRASO_VERSAO + 1.0, decorrido
+    print(f"✓ 1 'npm ls' + 1 'npm install' (só o Qwen CLI); concluído em {decorrido * 1000:.0f} ms")
+
+
+@_com_npm_falso({'@google/gemini-cli': '0.1.0', '@qwen-code/qwen-code': '0.0.1'})
+def test_outdated_packages_in_one_call(pasta):
+    """Pacotes desatualizados são atualizados juntos, na mesma chamada do npm."""
+    resultados = _instalador().instalar(PACOTES)
+
+    chamadas = _chamadas(pasta)
+    instalacoes = [c for c in chamadas if c[0] == 'install']
+    assert len(instalacoes) == 1, chamadas
+    assert instalacoes[0][-2:] == ['@google/gemini-cli@0.2.0', '@qwen-code/qwen-code@0.0.9'], instalacoes
+    assert all(r.acao == ResultadoPacote.ATUALIZADO and r.sucesso for r in resultados.values())
+    assert resultados['@qwen-code/qwen-code'].versao_anterior == '0.0.1'
+    print("✓ 2 pacotes atualizados em uma única chamada do npm")
+
+
+@_com_npm_falso({'@google/gemini-cli': '0.2.0', '@qwen-code/qwen-code': '0.0.9'})
+def test_nothing_to_install(pasta):
+    """Com tudo atualizado, o npm só é executado para listar os pacotes."""
+    resultados = _instalador().instalar(PACOTES)
+    assert [c[0] for c in _chamadas(pasta)] == ['ls']
+    assert all(r.acao == ResultadoPacote.ATUAL and r.sucesso for r in resultados.values())
+    print("✓ nenhuma instalação quando os pacotes já estão atualizados")
+
+
+@_com_npm_falso({}, quebrados=['pacote-quebrado'])
+def test_batch_failure_falls_back_per_package(pasta):
+    """Se o lote falhar, cada pacote é tentado sozinho: um pacote com problema não bloqueia os outros."""
+    pacotes = [PACOTES[0], PacoteNpm('pacote-quebrado', 'quebrado', 'Pacote quebrado')]
+    resultados = _instalador().instalar(pacotes)
+
+    assert [c[0] for c in _chamadas(pasta)] == ['ls', 'install', 'install', 'install']
+    assert resultados['@google/gemini-cli'].acao == ResultadoPacote.INSTALADO
+    assert resultados['@google/gemini-cli'].sucesso
+    quebrado = resultados['pacote-quebrado']
+    assert quebrado.acao == ResultadoPacote.FALHOU and not quebrado.sucesso
+    assert '404' in quebrado.mensagem, quebrado.mensagem
+    print("✓ falha do lote isolada no pacote com problema")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA INSTALAÇÃO EM LOTE DE PACOTES NPM")
+    print("=" * 60)
+
+    tests = [
+        ("Só os pacotes ausentes", test_only_missing_packages_are_installed),
+        ("Desatualizados em uma chamada", test_outdated_packages_in_one_call),
+        ("Nada a instalar", test_nothing_to_install),
+        ("Falha do lote", test_batch_failure_falls_back_per_package),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
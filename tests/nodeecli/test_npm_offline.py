@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Testes da instalação npm sem o registro público (nodeecli/modules/npm_offline.py):
+resolução das dependências pelo npm, bundle com os tarballs de todas elas e
+instalação a partir do registro local.
+
+O registro "público" é um RegistroLocal com pacotes gerados pelo teste; os
+testes usam o npm real e são ignorados se ele não estiver instalado.
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.bundle import TIPO_PACOTE_NPM
+from nodeecli.modules.npm_global import InstaladorNpmGlobal, PacoteNpm, ResultadoPacote
+from nodeecli.modules.npm_offline import RegistroLocal, resolver_dependencias
+from src.core import bundle as core_bundle
+
+# Pacotes do registro de teste: (nome, versão, package.json adicional)
+PACOTES = [
+    ('@exemplo/cli', '1.0.0', {
+        'bin': {'exemplo': 'cli.js'},
+        'dependencies': {'dep-a': '^1.0.0'},
+        'optionalDependencies': {'dep-mac': '1.0.0'},
+    }),
+    ('dep-a', '1.0.0', {}),
+    ('dep-a', '1.2.0', {'dependencies': {'dep-b': '^2.0.0'}}),
+    ('dep-b', '2.0.0', {}),
+    ('dep-mac', '1.0.0', {'os': ['darwin']}),
+]
+
+CLI_JS = "#!/usr/bin/env node\nconsole.log(require('./package.json').version);\n"
+
+
+def _tarball(pasta, nome, versao, adicional):
+    """Gera o tarball npm de um pacote ('package/package.json' e, se houver bin, 'package/cli.js')."""
+    arquivos = {'package.json': json.dumps(dict(adicional, name=nome, version=versao))}
+    if 'bin' in adicional:
+        arquivos['cli.js'] = CLI_JS
+    caminho = Path(pasta) / f"{nome.lstrip('@').replace('/', '-')}-{versao}.tgz"
+    with tarfile.open(caminho, 'w:gz') as tar:
+        for arquivo, conteudo in arquivos.items():
+            dados = conteudo.encode('utf-8')
+            info = tarfile.TarInfo(f"package/{arquivo}")
+            info.size = len(dados)
+            info.mode = 0o755
+            tar.addfile(info, io.BytesIO(dados))
+    return caminho
+
+
+def _com_registro_e_npm(test_func):
+    """Executa o teste com o registro de teste, um prefixo global, caches vazios e PATH isolados."""
+    def wrapper():
+        if not shutil.which('npm'):
+            print("⚠️  npm não encontrado; teste ignorado")
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / 'tarballs').mkdir()
+            tarballs = [(n, v, _tarball(tmp / 'tarballs', n, v, a), None) for n, v, a in PACOTES]
+            prefixo = tmp / 'prefixo'
+            variaveis = {
+                'npm_config_prefix': str(prefixo),
+                'npm_config_cache': str(tmp / 'cache-npm'),
+                'npm_config_update_notifier': 'false',
+                'ORQUESTRADOR_CACHE_DIR': str(tmp / 'cache'),
+                'PATH': os.pathsep.join([str(prefixo / 'bin'), str(prefixo), os.environ['PATH']]),
+            }
+            anteriores = {chave: os.environ.get(chave) for chave in variaveis}
+            os.environ.update(variaveis)
+            try:
+                with RegistroLocal(tarballs) as registro:
+                    test_func(tmp, registro)
+            finally:
+                for chave, valor in anteriores.items():
+                    if valor is None:
+                        os.environ.pop(chave, None)
+                    else:
+                        os.environ[chave] = valor
+    wrapper.__name__ = test_func.__name__
+    wrapper.__doc__ = test_func.__doc__
+    return wrapper
+
+
+def _gerar_bundle(tmp, registro):
+    """Gera o bundle do pacote de teste a partir do registro informado."""
+    original = core_bundle.NPM_REGISTRY
+    core_bundle.NPM_REGISTRY = registro.url.rstrip('/')
+    try:
+        fontes = {'cli_tools': lambda arch: core_bundle._npm_package_tree('exemplo', '@exemplo/cli', arch)}
+        return core_bundle.build_bundle(str(tmp / 'bundle'), sources=fontes, log=lambda msg: None)
+    finally:
+        core_bundle.NPM_REGISTRY = original
+
+
+@_com_registro_e_npm
+def test_dependency_tree_is_resolved_for_windows(tmp, registro):
+    """O npm resolve a árvore completa; dependências de outras plataformas ficam de fora."""
+    pacotes = resolver_dependencias('@exemplo/cli', '1.0.0', shutil.which('npm'), registro.url)
+    assert [(p['nome'], p['versao']) for p in pacotes] == [
+        ('@exemplo/cli', '1.0.0'), ('dep-a', '1.2.0'), ('dep-b', '2.0.0'),
+    ], pacotes
+    assert all(p['integrity'].startswith('sha512-') for p in pacotes)
+    # Só os documentos dos pacotes foram consultados, nenhum tarball
+    assert registro.requisicoes['tarballs'] == 0, registro.requisicoes
+    print(f"✓ {len(pacotes)} pacotes resolvidos, dep-mac (darwin) descartado")
+
+
+@_com_registro_e_npm
+def test_install_from_bundle_without_registry(tmp, registro):
+    """Os tarballs vêm do cache de artefatos na segunda geração; a instalação não usa o registro."""
+    _gerar_bundle(tmp, registro)
+    baixados = registro.requisicoes['tarballs']
+    bundle = _gerar_bundle(tmp, registro)
+    assert baixados == 3 and registro.requisicoes['tarballs'] == baixados, registro.requisicoes
+    dependencias = sorted(e['arquivo'] for e in bundle.artefatos if e['ferramenta'] == 'npm')
+    assert dependencias == ['npm/dep-a-1.2.0.tgz', 'npm/dep-b-2.0.0.tgz'], dependencias
+    assert bundle.verificar() == []
+
+    # Máquina de destino: o registro de origem não está mais acessível e o cache do npm está vazio
+    registro.stop()
+    os.environ['npm_config_cache'] = str(tmp / 'cache-npm-destino')
+    local = RegistroLocal.do_bundle(bundle)
+    versao = bundle.procurar('exemplo', tipo=TIPO_PACOTE_NPM)['versao']
+    with local:
+        resultados = InstaladorNpmGlobal(registro=local.url).instalar(
+            [PacoteNpm('@exemplo/cli', 'exemplo', 'Exemplo', versao=versao)]
+        )
+    resultado = resultados['@exemplo/cli']
+    assert resultado.acao == ResultadoPacote.INSTALADO and resultado.sucesso, resultado.mensagem
+    assert resultado.versao_comando == '1.0.0', resultado.versao_comando
+    assert local.requisicoes['tarballs'] == 3, local.requisicoes
+    print(f"✓ instalado do registro local: {local.requisicoes['documentos']} documentos, "
+          f"{local.requisicoes['tarballs']} tarballs, nenhum acesso ao registro de origem")
+
+
+@_com_registro_e_npm
+def test_tampered_tarball_is_rejected(tmp, registro):
+    """Um tarball alterado no bundle não confere com o integrity e a instalação falha."""
+    bundle = _gerar_bundle(tmp, registro)
+    registro.stop()
+    entrada = bundle.procurar('npm', tipo=TIPO_PACOTE_NPM)
+    _tarball(tmp, 'dep-a', entrada['versao'], {'scripts': {'postinstall': 'echo alterado'}}).replace(
+        bundle.caminho(entrada)
+    )
+
+    with RegistroLocal.do_bundle(bundle) as local:
+        resultados = InstaladorNpmGlobal(registro=local.url).instalar(
+            [PacoteNpm('@exemplo/cli', 'exemplo', 'Exemplo', versao='1.0.0')]
+        )
+    resultado = resultados['@exemplo/cli']
+    assert resultado.acao == ResultadoPacote.FALHOU, resultado.acao
+    assert 'integrity' in resultado.mensagem.lower() or 'EINTEGRITY' in resultado.mensagem, resultado.mensagem
+    print(f"✓ tarball alterado rejeitado: {resultado.mensagem}")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA INSTALAÇÃO NPM OFFLINE")
+    print("=" * 60)
+
+    tests = [
+        ("Resolução das dependências", test_dependency_tree_is_resolved_for_windows),
+        ("Instalação a partir do bundle", test_install_from_bundle_without_registry),
+        ("Tarball alterado", test_tampered_tarball_is_rejected),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
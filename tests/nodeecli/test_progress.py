@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Testes do indicador de progresso de download (nodeecli/modules/progress.py).
+"""
+
+import io
+import os
+import sys
+
+# Adicionar a raiz do projeto ao sys.path para garantir que nodeecli seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules.events import CanalEventos, ler_evento
+from nodeecli.modules.progress import (
+    MODO_ORQUESTRADOR,
+    MODO_TERMINAL,
+    IndicadorProgresso,
+    formatar_progresso,
+    formatar_tempo,
+)
+
+
+BLOCO = 64 * 1024
+
+
+class RelogioFalso:
+    """Relógio controlado pelo teste."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _eventos(saida):
+    """Eventos escritos no canal (um JSON por linha)."""
+    return [ler_evento(linha) for linha in saida.getvalue().splitlines()]
+
+
+def _simular_download(indicador, relogio, total, segundos):
+    """Chama o indicador a cada bloco de 64 KB, espalhando os blocos ao longo de 'segundos'."""
+    blocos = -(-total // BLOCO)
+    for i in range(1, blocos + 1):
+        relogio.agora = segundos * i / blocos
+        indicador(min(i * BLOCO, total), total)
+
+
+def test_updates_are_rate_limited():
+    """150 MB em blocos de 64 KB geram no máximo um evento por ponto percentual."""
+    total = 150 * 1024 * 1024
+    saida, relogio = io.StringIO(), RelogioFalso()
+    indicador = IndicadorProgresso(relogio=relogio, canal=CanalEventos(saida))
+    assert indicador.modo == MODO_ORQUESTRADOR
+
+    _simular_download(indicador, relogio, total, segundos=60)
+
+    eventos = _eventos(saida)
+    assert total // BLOCO == 2400
+    assert 1 < len(eventos) <= 101, len(eventos)
+    assert all(evento['evento'] == 'progresso' for evento in eventos)
+    final = eventos[-1]
+    assert final['baixados'] == final['total'] == total
+    assert abs(final['taxa'] - total / 60) < total / 60 * 0.05
+    print(f"✓ {len(eventos)} eventos para 2400 blocos (último: 100%)")
+
+
+def test_interval_limits_fast_downloads():
+    """Um download rápido emite poucas atualizações, mas sempre a final."""
+    total = 150 * 1024 * 1024
+    saida, relogio = io.StringIO(), RelogioFalso()
+    indicador = IndicadorProgresso(relogio=relogio, canal=CanalEventos(saida))
+
+    _simular_download(indicador, relogio, total, segundos=1)
+
+    eventos = _eventos(saida)
+    assert len(eventos) <= 6, len(eventos)
+    assert eventos[-1]['baixados'] == total
+    print(f"✓ download de 1s: {len(eventos)} atualizações")
+
+
+def test_unknown_size_and_terminal_mode():
+    """Sem Content-Length o limite é só de tempo; no terminal a barra fica em uma linha."""
+    saida, relogio = io.StringIO(), RelogioFalso()
+    indicador = IndicadorProgresso(saida=saida, relogio=relogio, canal=CanalEventos())
+    assert indicador.modo == MODO_TERMINAL
+    for i in range(1, 201):
+        relogio.agora = i * 0.01
+        indicador(i * BLOCO, None)
+    indicador.concluir()
+
+    texto = saida.getvalue()
+    assert texto.count('\r') == indicador.atualizacoes <= 9
+    assert texto.endswith('\n') and texto.count('\n') == 1
+    assert 'MB/s' in texto
+    print(f"✓ tamanho desconhecido: {indicador.atualizacoes} redesenhos da mesma linha")
+
+
+def test_progress_format_and_eta():
+    """Percentual, MB, taxa e tempo restante no texto exibido."""
+    mb = 1024 * 1024
+    assert formatar_progresso(75 * mb, 150 * mb, 12.5 * mb) == '50% (75.0/150.0 MB, 12.5 MB/s, ~6 s restantes)'
+    assert formatar_progresso(150 * mb, 150 * mb, 12.5 * mb) == '100% (150.0/150.0 MB, 12.5 MB/s)'
+    assert formatar_progresso(3 * mb) == '3.0 MB'
+    assert formatar_tempo(125) == '2 min 05 s'
+    assert formatar_tempo(4200) == '1 h 10 min'
+    print("✓ 50% (75.0/150.0 MB, 12.5 MB/s, ~6 s restantes)")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DO INDICADOR DE PROGRESSO")
+    print("=" * 60)
+
+    tests = [
+        ("Limite por percentual", test_updates_are_rate_limited),
+        ("Limite por tempo", test_interval_limits_fast_downloads),
+        ("Tamanho desconhecido", test_unknown_size_and_terminal_mode),
+        ("Formato e tempo restante", test_progress_format_and_eta),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Testes da instalação do Bun sem PowerShell (opencode/installer.py): release
+resolvida pela API do GitHub, .zip conferido pelo SHA-256 e reaproveitado do
+cache de artefatos, bun.exe extraído para o diretório do Bun.
+
+A API do GitHub e os assets são servidos por um servidor HTTP local.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# Adicionar a raiz do projeto ao sys.path para garantir que opencode seja importável
+project_root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from nodeecli.modules import common
+from nodeecli.modules.bundle import TIPO_BINARIO, Bundle
+from opencode import installer
+from tests.http_stub import ServidorHttpLocal
+
+BUN_EXE = os.urandom(512 * 1024)
+ASSET = 'bun-windows-x64.zip'
+TAG = 'bun-v1.2.19'
+
+
+def _zip_bun(conteudo=BUN_EXE):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('bun-windows-x64/bun.exe', conteudo)
+    return buffer.getvalue()
+
+
+def _release(sha256=None):
+    """Arquivos do servidor: release mais recente, SHASUMS256.txt e o .zip."""
+    conteudo = _zip_bun()
+    sha256 = sha256 or hashlib.sha256(conteudo).hexdigest()
+    base = f'/oven-sh/bun/releases/download/{TAG}'
+    return conteudo, {
+        f'{base}/{ASSET}': conteudo,
+        f'{base}/SHASUMS256.txt': f'{"0" * 64}  bun-linux-x64.zip\n{sha256}  {ASSET}\n'.encode(),
+    }
+
+
+def _com_release(arquivos, test_func, tmp):
+    """Executa test_func com a API do GitHub e o cache de artefatos apontando para o teste."""
+    with ServidorHttpLocal(arquivos) as servidor:
+        assets = [{'name': Path(caminho).name, 'browser_download_url': servidor.url(caminho)}
+                  for caminho in arquivos]
+        servidor.arquivos['/oven-sh/bun/releases/latest'] = json.dumps(
+            {'tag_name': TAG, 'assets': assets}).encode()
+        api_original = installer.GITHUB_API
+        cache_original = os.environ.get('ORQUESTRADOR_CACHE_DIR')
+        installer.GITHUB_API = servidor.url('').rstrip('/')
+        os.environ['ORQUESTRADOR_CACHE_DIR'] = os.path.join(tmp, 'cache')
+        try:
+            test_func(servidor)
+        finally:
+            installer.GITHUB_API = api_original
+            if cache_original is None:
+                os.environ.pop('ORQUESTRADOR_CACHE_DIR', None)
+            else:
+                os.environ['ORQUESTRADOR_CACHE_DIR'] = cache_original
+
+
+def test_install_and_reinstall_from_cache():
+    """bun.exe (e bunx.exe) extraídos; a reinstalação não baixa o .zip de novo."""
+    _, arquivos = _release()
+    with tempfile.TemporaryDirectory() as tmp:
+        def executar(servidor):
+            primeiro = Path(tmp) / 'primeiro' / 'bin'
+            assert installer.install_bun_native(primeiro)
+            assert (primeiro / 'bun.exe').read_bytes() == BUN_EXE
+            assert (primeiro / 'bunx.exe').read_bytes() == BUN_EXE
+            assert not (primeiro / 'bun.exe.part').exists()
+
+            downloads = [r for r in servidor.requisicoes if r[1].endswith(ASSET) and r[0] == 'GET']
+            segundo = Path(tmp) / 'segundo' / 'bin'
+            assert installer.install_bun_native(segundo)
+            assert (segundo / 'bun.exe').read_bytes() == BUN_EXE
+            repetidos = [r for r in servidor.requisicoes if r[1].endswith(ASSET) and r[0] == 'GET']
+            assert downloads and repetidos == downloads, (downloads, repetidos)
+        _com_release(arquivos, executar, tmp)
+    print("✓ instalado da release e reinstalado do cache sem baixar o .zip")
+
+
+def test_checksum_mismatch_is_rejected():
+    """Um .zip que não confere com o SHASUMS256.txt da release não é extraído."""
+    _, arquivos = _release(sha256='f' * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        def executar(servidor):
+            destino = Path(tmp) / 'bin'
+            assert not installer.install_bun_native(destino)
+            assert not (destino / 'bun.exe').exists()
+        _com_release(arquivos, executar, tmp)
+    print("✓ .zip com SHA-256 divergente rejeitado")
+
+
+def test_asset_per_architecture():
+    """Build baseline para CPUs x64 sem AVX2; x86 não tem build do Bun."""
+    assert installer.bun_asset_name('x64') == 'bun-windows-x64.zip'
+    assert installer.bun_asset_name('x64', avx2=False) == 'bun-windows-x64-baseline.zip'
+    assert installer.bun_asset_name('arm64') == 'bun-windows-aarch64.zip'
+    try:
+        installer.bun_asset_name('x86')
+        assert False, "x86 não deveria ter asset"
+    except ValueError:
+        pass
+    print("✓ asset escolhido por arquitetura e AVX2")
+
+
+def test_bundle_variant_follows_cpu():
+    """Do bundle, o build AVX2 só é extraído em CPUs com AVX2; as demais recebem o baseline."""
+    originais = (installer.bun_install_dir, installer._cpu_supports_avx2, common.detectar_arquitetura)
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = Bundle.criar(Path(tmp) / 'bundle')
+        for avx2 in (True, False):
+            nome = installer.bun_asset_name('x64', avx2)
+            origem = Path(tmp) / nome
+            origem.write_bytes(_zip_bun(nome.encode()))
+            bundle.adicionar(origem, 'bun', TIPO_BINARIO, TAG, 'x64')
+        bundle.salvar()
+
+        common.detectar_arquitetura = lambda: 'x64'
+        try:
+            for avx2 in (True, False):
+                destino = Path(tmp) / f'avx2-{avx2}'
+                installer.bun_install_dir = lambda: destino
+                installer._cpu_supports_avx2 = lambda: avx2
+                assert installer.install_bun_from_bundle(bundle)
+                assert (destino / 'bun.exe').read_bytes() == installer.bun_asset_name('x64', avx2).encode()
+
+            common.detectar_arquitetura = lambda: 'arm64'
+            assert not installer.install_bun_from_bundle(bundle)
+        finally:
+            installer.bun_install_dir, installer._cpu_supports_avx2, common.detectar_arquitetura = originais
+    print("✓ build do Bun do bundle escolhido pela arquitetura e pelo AVX2")
+
+
+def main():
+    """Função principal de teste."""
+    print("=" * 60)
+    print("TESTE DA INSTALAÇÃO DO BUN")
+    print("=" * 60)
+
+    tests = [
+        ("Instalação e reinstalação", test_install_and_reinstall_from_cache),
+        ("SHA-256 divergente", test_checksum_mismatch_is_rejected),
+        ("Asset por arquitetura", test_asset_per_architecture),
+        ("Build do bundle por processador", test_bundle_variant_follows_cpu),
+    ]
+
+    all_passed = True
+    for test_name, test_func in tests:
+        print(f"\n{test_name}")
+        print("-" * len(test_name))
+        try:
+            test_func()
+            print(f"{test_name}: PASSOU")
+        except Exception as e:
+            print(f"❌ {test_name}: FALHOU ({e})")
+            all_passed = False
+
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
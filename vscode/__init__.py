@@ -0,0 +1,9 @@
+"""
+VS Code Installer Module
+
+Módulo de instalação automatizada do Visual Studio Code.
+"""
+
+from vscode.vscode_installer import main
+
+__all__ = ["main"]
@@ -9,15 +9,40 @@ import os
 import sys
 import subprocess
 import tempfile
-import requests
-import time
 import ctypes
+import re
+import argparse
 import platform
 from pathlib import Path
-
+from urllib.parse import urljoin, urlparse
+
+# Garantir que os módulos compartilhados (nodeecli/modules) sejam importáveis
+_project_root = Path(__file__).resolve().parent.parent
+if (_project_root / 'nodeecli').is_dir() and str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from nodeecli.modules.common import (  # noqa: E402
+    configure_stdout_stderr, obter_diretorio_staging, salvar_artefato_preparado,
+    carregar_artefato_preparado, limpar_artefato_preparado,
+)
+from nodeecli.modules.artifact_cache import obter_com_cache, obter_do_cache  # noqa: E402
+from nodeecli.modules.bundle import ErroBundle, adicionar_argumento_bundle, obter_bundle  # noqa: E402
+from nodeecli.modules.downloader import ErroDownload  # noqa: E402
+from nodeecli.modules.events import avisar, cancelamento_solicitado, concluir, fase  # noqa: E402
+from nodeecli.modules.http_client import (  # noqa: E402
+    adicionar_argumentos_http, definir_opcoes_http, obter_sessao,
+)
+from nodeecli.modules.importacao import importar_adiado  # noqa: E402
+from nodeecli.modules.progress import IndicadorProgresso  # noqa: E402
+
+# Importado na primeira requisição: --help e a etapa "install" não carregam a pilha HTTP
+requests = importar_adiado('requests')
 
 
 # Constantes
+FERRAMENTA = "vscode"
+NOME_INSTALADOR = "VSCodeUserSetup-x64.exe"
+ARQUITETURA = "x64"
 VSCODE_DOWNLOAD_URL = "https://update.code.visualstudio.com/latest/win32-x64-user/stable"
 INSTALL_ARGS = ["/VERYSILENT", "/SP-", "/NORESTART", "/MERGETASKS=!runcode,desktopicon,addcontextmenufiles,addcontextmenufolders,associatewithfiles,addtopath"]
 
@@ -47,94 +72,89 @@ def verify_windows():
     return True
 
 
-def download_vscode():
+def resolve_vscode_release(timeout=10):
+    """
+    Resolve o redirecionamento de "latest" para a URL versionada do instalador.
+
+    Returns:
+        tuple: (url, versao) do instalador, ou (None, None) se não foi possível
+               consultar o servidor (ex.: máquina offline)
+    """
+    try:
+        response = obter_sessao().head(VSCODE_DOWNLOAD_URL, allow_redirects=False, timeout=timeout)
+    except requests.RequestException:
+        return None, None
+
+    location = response.headers.get('Location')
+    if response.status_code not in (301, 302, 303, 307, 308) or not location:
+        return None, None
+
+    url = urljoin(VSCODE_DOWNLOAD_URL, location)
+    match = re.search(r'-(\d+\.\d+\.\d+)\.exe$', urlparse(url).path)
+    return url, (match.group(1) if match else None)
+
+
+def download_vscode(bundle=None):
     """
     Baixa o instalador do VS Code com barra de progresso.
 
+    O instalador é reaproveitado do cache local de artefatos quando a mesma
+    versão já foi baixada; sem acesso à rede, usa a versão mais recente do cache.
+
+    Args:
+        bundle (Bundle): Bundle offline; se informado, o instalador é copiado dele sem acessar a rede
+
     Returns:
         str: Caminho completo do arquivo baixado
         None: Em caso de erro
     """
-    print("📥 Baixando VS Code...")
-    print(f"   URL: {VSCODE_DOWNLOAD_URL}")
+    # Caminho determinístico no staging: a etapa "install" pode rodar em outro processo
+    installer_path = str(obter_diretorio_staging(FERRAMENTA) / NOME_INSTALADOR)
+
+    if bundle:
+        entry = bundle.procurar(FERRAMENTA, arquitetura=ARQUITETURA)
+        if not entry:
+            print("❌ O bundle não contém o instalador do VS Code.")
+            return None
+        try:
+            bundle.materializar(entry, installer_path)
+        except ErroBundle as e:
+            print(f"❌ {e}")
+            return None
+        print(f"📦 Usando VS Code {entry.get('versao') or ''} do bundle offline")
+        print(f"✅ Instalador disponível: {installer_path}")
+        return installer_path
+
+    url, version = resolve_vscode_release()
+    if not url:
+        entry = obter_do_cache(FERRAMENTA, installer_path, arquitetura=ARQUITETURA)
+        if entry:
+            print(f"📦 Sem acesso ao servidor: usando VS Code {entry.get('versao') or ''} do cache local")
+            print(f"✅ Instalador disponível: {installer_path}")
+            return installer_path
+        url = VSCODE_DOWNLOAD_URL
+
+    print("📥 Baixando VS Code" + (f" {version}..." if version else "..."))
+    print(f"   URL: {url}")
     print(f"   Tamanho estimado: ~100 MB")
     print()
 
     try:
-        # Criar arquivo temporário com nome único
-        temp_file = tempfile.NamedTemporaryFile(suffix='.exe', delete=False)
-        installer_path = temp_file.name
-        temp_file.close()  # Fechar pois vamos escrever diretamente no arquivo
-
-        # Configurar timeout e tentativas
-        TIMEOUT = (10, 120)  # connect, read
-        response = None
-
-        for attempt in range(3):
-            try:
-                print(f"   Tentativa {attempt + 1}/3...")
-                response = requests.get(VSCODE_DOWNLOAD_URL, stream=True, timeout=TIMEOUT)
-                response.raise_for_status()
-                break
-            except requests.RequestException as e:
-                print(f"   Erro na tentativa {attempt + 1}: {e}")
-                if attempt == 2:
-                    raise
-                wait_time = 2 * (attempt + 1)
-                print(f"   Aguardando {wait_time} segundos antes de tentar novamente...")
-                time.sleep(wait_time)
-
-        # Obter tamanho total do arquivo
-        total_size = None
-        total_mb = 0
-        if response is not None:
-            total_size = response.headers.get('Content-Length')
-            if total_size is not None:
-                total_size = int(total_size)
-                total_mb = total_size / (1024 * 1024)
-            else:
-                total_size = None
-
-        # Iniciar download com barra de progresso
-        downloaded = 0
-        chunk_size = 8192
-
-        with open(installer_path, 'wb') as file:
-            if response is not None:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        file.write(chunk)
-                        downloaded += len(chunk)
-                        downloaded_mb = downloaded / (1024 * 1024)
-
-                        # Exibir progresso
-                        if total_size:
-                            progress = downloaded / total_size * 100
-                            # Barra de progresso com porcentagem e total
-                            bar_length = 40
-                            filled_length = int(bar_length * progress / 100)
-                            bar = '█' * filled_length + '-' * (bar_length - filled_length)
-                            print(f'\r   Progresso: |{bar}| {progress:.1f}% ({downloaded_mb:.1f}/{total_mb:.1f} MB)', end='', flush=True)
-                        else:
-                            # Contador simples sem porcentagem
-                            print(f'\r   Baixado: {downloaded_mb:.1f} MB', end='', flush=True)
-
-        print()  # Nova linha após o progresso
-        
-        # Verificar integridade do download comparando bytes baixados com Content-Length
-        if total_size is not None and downloaded != total_size:
-            try:
-                os.remove(installer_path)
-            except Exception:
-                pass
-            print("\n❌ Download incompleto: tamanho inesperado do arquivo.")
-            return None
-            
+        # Download em faixas paralelas (fluxo único se o servidor não suportar Range)
+        indicador = IndicadorProgresso()
+        resultado = obter_com_cache(url, installer_path, FERRAMENTA, version, ARQUITETURA,
+                                    ao_progresso=indicador, cancelar=cancelamento_solicitado)
+        indicador.concluir()
+        if resultado['origem'] == 'cache':
+            print("📦 Instalador encontrado no cache local (download dispensado)")
+
         print(f"✅ Download concluído: {installer_path}")
+        if resultado['segmentos'] > 1:
+            print(f"   Conexões simultâneas: {resultado['segmentos']}")
         return str(installer_path)
 
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ Erro de conexão após 3 tentativas: {e}")
+    except ErroDownload as e:
+        print(f"\n❌ Erro no download: {e}")
         print("   Verifique sua conexão com a internet e tente novamente.")
         return None
     except IOError as e:
@@ -219,20 +239,20 @@ def cleanup(installer_path):
         print(f"⚠️  Não foi possível remover o arquivo temporário: {e}")
 
 
-def main():
+def parse_args(argv=None):
+    """Interpreta os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Instalador automático do VS Code")
+    parser.add_argument('--phase', choices=['all', 'fetch', 'install'], default='all',
+                        help="Etapa a executar: all=download + instalação, fetch=apenas download, "
+                             "install=instala o que a etapa fetch baixou")
+    adicionar_argumentos_http(parser)
+    adicionar_argumento_bundle(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Função principal que orquestra o processo de instalação."""
-    # Import resiliente de configure_stdout_stderr (opcional)
-    try:
-        from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-    except ModuleNotFoundError:
-        try:
-            project_root = Path(__file__).resolve().parent.parent
-            if (project_root / 'nodeecli').is_dir() and str(project_root) not in sys.path:
-                sys.path.insert(0, str(project_root))
-            from nodeecli.modules.common import configure_stdout_stderr  # type: ignore
-        except ModuleNotFoundError:
-            def configure_stdout_stderr() -> None:  # type: ignore
-                return None
+    args = parse_args(argv)
 
     try:
         configure_stdout_stderr()
@@ -241,6 +261,13 @@ def main():
     
     print_banner()
 
+    try:
+        definir_opcoes_http(proxy=args.proxy, cacert=args.cacert, espelho=args.mirror)
+        bundle = obter_bundle(args.from_bundle) if args.phase != 'install' else None
+    except (FileNotFoundError, ErroBundle) as e:
+        print(f"❌ {e}")
+        return 1
+
     # Verificar se está no Windows
     if not verify_windows():
         return 1
@@ -248,35 +275,53 @@ def main():
     # Verificar arquitetura do sistema
     arch = platform.machine().lower()
     if arch not in ("amd64", "x86_64"):
-        print("⚠️  Aviso: Detectado sistema 32-bit.")
+        avisar("Detectado sistema 32-bit.")
         print("   • Este script baixa o instalador 64-bit do VS Code")
         print("   • Para sistemas 32-bit, considere usar a variante win32-ia32")
         print("   • A instalação pode não funcionar corretamente")
         print()
 
-    # Verificar privilégios de administrador
-    admin_status = is_admin()
-    if not admin_status:
-        print("ℹ️  Nota: Executando sem privilégios de administrador.")
-        print("   • O Instalador de Usuário do VS Code não requer administrador")
-        print("   • Alguns ambientes corporativos podem solicitar elevação")
-        print("   • Se encontrar problemas, execute como administrador")
-        print()
-    else:
-        print("✅ Executando com privilégios de administrador")
-        print()
+    if args.phase != 'fetch':
+        # Verificar privilégios de administrador
+        admin_status = is_admin()
+        if not admin_status:
+            print("ℹ️  Nota: Executando sem privilégios de administrador.")
+            print("   • O Instalador de Usuário do VS Code não requer administrador")
+            print("   • Alguns ambientes corporativos podem solicitar elevação")
+            print("   • Se encontrar problemas, execute como administrador")
+            print()
+        else:
+            print("✅ Executando com privilégios de administrador")
+            print()
 
     try:
-        # Baixar o instalador
-        installer_path = download_vscode()
-        if not installer_path:
-            return 1
+        if args.phase == 'install':
+            # Usar o instalador baixado pela etapa "fetch"
+            preparado = carregar_artefato_preparado(FERRAMENTA)
+            if not preparado or not preparado.get('caminho'):
+                print("❌ Nenhum instalador preparado encontrado. Execute a etapa 'fetch' antes.")
+                return 1
+            installer_path = preparado['caminho']
+        else:
+            # Baixar o instalador
+            with fase('download') as etapa:
+                installer_path = download_vscode(bundle)
+                etapa.sucesso = bool(installer_path)
+            if not installer_path:
+                return 1
+
+            if args.phase == 'fetch':
+                salvar_artefato_preparado(FERRAMENTA, installer_path)
+                print("📦 Instalador pronto para a etapa de instalação.")
+                return 0
 
         # Executar instalação
-        success = install_vscode(installer_path)
+        with fase('instalacao') as etapa:
+            success = etapa.sucesso = install_vscode(installer_path)
 
         # Limpar arquivo temporário
         cleanup(installer_path)
+        limpar_artefato_preparado(FERRAMENTA)
 
         if success:
             print("\n🎉 Instalação concluída com sucesso!")
@@ -296,4 +341,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(concluir(main()))